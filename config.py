@@ -8,6 +8,7 @@
 - children: 子菜单列表 (二级菜单)
 - order: 排序顺序 (数字越小越靠前)
 """
+import copy
 import json
 import os
 
@@ -52,10 +53,28 @@ MENU_CONFIG = [
 HUBSTUDIO_CONFIG = {
     "base_url": "http://localhost:6873",
     "app_id": "202601091459192924876173312",
-    "app_secret": "MIIEvwIBADANBgkqhkiG9w0BAQEFAASCBKkwggSlAgEAAoIBAQCUoDjNJ5nfphNcrMP0SrXnx5d4/4tZO0dYDvTJstk5wCgjoUDGb2WMSOGiXc5uC4vxQdZcnQZ8ae35qaI2+l4ARVpwFE5Fgir9RxTPcMrvRqvQh8rzWLp2z9wCXGOL7ZljDmgbCfrt5oLM/960OVXExy4duzJHgZ1QRTajkgH5hCRfbpJyI3G8MYlBIUhu6pKkHqUWvSLTttP1EO8XPLtQ4DeczaMA2oknI2M5SURVVhtE0AcFxrriJlp6rBmUwQuBCGlx+M6g5gNPy8MFHpZkZWra7b3bKQqe8nVN/q+EypsQDS+IeM77heAQl/9+hp7kJaBYBhZz6i0d02LyS79PAgMBAAECggEAP1/GeKw/L59YODcu4zcMM8Xmr+B/YdAmDsVp2auadsaaFv9GaJbNfTECjUJkqIXh6UDCkAEg5+IfaErN8ZV2ibUI6CuwaHEltZQeqomU7sx6rNOKVZNrBwiA7rzIcb0hn5xgBc+OoOyer50XMFAWY27vGhxdRyJcmwK4Vq0GjIcFzUu8l/NEPpNADmS94KUDQDpiWjoE74EJz2LQKOeTr3pAXQ7MddX5UbyHR1dtUTgWHXnw+aUMhBumjmXUO7IyTis4ZzFMWPGOh0G7Vg/roIQkm9TIqk9xiBlPKizvFT4ugKb+gVHfIiFCNyZI4P918iBlrzj2c52j88t0TUEhMQKBgQDZTzosC8MHpezCOE3wnM+Wkz4kk9b2h5899Z1v5N6fV7zVnYN6p+HZrANekSIZ1q7rBogiZ1+g+afviC+ot7PTuwDFns1kRhJ2OhFMt1qRlkOGWazo1qpkbLKDMgjDq+xxmYzEC6frH0QUYUEoe2pTRemjs9awzaQPBwZZwp+WFwKBgQCvFnTktmzodAaDuUr7Nct4KnBnjTOgZaaxoduyUR99TC6R1RWKxmvasgJWPp0PZBnqeBXVgdRvOx0wA9emUkd0ESKFlMTDXlqrWqJH/Qdc8BD4qwz1dIycnkRQJBOEgthR1hcwDujn2sBEZyNRqglVO0tCfw83zaV6D14klHAbiQKBgQCwnUOaKLUJskEKWNh/hfLxXhpTgBRlqTQzFzwthMWqm5RNyQbi2S8lyjey1CHy/hiLy3M5Ausl2cIzW2vgo+zzWDj4ZGhp5sl6bRdCUoK5cHbQ6nEti8pQdEdheXjGDyTL7xAJBbAj1/Vs2t4qGKQBqgCJm9ARQhDkZcEzkopBYQKBgQCqLAhm9wt5DrP6ORCwgoOFArKHYsznu4S9pxRSBti1PmMQ6Grsm5feUh9FVcvvVpp9skN+ZZZkma7vqPxjMhsyqyjDbmmjfURgwVFy6HHMmaPVHOMWejXkT0sUHUw/AbFgMNYOpp8mIg23Lgs85yf1CBFIyxeuZBjOPruAkCk6CQKBgQDQiEM92ojiO1sYODgslKgALYWN3EFmlszVr8TIVky1J262+wRusxyBTB/Rpuu4frDAgd8eqEPomZ/QCYzeyJGdq7FtOoXQO0PdqaSatqsq4OuWgSHi8wseLVNHBrmAAhIF38RK8Dc3GragwdtuspKj9nVAUfBdkuMPaZc1hp0vGA=="
+    "app_secret": "MIIEvwIBADANBgkqhkiG9w0BAQEFAASCBKkwggSlAgEAAoIBAQCUoDjNJ5nfphNcrMP0SrXnx5d4/4tZO0dYDvTJstk5wCgjoUDGb2WMSOGiXc5uC4vxQdZcnQZ8ae35qaI2+l4ARVpwFE5Fgir9RxTPcMrvRqvQh8rzWLp2z9wCXGOL7ZljDmgbCfrt5oLM/960OVXExy4duzJHgZ1QRTajkgH5hCRfbpJyI3G8MYlBIUhu6pKkHqUWvSLTttP1EO8XPLtQ4DeczaMA2oknI2M5SURVVhtE0AcFxrriJlp6rBmUwQuBCGlx+M6g5gNPy8MFHpZkZWra7b3bKQqe8nVN/q+EypsQDS+IeM77heAQl/9+hp7kJaBYBhZz6i0d02LyS79PAgMBAAECggEAP1/GeKw/L59YODcu4zcMM8Xmr+B/YdAmDsVp2auadsaaFv9GaJbNfTECjUJkqIXh6UDCkAEg5+IfaErN8ZV2ibUI6CuwaHEltZQeqomU7sx6rNOKVZNrBwiA7rzIcb0hn5xgBc+OoOyer50XMFAWY27vGhxdRyJcmwK4Vq0GjIcFzUu8l/NEPpNADmS94KUDQDpiWjoE74EJz2LQKOeTr3pAXQ7MddX5UbyHR1dtUTgWHXnw+aUMhBumjmXUO7IyTis4ZzFMWPGOh0G7Vg/roIQkm9TIqk9xiBlPKizvFT4ugKb+gVHfIiFCNyZI4P918iBlrzj2c52j88t0TUEhMQKBgQDZTzosC8MHpezCOE3wnM+Wkz4kk9b2h5899Z1v5N6fV7zVnYN6p+HZrANekSIZ1q7rBogiZ1+g+afviC+ot7PTuwDFns1kRhJ2OhFMt1qRlkOGWazo1qpkbLKDMgjDq+xxmYzEC6frH0QUYUEoe2pTRemjs9awzaQPBwZZwp+WFwKBgQCvFnTktmzodAaDuUr7Nct4KnBnjTOgZaaxoduyUR99TC6R1RWKxmvasgJWPp0PZBnqeBXVgdRvOx0wA9emUkd0ESKFlMTDXlqrWqJH/Qdc8BD4qwz1dIycnkRQJBOEgthR1hcwDujn2sBEZyNRqglVO0tCfw83zaV6D14klHAbiQKBgQCwnUOaKLUJskEKWNh/hfLxXhpTgBRlqTQzFzwthMWqm5RNyQbi2S8lyjey1CHy/hiLy3M5Ausl2cIzW2vgo+zzWDj4ZGhp5sl6bRdCUoK5cHbQ6nEti8pQdEdheXjGDyTL7xAJBbAj1/Vs2t4qGKQBqgCJm9ARQhDkZcEzkopBYQKBgQCqLAhm9wt5DrP6ORCwgoOFArKHYsznu4S9pxRSBti1PmMQ6Grsm5feUh9FVcvvVpp9skN+ZZZkma7vqPxjMhsyqyjDbmmjfURgwVFy6HHMmaPVHOMWejXkT0sUHUw/AbFgMNYOpp8mIg23Lgs85yf1CBFIyxeuZBjOPruAkCk6CQKBgQDQiEM92ojiO1sYODgslKgALYWN3EFmlszVr8TIVky1J262+wRusxyBTB/Rpuu4frDAgd8eqEPomZ/QCYzeyJGdq7FtOoXQO0PdqaSatqsq4OuWgSHi8wseLVNHBrmAAhIF38RK8Dc3GragwdtuspKj9nVAUfBdkuMPaZc1hp0vGA==",
+    "create_interval": [1, 2],  # 批量创建环境时相邻两次创建的间隔范围（秒），避免触发频率限制
+    "capacity": 0,  # 上面这个（默认）实例同时运行的浏览器数上限，0 为不限
+    # 其他 HubStudio 实例（多台电脑各运行一个 HubStudio，扩容时添加一项），每项：
+    # {"name": "pc2", "base_url": "http://192.168.1.12:6873", "app_id": "...", "app_secret": "...", "capacity": 5}
+    # app_id / app_secret 省略时使用上面的值；配置多个实例时批量任务的并发数为各实例容量之和
+    "instances": [],
 }
 
-# MySQL 配置（默认值）
+# 数据库配置（默认值）
+# MySQL 适合多人/多机共用；单机使用可选内嵌的 SQLite（WAL 模式），无需安装数据库服务
+DATABASE_CONFIG = {
+    "backend": "mysql",         # 数据库类型：mysql / sqlite
+    "sqlite_path": "google_account.db",  # SQLite 数据库文件（相对路径相对于程序运行目录）
+    "sqlite_busy_timeout": 30,  # SQLite 写入时等待其他写入完成的最长秒数
+    "sqlite_cache_mb": 64,      # SQLite 每个连接的页缓存大小（MB）
+    "sqlite_mmap_mb": 256,      # SQLite 内存映射读取的大小（MB，0 为不使用）
+    "log_batch_size": 200,      # SQLite 下登录日志由后台线程合并写入，每批最多条数（1 为逐条写入）
+    "log_flush_interval": 0.5,  # 登录日志合并写入的最长等待时间（秒）
+}
+
+# MySQL 配置（默认值，DATABASE_CONFIG.backend 为 mysql 时使用）
 MYSQL_CONFIG = {
     "host": "localhost",      # 数据库主机地址
     "port": 3306,             # 端口
@@ -64,6 +83,17 @@ MYSQL_CONFIG = {
     "database": "google_account"  # 数据库名
 }
 
+# 数据库连接池配置（默认值）
+# 后台任务按“每次数据库操作一个短会话”使用连接，浏览器操作期间不占用连接，
+# 因此连接数只需覆盖同时进行的数据库操作，而不是工作线程总数
+DB_POOL_CONFIG = {
+    "pool_size": 10,            # 常驻连接数
+    "max_overflow": 20,         # 高峰时可额外创建的连接数
+    "pool_timeout": 30,         # 连接池耗尽时等待空闲连接的秒数
+    "pool_recycle": 1800,       # 连接最长使用时间（秒），应小于 MySQL 的 wait_timeout
+    "pool_pre_ping": True,      # 取出连接前先检测，自动替换已被 MySQL 断开的连接
+}
+
 # 应用配置
 APP_CONFIG = {
     "SECRET_KEY": "your-secret-key-change-in-production",
@@ -72,6 +102,41 @@ APP_CONFIG = {
     "PORT": 5000,
 }
 
+# 生产环境 Web 服务配置（python serve.py，使用 waitress；默认值）
+SERVER_CONFIG = {
+    "threads": 16,              # 工作线程数（每个请求占用一个线程直到响应结束）
+    "sse_streams": 6,           # 同时保持的实时进度（SSE）连接上限，最多占用一半线程
+    "connection_limit": 200,    # 最大连接数
+    "channel_timeout": 120,     # 空闲连接超时（秒）
+}
+
+# 接口响应配置（默认值）
+RESPONSE_CONFIG = {
+    "compress": True,           # 是否压缩较大的响应（客户端支持时优先 br，需安装 brotli，否则 gzip）
+    "compress_min_size": 1024,  # 响应体超过该字节数才压缩
+    "compress_level": 6,        # gzip 压缩级别（1-9）
+    "etag": True,               # 接口 GET 响应是否带 ETag，内容未变化时返回 304
+}
+
+# 批量任务工作进程配置（默认值）
+WORKER_CONFIG = {
+    "embedded": True,           # Web 进程内是否同时运行工作线程（false 时需另外启动 python -m services.worker）
+    "max_jobs": 2,              # 每个工作进程同时执行的批量任务数
+    "poll_interval": 2,         # 领取新任务的间隔（秒）
+    "stale_timeout": 120,       # 运行中任务超过该时长（秒）没有心跳时视为工作进程已退出，标记为已停止
+}
+
+# 创收要求定期复查配置（默认值）
+MONETIZATION_CHECK_CONFIG = {
+    "enabled": True,            # 是否定期复查已创建频道的创收要求
+    "interval": 600,            # 检查是否有需要复查的频道的间隔（秒）
+    "batch_size": 5,            # 每批复查的频道数
+    "delay": 30,                # 同一批内相邻两个频道之间的间隔（秒）
+    "max_age_days": 7,          # 创收要求超过该天数未检测时重新检测
+    "retry_hours": 24,          # 检测失败（未获取到创收要求）后，间隔该小时数再重试
+    "on_login": True,           # 登录成功后若创收要求需要复查，复用已打开的浏览器顺便检测
+}
+
 # 2Captcha API 配置（用于解决人机验证）
 CAPTCHA_CONFIG = {
     "api_key": "d9718240bbbf8709464fc7f74f6498bc",  # 请替换为您的2captcha API密钥
@@ -81,40 +146,117 @@ CAPTCHA_CONFIG = {
 # 频道头像路径配置（默认值）
 CHANNEL_AVATAR_PATH = ""
 
+# 头像预处理缓存配置（默认值）
+AVATAR_CACHE_CONFIG = {
+    "enabled": True,            # 是否上传预处理后的头像（关闭则直接上传原图）
+    "dir": "avatar_cache",      # 缓存目录
+    "size": 800,                # 输出边长（像素，居中裁剪为正方形）
+    "format": "JPEG",           # 输出格式：JPEG / PNG
+    "quality": 88,              # JPEG 质量
+    "variation": True,          # 是否对每张图做轻微的视觉扰动（亮度/对比度/饱和度/裁剪位置）
+    "workers": 0,               # 进程池大小，0 表示使用 CPU 核心数
+}
+
 # 申诉文案Excel路径配置（默认值）
 APPEAL_TEXT_PATH = ""
 
+# 日志配置（默认值）
+LOG_CONFIG = {
+    "level": "INFO",            # 日志级别：DEBUG/INFO/WARNING/ERROR
+    "dir": "logs",              # 日志目录
+    "file": "app.log",          # 日志文件名（JSON 行格式）
+    "max_bytes": 10 * 1024 * 1024,  # 单个文件最大字节数，超过后轮转
+    "backup_count": 5,          # 保留的轮转文件数
+    "console": True,            # 是否同时输出到控制台（生产环境可关闭）
+    "console_level": "INFO",    # 控制台日志级别
+}
+
+# 登录失败自动重试配置（默认值，各失败类型的重试规则见 services/retry_service.py）
+RETRY_CONFIG = {
+    "enabled": True,            # 是否启用批量登录失败自动重试
+    "max_delay": 1800,          # 单次退避等待的上限（秒）
+    "proxy_cooldown": 600,      # 代理相关失败后，该浏览器环境（代理）的冷却时间（秒）
+}
+
+# 节点（SOCKS5 代理）健康检测配置（默认值）
+NODE_CHECK_CONFIG = {
+    "timeout": 5,               # 单个节点的连接/握手超时（秒）
+    "workers": 20,              # 并发检测的线程数
+    "target_host": "www.google.com",  # 通过代理建立连接的目标，用于确认代理可以出网
+    "target_port": 443,
+    "max_age": 1800,            # 创建环境时，超过该时长（秒）未检测的节点会先检测
+}
+
 # ==================== 从 JSON 文件加载配置 ====================
+# config.json 中的键 -> 本模块中的配置变量（字典类配置与默认值合并，其余直接覆盖）
+# 读取配置请使用 config.XXX（如 config.HUBSTUDIO_CONFIG），不要 from config import XXX：
+# 配置热加载时会整体替换这些变量，from import 拿到的是旧对象
+JSON_CONFIG_KEYS = {
+    'database': 'DATABASE_CONFIG',
+    'mysql': 'MYSQL_CONFIG',
+    'db_pool': 'DB_POOL_CONFIG',
+    'server': 'SERVER_CONFIG',
+    'response': 'RESPONSE_CONFIG',
+    'worker': 'WORKER_CONFIG',
+    'monetization_check': 'MONETIZATION_CHECK_CONFIG',
+    'hubstudio': 'HUBSTUDIO_CONFIG',
+    'channel_avatar_path': 'CHANNEL_AVATAR_PATH',
+    'appeal_text_path': 'APPEAL_TEXT_PATH',
+    'avatar_cache': 'AVATAR_CACHE_CONFIG',
+    'log': 'LOG_CONFIG',
+    'retry': 'RETRY_CONFIG',
+    'node_check': 'NODE_CHECK_CONFIG',
+}
+
+CONFIG_FILE = os.path.join(os.path.dirname(__file__), 'config.json')
+
+_DEFAULTS = copy.deepcopy({name: globals()[name] for name in JSON_CONFIG_KEYS.values()})
+
+
+def read_config_file(config_file=CONFIG_FILE):
+    """读取 config.json 并与默认值合并（不修改当前配置）
+
+    Returns:
+        dict: 配置变量名 -> 新值
+
+    Raises:
+        OSError: 文件无法读取
+        ValueError: JSON 格式错误
+    """
+    with open(config_file, 'r', encoding='utf-8') as f:
+        user_config = json.load(f)
+
+    values = copy.deepcopy(_DEFAULTS)
+    for key, name in JSON_CONFIG_KEYS.items():
+        if key not in user_config:
+            continue
+        if isinstance(values[name], dict):
+            values[name].update(user_config[key])
+        else:
+            values[name] = user_config[key]
+    return values
+
+
+def apply_config(values):
+    """用新值整体替换配置变量，读取方要么拿到旧配置、要么拿到新配置，不会读到更新了一半的字典
+
+    Returns:
+        list: 发生变化的配置变量名
+    """
+    current = globals()
+    changed = [name for name, value in values.items() if current.get(name) != value]
+    current.update({name: values[name] for name in changed})
+    return changed
+
+
 def load_config_from_json():
     """从 config.json 文件加载配置并覆盖默认值"""
-    config_file = os.path.join(os.path.dirname(__file__), 'config.json')
-    
-    if not os.path.exists(config_file):
-        print(f"警告: 配置文件 {config_file} 不存在，使用默认配置")
+    if not os.path.exists(CONFIG_FILE):
+        print(f"警告: 配置文件 {CONFIG_FILE} 不存在，使用默认配置")
         return
     
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            user_config = json.load(f)
-        
-        # 更新 MySQL 配置
-        if 'mysql' in user_config:
-            MYSQL_CONFIG.update(user_config['mysql'])
-        
-        # 更新 Hubstudio 配置
-        if 'hubstudio' in user_config:
-            HUBSTUDIO_CONFIG.update(user_config['hubstudio'])
-        
-        # 更新频道头像路径
-        if 'channel_avatar_path' in user_config:
-            global CHANNEL_AVATAR_PATH
-            CHANNEL_AVATAR_PATH = user_config['channel_avatar_path']
-        
-        # 更新申诉文案路径
-        if 'appeal_text_path' in user_config:
-            global APPEAL_TEXT_PATH
-            APPEAL_TEXT_PATH = user_config['appeal_text_path']
-        
+        apply_config(read_config_file())
         print("✓ 成功从 config.json 加载配置")
     except json.JSONDecodeError as e:
         print(f"错误: 配置文件 JSON 格式错误 - {e}")
@@ -124,6 +266,15 @@ def load_config_from_json():
 # 加载用户配置
 load_config_from_json()
 
+
+
+def build_database_uri():
+    """根据 DATABASE_CONFIG（及 MYSQL_CONFIG）构建数据库连接字符串"""
+    if DATABASE_CONFIG['backend'] == 'sqlite':
+        return f"sqlite:///{os.path.abspath(DATABASE_CONFIG['sqlite_path'])}"
+    return f"mysql+pymysql://{MYSQL_CONFIG['user']}:{MYSQL_CONFIG['password']}@{MYSQL_CONFIG['host']}:{MYSQL_CONFIG['port']}/{MYSQL_CONFIG['database']}?charset=utf8mb4"
+
+
 # 构建数据库连接字符串
-DATABASE_URI = f"mysql+pymysql://{MYSQL_CONFIG['user']}:{MYSQL_CONFIG['password']}@{MYSQL_CONFIG['host']}:{MYSQL_CONFIG['port']}/{MYSQL_CONFIG['database']}?charset=utf8mb4"
+DATABASE_URI = build_database_uri()
 
@@ -2,18 +2,45 @@
 """
 谷歌账号管理系统 - 主应用
 """
+import os
+import sys
+
+import click
 from flask import Flask
-from flask_migrate import Migrate
+import config
 from models import db
-from config import MENU_CONFIG, DATABASE_URI, APP_CONFIG
+from config import MENU_CONFIG, DATABASE_URI, APP_CONFIG, DB_POOL_CONFIG
 
 app = Flask(__name__)
 app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URI
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(DB_POOL_CONFIG)
 app.config['SECRET_KEY'] = APP_CONFIG['SECRET_KEY']
 
 db.init_app(app)
-migrate = Migrate(app, db)
+
+# orjson 序列化、ETag / 304、响应压缩
+from services import response_service
+response_service.init_app(app)
+
+
+class LazyMigrateGroup(click.Group):
+    """flask db 命令组：执行时才导入 flask_migrate / alembic（导入较慢），Web 服务启动不受影响"""
+
+    def _migrate_group(self):
+        if 'migrate' not in app.extensions:
+            from flask_migrate import Migrate
+            Migrate(app, db)
+        return app.cli.commands['db']
+
+    def list_commands(self, ctx):
+        return self._migrate_group().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._migrate_group().get_command(ctx, name)
+
+
+app.cli.add_command(LazyMigrateGroup('db', help='数据库迁移（Flask-Migrate）'))
 
 
 def get_sorted_menu():
@@ -32,7 +59,7 @@ def inject_menu():
 
 
 # 注册蓝图
-from routes import page_bp, account_bp, login_bp, phone_bp, node_bp, browser_bp, settings_bp, channel_bp
+from routes import page_bp, account_bp, login_bp, phone_bp, node_bp, browser_bp, settings_bp, channel_bp, job_bp
 
 app.register_blueprint(page_bp)
 app.register_blueprint(account_bp)
@@ -42,9 +69,36 @@ app.register_blueprint(node_bp)
 app.register_blueprint(browser_bp)
 app.register_blueprint(settings_bp)
 app.register_blueprint(channel_bp)
+app.register_blueprint(job_bp)
 
 
-if __name__ == '__main__':
+def prepare_runtime():
+    """启动 Web 服务前的准备：建表、监控 config.json（修改后自动生效）、启动内嵌的批量任务工作线程"""
+    # 打包为 exe 后，头像预处理的进程池需要
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
     with app.app_context():
         db.create_all()
-    app.run(host=APP_CONFIG['HOST'], port=APP_CONFIG['PORT'], debug=APP_CONFIG['DEBUG'])
+    
+    from services import config_service
+    config_service.start_watcher()
+    
+    # 批量任务由工作进程从数据库领取执行；未单独部署工作进程时在本进程内执行
+    if config.WORKER_CONFIG['embedded']:
+        from services import worker
+        worker.start_embedded(app)
+
+
+if __name__ == '__main__':
+    # 打包后的程序总是使用生产环境服务器
+    if APP_CONFIG['DEBUG'] and not getattr(sys, 'frozen', False):
+        # 开发模式：Flask 自带的调试服务器（自动重载）。重载器的父进程只负责监控文件、
+        # 重启子进程，不处理请求；只在处理请求的子进程中启动工作线程和配置监控，避免启动两份
+        if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+            prepare_runtime()
+        app.run(host=APP_CONFIG['HOST'], port=APP_CONFIG['PORT'], debug=True)
+    else:
+        prepare_runtime()
+        from services import server_service
+        server_service.serve(app)
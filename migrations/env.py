@@ -65,7 +65,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        render_as_batch=url.startswith('sqlite')
     )
 
     with context.begin_transaction():
@@ -97,6 +98,8 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # SQLite 不支持大部分 ALTER TABLE，自动生成的迁移使用 batch 模式（重建表）
+        conf_args.setdefault('render_as_batch', connection.dialect.name == 'sqlite')
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -0,0 +1,92 @@
+"""创建初始表
+
+Revision ID: 0b6e3f1a2c48
+Revises: 
+Create Date: 2026-01-09 15:30:02.118406
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b6e3f1a2c48'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 最早的版本由 db.create_all() 建表，没有对应的迁移；这里补上当时的表结构，
+    # 使空数据库（MySQL / SQLite）也能通过 flask db upgrade 建出完整的表结构。
+    # 已有这些表的数据库跳过（此前部署的数据库已处于之后的版本，不会执行到这里）
+    # 离线模式（flask db upgrade --sql）只生成 SQL，无法查询已有的表
+    existing = set() if context.is_offline_mode() else set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'accounts' not in existing:
+        op.create_table('accounts',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('account', sa.String(length=255), nullable=False, comment='账号'),
+        sa.Column('password', sa.String(length=255), nullable=False, comment='密码'),
+        sa.Column('backup_email', sa.String(length=255), nullable=True, comment='辅助邮箱'),
+        sa.Column('status', sa.Boolean(), nullable=True, comment='状态：是否使用'),
+        sa.Column('created_at', sa.DateTime(), nullable=True, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'phones' not in existing:
+        op.create_table('phones',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('phone_number', sa.String(length=50), nullable=False, comment='手机号'),
+        sa.Column('sms_url', sa.String(length=500), nullable=True, comment='接码URL'),
+        sa.Column('expire_time', sa.DateTime(), nullable=True, comment='过期时间'),
+        sa.Column('status', sa.Boolean(), nullable=True, comment='状态：是否使用'),
+        sa.Column('created_at', sa.DateTime(), nullable=True, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'nodes' not in existing:
+        op.create_table('nodes',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('ip', sa.String(length=50), nullable=False, comment='节点IP'),
+        sa.Column('port', sa.Integer(), nullable=False, comment='端口'),
+        sa.Column('username', sa.String(length=100), nullable=True, comment='用户名'),
+        sa.Column('password', sa.String(length=255), nullable=True, comment='密码'),
+        sa.Column('status', sa.Boolean(), nullable=True, comment='状态：是否使用'),
+        sa.Column('created_at', sa.DateTime(), nullable=True, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'login_logs' not in existing:
+        op.create_table('login_logs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False, comment='账号ID'),
+        sa.Column('browser_env_id', sa.String(length=100), nullable=True, comment='浏览器环境ID'),
+        sa.Column('action', sa.String(length=50), nullable=False, comment='操作类型'),
+        sa.Column('status', sa.String(length=50), nullable=False, comment='状态'),
+        sa.Column('message', sa.Text(), nullable=True, comment='详细信息'),
+        sa.Column('created_at', sa.DateTime(), nullable=True, comment='创建时间'),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'browser_envs' not in existing:
+        op.create_table('browser_envs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('container_code', sa.String(length=100), nullable=False, comment='环境ID'),
+        sa.Column('container_name', sa.String(length=255), nullable=True, comment='环境名称'),
+        sa.Column('status', sa.Boolean(), nullable=True, comment='状态：是否已使用'),
+        sa.Column('account_id', sa.Integer(), nullable=True, comment='关联账号ID'),
+        sa.Column('created_at', sa.DateTime(), nullable=True, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, comment='更新时间'),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('container_code')
+        )
+
+
+def downgrade():
+    op.drop_table('browser_envs')
+    op.drop_table('login_logs')
+    op.drop_table('nodes')
+    op.drop_table('phones')
+    op.drop_table('accounts')
@@ -1,7 +1,7 @@
 """添加 login_status 字段
 
 Revision ID: 1680069e0853
-Revises: 
+Revises: 0b6e3f1a2c48
 Create Date: 2026-01-09 15:46:49.438152
 
 """
@@ -11,7 +11,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision = '1680069e0853'
-down_revision = None
+down_revision = '0b6e3f1a2c48'
 branch_labels = None
 depends_on = None
 
@@ -0,0 +1,40 @@
+"""任务账号列表改为MEDIUMTEXT
+
+Revision ID: f2a8c6d4b1e9
+Revises: e5c1a9d3f7b2
+Create Date: 2026-10-19 21:05:12.408731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a8c6d4b1e9'
+down_revision = 'e5c1a9d3f7b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 只有 MySQL 的 TEXT 有 64KB 上限，其他数据库无需修改
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.alter_column('account_ids',
+               existing_type=mysql.TEXT(),
+               type_=mysql.MEDIUMTEXT(),
+               existing_nullable=False,
+               existing_comment='账号ID列表（JSON）')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.alter_column('account_ids',
+               existing_type=mysql.MEDIUMTEXT(),
+               type_=mysql.TEXT(),
+               existing_nullable=False,
+               existing_comment='账号ID列表（JSON）')
@@ -2,10 +2,91 @@
 """
 数据模型定义
 """
+import sqlite3
+from contextlib import contextmanager
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import MetaData, event
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import Engine
 from datetime import datetime
 
-db = SQLAlchemy()
+import config
+
+
+
+def _fk_target(constraint, table):
+    """外键名称中的列名和引用表名"""
+    if not constraint.elements:
+        # 迁移中 drop_constraint(None, ...) 删除未命名的外键时约束不带列，无法确定名称
+        raise ValueError(f'无法确定表 {table.name} 要删除的外键名称，请在迁移中显式写出外键名称')
+    element = constraint.elements[0]
+    return f"{element.parent.name}_{element.target_fullname.split('.')[-2]}"
+
+
+# 外键统一命名：SQLite 的 batch 迁移（重建表）要求约束有名称，迁移操作创建约束时也沿用此规则。
+# 已有 MySQL 库中数据库自动生成的名称（如 accounts_ibfk_1）不受影响；新的迁移中应显式写出约束名称
+NAMING_CONVENTION = {
+    'ix': 'ix_%(column_0_label)s',
+    'fk_target': _fk_target,
+    'fk': 'fk_%(table_name)s_%(fk_target)s',
+}
+
+db = SQLAlchemy(metadata=MetaData(naming_convention=NAMING_CONVENTION))
+
+
+@event.listens_for(Engine, 'connect')
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    """SQLite 连接：WAL 模式（读写互不阻塞）及缓存、等待锁等 PRAGMA；其他数据库不处理"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    database_config = config.DATABASE_CONFIG
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    # WAL 模式下 NORMAL 只在检查点时同步磁盘，断电最多丢失最近的事务，不会损坏数据库
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute(f"PRAGMA busy_timeout={int(database_config.get('sqlite_busy_timeout', 30) * 1000)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(database_config.get('sqlite_cache_mb', 64) * 1024)}")
+    cursor.execute(f"PRAGMA mmap_size={int(database_config.get('sqlite_mmap_mb', 256) * 1024 * 1024)}")
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.close()
+
+
+def format_datetime(value):
+    """时间字段输出为 ISO 8601 格式（YYYY-MM-DD HH:MM:SS，精确到秒），为空时返回空字符串
+
+    isoformat 比 strftime 快数倍，列表接口每行有多个时间字段。
+    """
+    return value.isoformat(' ', 'seconds') if value else ''
+
+
+def _session_in_use():
+    """当前会话是否已被调用方使用（有未结束的事务或已加载/新增的对象）"""
+    if not db.session.registry.has():
+        return False
+    session = db.session()
+    return session.in_transaction() or bool(session.identity_map) or bool(session.new)
+
+
+@contextmanager
+def session_scope():
+    """短会话：块结束时提交（出错回滚）并关闭会话，连接立即归还连接池
+
+    后台任务在浏览器操作（可能持续数分钟）期间不应持有数据库连接或 ORM 对象：
+    只在块内查询/修改，需要的字段先取成普通值，块外不要再使用块内查出的对象。
+
+    调用方的会话已在使用时（如请求处理函数中调用的辅助函数），块结束只提交、不关闭会话，
+    调用方查出的对象仍可继续使用；与 add_login_log 一样，提交时会一并提交调用方未提交的修改。
+    """
+    owned = not _session_in_use()
+    try:
+        yield db.session
+        db.session.commit()
+    except BaseException:
+        db.session.rollback()
+        raise
+    finally:
+        if owned:
+            db.session.close()
 
 
 # 登录状态枚举
@@ -27,6 +108,9 @@ LOGIN_STATUS = {
 class Account(db.Model):
     """账号管理模型"""
     __tablename__ = 'accounts'
+    __table_args__ = (
+        db.Index('ix_accounts_channel_status_monetization_checked_at', 'channel_status', 'monetization_checked_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     account = db.Column(db.String(255), nullable=False, comment='账号')
@@ -39,6 +123,7 @@ class Account(db.Model):
     channel_status = db.Column(db.String(50), default='not_created', comment='频道状态：not_created/created/failed')
     channel_url = db.Column(db.String(500), nullable=True, comment='频道链接')
     monetization_requirement = db.Column(db.String(10), nullable=True, comment='创收次数要求：3m/10m')
+    monetization_checked_at = db.Column(db.DateTime, nullable=True, comment='最近一次检测创收要求的时间')
     created_at = db.Column(db.DateTime, default=datetime.now, comment='创建时间')
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, comment='更新时间')
     
@@ -47,6 +132,12 @@ class Account(db.Model):
     # 关联手机号
     phone = db.relationship('Phone', backref='bound_account', foreign_keys=[phone_id])
     
+    @classmethod
+    def update_by_id(cls, account_id, **values):
+        """用短会话按ID更新字段（后台任务在长流程中不持有账号对象）"""
+        with session_scope():
+            cls.query.filter_by(id=account_id).update(values, synchronize_session=False)
+    
     def to_dict(self):
         # 频道状态映射
         channel_status_map = {
@@ -69,14 +160,19 @@ class Account(db.Model):
             'channel_status_text': channel_status_map.get(self.channel_status, '未创建'),
             'channel_url': self.channel_url or '',
             'monetization_requirement': self.monetization_requirement or '',
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else '',
-            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S') if self.updated_at else '',
+            'monetization_checked_at': format_datetime(self.monetization_checked_at),
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at),
         }
 
 
 class LoginLog(db.Model):
     """登录日志模型"""
     __tablename__ = 'login_logs'
+    __table_args__ = (
+        # MySQL 会为外键自动建索引，SQLite 不会；查看账号日志按 account_id 查询
+        db.Index('ix_login_logs_account_id', 'account_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     account_id = db.Column(db.Integer, db.ForeignKey('accounts.id'), nullable=False, comment='账号ID')
@@ -94,19 +190,24 @@ class LoginLog(db.Model):
             'action': self.action,
             'status': self.status,
             'message': self.message or '',
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else '',
+            'created_at': format_datetime(self.created_at),
         }
 
 
 class BrowserEnv(db.Model):
     """浏览器环境状态模型（本地记录HubStudio环境使用状态）"""
     __tablename__ = 'browser_envs'
+    __table_args__ = (
+        # 多个 HubStudio 实例时按实例查找未使用的环境
+        db.Index('ix_browser_envs_instance_status', 'instance', 'status'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     container_code = db.Column(db.String(100), unique=True, nullable=False, comment='环境ID')
     container_name = db.Column(db.String(255), nullable=True, comment='环境名称')
     status = db.Column(db.Boolean, default=False, comment='状态：是否已使用')
     account_id = db.Column(db.Integer, db.ForeignKey('accounts.id'), nullable=True, comment='关联账号ID')
+    instance = db.Column(db.String(50), nullable=True, comment='所属HubStudio实例名称（空为默认实例）')
     created_at = db.Column(db.DateTime, default=datetime.now, comment='创建时间')
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, comment='更新时间')
     
@@ -115,13 +216,29 @@ class BrowserEnv(db.Model):
             'id': self.id,
             'container_code': self.container_code,
             'container_name': self.container_name or '',
+            'instance': self.instance or '',
             'status': self.status,
             'account_id': self.account_id,
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else '',
-            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S') if self.updated_at else '',
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at),
         }
 
 
+class HubStudioSlot(db.Model):
+    """HubStudio 实例的运行名额：每行是一个运行中的浏览器，Web 进程和各工作进程共享实例容量"""
+    __tablename__ = 'hubstudio_slots'
+    __table_args__ = (
+        # 名额编号在实例内唯一：多个进程同时占用同一名额时只有一个能插入成功
+        db.UniqueConstraint('instance', 'slot', name='uq_hubstudio_slots_instance_slot'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    instance = db.Column(db.String(50), nullable=False, comment='HubStudio实例名称')
+    slot = db.Column(db.Integer, nullable=False, comment='名额编号（设置容量时为 0 到容量-1）')
+    container_code = db.Column(db.String(100), nullable=False, comment='占用名额的环境ID')
+    acquired_at = db.Column(db.DateTime, nullable=False, default=datetime.now, comment='占用时间（启动浏览器的时间）')
+
+
 class Phone(db.Model):
     """手机号管理模型"""
     __tablename__ = 'phones'
@@ -139,16 +256,19 @@ class Phone(db.Model):
             'id': self.id,
             'phone_number': self.phone_number,
             'sms_url': self.sms_url or '',
-            'expire_time': self.expire_time.strftime('%Y-%m-%d') if self.expire_time else '',
+            'expire_time': self.expire_time.date().isoformat() if self.expire_time else '',
             'status': self.status,
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else '',
-            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S') if self.updated_at else '',
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at),
         }
 
 
 class Node(db.Model):
     """节点管理模型"""
     __tablename__ = 'nodes'
+    __table_args__ = (
+        db.Index('ix_nodes_status_health_score', 'status', 'health_score'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     ip = db.Column(db.String(50), nullable=False, comment='节点IP')
@@ -156,6 +276,10 @@ class Node(db.Model):
     username = db.Column(db.String(100), nullable=True, comment='用户名')
     password = db.Column(db.String(255), nullable=True, comment='密码')
     status = db.Column(db.Boolean, default=False, comment='状态：是否使用')
+    latency = db.Column(db.Integer, nullable=True, comment='最近一次检测的延迟（毫秒）')
+    health_score = db.Column(db.Integer, nullable=True, comment='健康评分：0-100，0表示不可用，空表示未检测')
+    check_message = db.Column(db.String(255), nullable=True, comment='最近一次检测结果说明')
+    last_check_at = db.Column(db.DateTime, nullable=True, comment='最近一次检测时间')
     created_at = db.Column(db.DateTime, default=datetime.now, comment='创建时间')
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, comment='更新时间')
     
@@ -167,8 +291,57 @@ class Node(db.Model):
             'username': self.username or '',
             'password': self.password or '',
             'status': self.status,
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else '',
-            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S') if self.updated_at else '',
+            'latency': self.latency,
+            'health_score': self.health_score,
+            'check_message': self.check_message or '',
+            'last_check_at': format_datetime(self.last_check_at),
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at),
+        }
+
+
+class Avatar(db.Model):
+    """频道头像使用记录（文件本身在头像文件夹中，按文件名关联）"""
+    __tablename__ = 'avatars'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    file_name = db.Column(db.String(255), unique=True, nullable=False, comment='头像文件名')
+    use_count = db.Column(db.Integer, default=0, nullable=False, comment='被分配的次数')
+    account_id = db.Column(db.Integer, db.ForeignKey('accounts.id'), nullable=True, comment='已成功使用该头像的账号ID')
+    last_used_at = db.Column(db.DateTime, nullable=True, comment='最近一次分配时间')
+    leased_at = db.Column(db.DateTime, nullable=True, comment='当前分配（未归还）的时间，为空表示未分配')
+    leased_by = db.Column(db.String(100), nullable=True, comment='当前持有该头像的进程（主机名:进程号）')
+    created_at = db.Column(db.DateTime, default=datetime.now, comment='创建时间')
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'file_name': self.file_name,
+            'use_count': self.use_count,
+            'account_id': self.account_id,
+            'last_used_at': format_datetime(self.last_used_at),
+            'leased_at': format_datetime(self.leased_at),
+            'created_at': format_datetime(self.created_at),
         }
 
 
+class Job(db.Model):
+    """批量任务队列（Web 端入队，工作进程领取执行并回写进度）"""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_status_created_at', 'status', 'created_at'),
+    )
+    
+    id = db.Column(db.String(32), primary_key=True, comment='任务ID')
+    type = db.Column(db.String(50), nullable=False, comment='任务类型：batch_login/batch_create_channel')
+    # MySQL 的 TEXT 最大 64KB，按筛选条件批量操作时可能有数万个账号，使用 MEDIUMTEXT
+    account_ids = db.Column(db.Text().with_variant(mysql.MEDIUMTEXT(), 'mysql'), nullable=False,
+                            comment='账号ID列表（JSON）')
+    status = db.Column(db.String(20), default='queued', nullable=False, comment='状态：queued/running/stopped/finished')
+    cancel_requested = db.Column(db.Boolean, default=False, nullable=False, comment='是否已请求停止')
+    worker = db.Column(db.String(100), nullable=True, comment='执行该任务的工作进程（主机名:进程号）')
+    progress = db.Column(db.Text, nullable=True, comment='进度快照（JSON：计数、预计剩余时间、最近的账号事件）')
+    heartbeat_at = db.Column(db.DateTime, nullable=True, comment='工作进程最近一次回写进度的时间')
+    created_at = db.Column(db.DateTime, default=datetime.now, comment='创建时间')
+    started_at = db.Column(db.DateTime, nullable=True, comment='开始执行时间')
+    finished_at = db.Column(db.DateTime, nullable=True, comment='结束时间')
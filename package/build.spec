@@ -0,0 +1,80 @@
+# -*- mode: python ; coding: utf-8 -*-
+"""
+PyInstaller 规格文件，配置项见 build_config.py
+
+在项目根目录执行: pyinstaller package/build.spec --clean
+"""
+import inspect
+import os
+import sys
+
+from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+
+sys.path.insert(0, SPECPATH)
+import build_config  # noqa: E402
+
+ROOT_DIR = os.path.dirname(SPECPATH)
+
+datas = [(os.path.join(ROOT_DIR, src), dest) for src, dest in build_config.datas
+         if os.path.exists(os.path.join(ROOT_DIR, src))]
+for package in build_config.collect_data:
+    datas += collect_data_files(package)
+
+hiddenimports = list(build_config.hiddenimports)
+for package in build_config.collect_submodules:
+    hiddenimports += collect_submodules(package)
+
+# PyInstaller 6.6 起 Analysis 支持 optimize 参数；更早的版本需用 python -O -m PyInstaller 打包
+analysis_options = {}
+if 'optimize' in inspect.signature(Analysis).parameters:
+    analysis_options['optimize'] = build_config.OPTIMIZE
+
+a = Analysis(
+    [os.path.join(ROOT_DIR, build_config.MAIN_SCRIPT)],
+    pathex=[ROOT_DIR],
+    binaries=build_config.binaries,
+    datas=datas,
+    hiddenimports=hiddenimports,
+    hookspath=[],
+    runtime_hooks=[os.path.join(SPECPATH, 'runtime_hook.py')],
+    excludes=build_config.excludes,
+    noarchive=False,  # 预编译的字节码放入 PYZ 归档
+    **analysis_options
+)
+pyz = PYZ(a.pure)
+
+if build_config.ONEDIR:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name=build_config.APP_NAME,
+        icon=build_config.ICON_FILE,
+        console=build_config.CONSOLE,
+        upx=build_config.UPX,
+        strip=False,
+        debug=False,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        name=build_config.APP_NAME,
+        upx=build_config.UPX,
+        strip=False,
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name=build_config.APP_NAME,
+        icon=build_config.ICON_FILE,
+        console=build_config.CONSOLE,
+        upx=build_config.UPX,
+        strip=False,
+        debug=False,
+    )
@@ -18,42 +18,75 @@ datas = [
     ('申诉文件.xlsx', '.'),
 ]
 
-# 隐藏导入（PyInstaller可能检测不到的模块）
+# 隐藏导入（PyInstaller 检测不到的、按名称动态加载的模块）
+# 业务模块中函数内的延迟导入（pandas、selenium 等）能被静态分析到，无需列出
 hiddenimports = [
-    'flask',
-    'flask_sqlalchemy',
-    'flask_migrate',
     'sqlalchemy.sql.default_comparator',
+    'sqlalchemy.dialects.mysql.pymysql',  # 由 DATABASE_URI 按名称加载
+    'sqlalchemy.dialects.sqlite.pysqlite',  # database.backend 为 sqlite 时按名称加载
     'pymysql',
-    'pandas',
-    'openpyxl',
-    'selenium',
-    'pyautogui',
-    'pyperclip',
-    'requests',
+    'openpyxl',                           # pandas 读写 xlsx 的引擎，按名称加载
 ]
 
-# 排除的模块（减小打包体积）
+# 排除的模块（减小打包体积、缩短启动时间）
 excludes = [
-    'matplotlib',
+    # 打包后的程序直接启动 Web 服务，不执行 flask db 迁移命令
+    'flask_migrate',
+    'alembic',
+    'mako',
+
+    # pandas / numpy 中用不到的部分：测试、绘图、可选的读写和计算引擎
+    'pandas.tests',
+    'pandas.plotting._matplotlib',
+    'pandas.io.formats.style',
+    'pandas.io.clipboard',
+    'numpy.tests',
     'numpy.testing',
+    'numpy.f2py',
+    'numpy.distutils',
+    'pyarrow',
+    'numexpr',
+    'bottleneck',
+    'tables',
+    'xlrd',
+    'xlsxwriter',
+    'odf',
+    'pyxlsb',
+    'fsspec',
+
+    # 其他常见的大型库
+    'matplotlib',
     'scipy',
+    'IPython',
+    'pytest',
     'tkinter',
 ]
 
 # 二进制文件
 binaries = []
 
-# 收集所有子包
+# 收集所有子包（只收集按名称动态加载、静态分析不到的包）
 collect_submodules = [
-    'flask',
-    'sqlalchemy',
-    'alembic',
+    'sqlalchemy.dialects.mysql',
 ]
 
 # 收集数据
 collect_data = [
     'flask',
     'flask_sqlalchemy',
-    'flask_migrate',
 ]
+
+# ---------- 构建模式 ----------
+
+# onedir：程序和依赖解压好放在目录中，启动时不需要像 onefile 那样每次解压到临时目录
+ONEDIR = True
+
+# 字节码优化级别（0/1/2），Python 模块在打包时预编译成 .pyc 放入归档，运行时不再编译
+# 2 会去掉文档字符串，click/flask 的命令帮助依赖文档字符串，因此使用 1
+OPTIMIZE = 1
+
+# UPX 压缩会让每次启动都要解压 DLL，关闭以加快启动
+UPX = False
+
+# 保留控制台窗口，便于查看日志
+CONSOLE = True
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+打包程序启动耗时测量
+
+多次启动程序（打包后的 exe 或 python main.py），测量从启动到首页可以访问的时间，
+以及此时进程（含子进程）占用的内存，每轮结束后关闭程序。
+
+用法（在项目根目录执行）:
+    python package/measure_startup.py                    # 测量 dist 中打包后的程序
+    python package/measure_startup.py --source           # 测量源码启动（python main.py）
+    python package/measure_startup.py --runs 5 --target 3
+
+内存统计需要 psutil（可选，未安装时只统计耗时）。
+"""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(PACKAGE_DIR)
+sys.path.insert(0, PACKAGE_DIR)
+
+import build_config  # noqa: E402
+
+
+def default_command(source):
+    if source:
+        return [sys.executable, os.path.join(ROOT_DIR, build_config.MAIN_SCRIPT)], ROOT_DIR
+    exe_name = build_config.APP_NAME + ('.exe' if os.name == 'nt' else '')
+    if build_config.ONEDIR:
+        dist_dir = os.path.join(ROOT_DIR, 'dist', build_config.APP_NAME)
+    else:
+        dist_dir = os.path.join(ROOT_DIR, 'dist')
+    return [os.path.join(dist_dir, exe_name)], dist_dir
+
+
+def memory_mb(pid):
+    """进程及其子进程的常驻内存（MB），未安装 psutil 时返回 None"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        process = psutil.Process(pid)
+        processes = [process] + process.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes) / 1024 / 1024
+    except psutil.Error:
+        return None
+
+
+def stop(process):
+    if process.poll() is not None:
+        return
+    if os.name == 'nt':
+        # 结束整个进程树（包括头像预处理等子进程）
+        subprocess.run(['taskkill', '/T', '/F', '/PID', str(process.pid)], capture_output=True)
+    else:
+        os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def measure_once(command, cwd, url, timeout):
+    """启动一次程序，返回 (首页可访问耗时秒, 内存MB)"""
+    start = time.perf_counter()
+    # 调试模式下 Flask 会启动重载子进程，放在单独的进程组中以便一起结束
+    options = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP} if os.name == 'nt' else {'start_new_session': True}
+    process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **options)
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f'程序已退出（退出码 {process.returncode}），请先确认程序可以正常启动')
+            elapsed = time.perf_counter() - start
+            if elapsed > timeout:
+                raise RuntimeError(f'{timeout} 秒内首页无法访问')
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    response.read()
+                return time.perf_counter() - start, memory_mb(process.pid)
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.05)
+    finally:
+        stop(process)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='测量程序启动到首页可访问的耗时')
+    parser.add_argument('--source', action='store_true', help='测量源码启动（python main.py）而不是打包后的程序')
+    parser.add_argument('--runs', type=int, default=3, help='测量轮数')
+    parser.add_argument('--url', default='http://127.0.0.1:5000/', help='判断启动完成的地址')
+    parser.add_argument('--timeout', type=float, default=60, help='单轮最长等待秒数')
+    parser.add_argument('--target', type=float, default=0, help='启动耗时目标（秒），超过时退出码为 1')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    command, cwd = default_command(options.source)
+    if not options.source and not os.path.exists(command[0]):
+        print(f"× 找不到打包后的程序: {command[0]}")
+        print("请先执行 打包.bat 中的 [3] 打包成 EXE")
+        return 1
+
+    print(f"启动命令: {' '.join(command)}")
+    durations = []
+    memories = []
+    for index in range(options.runs):
+        try:
+            duration, memory = measure_once(command, cwd, options.url, options.timeout)
+        except RuntimeError as e:
+            print(f"× 第 {index + 1} 轮失败: {e}")
+            return 1
+        durations.append(duration)
+        if memory is not None:
+            memories.append(memory)
+        memory_text = f"，内存 {memory:.0f} MB" if memory is not None else ''
+        print(f"第 {index + 1} 轮: {duration:.2f} 秒{memory_text}")
+
+    median = statistics.median(durations)
+    print()
+    print(f"启动耗时: 中位数 {median:.2f} 秒，最快 {min(durations):.2f} 秒，最慢 {max(durations):.2f} 秒")
+    if memories:
+        print(f"首页可访问时内存: 中位数 {statistics.median(memories):.0f} MB")
+    else:
+        print("（安装 psutil 后可同时统计内存: pip install psutil）")
+
+    if options.target and median > options.target:
+        print(f"× 启动耗时超过目标 {options.target} 秒")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -30,14 +30,16 @@ echo [1] 安装依赖
 echo [2] 启动程序（开发测试）
 echo [3] 打包成 EXE
 echo [4] 制作用户部署包
+echo [5] 测量启动耗时
 echo [0] 退出
 echo.
-set /p choice=请选择 (0-4): 
+set /p choice=请选择 (0-5): 
 
 if "%choice%"=="1" goto install
 if "%choice%"=="2" goto run
 if "%choice%"=="3" goto build
 if "%choice%"=="4" goto package_app
+if "%choice%"=="5" goto measure
 if "%choice%"=="0" exit
 goto menu
 
@@ -106,7 +108,8 @@ echo 使用配置文件: %PACKAGE_DIR%\build.spec
 echo.
 
 :: 直接使用完整路径执行 pyinstaller
-pyinstaller "%PACKAGE_DIR%\build.spec" --clean
+:: -O: 以优化级别 1 预编译字节码（PyInstaller 6.6 以下不支持在 spec 中设置）
+python -O -m PyInstaller "%PACKAGE_DIR%\build.spec" --clean
 
 if %errorlevel% equ 0 (
     echo.
@@ -221,3 +224,15 @@ if /i "%zip_choice%"=="Y" (
 echo.
 pause
 goto menu
+
+:measure
+cls
+echo ========================================
+echo   测量启动耗时
+echo ========================================
+echo.
+echo 请确认 config.json 中的数据库可以连接，测量期间会多次启动并关闭程序
+echo.
+python "%PACKAGE_DIR%\measure_startup.py" --runs 3
+pause
+goto menu
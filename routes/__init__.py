@@ -13,6 +13,7 @@ node_bp = Blueprint('nodes', __name__, url_prefix='/api/nodes')
 browser_bp = Blueprint('browsers', __name__, url_prefix='/api')
 settings_bp = Blueprint('settings', __name__, url_prefix='/api/settings')
 channel_bp = Blueprint('channels', __name__, url_prefix='/api/channels')
+job_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
 
 # 导入路由
 from routes import page_routes
@@ -23,4 +24,5 @@ from routes import node_routes
 from routes import browser_routes
 from routes import settings_routes
 from routes import channel_routes
+from routes import job_routes
 
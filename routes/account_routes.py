@@ -3,42 +3,66 @@
 账号管理路由
 """
 from flask import request, jsonify, send_file
-from models import db, Account
+from models import db, Account, Phone, LoginLog, BrowserEnv, Avatar
 from routes import account_bp
-import pandas as pd
+from services.log_service import get_logger
 from io import BytesIO
 from datetime import datetime
 
+logger = get_logger('account')
+
+
+# 批量操作每批处理的账号数：按筛选条件分批取ID，每批一个事务，避免超长的 IN (...) 和长时间锁表
+BATCH_CHUNK_SIZE = 1000
+
+# 筛选条件中的多选字段（其余为文本搜索字段：account / phone / env_id）
+MULTI_FILTER_KEYS = ('login_status', 'channel_status', 'monetization')
+
+
+def filters_from_args(args):
+    """从查询参数中读取账号筛选条件（与批量操作的 filter 参数格式相同）"""
+    filters = {key: args.get(key, '').strip() for key in ('account', 'phone', 'env_id')}
+    for key in MULTI_FILTER_KEYS:
+        filters[key] = args.getlist(key)
+    return filters
+
+
+def _status_filter(column, values, empty_value):
+    """状态多选筛选；empty_value（not_logged / not_created）同时匹配 None"""
+    if empty_value not in values:
+        return column.in_(values)
+    # 将 empty_value 和 None 都包含进来
+    other_statuses = [s for s in values if s != empty_value]
+    conditions = [column == empty_value, column.is_(None)]
+    if other_statuses:
+        conditions.insert(0, column.in_(other_statuses))
+    return db.or_(*conditions)
+
+
+def apply_account_filters(query, filters):
+    """按筛选条件过滤账号查询
+
+    Args:
+        query: Account 查询（Account.query 或 db.session.query(Account.id)）
+        filters: 筛选条件字典，键同 get_accounts 的查询参数；多选字段为列表（也接受单个字符串）
+    """
+    filters = filters or {}
+    account_search = str(filters.get('account') or '').strip()
+    phone_search = str(filters.get('phone') or '').strip()
+    env_id_search = str(filters.get('env_id') or '').strip()
+    multi = {}
+    for key in MULTI_FILTER_KEYS:
+        values = filters.get(key) or []
+        multi[key] = [values] if isinstance(values, str) else list(values)
 
-@account_bp.route('', methods=['GET'])
-def get_accounts():
-    """获取账号列表（支持分页和筛选）"""
-    # 获取分页参数
-    page = request.args.get('page', 1, type=int)
-    page_size = request.args.get('page_size', 20, type=int)
-    
-    # 获取筛选参数
-    account_search = request.args.get('account', '').strip()
-    phone_search = request.args.get('phone', '').strip()
-    env_id_search = request.args.get('env_id', '').strip()
-    login_status_filter = request.args.getlist('login_status')  # 多选
-    channel_status_filter = request.args.getlist('channel_status')  # 多选
-    monetization_filter = request.args.getlist('monetization')  # 多选
-    
-    # 构建查询
-    query = Account.query
-    
     # 账号搜索
     if account_search:
         query = query.filter(Account.account.like(f'%{account_search}%'))
     
-    # 手机号搜索（需要处理 None 值）
+    # 手机号搜索（按绑定的手机号，未绑定的账号不匹配）
     if phone_search:
-        query = query.filter(
-            db.and_(
-                Account.phone_number.isnot(None),
-                Account.phone_number.like(f'%{phone_search}%')
-            )
+        query = query.join(Phone, Account.phone_id == Phone.id).filter(
+            Phone.phone_number.like(f'%{phone_search}%')
         )
     
     # 环境ID搜索（需要处理 None 值）
@@ -50,63 +74,36 @@ def get_accounts():
             )
         )
     
-    # 登录状态筛选（多选）
-    if login_status_filter:
-        # 处理 not_logged 包括 None 的情况
-        if 'not_logged' in login_status_filter:
-            # 将 not_logged 和 None 都包含进来
-            other_statuses = [s for s in login_status_filter if s != 'not_logged']
-            if other_statuses:
-                query = query.filter(
-                    db.or_(
-                        Account.login_status.in_(other_statuses),
-                        Account.login_status == 'not_logged',
-                        Account.login_status.is_(None)
-                    )
-                )
-            else:
-                query = query.filter(
-                    db.or_(
-                        Account.login_status == 'not_logged',
-                        Account.login_status.is_(None)
-                    )
-                )
-        else:
-            query = query.filter(Account.login_status.in_(login_status_filter))
+    # 登录状态筛选（多选，not_logged 包括 None）
+    if multi['login_status']:
+        query = query.filter(_status_filter(Account.login_status, multi['login_status'], 'not_logged'))
     
-    # 频道状态筛选（多选）
-    if channel_status_filter:
-        # 处理 not_created 包括 None 的情况
-        if 'not_created' in channel_status_filter:
-            # 将 not_created 和 None 都包含进来
-            other_statuses = [s for s in channel_status_filter if s != 'not_created']
-            if other_statuses:
-                query = query.filter(
-                    db.or_(
-                        Account.channel_status.in_(other_statuses),
-                        Account.channel_status == 'not_created',
-                        Account.channel_status.is_(None)
-                    )
-                )
-            else:
-                query = query.filter(
-                    db.or_(
-                        Account.channel_status == 'not_created',
-                        Account.channel_status.is_(None)
-                    )
-                )
-        else:
-            query = query.filter(Account.channel_status.in_(channel_status_filter))
+    # 频道状态筛选（多选，not_created 包括 None）
+    if multi['channel_status']:
+        query = query.filter(_status_filter(Account.channel_status, multi['channel_status'], 'not_created'))
     
     # 创收要求筛选（多选）
-    if monetization_filter:
-        query = query.filter(Account.monetization_requirement.in_(monetization_filter))
+    if multi['monetization']:
+        query = query.filter(Account.monetization_requirement.in_(multi['monetization']))
+    
+    return query
+
+
+@account_bp.route('', methods=['GET'])
+def get_accounts():
+    """获取账号列表（支持分页和筛选）"""
+    # 获取分页参数
+    page = request.args.get('page', 1, type=int)
+    page_size = request.args.get('page_size', 20, type=int)
+    
+    # 构建查询
+    query = apply_account_filters(Account.query, filters_from_args(request.args))
     
     # 查询总数
     total = query.count()
     
-    # 分页查询
-    pagination = query.order_by(Account.id.desc()).paginate(
+    # 分页查询（一并加载绑定的手机号，避免逐行查询）
+    pagination = query.options(db.joinedload(Account.phone)).order_by(Account.id.desc()).paginate(
         page=page, per_page=page_size, error_out=False
     )
     
@@ -120,6 +117,124 @@ def get_accounts():
     })
 
 
+def has_filter_criteria(filters):
+    """筛选条件中是否至少有一项有效条件（空条件会匹配全部账号）"""
+    filters = filters or {}
+    if any(str(filters.get(key) or '').strip() for key in ('account', 'phone', 'env_id')):
+        return True
+    return any(filters.get(key) for key in MULTI_FILTER_KEYS)
+
+
+def _valid_multi_value(values):
+    """多选筛选值：空、字符串或字符串列表"""
+    if values is None or isinstance(values, str):
+        return True
+    return isinstance(values, list) and all(isinstance(value, str) for value in values)
+
+
+def _batch_target(data, empty_message='请选择要操作的账号'):
+    """批量操作的目标：请求体中的 filter（筛选条件）或 ids（账号ID列表）
+
+    没有有效条件的 filter 会匹配全部账号，必须同时传 "all": true 才接受，
+    避免一次请求误操作整张表。
+
+    Returns:
+        tuple: (filters, ids, error)，filters 为 None 时按 ids 处理；error 不为空时应直接返回给前端
+    """
+    data = data or {}
+    if isinstance(data.get('filter'), dict):
+        filters = data['filter']
+        invalid = [key for key in MULTI_FILTER_KEYS if not _valid_multi_value(filters.get(key))]
+        if invalid:
+            return None, None, f'筛选条件格式错误: {", ".join(invalid)} 应为字符串或字符串列表'
+        if not has_filter_criteria(filters) and data.get('all') is not True:
+            return None, None, '筛选条件为空，如需操作全部账号请确认选择全部'
+        return filters, None, None
+    ids = list(dict.fromkeys(data.get('ids') or []))
+    if not ids:
+        return None, None, empty_message
+    return None, ids, None
+
+
+def iter_account_id_chunks(filters=None, ids=None, chunk_size=BATCH_CHUNK_SIZE):
+    """分批产出目标账号ID
+
+    按筛选条件时以 ID 为游标分页（WHERE id > 上一批最大ID），每批单独查询；
+    调用方可以在批与批之间修改或删除已产出的账号，不影响后续批次。
+    """
+    if filters is None:
+        for start in range(0, len(ids or []), chunk_size):
+            yield ids[start:start + chunk_size]
+        return
+
+    last_id = 0
+    while True:
+        chunk = [row[0] for row in apply_account_filters(db.session.query(Account.id), filters)
+                 .filter(Account.id > last_id).order_by(Account.id).limit(chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def resolve_account_ids(filters=None, ids=None):
+    """解析出全部目标账号ID（批量登录/创建频道入队用）"""
+    resolved = []
+    for chunk in iter_account_id_chunks(filters, ids):
+        resolved.extend(chunk)
+    return resolved
+
+
+def count_accounts(filters, ids, *criteria):
+    """统计目标账号中满足 criteria 的数量（按 ids 时分批统计）"""
+    if filters is not None:
+        return apply_account_filters(Account.query, filters).filter(*criteria).count()
+    return sum(
+        Account.query.filter(Account.id.in_(chunk), *criteria).count()
+        for chunk in iter_account_id_chunks(ids=ids)
+    )
+
+
+def _apply_in_chunks(filters, ids, action):
+    """分批执行 action(query, chunk)（update / delete），每批提交一次
+
+    不是整体原子操作：中途失败时之前的批次已经提交，当前批次回滚、后续批次不再执行。
+    按筛选条件时目标账号在执行时重新查询，数量可能与前端确认时看到的不同，以返回的数量为准。
+
+    Returns:
+        tuple: (实际影响的行数, 错误信息)，全部成功时错误信息为 None
+    """
+    affected = 0
+    try:
+        for chunk in iter_account_id_chunks(filters, ids):
+            affected += action(Account.query.filter(Account.id.in_(chunk)), chunk)
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"[批量操作] 执行中断，已处理 {affected} 条: {e}")
+        return affected, str(e)
+    return affected, None
+
+
+def _delete_accounts(query, chunk):
+    """删除一批账号，先处理引用这些账号的记录（外键约束，MySQL 下否则删除失败）
+
+    登录日志随账号删除；浏览器环境和头像只解除关联（头像回到可分配状态）。
+    """
+    LoginLog.query.filter(LoginLog.account_id.in_(chunk)).delete(synchronize_session=False)
+    BrowserEnv.query.filter(BrowserEnv.account_id.in_(chunk)).update(
+        {'account_id': None}, synchronize_session=False)
+    Avatar.query.filter(Avatar.account_id.in_(chunk)).update(
+        {'account_id': None}, synchronize_session=False)
+    return query.delete(synchronize_session=False)
+
+
+def _interrupted(count, error, action_text):
+    """批量操作中途失败的响应：带上已完成的数量"""
+    return jsonify({'code': 1, 'message': f'{action_text}中断：已处理 {count} 条记录，剩余未处理（{error}）',
+                    'data': {'count': count}})
+
+
 @account_bp.route('', methods=['POST'])
 def add_account():
     """添加账号"""
@@ -175,27 +290,36 @@ def delete_account(id):
 
 @account_bp.route('/batch-delete', methods=['POST'])
 def batch_delete_accounts():
-    """批量删除账号"""
-    ids = request.json.get('ids', [])
-    Account.query.filter(Account.id.in_(ids)).delete(synchronize_session=False)
-    db.session.commit()
-    return jsonify({'code': 0, 'message': f'成功删除 {len(ids)} 条记录'})
+    """批量删除账号（ids 或 filter）"""
+    filters, ids, error = _batch_target(request.json, '请选择要删除的账号')
+    if error:
+        return jsonify({'code': 1, 'message': error})
+    count, error = _apply_in_chunks(filters, ids, _delete_accounts)
+    if error:
+        return _interrupted(count, error, '删除')
+    return jsonify({'code': 0, 'message': f'成功删除 {count} 条记录', 'data': {'count': count}})
 
 
 @account_bp.route('/batch-status', methods=['POST'])
 def batch_update_accounts_status():
-    """批量更新账号状态"""
-    data = request.json
-    ids = data.get('ids', [])
+    """批量更新账号状态（ids 或 filter）"""
+    data = request.json or {}
+    filters, ids, error = _batch_target(data)
+    if error:
+        return jsonify({'code': 1, 'message': error})
     status = data.get('status', False)
-    Account.query.filter(Account.id.in_(ids)).update({'status': status}, synchronize_session=False)
-    db.session.commit()
-    return jsonify({'code': 0, 'message': f'成功更新 {len(ids)} 条记录'})
+    count, error = _apply_in_chunks(filters, ids,
+                                    lambda query, chunk: query.update({'status': status}, synchronize_session=False))
+    if error:
+        return _interrupted(count, error, '更新')
+    return jsonify({'code': 0, 'message': f'成功更新 {count} 条记录', 'data': {'count': count}})
 
 
 @account_bp.route('/export', methods=['GET'])
 def export_accounts():
     """导出账号"""
+    import pandas as pd
+    
     accounts = Account.query.all()
     data = [{
         '账号': a.account,
@@ -214,6 +338,8 @@ def export_accounts():
 @account_bp.route('/import', methods=['POST'])
 def import_accounts():
     """导入账号"""
+    import pandas as pd
+    
     file = request.files.get('file')
     if not file:
         return jsonify({'code': 1, 'message': '请选择文件'})
@@ -236,6 +362,8 @@ def import_accounts():
 @account_bp.route('/template', methods=['GET'])
 def download_accounts_template():
     """下载账号导入模板"""
+    import pandas as pd
+    
     data = [{
         '账号': 'example@gmail.com',
         '密码': 'password123',
@@ -264,78 +392,76 @@ def reset_login_status(id):
 
 @account_bp.route('/batch-reset-login-status', methods=['POST'])
 def batch_reset_login_status():
-    """批量重置账号登录状态"""
-    ids = request.json.get('ids', [])
-    Account.query.filter(Account.id.in_(ids)).update({'login_status': None}, synchronize_session=False)
-    db.session.commit()
-    return jsonify({'code': 0, 'message': f'成功重置 {len(ids)} 个账号的登录状态'})
+    """批量重置账号登录状态（ids 或 filter）"""
+    filters, ids, error = _batch_target(request.json)
+    if error:
+        return jsonify({'code': 1, 'message': error})
+    count, error = _apply_in_chunks(filters, ids,
+                                    lambda query, chunk: query.update({'login_status': None}, synchronize_session=False))
+    if error:
+        return _interrupted(count, error, '重置')
+    return jsonify({'code': 0, 'message': f'成功重置 {count} 个账号的登录状态', 'data': {'count': count}})
 
 
 @account_bp.route('/batch-login', methods=['POST'])
 def batch_login():
-    """批量登录账号"""
-    import threading
-    from flask import current_app
-    from services import login_service
+    """批量登录账号（ids 或 filter）"""
+    from services import job_service
     
-    ids = request.json.get('ids', [])
-    if not ids:
-        return jsonify({'code': 1, 'message': '请选择要登录的账号'})
+    filters, ids, error = _batch_target(request.json, '请选择要登录的账号')
+    if error:
+        return jsonify({'code': 1, 'message': error})
     
     # 检查是否有账号正在登录中
-    logging_accounts = Account.query.filter(
-        Account.id.in_(ids),
-        Account.login_status == 'logging'
-    ).count()
+    logging_accounts = count_accounts(filters, ids, Account.login_status == 'logging')
     
     if logging_accounts > 0:
         return jsonify({'code': 1, 'message': f'有 {logging_accounts} 个账号正在登录中，请等待完成'})
     
-    # 在后台线程中执行批量登录任务
-    app = current_app._get_current_object()
-    thread = threading.Thread(target=login_service.batch_login_task, args=(app, ids))
-    thread.daemon = True
-    thread.start()
+    ids = resolve_account_ids(filters, ids)
+    if not ids:
+        return jsonify({'code': 1, 'message': '没有符合筛选条件的账号'})
+    
+    # 加入任务队列，由工作进程执行
+    job_id = job_service.create_job('batch_login', ids)
     
-    return jsonify({'code': 0, 'message': f'已开始批量登录 {len(ids)} 个账号'})
+    return jsonify({'code': 0, 'message': f'已提交批量登录 {len(ids)} 个账号', 'data': {'job_id': job_id}})
 
 
 @account_bp.route('/batch-create-channel', methods=['POST'])
 def batch_create_channel():
-    """批量创建频道"""
-    import threading
-    from flask import current_app
-    from services import channel_service
+    """批量创建频道（ids 或 filter）"""
+    from services import job_service
     
-    ids = request.json.get('ids', [])
-    if not ids:
-        return jsonify({'code': 1, 'message': '请选择要创建频道的账号'})
+    filters, ids, error = _batch_target(request.json, '请选择要创建频道的账号')
+    if error:
+        return jsonify({'code': 1, 'message': error})
     
     # 检查账号是否已登录
-    not_logged_accounts = Account.query.filter(
-        Account.id.in_(ids),
-        ~Account.login_status.in_(['success', 'success_with_verification'])
-    ).count()
+    not_logged_accounts = count_accounts(
+        filters, ids, ~Account.login_status.in_(['success', 'success_with_verification'])
+    )
     
     if not_logged_accounts > 0:
         return jsonify({'code': 1, 'message': f'有 {not_logged_accounts} 个账号未登录，无法创建频道'})
     
-    # 在后台线程中执行批量创建频道任务
-    app = current_app._get_current_object()
-    thread = threading.Thread(target=channel_service.batch_create_channel_task, args=(app, ids))
-    thread.daemon = True
-    thread.start()
+    ids = resolve_account_ids(filters, ids)
+    if not ids:
+        return jsonify({'code': 1, 'message': '没有符合筛选条件的账号'})
+    
+    # 加入任务队列，由工作进程执行
+    job_id = job_service.create_job('batch_create_channel', ids)
     
-    return jsonify({'code': 0, 'message': f'已开始批量创建频道 {len(ids)} 个账号'})
+    return jsonify({'code': 0, 'message': f'已提交批量创建频道 {len(ids)} 个账号', 'data': {'job_id': job_id}})
 
 
 @account_bp.route('/stop-all-tasks', methods=['POST'])
 def stop_all_tasks():
     """停止所有批量任务"""
-    from services import login_service, channel_service
+    from services import job_service
     
-    # 设置停止标志
-    login_service.stop_batch_tasks = True
-    channel_service.stop_batch_tasks = True
+    count = job_service.cancel_all_jobs()
+    if count == 0:
+        return jsonify({'code': 0, 'message': '当前没有正在执行的批量任务'})
     
-    return jsonify({'code': 0, 'message': '已发送停止信号，任务将在当前操作完成后停止'})
+    return jsonify({'code': 0, 'message': f'已停止 {count} 个批量任务，正在处理的账号将在数秒内中断并关闭浏览器'})
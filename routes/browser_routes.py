@@ -6,9 +6,10 @@ import json
 import random
 import time
 from flask import request, jsonify, Response
-from models import db, Node
+import config
+from models import db, BrowserEnv, Node
 from routes import browser_bp
-from services import hubstudio_service
+from services import hubstudio_service, node_health_service, server_service
 from datetime import datetime
 
 
@@ -19,6 +20,34 @@ def check_hubstudio_status():
     return jsonify({'code': 0, 'data': {'connected': connected}})
 
 
+@browser_bp.route('/hubstudio/instances', methods=['GET'])
+def get_hubstudio_instances():
+    """各HubStudio实例的连接状态、容量、运行中浏览器数和本地环境数"""
+    env_counts = _env_counts()
+    running = hubstudio_service.running_counts()
+    data = []
+    for instance in hubstudio_service.get_instances():
+        data.append({
+            'name': instance.name,
+            'base_url': instance.base_url,
+            'connected': hubstudio_service.check_api_status(instance.name),
+            'capacity': instance.capacity,
+            'running': running.get(instance.name, 0),
+            'envs': env_counts.get(instance.name, 0),
+        })
+    return jsonify({'code': 0, 'data': data})
+
+
+def _env_counts():
+    """实例名称 -> 本地记录的环境数（未记录实例的环境计入默认实例）"""
+    counts = {}
+    rows = db.session.query(BrowserEnv.instance, db.func.count(BrowserEnv.id)).group_by(BrowserEnv.instance).all()
+    for instance, count in rows:
+        name = instance or hubstudio_service.DEFAULT_INSTANCE
+        counts[name] = counts.get(name, 0) + count
+    return counts
+
+
 @browser_bp.route('/hubstudio/groups', methods=['GET'])
 def get_hubstudio_groups():
     """获取HubStudio分组列表"""
@@ -55,13 +84,22 @@ def batch_create_browser():
     count = data.get('count', 1)
     group_code = data.get('group_code', '')
     core_version = data.get('core_version', 'random')
+    # 是否在选择节点前检测长时间未检测的节点
+    check_nodes = data.get('check_nodes', True)
     
     # 可选内核版本
     available_cores = [112, 113, 117, 122, 124, 126, 128, 130, 131]
     
+    # 推送过程中一直占用一个服务线程，与实时进度连接共用名额
+    if not server_service.acquire_stream():
+        return jsonify({'code': 1, 'message': '当前进行中的实时任务过多，请稍后再试'}), 503
+    
     def generate():
         with app.app_context():
-            nodes = Node.query.filter_by(status=False).limit(count).all()
+            if check_nodes:
+                yield f"data: {json.dumps({'type': 'log', 'level': 'info', 'message': '正在检测候选节点的连通性...'})}\n\n"
+            # 优先选择健康、低延迟的节点，检测不可用的节点不会被选中
+            nodes = node_health_service.select_nodes(count, check=check_nodes)
             if len(nodes) < count:
                 yield f"data: {json.dumps({'type': 'log', 'level': 'error', 'message': f'可用节点不足，需要{count}个，仅有{len(nodes)}个'})}\n\n"
                 return
@@ -72,6 +110,9 @@ def batch_create_browser():
                 groups = hubstudio_service.get_groups()
                 group_name = next((g['tagName'] for g in groups if g['tagCode'] == group_code), '')
             
+            # 多个 HubStudio 实例时，新环境按容量分摊到各实例
+            env_counts = _env_counts() if hubstudio_service.is_multi_instance() else {}
+            
             # 生成环境名称前缀
             env_prefix = datetime.now().strftime("%m%d%H%M")
             
@@ -88,28 +129,37 @@ def batch_create_browser():
                     # 构建环境名称
                     env_name = f"{env_prefix}_{idx}"
                     proxy_info = f"{node.ip}:{node.port}"
+                    if node.latency is not None:
+                        proxy_info += f" ({node.latency}ms)"
                     
                     yield f"data: {json.dumps({'type': 'log', 'level': 'info', 'message': f'正在创建环境 #{idx}: {env_name} (内核: {current_core})'})}\n\n"
                     
                     # 创建环境
+                    instance = hubstudio_service.instance_for_new_env(env_counts)
                     success, result = hubstudio_service.create_environment(
                         env_name, group_name, node.ip, node.port, 
-                        node.username, node.password, current_core
+                        node.username, node.password, current_core,
+                        instance=instance.name
                     )
                     
                     if success:
-                        # 标记节点为已使用
+                        # 标记节点为已使用，并记录环境及其所属实例（无需再同步即可分配给账号）
                         node.status = True
+                        if result and not BrowserEnv.query.filter_by(container_code=result).first():
+                            db.session.add(BrowserEnv(container_code=result, container_name=env_name,
+                                                      instance=instance.name, status=False))
                         db.session.commit()
+                        env_counts[instance.name] = env_counts.get(instance.name, 0) + 1
                         
-                        yield f"data: {json.dumps({'type': 'log', 'level': 'success', 'message': f'环境 #{idx} 创建成功，ID: {result}'})}\n\n"
+                        location = f'（实例 {instance.name}）' if hubstudio_service.is_multi_instance() else ''
+                        yield f"data: {json.dumps({'type': 'log', 'level': 'success', 'message': f'环境 #{idx} 创建成功{location}，ID: {result}'})}\n\n"
                         yield f"data: {json.dumps({'type': 'progress', 'index': idx, 'success': True, 'env_name': env_name, 'container_code': result, 'proxy': proxy_info})}\n\n"
                     else:
                         yield f"data: {json.dumps({'type': 'log', 'level': 'error', 'message': f'环境 #{idx} 创建失败: {result}'})}\n\n"
                         yield f"data: {json.dumps({'type': 'progress', 'index': idx, 'success': False, 'env_name': env_name, 'container_code': '', 'proxy': proxy_info, 'error': result})}\n\n"
                     
                     # 添加延时避免频率限制
-                    time.sleep(random.uniform(1, 2))
+                    time.sleep(random.uniform(*config.HUBSTUDIO_CONFIG.get('create_interval', (1, 2))))
                     
                 except Exception as e:
                     yield f"data: {json.dumps({'type': 'log', 'level': 'error', 'message': f'环境 #{idx} 创建异常: {str(e)}'})}\n\n"
@@ -117,6 +167,6 @@ def batch_create_browser():
             
             yield f"data: {json.dumps({'type': 'log', 'level': 'info', 'message': '批量创建任务完成'})}\n\n"
     
-    return Response(generate(), mimetype='text/event-stream')
+    return server_service.limit_stream(Response(generate(), mimetype='text/event-stream'))
 
 
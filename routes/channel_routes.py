@@ -6,15 +6,18 @@ from flask import request, jsonify
 from routes import channel_bp
 from models import db, Account, LoginLog
 from services import hubstudio_service
-from services.channel_service import check_avatar_availability, create_youtube_channel, detect_monetization_requirement
-from services.login_service import perform_login
+from services.log_service import get_logger, log_context
 import threading
 import time
 
+logger = get_logger('channel')
+
 
 @channel_bp.route('/check-avatar-availability', methods=['GET'])
 def check_avatar():
     """检查头像文件夹可用性"""
+    from services.channel_service import check_avatar_availability
+    
     try:
         is_available, count, error_msg = check_avatar_availability()
         
@@ -41,6 +44,10 @@ def check_avatar():
 @channel_bp.route('/<int:account_id>/create-channel', methods=['POST'])
 def create_channel(account_id):
     """为指定账号创建YouTube频道"""
+    # 频道创建依赖 selenium，只在真正使用时导入
+    from services.channel_service import check_avatar_availability, create_youtube_channel, detect_monetization_requirement
+    from services.login_service import perform_login
+    
     try:
         # 获取账号信息
         account = Account.query.get(account_id)
@@ -65,7 +72,7 @@ def create_channel(account_id):
         # 启动后台任务创建频道
         def create_channel_task():
             from main import app
-            with app.app_context():
+            with app.app_context(), log_context(account_id=account_id, stage='create_channel'):
                 driver = None
                 browser_env_id = None
                 
@@ -73,7 +80,7 @@ def create_channel(account_id):
                     # 在后台线程中重新查询账号信息（避免数据库会话问题）
                     acc = Account.query.get(account_id)
                     if not acc:
-                        print(f"[创建频道错误] 账号不存在")
+                        logger.error(f"[创建频道错误] 账号不存在")
                         return
                     
                     browser_env_id = acc.browser_env_id
@@ -90,12 +97,12 @@ def create_channel(account_id):
                     db.session.commit()
                     
                     # 打开浏览器
-                    print(f"[创建频道] 正在打开浏览器环境: {browser_env_id}")
+                    logger.info(f"[创建频道] 正在打开浏览器环境: {browser_env_id}")
                     driver = hubstudio_service.open_browser(browser_env_id)
                     
                     if not driver:
                         error_msg = '无法打开浏览器'
-                        print(f"[创建频道错误] {error_msg}")
+                        logger.error(f"[创建频道错误] {error_msg}")
                         log = LoginLog(
                             account_id=account_id,
                             browser_env_id=browser_env_id,
@@ -107,7 +114,7 @@ def create_channel(account_id):
                         db.session.commit()
                         return
                     
-                    print(f"[创建频道] 浏览器已打开")
+                    logger.info(f"[创建频道] 浏览器已打开")
                     
                     # 添加日志：浏览器已打开
                     log = LoginLog(
@@ -123,11 +130,11 @@ def create_channel(account_id):
                     # 检查是否需要登录
                     try:
                         current_url = driver.current_url
-                        print(f"[创建频道] 当前URL: {current_url}")
+                        logger.info(f"[创建频道] 当前URL: {current_url}")
                         
                         # 如果是空白页或不在Google域名，先进行登录
                         if current_url == "about:blank" or current_url == "data:," or "google.com" not in current_url:
-                            print(f"[创建频道] 检测到未登录，开始自动登录...")
+                            logger.info(f"[创建频道] 检测到未登录，开始自动登录...")
                             
                             # 添加日志：开始登录
                             log = LoginLog(
@@ -149,11 +156,11 @@ def create_channel(account_id):
                                 backup_email=acc.backup_email
                             )
                             
-                            print(f"[创建频道] 登录结果 - 状态: {login_status}, 消息: {login_message}")
+                            logger.info(f"[创建频道] 登录结果 - 状态: {login_status}, 消息: {login_message}")
                             
                             if login_status not in ['success', 'success_with_verification']:
                                 error_msg = f'自动登录失败: {login_message}'
-                                print(f"[创建频道错误] {error_msg}")
+                                logger.error(f"[创建频道错误] {error_msg}")
                                 
                                 # 更新账号登录状态（根据登录结果设置）
                                 if login_status == 'disabled':
@@ -196,14 +203,14 @@ def create_channel(account_id):
                             # 等待登录完全完成
                             time.sleep(3)
                     except Exception as check_error:
-                        print(f"[创建频道警告] 检查登录状态失败: {str(check_error)}")
+                        logger.warning(f"[创建频道警告] 检查登录状态失败: {str(check_error)}")
                         # 继续尝试创建频道
                         pass
                     
                     # 检查频道是否已存在
                     acc_check = Account.query.get(account_id)
                     if acc_check and acc_check.channel_status == 'created' and acc_check.channel_url:
-                        print(f"[创建频道] 检测到频道已存在，跳转到检测创收要求流程...")
+                        logger.info(f"[创建频道] 检测到频道已存在，跳转到检测创收要求流程...")
                         
                         # 添加日志：检测到频道已存在
                         log = LoginLog(
@@ -224,18 +231,15 @@ def create_channel(account_id):
                             browser_env_id=browser_env_id
                         )
                         
-                        # 更新数据库
+                        # 检测结果已由 detect_monetization_requirement 写入数据库
                         if monetization_req:
-                            acc_check.monetization_requirement = monetization_req
-                            db.session.commit()
-                            
                             status = 'success'
                             message = f'创收要求检测完成：{monetization_req}'
                         else:
                             status = 'warning'
                             message = '创收要求检测失败'
                     else:
-                        print(f"[创建频道] 开始创建YouTube频道...")
+                        logger.info(f"[创建频道] 开始创建YouTube频道...")
                         
                         # 添加日志：开始创建频道
                         log = LoginLog(
@@ -251,7 +255,7 @@ def create_channel(account_id):
                         # 执行创建频道操作
                         status, message = create_youtube_channel(driver, account_id=account_id, browser_env_id=browser_env_id)
                     
-                    print(f"[创建频道] 创建结果 - 状态: {status}, 消息: {message}")
+                    logger.info(f"[创建频道] 创建结果 - 状态: {status}, 消息: {message}")
                     
                     # 添加日志：创建结果
                     log = LoginLog(
@@ -266,9 +270,7 @@ def create_channel(account_id):
                     
                 except Exception as e:
                     error_msg = f'创建频道过程发生异常: {str(e)}'
-                    print(f"[创建频道异常] {error_msg}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.error(f"[创建频道异常] {error_msg}", exc_info=True)
                     
                     # 添加异常日志
                     try:
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+批量任务进度路由
+"""
+import json
+import time
+from flask import jsonify, Response, current_app
+from models import db
+from routes import job_bp
+from services import job_service, server_service
+
+# SSE 心跳间隔（秒），防止连接被代理或浏览器断开
+SSE_KEEPALIVE_INTERVAL = 15
+# SSE 读取任务进度的间隔（秒），进度由工作进程回写到数据库
+SSE_POLL_INTERVAL = 1
+
+
+@job_bp.route('', methods=['GET'])
+def get_jobs():
+    """获取批量任务列表"""
+    return jsonify({'code': 0, 'data': job_service.list_jobs()})
+
+
+@job_bp.route('/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """获取批量任务当前进度"""
+    job = job_service.get_job(job_id, with_events=True)
+    if not job:
+        return jsonify({'code': 1, 'message': '任务不存在或已过期'}), 404
+    return jsonify({'code': 0, 'data': job})
+
+
+@job_bp.route('/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """停止指定批量任务（不影响其他批次）"""
+    if not job_service.cancel_job(job_id):
+        return jsonify({'code': 1, 'message': '任务不存在或已过期'}), 404
+    return jsonify({'code': 0, 'message': '已停止该批量任务，正在处理的账号将在数秒内中断'})
+
+
+@job_bp.route('/<job_id>/progress', methods=['GET'])
+def stream_job_progress(job_id):
+    """以 SSE 实时推送批量任务进度"""
+    job = job_service.get_job(job_id, with_events=True)
+    if not job:
+        return jsonify({'code': 1, 'message': '任务不存在或已过期'}), 404
+    # SSE 连接会一直占用服务线程，超过上限时页面改为轮询 GET /api/jobs/<job_id>
+    if not server_service.acquire_stream():
+        return jsonify({'code': 1, 'message': '实时进度连接数已达上限，请改为轮询任务进度'}), 503
+    db.session.close()
+
+    app = current_app._get_current_object()
+
+    def done_event(job):
+        return {'type': 'done', 'job_id': job['id'], 'status': job['status'], 'counts': job['counts'], 'eta': 0}
+
+    def generate():
+        # 先推送快照（包含最近的账号事件），再推送增量事件
+        yield f"data: {json.dumps(dict(job, type='snapshot'), ensure_ascii=False)}\n\n"
+        if job['status'] not in ('queued', 'running'):
+            yield f"data: {json.dumps(done_event(job))}\n\n"
+            return
+
+        last_seq = job['seq']
+        last_status = job['status']
+        stopping = job['cancel_requested']
+        last_sent = time.time()
+        while True:
+            time.sleep(SSE_POLL_INTERVAL)
+            with app.app_context():
+                current = job_service.get_job(job_id, with_events=True)
+            if not current:
+                return
+
+            events = [event for event in current['events'] if event['seq'] > last_seq]
+            if current['cancel_requested'] and not stopping and current['status'] == 'running':
+                events.append(dict(current, type='stopping'))
+            elif current['status'] != last_status and current['status'] == 'running':
+                # 已被工作进程领取
+                events.append(dict(current, type='started'))
+            stopping = stopping or current['cancel_requested']
+            last_seq = current['seq']
+            last_status = current['status']
+
+            for event in events:
+                if event['type'] == 'done':
+                    continue
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+                last_sent = time.time()
+            if current['status'] not in ('queued', 'running'):
+                yield f"data: {json.dumps(done_event(current))}\n\n"
+                return
+            if time.time() - last_sent >= SSE_KEEPALIVE_INTERVAL:
+                yield ": keepalive\n\n"
+                last_sent = time.time()
+
+    return server_service.limit_stream(
+        Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'}))
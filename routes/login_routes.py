@@ -6,12 +6,13 @@ import threading
 from flask import request, jsonify, current_app
 from models import db, Account, LoginLog, BrowserEnv
 from routes import login_bp
-from services import login_service
 
 
 @login_bp.route('/accounts/<int:id>/auto-login', methods=['POST'])
 def auto_login_account(id):
     """自动登录账号"""
+    from services import login_service
+    
     account = Account.query.get_or_404(id)
     
     # 检查是否正在登录中
@@ -42,6 +43,8 @@ def get_account_logs(id):
 @login_bp.route('/accounts/<int:id>/reset-status', methods=['POST'])
 def reset_account_status(id):
     """重置账号登录状态"""
+    from services import login_service
+    
     account = Account.query.get_or_404(id)
     
     # 如果有关联的浏览器环境，释放它
@@ -63,6 +66,8 @@ def reset_account_status(id):
 @login_bp.route('/browser-envs/sync', methods=['POST'])
 def sync_browser_envs():
     """同步HubStudio浏览器环境到本地"""
+    from services import login_service
+    
     try:
         synced_count, total = login_service.sync_browser_envs()
         return jsonify({
@@ -5,7 +5,6 @@
 from flask import request, jsonify, send_file
 from models import db, Node
 from routes import node_bp
-import pandas as pd
 from io import BytesIO
 from datetime import datetime
 
@@ -104,9 +103,37 @@ def batch_update_nodes_status():
     return jsonify({'code': 0, 'message': f'成功更新 {len(ids)} 条记录'})
 
 
+@node_bp.route('/health-check', methods=['POST'])
+def check_nodes_health():
+    """并发检测节点连通性（未指定ID时检测全部未使用节点）"""
+    from services import node_health_service
+    
+    data = request.json or {}
+    ids = data.get('ids', [])
+    
+    query = Node.query
+    if ids:
+        query = query.filter(Node.id.in_(ids))
+    else:
+        query = query.filter_by(status=False)
+    nodes = query.all()
+    if not nodes:
+        return jsonify({'code': 1, 'message': '没有需要检测的节点'})
+    
+    results = node_health_service.check_nodes(nodes)
+    healthy = sum(1 for _, result in results if result['ok'])
+    return jsonify({
+        'code': 0,
+        'message': f'检测完成：可用 {healthy} 个，不可用 {len(results) - healthy} 个',
+        'data': [dict(node.to_dict(), auth_ok=result['auth_ok']) for node, result in results]
+    })
+
+
 @node_bp.route('/export', methods=['GET'])
 def export_nodes():
     """导出节点"""
+    import pandas as pd
+    
     nodes = Node.query.all()
     data = [{
         '节点IP': n.ip,
@@ -126,6 +153,8 @@ def export_nodes():
 @node_bp.route('/import', methods=['POST'])
 def import_nodes():
     """导入节点"""
+    import pandas as pd
+    
     file = request.files.get('file')
     if not file:
         return jsonify({'code': 1, 'message': '请选择文件'})
@@ -149,6 +178,8 @@ def import_nodes():
 @node_bp.route('/template', methods=['GET'])
 def download_nodes_template():
     """下载节点导入模板"""
+    import pandas as pd
+    
     data = [{
         '节点IP': '192.168.1.1',
         '端口': 8080,
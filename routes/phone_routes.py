@@ -5,7 +5,6 @@
 from flask import request, jsonify, send_file
 from models import db, Phone
 from routes import phone_bp
-import pandas as pd
 from io import BytesIO
 from datetime import datetime
 
@@ -118,6 +117,8 @@ def batch_update_phones_status():
 @phone_bp.route('/export', methods=['GET'])
 def export_phones():
     """导出手机号"""
+    import pandas as pd
+    
     phones = Phone.query.all()
     data = [{
         '手机号': p.phone_number,
@@ -136,6 +137,8 @@ def export_phones():
 @phone_bp.route('/import', methods=['POST'])
 def import_phones():
     """导入手机号"""
+    import pandas as pd
+    
     file = request.files.get('file')
     if not file:
         return jsonify({'code': 1, 'message': '请选择文件'})
@@ -174,6 +177,8 @@ def import_phones():
 @phone_bp.route('/template', methods=['GET'])
 def download_phones_template():
     """下载手机号导入模板"""
+    import pandas as pd
+    
     data = [{
         '手机号': '13800138000',
         '接码URL': 'https://sms.example.com/receive',
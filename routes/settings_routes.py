@@ -4,12 +4,14 @@
 """
 from flask import request, jsonify
 from routes import settings_bp
+from services import config_service
+import config as app_config
 import json
 import os
 from threading import Lock
 
 # 配置文件路径
-CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.json')
+CONFIG_FILE = app_config.CONFIG_FILE
 # 线程锁，确保并发写入安全
 config_lock = Lock()
 
@@ -106,8 +108,13 @@ def update_config():
             
             # 写回配置文件（带备份）
             backup_and_save_config(config)
+            
+            # 立即重新加载，不等待文件监控
+            config_service.reload(force=True)
         
-        return jsonify({'success': True, 'message': '配置更新成功，请重启应用以生效'})
+        if config_type == 'mysql':
+            return jsonify({'success': True, 'message': '配置已保存，数据库配置需重启应用后生效'})
+        return jsonify({'success': True, 'message': '配置更新成功，已立即生效'})
         
     except json.JSONDecodeError as e:
         return jsonify({'success': False, 'message': f'配置文件格式错误: {str(e)}'}), 500
@@ -151,9 +158,11 @@ def backup_and_save_config(config):
         except Exception as e:
             print(f"警告: 创建备份文件失败 - {e}")
     
-    # 保存新配置
-    with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
+    # 保存新配置：先写临时文件再替换，配置监控不会读到写了一半的文件
+    temp_file = CONFIG_FILE + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as f:
         json.dump(config, f, ensure_ascii=False, indent=2)
+    os.replace(temp_file, CONFIG_FILE)
 
 
 def validate_mysql_config(config):
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+谷歌账号管理系统 - 生产环境启动入口
+
+使用 waitress 多线程 WSGI 服务器（不受 APP_CONFIG['DEBUG'] 影响），
+线程数和 SSE 连接上限见 config.json 的 "server" 配置。
+
+用法: python serve.py
+"""
+from main import app, prepare_runtime
+from services import server_service
+
+if __name__ == '__main__':
+    prepare_runtime()
+    server_service.serve(app)
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+申诉文案服务
+
+- 申诉文案 Excel（第二列，首行为表头）只在首次使用或文件修改后读取
+- 读取使用 openpyxl 只读模式，申诉流程中不导入 pandas
+- 文案按洗牌顺序轮流使用，一轮用完才会重复，且相邻两次不会取到同一条
+"""
+import os
+import random
+import threading
+
+import config
+from services import config_service
+from services.log_service import get_logger
+
+logger = get_logger('appeal')
+
+# 文案所在列（从0开始）
+TEXT_COLUMN = 1
+
+
+def read_appeal_texts(path):
+    """读取 Excel 第二列的所有非空文案（跳过表头）
+
+    Returns:
+        list: 文案列表
+    """
+    if path.lower().endswith(('.xlsx', '.xlsm')):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(min_row=2, values_only=True)
+            values = [row[TEXT_COLUMN] if len(row) > TEXT_COLUMN else None for row in rows]
+        finally:
+            workbook.close()
+    else:
+        # 旧版 .xls 等格式交给 pandas 处理
+        import pandas as pd
+
+        df = pd.read_excel(path)
+        if len(df.columns) <= TEXT_COLUMN:
+            raise ValueError('Excel文件列数不足，需要至少2列')
+        values = df.iloc[:, TEXT_COLUMN].dropna().tolist()
+
+    texts = []
+    for value in values:
+        if value is None:
+            continue
+        text = str(value).strip()
+        if text:
+            texts.append(text)
+    return texts
+
+
+class AppealTextStore:
+    """申诉文案库（线程安全）"""
+
+    def __init__(self):
+        self.path = None
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._texts = []
+        # 当前一轮的出场顺序（文案下标），从尾部弹出
+        self._bag = []
+        self._last = None
+
+    def _stat_mtime(self, path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _reload_locked(self, path, mtime):
+        logger.info(f"[申诉] 读取申诉文案Excel文件: {path}")
+        texts = read_appeal_texts(path)
+        self.path = path
+        self._mtime = mtime
+        self._texts = texts
+        self._bag = []
+        self._last = None
+        logger.info(f"[申诉] 申诉文案加载完成，共{len(self._texts)}条")
+
+    def _refill_locked(self):
+        self._bag = list(range(len(self._texts)))
+        random.shuffle(self._bag)
+        # 新一轮的第一条不与上一轮的最后一条相同
+        if len(self._bag) > 1 and self._bag[-1] == self._last:
+            self._bag[0], self._bag[-1] = self._bag[-1], self._bag[0]
+
+    def next_text(self):
+        """取下一条申诉文案
+
+        Returns:
+            str: 申诉文案，未配置、文件不存在或没有可用文案时返回 None
+        """
+        path = config.APPEAL_TEXT_PATH
+        if not path:
+            logger.error(f"[申诉] 错误: 未配置申诉文案Excel路径")
+            return None
+
+        mtime = self._stat_mtime(path)
+        if mtime is None:
+            logger.error(f"[申诉] 错误: 申诉文案文件不存在: {path}")
+            return None
+
+        with self._lock:
+            if path != self.path or mtime != self._mtime:
+                try:
+                    self._reload_locked(path, mtime)
+                except Exception as e:
+                    logger.error(f"[申诉] 读取申诉文案失败: {str(e)}", exc_info=True)
+                    return None
+
+            if not self._texts:
+                logger.error(f"[申诉] 错误: 第二列没有可用的申诉文案")
+                return None
+
+            if not self._bag:
+                self._refill_locked()
+            self._last = self._bag.pop()
+            text = self._texts[self._last]
+
+        logger.info(f"[申诉] 成功获取申诉文案（共{len(self._texts)}条可用）")
+        logger.info(f"[申诉] 文案内容: {text[:100]}...")  # 只显示前100个字符
+        return text
+
+    def invalidate(self):
+        """下次取文案时重新读取文件"""
+        with self._lock:
+            self.path = None
+            self._mtime = None
+
+    def count(self):
+        """已加载的文案数量"""
+        with self._lock:
+            return len(self._texts)
+
+
+store = AppealTextStore()
+
+
+def _on_config_changed(names):
+    logger.info(f"[申诉] 申诉文案路径已更新: {config.APPEAL_TEXT_PATH}")
+    store.invalidate()
+
+
+config_service.subscribe(_on_config_changed, 'APPEAL_TEXT_PATH')
+
+
+def next_appeal_text():
+    return store.next_text()
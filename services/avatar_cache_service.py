@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+头像预处理缓存服务
+
+头像文件夹变化时，用进程池把每张原图处理成统一规格的缓存文件：
+- EXIF 方向校正、居中裁剪为正方形、缩放到目标边长
+- 统一重新编码为 JPEG/PNG，去掉元数据
+- 按文件名确定的轻微视觉扰动（亮度/对比度/饱和度/裁剪位置），
+  使每张上传的头像感知哈希互不相同
+
+上传时优先使用缓存文件，缓存未就绪或处理失败时回退到原图。
+"""
+import hashlib
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import config
+from services.log_service import get_logger
+
+logger = get_logger('avatar_cache')
+
+# 扰动幅度
+VARIATION_ENHANCE = 0.04     # 亮度/对比度/饱和度 ±4%
+VARIATION_CROP = 0.03        # 裁剪位置偏移 ±3%
+
+_build_lock = threading.Lock()
+_build_thread = None
+_pending_build = None
+
+
+def _settings():
+    return {
+        'size': int(config.AVATAR_CACHE_CONFIG.get('size', 800)),
+        'format': (config.AVATAR_CACHE_CONFIG.get('format') or 'JPEG').upper(),
+        'quality': int(config.AVATAR_CACHE_CONFIG.get('quality', 88)),
+        'variation': bool(config.AVATAR_CACHE_CONFIG.get('variation', True)),
+    }
+
+
+def _cache_dir():
+    return os.path.abspath(config.AVATAR_CACHE_CONFIG.get('dir') or 'avatar_cache')
+
+
+def cache_path_for(source_path, settings=None):
+    """计算原图对应的缓存文件路径
+
+    文件名包含原图的大小、修改时间和处理参数的摘要，原图或参数变化后自动失效。
+    """
+    settings = settings or _settings()
+    stat = os.stat(source_path)
+    key = f"{os.path.basename(source_path)}|{stat.st_size}|{stat.st_mtime_ns}|{sorted(settings.items())}"
+    digest = hashlib.md5(key.encode('utf-8')).hexdigest()[:12]
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    extension = '.png' if settings['format'] == 'PNG' else '.jpg'
+    return os.path.join(_cache_dir(), f"{stem}_{digest}{extension}")
+
+
+def process_avatar(source_path, target_path, settings):
+    """处理单张头像（在子进程中运行，只依赖 Pillow）
+
+    Returns:
+        tuple: (source_path, 是否成功, 错误信息)
+    """
+    try:
+        from PIL import Image, ImageEnhance, ImageOps
+
+        # 以文件名为种子，同一张图每次生成相同的结果
+        rng = random.Random(os.path.basename(source_path))
+
+        with Image.open(source_path) as image:
+            image = ImageOps.exif_transpose(image)
+            image = image.convert('RGB')
+
+            # 居中裁剪为正方形（带少量随机偏移）
+            width, height = image.size
+            side = min(width, height)
+            shift = int(side * VARIATION_CROP) if settings['variation'] else 0
+            left = (width - side) // 2 + (rng.randint(-shift, shift) if shift else 0)
+            top = (height - side) // 2 + (rng.randint(-shift, shift) if shift else 0)
+            left = max(0, min(left, width - side))
+            top = max(0, min(top, height - side))
+            image = image.crop((left, top, left + side, top + side))
+            image = image.resize((settings['size'], settings['size']), Image.LANCZOS)
+
+            if settings['variation']:
+                for enhancer in (ImageEnhance.Brightness, ImageEnhance.Contrast, ImageEnhance.Color):
+                    image = enhancer(image).enhance(1 + rng.uniform(-VARIATION_ENHANCE, VARIATION_ENHANCE))
+
+            # 先写临时文件再改名，避免上传时读到写了一半的文件
+            temp_path = target_path + '.tmp'
+            if settings['format'] == 'PNG':
+                image.save(temp_path, 'PNG', optimize=True)
+            else:
+                image.save(temp_path, 'JPEG', quality=settings['quality'], optimize=True, progressive=True)
+            os.replace(temp_path, target_path)
+
+        return source_path, True, ''
+    except Exception as e:
+        return source_path, False, str(e)
+
+
+def _build(source_paths):
+    """为缺少缓存的原图生成缓存，并清理过期的缓存文件"""
+    settings = _settings()
+    cache_dir = _cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    tasks = []
+    expected = set()
+    for source_path in source_paths:
+        try:
+            target_path = cache_path_for(source_path, settings)
+        except OSError:
+            continue
+        expected.add(os.path.basename(target_path))
+        if not os.path.exists(target_path):
+            tasks.append((source_path, target_path))
+
+    if tasks:
+        workers = int(config.AVATAR_CACHE_CONFIG.get('workers') or 0) or os.cpu_count() or 1
+        workers = max(1, min(workers, len(tasks)))
+        logger.info(f"[头像缓存] 开始预处理 {len(tasks)} 张头像（{workers} 个进程）")
+        failed = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(process_avatar, source, target, settings) for source, target in tasks]
+            for future in futures:
+                source_path, success, error = future.result()
+                if not success:
+                    failed += 1
+                    logger.warning(f"[头像缓存警告] 处理失败，将使用原图上传: {os.path.basename(source_path)} - {error}")
+        logger.info(f"[头像缓存] 预处理完成: 成功 {len(tasks) - failed} 张，失败 {failed} 张")
+
+    # 清理原图已删除或参数已变化的缓存
+    for name in os.listdir(cache_dir):
+        if name not in expected:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+
+def _build_loop():
+    global _build_thread, _pending_build
+
+    while True:
+        with _build_lock:
+            source_paths = _pending_build
+            _pending_build = None
+            if source_paths is None:
+                _build_thread = None
+                return
+        try:
+            _build(source_paths)
+        except Exception as e:
+            logger.error(f"[头像缓存错误] 预处理失败: {str(e)}", exc_info=True)
+
+
+def schedule_build(source_paths):
+    """在后台线程中（用进程池）为头像生成缓存
+
+    构建进行中再次调用时，只保留最新一次的文件列表，当前构建结束后再处理。
+    """
+    global _build_thread, _pending_build
+
+    if not config.AVATAR_CACHE_CONFIG.get('enabled', True):
+        return
+
+    with _build_lock:
+        _pending_build = list(source_paths)
+        if _build_thread is None:
+            _build_thread = threading.Thread(target=_build_loop, name='avatar-cache-builder', daemon=True)
+            _build_thread.start()
+
+
+def get_upload_path(source_path):
+    """获取上传用的文件路径：缓存已就绪时返回缓存文件，否则返回原图"""
+    if not config.AVATAR_CACHE_CONFIG.get('enabled', True):
+        return source_path
+    try:
+        cached = cache_path_for(source_path)
+    except OSError:
+        return source_path
+    return cached if os.path.exists(cached) else source_path
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+频道头像目录服务
+
+- 头像文件夹只在变化时重新扫描（后台线程轮询文件夹修改时间）
+- 每个头像的分配次数保存在数据库（avatars 表）
+- 内存中按分配次数分桶，取最少使用的头像为 O(1)
+- 分配出去的头像在归还前不会再分配给其他账号；
+  已成功用于某个账号的头像永久排除
+- 分配记录（租约）保存在数据库：多个工作进程同时创建频道时，用带条件的 UPDATE 抢占头像
+  （与领取任务相同），同一个头像不会同时分配给两个进程；进程异常退出未归还的租约
+  超过 LEASE_TIMEOUT 后失效
+"""
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import config
+from models import db, Avatar
+from services import avatar_cache_service, config_service
+from services.log_service import get_logger
+
+logger = get_logger('avatar')
+
+SUPPORTED_FORMATS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+
+# 文件夹变化检测间隔（秒）
+WATCH_INTERVAL = 5
+# 租约有效期（秒）：创建一个频道远少于该时长，超时未归还视为持有的进程已退出
+LEASE_TIMEOUT = 3600
+
+# 租约持有者（本进程）
+LEASE_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _lease_free():
+    """头像未被分配（或租约已超时）的条件"""
+    deadline = datetime.now() - timedelta(seconds=LEASE_TIMEOUT)
+    return db.or_(Avatar.leased_at.is_(None), Avatar.leased_at < deadline)
+
+
+class AvatarCatalog:
+    """头像目录（线程安全）"""
+
+    def __init__(self):
+        self.path = None
+        self._lock = threading.Lock()
+        # 分配次数 -> 有序的文件名集合（先进先出，保证同次数的头像轮流使用）
+        self._buckets = {}
+        self._counts = {}
+        self._min_count = 0
+        self._dirty = True
+        self._dir_mtime = None
+        self._watcher = None
+
+    # ---------- 文件夹扫描与监控 ----------
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _watch(self):
+        """后台轮询文件夹修改时间，变化时标记需要重新扫描"""
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            path = config.CHANNEL_AVATAR_PATH
+            if path != self.path or self._current_mtime() != self._dir_mtime:
+                self._dirty = True
+
+    def _ensure_watcher(self):
+        if self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name='avatar-watcher', daemon=True)
+            self._watcher.start()
+
+    def _refresh_locked(self):
+        """重新扫描文件夹并与数据库中的使用记录同步（需要应用上下文）"""
+        self.path = config.CHANNEL_AVATAR_PATH
+        self._dir_mtime = self._current_mtime()
+        self._dirty = False
+
+        files = []
+        if self.path and os.path.isdir(self.path):
+            files = sorted(
+                name for name in os.listdir(self.path)
+                if name.lower().endswith(SUPPORTED_FORMATS)
+            )
+
+        records = {}
+        leased = set()
+        if files:
+            records = {a.file_name: a for a in Avatar.query.filter(Avatar.file_name.in_(files)).all()}
+            leased = {name for (name,) in db.session.query(Avatar.file_name).filter(
+                Avatar.file_name.in_(files), db.not_(_lease_free()))}
+            new_records = [Avatar(file_name=name, use_count=0) for name in files if name not in records]
+            if new_records:
+                db.session.add_all(new_records)
+                db.session.commit()
+                records.update({a.file_name: a for a in new_records})
+
+        self._buckets = {}
+        self._counts = {}
+        for name in files:
+            record = records[name]
+            # 已被其他账号成功使用、或当前正在分配中（任一进程）的头像不进入候选
+            if record.account_id is not None or name in leased:
+                continue
+            self._add_locked(name, record.use_count or 0)
+        self._min_count = min(self._buckets) if self._buckets else 0
+
+        logger.info(f"[头像目录] 扫描完成: 共 {len(files)} 个头像，可分配 {len(self._counts)} 个")
+        
+        # 文件夹有变化，后台预处理上传用的缓存图
+        avatar_cache_service.schedule_build([os.path.join(self.path, name) for name in files])
+
+    def _ensure_fresh_locked(self):
+        self._ensure_watcher()
+        if self._dirty or config.CHANNEL_AVATAR_PATH != self.path:
+            self._refresh_locked()
+
+    # ---------- 分桶结构 ----------
+
+    def _add_locked(self, name, count):
+        self._counts[name] = count
+        self._buckets.setdefault(count, OrderedDict())[name] = None
+        if count < self._min_count:
+            self._min_count = count
+
+    def _pop_least_used_locked(self):
+        if not self._counts:
+            return None
+        # 分配次数只会递增，最小桶为空时向上查找，均摊 O(1)
+        while not self._buckets.get(self._min_count):
+            self._buckets.pop(self._min_count, None)
+            self._min_count += 1
+        name, _ = self._buckets[self._min_count].popitem(last=False)
+        count = self._counts.pop(name)
+        return name, count
+
+    # ---------- 对外接口 ----------
+
+    def acquire(self, account_id=None):
+        """分配一个使用次数最少的头像（需要应用上下文）
+
+        Returns:
+            str: 头像完整路径，没有可用头像返回 None
+        """
+        with self._lock:
+            self._ensure_fresh_locked()
+            while True:
+                picked = self._pop_least_used_locked()
+                if picked is None:
+                    return None
+                name, count = picked
+                file_path = os.path.join(self.path, name)
+                if not os.path.exists(file_path):
+                    # 文件已被删除但尚未重新扫描
+                    self._dirty = True
+                    continue
+                # 带条件抢占：其他进程已分配或已成功使用时不更新，换下一个头像
+                claimed = Avatar.query.filter(
+                    Avatar.file_name == name, Avatar.account_id.is_(None), _lease_free()
+                ).update({
+                    'use_count': Avatar.use_count + 1,
+                    'last_used_at': datetime.now(),
+                    'leased_at': datetime.now(),
+                    'leased_by': LEASE_OWNER,
+                }, synchronize_session=False)
+                db.session.commit()
+                if claimed:
+                    break
+                # 其他进程归还后需重新扫描才会回到候选
+                logger.debug(f"[头像目录] 头像 {name} 已被其他进程分配，跳过")
+                self._dirty = True
+
+            logger.info(f"[头像目录] 分配头像: {name}（此前已分配 {count} 次，账号 ID: {account_id}）")
+            return file_path
+
+    def release(self, file_path):
+        """归还未成功使用的头像，放回候选（分配次数保留，之后会排在更少使用的头像之后）"""
+        name = os.path.basename(file_path)
+        with self._lock:
+            released = Avatar.query.filter_by(file_name=name, leased_by=LEASE_OWNER).update(
+                {'leased_at': None, 'leased_by': None}, synchronize_session=False)
+            db.session.commit()
+            if not released or not os.path.exists(file_path):
+                return
+            record = Avatar.query.filter_by(file_name=name).first()
+            if record and record.account_id is None and name not in self._counts:
+                self._add_locked(name, record.use_count)
+
+    def mark_used(self, file_path, account_id):
+        """记录头像已被某账号成功使用，之后不会再分配给任何账号"""
+        name = os.path.basename(file_path)
+        with self._lock:
+            Avatar.query.filter_by(file_name=name).update(
+                {'account_id': account_id, 'leased_at': None, 'leased_by': None}, synchronize_session=False)
+            db.session.commit()
+
+    def invalidate(self):
+        """标记需要重新扫描（下次分配时执行）"""
+        self._dirty = True
+
+    def available_count(self):
+        """当前可分配的头像数量（需要应用上下文）"""
+        with self._lock:
+            self._ensure_fresh_locked()
+            return len(self._counts)
+
+
+catalog = AvatarCatalog()
+
+
+def _on_config_changed(names):
+    # 头像文件夹或预处理参数变化：重新扫描，扫描时按新参数生成缓存
+    logger.info(f"[头像目录] 配置已更新，下次分配头像时重新扫描: {config.CHANNEL_AVATAR_PATH}")
+    catalog.invalidate()
+
+
+config_service.subscribe(_on_config_changed, 'CHANNEL_AVATAR_PATH', 'AVATAR_CACHE_CONFIG')
+
+
+def acquire_avatar(account_id=None):
+    return catalog.acquire(account_id)
+
+
+def release_avatar(file_path):
+    catalog.release(file_path)
+
+
+def mark_avatar_used(file_path, account_id):
+    catalog.mark_used(file_path, account_id)
+
+
+def available_count():
+    return catalog.available_count()
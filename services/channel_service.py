@@ -2,17 +2,25 @@
 """
 YouTube频道创建服务
 """
+import json
 import time
 import os
 import random
+import re
 import string
+import threading
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
-from config import CHANNEL_AVATAR_PATH
-from models import db, LoginLog
+import config
+from models import db, Account, Phone, session_scope
+from services import avatar_service, avatar_cache_service, login_log_service, monetization_service, selector_service
+from services.log_service import get_logger, log_context, update_log_context
+from services.job_service import CancelToken, TaskCancelled, cancel_scope, check_cancelled, interruptible_sleep
+
+logger = get_logger('channel')
 
 
 def get_random_name(length=10):
@@ -22,134 +30,183 @@ def get_random_name(length=10):
     return ''.join(random.choice(chars) for _ in range(length))
 
 
-def get_available_avatar():
-    """从头像文件夹中获取一个可用的头像
+def get_available_avatar(account_id=None):
+    """从头像目录中分配一个使用次数最少的头像
+    
+    分配出的头像在 release_avatar / mark_avatar_used 之前不会再分配给其他账号。
+    
+    Args:
+        account_id: 使用头像的账号ID
     
     Returns:
         str: 头像文件的完整路径，如果没有可用头像则返回 None
     """
     try:
-        if not CHANNEL_AVATAR_PATH or not os.path.exists(CHANNEL_AVATAR_PATH):
-            print(f"[频道创建错误] 头像文件夹路径不存在: {CHANNEL_AVATAR_PATH}")
+        if not config.CHANNEL_AVATAR_PATH or not os.path.exists(config.CHANNEL_AVATAR_PATH):
+            logger.error(f"[频道创建错误] 头像文件夹路径不存在: {config.CHANNEL_AVATAR_PATH}")
             return None
         
-        # 获取文件夹中所有图片文件
-        supported_formats = ['.jpg', '.jpeg', '.png', '.gif', '.bmp']
-        avatar_files = []
-        
-        for file in os.listdir(CHANNEL_AVATAR_PATH):
-            file_lower = file.lower()
-            if any(file_lower.endswith(fmt) for fmt in supported_formats):
-                avatar_files.append(os.path.join(CHANNEL_AVATAR_PATH, file))
-        
-        if not avatar_files:
-            print(f"[频道创建错误] 头像文件夹中没有可用的图片文件")
+        avatar_path = avatar_service.acquire_avatar(account_id)
+        if not avatar_path:
+            logger.error(f"[频道创建错误] 头像文件夹中没有可用的图片文件")
             return None
         
-        # 随机选择一个头像
-        avatar_path = random.choice(avatar_files)
-        print(f"[频道创建] 选择头像: {avatar_path}")
+        logger.info(f"[频道创建] 选择头像: {avatar_path}")
         return avatar_path
         
     except Exception as e:
-        print(f"[频道创建错误] 获取头像失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"[频道创建错误] 获取头像失败: {str(e)}", exc_info=True)
+        return None
+
+
+# 拦截页面打开文件选择框：页面调用 input[type=file].click() 时不弹出系统对话框，
+# 而是记录该 input（未挂到文档上的临时 input 会被隐藏挂到 body 上，便于 WebDriver 操作）
+FILE_CHOOSER_HOOK_JS = """
+if (!window.__fileChooserHook) {
+    window.__fileChooserHook = true;
+    window.__capturedFileInputs = [];
+    var capture = function(input) {
+        if (!input.isConnected) {
+            input.style.display = 'none';
+            document.body.appendChild(input);
+        }
+        window.__capturedFileInputs.push(input);
+    };
+    var originalClick = HTMLInputElement.prototype.click;
+    HTMLInputElement.prototype.click = function() {
+        if (this.type === 'file') { capture(this); return; }
+        return originalClick.apply(this, arguments);
+    };
+    if (HTMLInputElement.prototype.showPicker) {
+        var originalShowPicker = HTMLInputElement.prototype.showPicker;
+        HTMLInputElement.prototype.showPicker = function() {
+            if (this.type === 'file') { capture(this); return; }
+            return originalShowPicker.apply(this, arguments);
+        };
+    }
+}
+window.__capturedFileInputs = [];
+"""
+
+# 系统文件对话框依赖全局的键盘和剪贴板，同一时间只能有一个线程操作
+_upload_dialog_lock = threading.Lock()
+
+
+def install_file_chooser_hook(driver):
+    """在当前文档（frame）中安装文件选择框拦截，需在点击上传按钮之前调用"""
+    try:
+        driver.execute_script(FILE_CHOOSER_HOOK_JS)
+        return True
+    except Exception as e:
+        logger.warning(f"[频道创建警告] 安装文件选择拦截失败: {str(e)}")
+        return False
+
+
+def get_captured_file_input(driver):
+    """获取点击上传按钮后被拦截的 input[type=file]，没有则返回 None"""
+    try:
+        return driver.execute_script(
+            "var inputs = window.__capturedFileInputs || [];"
+            "return inputs.length ? inputs[inputs.length - 1] : null;"
+        )
+    except Exception:
         return None
 
 
 def handle_system_upload_dialog(file_path):
-    """处理操作系统文件上传弹窗
-    使用 pyautogui 模拟键盘操作
+    """处理操作系统文件上传弹窗（兜底方案）
+    使用 pyautogui 模拟键盘操作；键盘和剪贴板是全局的，多个线程排队依次处理
     """
+    waited = 0
+    while not _upload_dialog_lock.acquire(timeout=1):
+        waited += 1
+        if waited % 10 == 1:
+            logger.info(f"[系统交互] 其他账号正在操作系统弹窗，排队等待...")
+        check_cancelled()
+    try:
+        return _handle_system_upload_dialog(file_path)
+    finally:
+        _upload_dialog_lock.release()
+
+
+def _handle_system_upload_dialog(file_path):
     try:
         import pyautogui
         import pyperclip
         
         abs_path = os.path.abspath(file_path)
-        print(f"[系统交互] 开始处理文件上传弹窗: {abs_path}")
+        logger.info(f"[系统交互] 开始处理文件上传弹窗: {abs_path}")
         
         # 禁用 pyautogui 的安全暂停（加快速度）
         pyautogui.PAUSE = 0.3
         
         # 等待系统弹窗完全加载
-        print(f"[系统交互] 等待系统弹窗加载...")
-        time.sleep(5)  # 等待5秒确保弹窗完全加载
+        logger.info(f"[系统交互] 等待系统弹窗加载...")
+        interruptible_sleep(5)  # 等待5秒确保弹窗完全加载
         
         # 方法1：使用 Alt+N 聚焦到文件名输入框（Windows "打开"对话框中的快捷键）
-        print(f"[系统交互] 尝试聚焦到文件名输入框 (Alt+N)...")
+        logger.info(f"[系统交互] 尝试聚焦到文件名输入框 (Alt+N)...")
         pyautogui.hotkey('alt', 'n')
-        time.sleep(0.5)
+        interruptible_sleep(0.5)
         
         # 清空当前输入框内容
         pyautogui.hotkey('ctrl', 'a')
-        time.sleep(0.3)
+        interruptible_sleep(0.3)
         
         # 复制路径到剪贴板（支持中文路径）
-        print(f"[系统交互] 复制路径到剪贴板...")
+        logger.info(f"[系统交互] 复制路径到剪贴板...")
         pyperclip.copy(abs_path)
-        time.sleep(0.3)
+        interruptible_sleep(0.3)
         
         # 验证剪贴板内容
         clipboard_content = pyperclip.paste()
         if clipboard_content == abs_path:
-            print(f"[系统交互] ✅ 剪贴板验证成功")
+            logger.info(f"[系统交互] ✅ 剪贴板验证成功")
         else:
-            print(f"[系统交互警告] 剪贴板内容不匹配！")
-            print(f"[系统交互调试] 期望: {abs_path}")
-            print(f"[系统交互调试] 实际: {clipboard_content}")
+            logger.warning(f"[系统交互警告] 剪贴板内容不匹配！")
+            logger.debug(f"[系统交互调试] 期望: {abs_path}")
+            logger.debug(f"[系统交互调试] 实际: {clipboard_content}")
         
         # 粘贴路径
-        print(f"[系统交互] 粘贴路径 (Ctrl+V)...")
+        logger.info(f"[系统交互] 粘贴路径 (Ctrl+V)...")
         pyautogui.hotkey('ctrl', 'v')
-        time.sleep(2)  # 等待粘贴完成
+        interruptible_sleep(2)  # 等待粘贴完成
         
         # 按回车确认（打开文件）
-        print(f"[系统交互] 按回车确认...")
+        logger.info(f"[系统交互] 按回车确认...")
         pyautogui.press('enter')
         
         # 重要：等待系统弹窗完全关闭，避免后续按键被浏览器捕获
-        print(f"[系统交互] 等待系统弹窗关闭...")
-        time.sleep(3)
+        logger.info(f"[系统交互] 等待系统弹窗关闭...")
+        interruptible_sleep(3)
         
-        print(f"[系统交互] ✅ 文件选择操作完成")
+        logger.info(f"[系统交互] ✅ 文件选择操作完成")
         
         # 立即返回，不要在这里长时间等待，让浏览器自然上传
         return True
         
     except ImportError:
-        print(f"[系统交互错误] 缺少 pyautogui 或 pyperclip 库，无法处理系统弹窗")
+        logger.error(f"[系统交互错误] 缺少 pyautogui 或 pyperclip 库，无法处理系统弹窗")
         return False
     except Exception as e:
-        print(f"[系统交互错误] 处理弹窗失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"[系统交互错误] 处理弹窗失败: {str(e)}", exc_info=True)
         return False
 
 
 def check_avatar_availability():
-    """检查头像文件夹中的头像数量
+    """检查头像文件夹中可分配的头像数量
     
     Returns:
         tuple: (是否可用, 可用数量, 错误信息)
     """
     try:
-        if not CHANNEL_AVATAR_PATH:
+        if not config.CHANNEL_AVATAR_PATH:
             return False, 0, "未配置头像文件夹路径"
         
-        if not os.path.exists(CHANNEL_AVATAR_PATH):
-            return False, 0, f"头像文件夹不存在: {CHANNEL_AVATAR_PATH}"
-        
-        # 获取文件夹中所有图片文件
-        supported_formats = ['.jpg', '.jpeg', '.png', '.gif', '.bmp']
-        avatar_files = []
+        if not os.path.exists(config.CHANNEL_AVATAR_PATH):
+            return False, 0, f"头像文件夹不存在: {config.CHANNEL_AVATAR_PATH}"
         
-        for file in os.listdir(CHANNEL_AVATAR_PATH):
-            file_lower = file.lower()
-            if any(file_lower.endswith(fmt) for fmt in supported_formats):
-                avatar_files.append(file)
-        
-        count = len(avatar_files)
+        count = avatar_service.available_count()
         if count == 0:
             return False, 0, "头像文件夹中没有可用的图片文件"
         
@@ -162,19 +219,202 @@ def check_avatar_availability():
 def add_channel_log(account_id, browser_env_id, status, message):
     """添加频道创建日志"""
     try:
-        log = LoginLog(
-            account_id=account_id,
-            browser_env_id=browser_env_id,
-            action='create_channel',
-            status=status,
-            message=message
-        )
-        db.session.add(log)
-        db.session.commit()
+        login_log_service.write(account_id, browser_env_id, 'create_channel', status, message)
+    except Exception as e:
+        logger.error(f"[日志错误] 添加日志失败: {str(e)}")
+
+
+# 创收页面 threshold 提取脚本（execute_async_script，一次调用完成）：
+# 关闭欢迎弹窗（Got it / Continue）、滚动主容器触发进度区域渲染，
+# 等到 Shorts 进度区域的 threshold 出现（或 threshold 元素数量稳定）后，
+# 以 JSON 返回所有 threshold 的文字、所在区域和说明文字
+MONETIZATION_THRESHOLDS_JS = """
+var waitMs = arguments[0];
+var done = arguments[arguments.length - 1];
+var start = Date.now();
+var clicked = [], clickedButtons = [];
+var lastCount = -1, stableSince = Date.now(), scrolledToShorts = false;
+
+function visible(el) {
+    return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+
+function hasClass(el, predicate) {
+    var names = (el.getAttribute && el.getAttribute('class') || '').split(/\\s+/);
+    for (var i = 0; i < names.length; i++) {
+        if (names[i] && predicate(names[i])) return true;
+    }
+    return false;
+}
+
+function closest(el, predicate) {
+    for (var node = el; node && node.nodeType === 1; node = node.parentElement) {
+        if (hasClass(node, predicate)) return node;
+    }
+    return null;
+}
+
+function dismissPopups() {
+    var buttons = document.querySelectorAll('button, ytcp-button, tp-yt-paper-button');
+    for (var i = 0; i < buttons.length; i++) {
+        var button = buttons[i];
+        if (!visible(button) || clickedButtons.indexOf(button) >= 0) continue;
+        var texts = [(button.innerText || '').trim().toLowerCase(), (button.getAttribute('aria-label') || '').trim().toLowerCase()];
+        for (var j = 0; j < texts.length; j++) {
+            if (['got it', '知道了', 'continue', '继续'].indexOf(texts[j]) >= 0) {
+                button.click();
+                clickedButtons.push(button);
+                clicked.push(texts[j]);
+                break;
+            }
+        }
+    }
+}
+
+function scrollContent() {
+    var shorts = document.querySelector('[class*="shorts-progress"]:not([class*="watch-and-shorts-progress"])');
+    if (shorts) {
+        if (!scrolledToShorts) shorts.scrollIntoView({block: 'center'});
+        scrolledToShorts = true;
+        return;
+    }
+    var selectors = ['tp-yt-app-drawer[opened] #contentContainer', '#page-manager', 'ytcp-app'];
+    for (var i = 0; i < selectors.length; i++) {
+        var container = document.querySelector(selectors[i]);
+        if (container && container.scrollHeight > container.clientHeight) {
+            container.scrollTop += 500;
+            return;
+        }
+    }
+    window.scrollBy(0, 500);
+}
+
+function collect() {
+    var spans = document.querySelectorAll('span[class*="threshold"]');
+    var items = [];
+    for (var i = 0; i < spans.length; i++) {
+        var span = spans[i];
+        var section = '';
+        if (closest(span, function (c) { return c !== 'watch-and-shorts-progress' && c.indexOf('shorts-progress') >= 0; })) {
+            section = 'shorts';
+        } else if (closest(span, function (c) { return c.indexOf('watch') >= 0 && c.indexOf('progress') >= 0 && c !== 'watch-and-shorts-progress'; })) {
+            section = 'watch';
+        } else if (closest(span, function (c) { return c.indexOf('subscriber') >= 0; })) {
+            section = 'subscribers';
+        }
+        var labelNode = closest(span, function (c) { return c.indexOf('progress-text') >= 0; }) || span.parentElement;
+        items.push({
+            text: (span.innerText || span.textContent || '').trim(),
+            section: section,
+            label: (labelNode && (labelNode.innerText || labelNode.textContent) || '').trim()
+        });
+    }
+    return items;
+}
+
+function tick() {
+    try {
+        dismissPopups();
+        scrollContent();
+        var items = collect();
+        if (items.length !== lastCount) {
+            lastCount = items.length;
+            stableSince = Date.now();
+        }
+        var shortsReady = items.some(function (item) { return item.section === 'shorts' && item.text; });
+        var settled = items.length > 0 && Date.now() - stableSince > 2000;
+        if (shortsReady || settled || Date.now() - start > waitMs) {
+            done(JSON.stringify({ready: shortsReady || settled, items: items, clicked: clicked, url: location.href}));
+            return;
+        }
+    } catch (e) {
+        done(JSON.stringify({ready: false, items: [], clicked: clicked, error: String(e)}));
+        return;
+    }
+    setTimeout(tick, 250);
+}
+tick();
+"""
+
+# 等待创收页面 threshold 出现的最长时间（秒），按 MONETIZATION_SCRIPT_CHUNK 分段调用，段间检查任务是否已停止
+MONETIZATION_WAIT_TIMEOUT = 30
+MONETIZATION_SCRIPT_CHUNK = 5
+
+
+def collect_monetization_thresholds(driver, timeout=MONETIZATION_WAIT_TIMEOUT):
+    """在创收页面等待并提取所有 threshold（一次脚本调用，页面未就绪时分段重试）
+
+    Returns:
+        list: [{'text': threshold文字, 'section': 'shorts'/'watch'/'subscribers'/'', 'label': 说明文字}]
+    """
+    driver.set_script_timeout(MONETIZATION_SCRIPT_CHUNK + 5)
+    deadline = time.time() + timeout
+    result = {'items': []}
+    while True:
+        check_cancelled()
+        chunk_ms = int(max(0.5, min(MONETIZATION_SCRIPT_CHUNK, deadline - time.time())) * 1000)
+        try:
+            result = json.loads(driver.execute_async_script(MONETIZATION_THRESHOLDS_JS, chunk_ms))
+        except (TimeoutException, ValueError, TypeError) as e:
+            logger.info(f"[创收检测] 提取threshold脚本未返回结果: {str(e)}")
+        if result.get('clicked'):
+            logger.info(f"[创收检测] ✅ 已关闭弹窗: {', '.join(result['clicked'])}")
+        if result.get('error'):
+            logger.info(f"[创收检测] 提取threshold脚本出错: {result['error']}")
+        if result.get('ready') or time.time() >= deadline:
+            return result.get('items', [])
+
+
+def _is_million(text):
+    return 'M' in text or 'million' in text.lower() or '万' in text
+
+
+def pick_shorts_threshold(items):
+    """从页面上的 threshold 中选出 Shorts 观看次数要求
+
+    优先级：Shorts 进度区域中的值 > 说明文字为 Shorts views 的值 > 任意以百万为单位的值 > 第4个值
+    """
+    texts = [item for item in items if item.get('text')]
+    for item in texts:
+        if item.get('section') == 'shorts' and _is_million(item['text']):
+            return item['text']
+    for item in texts:
+        if 'shorts views' in item.get('label', '').lower():
+            return item['text']
+    for item in texts:
+        if _is_million(item['text']):
+            return item['text']
+    if len(items) >= 4:
+        return items[3].get('text') or None
+    return None
+
+
+def classify_threshold(threshold_value):
+    """threshold 文字 -> "3m" / "10m"，无法识别返回 None"""
+    # 清理和标准化threshold值
+    threshold_clean = threshold_value.upper().replace(',', '').replace('.', '').replace(' ', '')
+    # 检测3M相关
+    # 匹配: 3M, 3000000, 300万, 3 million, 3 triệu 等
+    if re.search(r'3M|3000000|300万|3MILLION|3TRIỆU', threshold_clean):
+        return "3m"
+    # 检测10M相关
+    # 匹配: 10M, 10000000, 1000万, 10 million, 10 triệu 等
+    if re.search(r'10M|10000000|1000万|10MILLION|10TRIỆU', threshold_clean):
+        return "10m"
+    return None
+
+
+def _record_monetization_check(account_id, requirement):
+    """记录检测时间和结果（定期复查据此挑选需要复查的频道）"""
+    if not account_id:
+        return
+    try:
+        monetization_service.record_check(account_id, requirement)
     except Exception as e:
-        print(f"[日志错误] 添加日志失败: {str(e)}")
+        logger.warning(f"[创收检测] 记录检测时间失败: {str(e)}")
 
 
+@log_context(stage='monetization')
 def detect_monetization_requirement(driver, channel_url, account_id=None, browser_env_id=None):
     """检测YouTube创收要求（3m还是10m）
     
@@ -188,7 +428,7 @@ def detect_monetization_requirement(driver, channel_url, account_id=None, browse
         str: "3m" 或 "10m" 或 None（检测失败）
     """
     try:
-        print(f"[创收检测] 开始检测创收要求...")
+        logger.info(f"[创收检测] 开始检测创收要求...")
         add_channel_log(account_id, browser_env_id, 'info', '开始检测创收要求')
         
         # 从频道URL提取频道ID
@@ -204,245 +444,77 @@ def detect_monetization_requirement(driver, channel_url, account_id=None, browse
                     break
         
         if not channel_id:
-            print(f"[创收检测] 无法从URL中提取频道ID: {channel_url}")
+            logger.info(f"[创收检测] 无法从URL中提取频道ID: {channel_url}")
             add_channel_log(account_id, browser_env_id, 'warning', f'无法从URL中提取频道ID')
+            _record_monetization_check(account_id, None)
             return None
         
         # 构建创收页面URL
         monetization_url = f"https://studio.youtube.com/channel/{channel_id}/monetization/overview"
-        print(f"[创收检测] 导航到创收页面: {monetization_url}")
+        logger.info(f"[创收检测] 导航到创收页面: {monetization_url}")
         add_channel_log(account_id, browser_env_id, 'info', f'导航到创收页面')
         
         driver.get(monetization_url)
-        time.sleep(8)  # 等待页面加载
         
-        # 处理"Welcome to YouTube Studio"弹窗
-        try:
-            print(f"[创收检测] 检查是否有欢迎弹窗...")
-            
-            # 先检查并点击"Got it"按钮（可能在Continue按钮上方）
-            try:
-                got_it_button = None
-                # 尝试多种方式查找"Got it"按钮
-                try:
-                    got_it_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Got it') or contains(text(), 'got it') or contains(text(), '知道了')]")
-                except:
-                    try:
-                        got_it_button = driver.find_element(By.XPATH, "//button[@aria-label='Got it' or @aria-label='知道了']")
-                    except:
-                        pass
-                
-                if got_it_button and got_it_button.is_displayed():
-                    print(f"[创收检测] 检测到上层弹窗，点击Got it按钮...")
-                    got_it_button.click()
-                    time.sleep(2)
-                    print(f"[创收检测] ✅ 已点击Got it按钮")
-            except Exception as got_it_err:
-                print(f"[创收检测] 未检测到Got it按钮或点击失败（可忽略）: {str(got_it_err)}")
-            
-            # 查找Continue按钮
-            continue_button = None
-            try:
-                # 方式1：通过按钮文本查找
-                continue_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Continue') or contains(text(), '继续')]")
-            except:
-                # 方式2：通过aria-label查找
-                try:
-                    continue_button = driver.find_element(By.XPATH, "//button[@aria-label='Continue' or @aria-label='继续']")
-                except:
-                    pass
-
-            if continue_button and continue_button.is_displayed():
-                print(f"[创收检测] 检测到欢迎弹窗，点击Continue按钮...")
-                continue_button.click()
-                time.sleep(2)
-                print(f"[创收检测] ✅ 已点击Continue按钮")
-            else:
-                print(f"[创收检测] 未检测到欢迎弹窗，继续...")
-        except Exception as popup_err:
-            print(f"[创收检测] 处理弹窗时出错（可忽略）: {str(popup_err)}")
-        
-        # 向下滚动页面，确保创收要求区域可见
-        print(f"[创收检测] 向下滚动页面...")
-        try:
-            # 尝试找到YouTube Studio的主滚动容器
-            scroll_containers = [
-                "tp-yt-app-drawer[opened] #contentContainer",
-                "#page-manager",
-                "ytcp-app",
-                "body"
-            ]
-            
-            scrolled = False
-            for container_selector in scroll_containers:
-                try:
-                    container = driver.find_element(By.CSS_SELECTOR, container_selector)
-                    # 使用JavaScript滚动容器
-                    driver.execute_script("""
-                        arguments[0].scrollTop = arguments[0].scrollHeight / 2;
-                    """, container)
-                    time.sleep(1)
-                    driver.execute_script("""
-                        arguments[0].scrollTop += 500;
-                    """, container)
-                    time.sleep(1)
-                    print(f"[创收检测] ✅ 成功滚动容器: {container_selector}")
-                    scrolled = True
-                    break
-                except:
-                    continue
-            
-            # 如果没有找到特定容器，使用传统的window滚动
-            if not scrolled:
-                print(f"[创收检测] 使用传统window滚动方式...")
-                driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight / 2);")
-                time.sleep(1)
-                driver.execute_script("window.scrollBy(0, 500);")
-                time.sleep(1)
-            
-            # 额外尝试：直接找到Shorts区域并滚动到可见
-            try:
-                shorts_element = driver.find_element(By.XPATH, "//div[contains(@class, 'shorts-progress')]")
-                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", shorts_element)
-                time.sleep(2)
-                print(f"[创收检测] ✅ 已滚动到Shorts区域")
-            except:
-                print(f"[创收检测] 未找到Shorts区域元素（将继续尝试其他方法）")
-            
-            print(f"[创收检测] ✅ 页面滚动完成")
-        except Exception as scroll_err:
-            print(f"[创收检测] 滚动页面时出错: {str(scroll_err)}")
+        # 一次脚本调用完成：关闭欢迎弹窗、滚动到进度区域、等待 threshold 元素出现并返回全部 threshold/说明文字
+        thresholds = collect_monetization_thresholds(driver)
+        for idx, item in enumerate(thresholds):
+            logger.debug(f"[创收检测调试] threshold {idx+1}: {item['text']}（区域: {item['section'] or '未知'}，说明: {item['label'][:60]}）")
+        logger.info(f"[创收检测] 页面上共有 {len(thresholds)} 个threshold元素")
         
         # 获取Shorts创收要求的threshold值
-        threshold_value = None
-        
-        # 方法1（最优先）：精确定位 shorts-progress 区域的 threshold 元素
-        try:
-            print(f"[创收检测] 方法1: 精确定位shorts-progress中的threshold元素...")
-            # 更精确的定位：确保是在watch-and-shorts-progress容器内的shorts-progress
-            shorts_threshold = driver.find_element(
-                By.XPATH,
-                "//div[contains(@class, 'watch-and-shorts-progress')]//div[contains(@class, 'shorts-progress')]//span[contains(@class, 'threshold')]"
-            )
-            threshold_value = shorts_threshold.text.strip()
-            print(f"[创收检测] ✅ 方法1成功 - Shorts threshold值: {threshold_value}")
-            
-            # 额外验证：如果获取到的值不包含M，说明可能获取错了
-            if threshold_value and 'M' not in threshold_value and 'million' not in threshold_value.lower():
-                print(f"[创收检测] ⚠️ 方法1获取的值可能不正确（不包含M）: {threshold_value}，尝试其他方法...")
-                threshold_value = None
-        except Exception as e:
-            print(f"[创收检测] 方法1失败: {str(e)}")
-
-        # 方法2：通过ID定位
-        if not threshold_value:
-            try:
-                print(f"[创收检测] 方法2: 通过shorts-count ID定位...")
-                shorts_count_elem = driver.find_element(By.ID, "shorts-count")
-                # 找到父容器，然后找threshold
-                parent_div = shorts_count_elem.find_element(By.XPATH, "./ancestor::div[contains(@class, 'shorts-progress')]")
-                shorts_threshold = parent_div.find_element(By.XPATH, ".//span[contains(@class, 'threshold')]")
-                threshold_value = shorts_threshold.text.strip()
-                print(f"[创收检测] ✅ 方法2成功 - Shorts threshold值: {threshold_value}")
-                
-                # 验证
-                if threshold_value and 'M' not in threshold_value and 'million' not in threshold_value.lower():
-                    print(f"[创收检测] ⚠️ 方法2获取的值可能不正确: {threshold_value}")
-                    threshold_value = None
-            except Exception as e:
-                print(f"[创收检测] 方法2失败: {str(e)}")
-        
-        # 方法2.5：尝试通过"valid public Shorts views"文本定位
-        if not threshold_value:
-            try:
-                print(f"[创收检测] 方法2.5: 通过Shorts views文本定位...")
-                # 找到包含"Shorts views"的元素
-                shorts_views_elem = driver.find_element(By.XPATH, "//*[contains(text(), 'Shorts views') or contains(text(), 'shorts views')]")
-                # 向上找到progress-text容器
-                progress_text = shorts_views_elem.find_element(By.XPATH, "./ancestor::div[contains(@class, 'progress-text')]")
-                # 在该容器中找threshold
-                shorts_threshold = progress_text.find_element(By.XPATH, ".//span[contains(@class, 'threshold')]")
-                threshold_value = shorts_threshold.text.strip()
-                print(f"[创收检测] ✅ 方法2.5成功 - Shorts threshold值: {threshold_value}")
-            except Exception as e:
-                print(f"[创收检测] 方法2.5失败: {str(e)}")
-
-        # 方法3（兜底）：获取所有threshold元素并调试
-        if not threshold_value:
-            all_thresholds = []
-            try:
-                print(f"[创收检测] 方法3: 获取所有threshold元素进行分析...")
-                all_thresholds = driver.find_elements(By.XPATH, "//span[contains(@class, 'threshold')]")
-                print(f"[创收检测] 页面上共有 {len(all_thresholds)} 个threshold元素")
-
-                # 打印所有threshold的值（调试用）
-                for idx, th in enumerate(all_thresholds):
-                    try:
-                        th_text = th.text.strip()
-                        print(f"[创收检测调试] threshold {idx+1}: {th_text}")
-                    except:
-                        pass
-
-                # 尝试查找包含M的threshold（通常是Shorts的要求）
-                for idx, th in enumerate(all_thresholds):
-                    try:
-                        th_text = th.text.strip()
-                        if 'M' in th_text or 'million' in th_text.lower():
-                            threshold_value = th_text
-                            print(f"[创收检测] ✅ 方法3成功 - 找到包含M的threshold（第{idx+1}个）: {threshold_value}")
-                            break
-                    except:
-                        pass
-
-                # 如果还是没找到，尝试使用第4个threshold（索引3）
-                if not threshold_value and len(all_thresholds) >= 4:
-                    threshold_value = all_thresholds[3].text.strip()
-                    print(f"[创收检测] 方法3 - 使用第4个threshold值: {threshold_value}")
-
-            except Exception as e:
-                print(f"[创收检测] 方法3失败: {str(e)}")
+        threshold_value = pick_shorts_threshold(thresholds)
         
         # 判断结果
         if not threshold_value:
-            print(f"[创收检测] ⚠️ 无法获取threshold值")
+            logger.warning(f"[创收检测] ⚠️ 无法获取threshold值")
             add_channel_log(account_id, browser_env_id, 'warning', '无法获取Shorts threshold值')
+            _record_monetization_check(account_id, None)
             return None
-        
-        # 清理和标准化threshold值
-        threshold_clean = threshold_value.upper().replace(',', '').replace('.', '').replace(' ', '')
-        print(f"[创收检测] 标准化后的threshold值: {threshold_clean}")
+        logger.info(f"[创收检测] Shorts threshold值: {threshold_value}")
         
         # 判断是3m还是10m
-        import re
-        result = None
-        
-        # 检测3M相关
-        # 匹配: 3M, 3000000, 300万, 3 million, 3 triệu 等
-        if re.search(r'3M|3000000|300万|3MILLION|3TRIỆU', threshold_clean):
-            result = "3m"
-            print(f"[创收检测] ✅ 检测结果: 3m (300万) - threshold值: {threshold_value}")
+        result = classify_threshold(threshold_value)
+        if result == "3m":
+            logger.info(f"[创收检测] ✅ 检测结果: 3m (300万) - threshold值: {threshold_value}")
             add_channel_log(account_id, browser_env_id, 'success', f'检测到创收要求: 3m (300万) - 显示值: {threshold_value}')
-        # 检测10M相关
-        # 匹配: 10M, 10000000, 1000万, 10 million, 10 triệu 等
-        elif re.search(r'10M|10000000|1000万|10MILLION|10TRIỆU', threshold_clean):
-            result = "10m"
-            print(f"[创收检测] ✅ 检测结果: 10m (1000万) - threshold值: {threshold_value}")
+        elif result == "10m":
+            logger.info(f"[创收检测] ✅ 检测结果: 10m (1000万) - threshold值: {threshold_value}")
             add_channel_log(account_id, browser_env_id, 'success', f'检测到创收要求: 10m (1000万) - 显示值: {threshold_value}')
         else:
-            print(f"[创收检测] ⚠️ 无法识别threshold值: {threshold_value}")
+            logger.warning(f"[创收检测] ⚠️ 无法识别threshold值: {threshold_value}")
             add_channel_log(account_id, browser_env_id, 'warning', f'无法识别threshold值: {threshold_value}')
         
+        _record_monetization_check(account_id, result)
         return result
         
     except Exception as e:
         error_msg = f"检测创收要求失败: {str(e)}"
-        print(f"[创收检测错误] {error_msg}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"[创收检测错误] {error_msg}", exc_info=True)
         add_channel_log(account_id, browser_env_id, 'failed', error_msg)
+        _record_monetization_check(account_id, None)
         return None
 
 
+# YouTube 顶栏的 Create 按钮
+CREATE_BUTTON_SELECTORS = selector_service.register('channel.create_button', [
+    ('aria-label', By.XPATH, "//button[@aria-label='Create' or @aria-label='创建']"),
+    ('title', By.XPATH, "//button[@title='Create' or @title='创建']"),
+    ('topbar', By.XPATH, "//ytd-topbar-menu-button-renderer[contains(@class, 'style-scope')]//button[contains(@aria-label, 'reate')]"),
+    # 任意 aria-label / title 中包含 create 或 创建 的按钮
+    ('any-label', By.XPATH, "//button[contains(translate(@aria-label, 'CREATE', 'create'), 'create') or "
+                            "contains(translate(@title, 'CREATE', 'create'), 'create') or "
+                            "contains(@aria-label, '创建') or contains(@title, '创建')]"),
+])
+
+# 头像确认对话框的 "Save as profile picture" 按钮
+SAVE_AVATAR_SELECTORS = selector_service.register('channel.save_avatar', [
+    ('jsname', By.CSS_SELECTOR, 'button[jsname="WCwAu"]'),
+    ('text', By.XPATH, "//button[contains(translate(normalize-space(.), 'SAVE', 'save'), 'save')]"),
+])
+
+
+@log_context(stage='create_channel')
 def create_youtube_channel(driver, account_id=None, browser_env_id=None):
     """创建YouTube频道
     
@@ -457,115 +529,121 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
             - message: 详细信息
     """
     avatar_path = None
+    avatar_used = False  # 头像是否已成功用于该账号（否则结束时归还头像目录）
     channel_name = ""
     channel_url = ""  # 频道链接
     
     try:
-        print(f"[频道创建-开始] ===== 开始创建YouTube频道 =====")
+        logger.info(f"[频道创建-开始] ===== 开始创建YouTube频道 =====")
         add_channel_log(account_id, browser_env_id, 'info', '开始创建YouTube频道')
         driver.maximize_window()
         
         # === 步骤1: 检查是否已登录Google账号 ===
-        print(f"[频道创建-步骤1] 检查浏览器登录状态...")
+        logger.info(f"[频道创建-步骤1] 检查浏览器登录状态...")
         add_channel_log(account_id, browser_env_id, 'info', '步骤1: 检查浏览器登录状态')
         try:
             current_url = driver.current_url
-            print(f"[频道创建-步骤1] 当前URL: {current_url}")
+            logger.info(f"[频道创建-步骤1] 当前URL: {current_url}")
             
             # 如果是空白页，先导航到YouTube检查登录状态
             if current_url == "about:blank" or ("google.com" not in current_url and "youtube.com" not in current_url):
-                print(f"[频道创建-步骤1] 当前不在Google/YouTube页面，先导航到YouTube检查登录状态...")
+                logger.info(f"[频道创建-步骤1] 当前不在Google/YouTube页面，先导航到YouTube检查登录状态...")
                 driver.get("https://www.youtube.com/")
-                time.sleep(5)
+                interruptible_sleep(5)
                 current_url = driver.current_url
-                print(f"[频道创建-步骤1] 导航后URL: {current_url}")
+                logger.info(f"[频道创建-步骤1] 导航后URL: {current_url}")
             
-            print(f"[频道创建-步骤1] ✅ 浏览器状态正常")
+            logger.info(f"[频道创建-步骤1] ✅ 浏览器状态正常")
             add_channel_log(account_id, browser_env_id, 'success', '步骤1完成: 浏览器状态检查通过')
             
         except Exception as e:
             error_msg = f"步骤1失败: 无法获取当前URL: {str(e)}"
-            print(f"[频道创建-步骤1-错误] {error_msg}")
+            logger.error(f"[频道创建-步骤1-错误] {error_msg}")
             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
             return "failed", "浏览器连接失败"
         
         # === 步骤2: 检查频道是否已经创建 ===
-        print(f"[频道创建-步骤2] 检查频道是否已经创建...")
+        logger.info(f"[频道创建-步骤2] 检查频道是否已经创建...")
         add_channel_log(account_id, browser_env_id, 'info', '步骤2: 检查频道是否已存在')
         try:
-            from models import Account
-            account = Account.query.get(account_id)
-            if account and account.channel_status == 'created' and account.channel_url:
-                print(f"[频道创建-步骤2] ⚠️ 检测到频道已存在: {account.channel_url}")
+            with session_scope():
+                existing_url = db.session.query(Account.channel_url).filter(
+                    Account.id == account_id, Account.channel_status == 'created'
+                ).scalar()
+            if existing_url:
+                logger.warning(f"[频道创建-步骤2] ⚠️ 检测到频道已存在: {existing_url}")
                 add_channel_log(account_id, browser_env_id, 'info', '步骤2: 检测到频道已存在，跳转到验证流程')
                 
                 # 跳转到YouTube工作室验证频道
-                print(f"[频道创建-步骤2.1] 跳转到YouTube工作室验证频道...")
+                logger.info(f"[频道创建-步骤2.1] 跳转到YouTube工作室验证频道...")
                 driver.get("https://studio.youtube.com")
-                time.sleep(5)
+                interruptible_sleep(5)
                 
                 # 验证频道链接是否正常
                 current_url = driver.current_url
-                print(f"[频道创建-步骤2.1] 当前URL: {current_url}")
+                logger.info(f"[频道创建-步骤2.1] 当前URL: {current_url}")
                 
                 if "studio.youtube.com" in current_url:
-                    print(f"[频道创建-步骤2.1] ✅ 频道状态正常，可以访问YouTube工作室")
+                    logger.info(f"[频道创建-步骤2.1] ✅ 频道状态正常，可以访问YouTube工作室")
                     add_channel_log(account_id, browser_env_id, 'success', '步骤2.1完成: 频道状态正常')
                     
                     # 检测创收要求
-                    print(f"[频道创建-步骤2.2] 开始检测创收要求...")
+                    logger.info(f"[频道创建-步骤2.2] 开始检测创收要求...")
                     add_channel_log(account_id, browser_env_id, 'info', '步骤2.2: 检测创收要求')
-                    monetization_req = detect_monetization_requirement(driver, account.channel_url, account_id, browser_env_id)
+                    monetization_req = detect_monetization_requirement(driver, existing_url, account_id, browser_env_id)
                     
                     if monetization_req:
-                        print(f"[频道创建-步骤2.2] ✅ 创收要求检测成功: {monetization_req}")
-                        account.monetization_requirement = monetization_req
-                        db.session.commit()
+                        logger.info(f"[频道创建-步骤2.2] ✅ 创收要求检测成功: {monetization_req}")
+                        Account.update_by_id(account_id, monetization_requirement=monetization_req)
                         add_channel_log(account_id, browser_env_id, 'success', f'步骤2.2完成: 创收要求为 {monetization_req}')
                         
-                        success_msg = f"✅ 频道已存在且状态正常！链接: {account.channel_url}, 创收要求: {monetization_req}"
+                        success_msg = f"✅ 频道已存在且状态正常！链接: {existing_url}, 创收要求: {monetization_req}"
                         return "success", success_msg
                     else:
-                        print(f"[频道创建-步骤2.2] ⚠️ 无法检测创收要求")
+                        logger.warning(f"[频道创建-步骤2.2] ⚠️ 无法检测创收要求")
                         add_channel_log(account_id, browser_env_id, 'warning', '步骤2.2: 无法检测创收要求')
                         
-                        success_msg = f"✅ 频道已存在且状态正常！链接: {account.channel_url}, 创收要求: 未检测到"
+                        success_msg = f"✅ 频道已存在且状态正常！链接: {existing_url}, 创收要求: 未检测到"
                         return "success", success_msg
                 else:
-                    print(f"[频道创建-步骤2.1] ⚠️ 无法访问YouTube工作室，频道可能有问题")
+                    logger.warning(f"[频道创建-步骤2.1] ⚠️ 无法访问YouTube工作室，频道可能有问题")
                     add_channel_log(account_id, browser_env_id, 'warning', '步骤2.1: 无法访问YouTube工作室')
                     # 继续创建新频道流程
             
-            print(f"[频道创建-步骤2] ✅ 频道未创建，继续创建流程")
+            logger.info(f"[频道创建-步骤2] ✅ 频道未创建，继续创建流程")
         except Exception as e:
-            print(f"[频道创建-步骤2-警告] 检查频道状态失败: {str(e)}")
+            logger.warning(f"[频道创建-步骤2-警告] 检查频道状态失败: {str(e)}")
             # 继续创建流程
         
         # === 步骤3: 获取可用头像 ===
-        print(f"[频道创建-步骤3] 获取可用头像...")
+        logger.info(f"[频道创建-步骤3] 获取可用头像...")
         add_channel_log(account_id, browser_env_id, 'info', '步骤3: 获取可用头像')
-        avatar_path = get_available_avatar()
+        avatar_path = get_available_avatar(account_id)
         if not avatar_path:
             error_msg = "步骤3失败: 没有可用的头像文件"
-            print(f"[频道创建-步骤3-错误] {error_msg}")
+            logger.error(f"[频道创建-步骤3-错误] {error_msg}")
             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
             return "failed", "没有可用的头像文件，请在设置中配置头像文件夹路径"
         
-        print(f"[频道创建-步骤3] ✅ 已选择头像: {os.path.basename(avatar_path)}")
+        # 上传使用预处理后的缓存图（未就绪时为原图）
+        upload_path = avatar_cache_service.get_upload_path(avatar_path)
+        logger.info(f"[频道创建-步骤3] ✅ 已选择头像: {os.path.basename(avatar_path)}")
+        if upload_path != avatar_path:
+            logger.info(f"[频道创建-步骤3] 使用预处理缓存: {os.path.basename(upload_path)}")
         add_channel_log(account_id, browser_env_id, 'success', f'步骤3完成: 已选择头像 [{os.path.basename(avatar_path)}]')
         
         # === 步骤4: 跳转到YouTube首页 ===
-        print(f"[频道创建-步骤4] 跳转到YouTube首页...")
+        logger.info(f"[频道创建-步骤4] 跳转到YouTube首页...")
         add_channel_log(account_id, browser_env_id, 'info', '步骤4: 跳转到YouTube首页')
         driver.get("https://www.youtube.com/")
-        time.sleep(5)
+        interruptible_sleep(5)
         
         current_url = driver.current_url
-        print(f"[频道创建-步骤4] 当前URL: {current_url}")
+        logger.info(f"[频道创建-步骤4] 当前URL: {current_url}")
         
         # === 步骤4.1: 检查是否遇到 Google 登录被拒绝页面 ===
         if "signin/rejected" in current_url or "Couldn't sign you in" in driver.page_source:
-            print(f"[频道创建-步骤4.1] ⚠️ 检测到Google登录被拒绝页面")
+            logger.warning(f"[频道创建-步骤4.1] ⚠️ 检测到Google登录被拒绝页面")
             add_channel_log(account_id, browser_env_id, 'warning', '步骤4.1: 检测到登录被拒绝，尝试点击Try again')
             
             try:
@@ -574,27 +652,27 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                     EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Try again') or contains(., '重试')]"))
                 )
                 try_again_btn.click()
-                print(f"[频道创建-步骤4.1] ✅ 已点击 'Try again' 按钮")
+                logger.info(f"[频道创建-步骤4.1] ✅ 已点击 'Try again' 按钮")
                 add_channel_log(account_id, browser_env_id, 'success', '步骤4.1完成: 已点击Try again按钮，等待重新登录')
-                time.sleep(5)
+                interruptible_sleep(5)
                 
                 # 更新URL
                 current_url = driver.current_url
-                print(f"[频道创建-步骤4.1] 点击Try again后URL: {current_url}")
+                logger.info(f"[频道创建-步骤4.1] 点击Try again后URL: {current_url}")
                 
             except Exception as e:
                 error_msg = f"步骤4.1失败: 点击Try again按钮失败: {str(e)}"
-                print(f"[频道创建-步骤4.1-错误] {error_msg}")
+                logger.error(f"[频道创建-步骤4.1-错误] {error_msg}")
                 add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                 return "failed", "登录被拒绝且无法点击Try again按钮"
         else:
-            print(f"[频道创建-步骤4] ✅ 成功跳转到YouTube")
+            logger.info(f"[频道创建-步骤4] ✅ 成功跳转到YouTube")
             add_channel_log(account_id, browser_env_id, 'success', '步骤4完成: 成功跳转到YouTube首页')
         
         # === 步骤5: 检查是否需要处理额外的验证步骤 ===
         if "accounts.google.com" in current_url:
             if "uplevelingstep" in current_url or "selection" in current_url:
-                print(f"[频道创建-步骤5] 检测到Google额外验证步骤（Verify your info to continue）")
+                logger.info(f"[频道创建-步骤5] 检测到Google额外验证步骤（Verify your info to continue）")
                 add_channel_log(account_id, browser_env_id, 'info', '步骤5: 检测到需要验证身份')
                 
                 # 导入手机验证相关函数
@@ -606,160 +684,160 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                     phone_verify_option = None
                     try:
                         phone_verify_option = driver.find_element(By.XPATH, "//*[contains(text(), 'Verify your phone number') or contains(text(), '验证您的手机号码')]")
-                        print(f"[频道创建] 找到手机号验证选项")
+                        logger.info(f"[频道创建] 找到手机号验证选项")
                     except:
                         # 查找所有包含"phone"的可点击元素
                         elements = driver.find_elements(By.XPATH, "//*[contains(translate(text(), 'PHONE', 'phone'), 'phone')]")
                         for elem in elements:
                             if elem.is_displayed() and ("verify" in elem.text.lower() or "验证" in elem.text):
                                 phone_verify_option = elem
-                                print(f"[频道创建] 通过遍历找到手机号验证选项")
+                                logger.info(f"[频道创建] 通过遍历找到手机号验证选项")
                                 break
                     
                     if phone_verify_option:
-                        print(f"[频道创建-步骤4.1] 需要手机号验证，开始处理...")
+                        logger.info(f"[频道创建-步骤4.1] 需要手机号验证，开始处理...")
                         add_channel_log(account_id, browser_env_id, 'info', '步骤4.1: 需要手机号验证')
                         
                         # 获取可用手机号
-                        from models import Account
-                        acc = Account.query.get(account_id)
                         phone = get_available_phone(account_id)
                         
                         if not phone:
                             error_msg = "步骤4.1失败: 需要手机号验证，但没有可用的手机号"
-                            print(f"[频道创建-步骤4.1-错误] {error_msg}")
+                            logger.error(f"[频道创建-步骤4.1-错误] {error_msg}")
                             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                             return "failed", error_msg
                         
-                        if not phone.sms_url:
-                            error_msg = f"步骤4.1失败: 手机号 {phone.phone_number} 没有配置接码URL"
-                            print(f"[频道创建-步骤4.1-错误] {error_msg}")
+                        # 取出需要的字段后结束会话，接码等待期间不占用数据库连接
+                        phone_id, phone_number, sms_url = phone.id, phone.phone_number, phone.sms_url
+                        db.session.close()
+                        
+                        if not sms_url:
+                            error_msg = f"步骤4.1失败: 手机号 {phone_number} 没有配置接码URL"
+                            logger.error(f"[频道创建-步骤4.1-错误] {error_msg}")
                             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                             return "failed", error_msg
                         
-                        print(f"[频道创建-步骤4.1] 已获取手机号: {phone.phone_number}")
-                        add_channel_log(account_id, browser_env_id, 'info', f'步骤4.1: 已获取手机号 [+{phone.phone_number}]')
+                        logger.info(f"[频道创建-步骤4.1] 已获取手机号: {phone_number}")
+                        add_channel_log(account_id, browser_env_id, 'info', f'步骤4.1: 已获取手机号 [+{phone_number}]')
                         
                         # === 步骤4.2: 点击手机号验证选项 ===
-                        print(f"[频道创建-步骤4.2] 点击手机号验证选项...")
+                        logger.info(f"[频道创建-步骤4.2] 点击手机号验证选项...")
                         add_channel_log(account_id, browser_env_id, 'info', '步骤4.2: 点击手机号验证选项')
                         try:
                             phone_verify_option.click()
-                            print(f"[频道创建-步骤4.2] ✅ 已点击手机号验证选项")
+                            logger.info(f"[频道创建-步骤4.2] ✅ 已点击手机号验证选项")
                         except:
                             driver.execute_script("arguments[0].click();", phone_verify_option)
-                            print(f"[频道创建-步骤4.2] ✅ 已点击手机号验证选项（JS方式）")
+                            logger.info(f"[频道创建-步骤4.2] ✅ 已点击手机号验证选项（JS方式）")
                         
                         add_channel_log(account_id, browser_env_id, 'success', '步骤4.2完成: 已选择手机号验证方式')
-                        time.sleep(3)
+                        interruptible_sleep(3)
                         
                         # === 步骤4.3: 检查是否需要输入手机号 ===
-                        print(f"[频道创建-步骤4.3] 检查是否需要输入手机号...")
+                        logger.info(f"[频道创建-步骤4.3] 检查是否需要输入手机号...")
                         try:
                             phone_input = driver.find_element(By.XPATH, "//input[@type='tel' or @id='phoneNumberId']")
-                            print(f"[频道创建-步骤4.3] 需要输入手机号")
+                            logger.info(f"[频道创建-步骤4.3] 需要输入手机号")
                             add_channel_log(account_id, browser_env_id, 'info', '步骤4.3: 输入手机号')
                             
-                            full_phone = f"+{phone.phone_number}"
+                            full_phone = f"+{phone_number}"
                             phone_input.clear()
                             phone_input.send_keys(full_phone)
-                            print(f"[频道创建-步骤4.3] 已输入手机号: {full_phone}")
+                            logger.info(f"[频道创建-步骤4.3] 已输入手机号: {full_phone}")
                             add_channel_log(account_id, browser_env_id, 'info', f'步骤4.3: 已输入手机号 [{full_phone}]')
                             
                             # 点击下一步
                             next_btn = driver.find_element(By.XPATH, "//button[@type='button']//span[contains(text(), 'Next') or contains(text(), '下一步')]")
                             next_btn.click()
-                            print(f"[频道创建-步骤4.3] ✅ 已点击下一步")
+                            logger.info(f"[频道创建-步骤4.3] ✅ 已点击下一步")
                             add_channel_log(account_id, browser_env_id, 'success', '步骤4.3完成: 已点击下一步，等待验证码')
                             
                             # 记录点击下一步的时间（用于过滤旧验证码）
                             from datetime import datetime
                             sms_request_time = datetime.now()
-                            print(f"[频道创建-步骤4.3] 记录请求时间: {sms_request_time.strftime('%Y-%m-%d %H:%M:%S')}")
+                            logger.info(f"[频道创建-步骤4.3] 记录请求时间: {sms_request_time.strftime('%Y-%m-%d %H:%M:%S')}")
                             
-                            time.sleep(3)
+                            interruptible_sleep(3)
                         except:
-                            print(f"[频道创建-步骤4.3] 不需要输入手机号（可能已保存）")
+                            logger.info(f"[频道创建-步骤4.3] 不需要输入手机号（可能已保存）")
                             add_channel_log(account_id, browser_env_id, 'info', '步骤4.3: 手机号已保存，无需输入')
                             from datetime import datetime
                             sms_request_time = datetime.now()
                         
                         # === 步骤4.4: 获取验证码 ===
-                        print(f"[频道创建-步骤4.4] 开始获取验证码...")
+                        logger.info(f"[频道创建-步骤4.4] 开始获取验证码...")
                         add_channel_log(account_id, browser_env_id, 'info', '步骤4.4: 开始获取验证码')
-                        sms_code = get_sms_code(phone.sms_url, max_retries=12, interval=10, request_time=sms_request_time)
+                        sms_code = get_sms_code(sms_url, max_retries=12, interval=10, request_time=sms_request_time)
                         
                         if not sms_code:
                             error_msg = "步骤4.4失败: 获取验证码失败（超过12次重试）"
-                            print(f"[频道创建-步骤4.4-错误] {error_msg}")
+                            logger.error(f"[频道创建-步骤4.4-错误] {error_msg}")
                             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                             return "failed", error_msg
                         
-                        print(f"[频道创建-步骤4.4] ✅ 已获取验证码: {sms_code}")
+                        logger.info(f"[频道创建-步骤4.4] ✅ 已获取验证码: {sms_code}")
                         add_channel_log(account_id, browser_env_id, 'success', f'步骤4.4完成: 已获取验证码')
                         
                         # === 步骤4.5: 输入验证码 ===
-                        print(f"[频道创建-步骤4.5] 查找验证码输入框...")
+                        logger.info(f"[频道创建-步骤4.5] 查找验证码输入框...")
                         add_channel_log(account_id, browser_env_id, 'info', '步骤4.5: 输入验证码')
                         try:
                             code_input = WebDriverWait(driver, 10).until(
                                 EC.presence_of_element_located((By.XPATH, "//input[@type='tel' or @id='code' or contains(@name, 'code') or contains(@aria-label, 'code')]"))
                             )
-                            print(f"[频道创建-步骤4.5] 找到验证码输入框")
+                            logger.info(f"[频道创建-步骤4.5] 找到验证码输入框")
                             
                             code_input.clear()
                             code_input.send_keys(sms_code)
-                            print(f"[频道创建-步骤4.5] 已输入验证码: {sms_code}")
+                            logger.info(f"[频道创建-步骤4.5] 已输入验证码: {sms_code}")
                             add_channel_log(account_id, browser_env_id, 'info', f'步骤4.5: 已输入验证码')
                             
-                            time.sleep(2)
+                            interruptible_sleep(2)
                             
                             # 点击下一步/验证按钮
                             try:
                                 verify_btn = driver.find_element(By.XPATH, "//button[@type='button']//span[contains(text(), 'Next') or contains(text(), '下一步') or contains(text(), 'Verify') or contains(text(), '验证')]")
                                 verify_btn.click()
-                                print(f"[频道创建-步骤4.5] 已点击验证按钮")
+                                logger.info(f"[频道创建-步骤4.5] 已点击验证按钮")
                                 add_channel_log(account_id, browser_env_id, 'info', '步骤4.5: 已提交验证码')
                             except:
-                                print(f"[频道创建-步骤4.5] 未找到验证按钮，可能自动提交")
+                                logger.info(f"[频道创建-步骤4.5] 未找到验证按钮，可能自动提交")
                             
                             # 等待验证完成
-                            time.sleep(5)
+                            interruptible_sleep(5)
                             
                             # 更新数据库
                             try:
-                                if not phone.status:
-                                    phone.status = True
-                                if acc.phone_id != phone.id:
-                                    acc.phone_id = phone.id
-                                db.session.commit()
-                                print(f"[频道创建-步骤4.5] 已绑定手机号到账号")
+                                with session_scope():
+                                    Phone.query.filter_by(id=phone_id).update({'status': True}, synchronize_session=False)
+                                    Account.query.filter_by(id=account_id).update({'phone_id': phone_id}, synchronize_session=False)
+                                logger.info(f"[频道创建-步骤4.5] 已绑定手机号到账号")
                             except:
                                 pass
                             
                             # 检查是否成功
                             current_url = driver.current_url
-                            print(f"[频道创建-步骤4.5] 验证后URL: {current_url}")
+                            logger.info(f"[频道创建-步骤4.5] 验证后URL: {current_url}")
                             
                             if "youtube.com" in current_url:
-                                print(f"[频道创建-步骤4.5] ✅ 手机验证成功，已到达YouTube")
+                                logger.info(f"[频道创建-步骤4.5] ✅ 手机验证成功，已到达YouTube")
                                 add_channel_log(account_id, browser_env_id, 'success', '步骤4.5完成: 手机验证成功')
                             else:
-                                print(f"[频道创建-步骤4.5] 验证后仍未到达YouTube，等待跳转...")
+                                logger.info(f"[频道创建-步骤4.5] 验证后仍未到达YouTube，等待跳转...")
                                 add_channel_log(account_id, browser_env_id, 'info', '步骤4.5: 等待页面跳转到YouTube')
-                                time.sleep(10)
+                                interruptible_sleep(10)
                                 current_url = driver.current_url
-                                print(f"[频道创建-步骤4.5] 等待后URL: {current_url}")
+                                logger.info(f"[频道创建-步骤4.5] 等待后URL: {current_url}")
                             
                         except Exception as code_error:
                             error_msg = f"步骤4.5失败: 输入验证码失败: {str(code_error)}"
-                            print(f"[频道创建-步骤4.5-错误] {error_msg}")
+                            logger.error(f"[频道创建-步骤4.5-错误] {error_msg}")
                             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                             return "failed", "手机验证失败"
                     
                     else:
                         # 没有手机验证选项，可能有其他选项
-                        print(f"[频道创建] 未找到手机验证选项，查找其他验证方式...")
+                        logger.info(f"[频道创建] 未找到手机验证选项，查找其他验证方式...")
                         
                         # 尝试查找任何Continue/Next按钮
                         buttons = driver.find_elements(By.TAG_NAME, "button")
@@ -773,43 +851,41 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                         
                         if continue_btn:
                             continue_btn.click()
-                            print(f"[频道创建] 已点击继续按钮")
-                            time.sleep(5)
+                            logger.info(f"[频道创建] 已点击继续按钮")
+                            interruptible_sleep(5)
                         else:
-                            print(f"[频道创建] 未找到继续按钮，等待自动跳转...")
-                            time.sleep(10)
+                            logger.info(f"[频道创建] 未找到继续按钮，等待自动跳转...")
+                            interruptible_sleep(10)
                         
                         current_url = driver.current_url
-                        print(f"[频道创建] 处理后URL: {current_url}")
+                        logger.info(f"[频道创建] 处理后URL: {current_url}")
                     
                 except Exception as verify_error:
                     error_msg = f"处理验证步骤失败: {str(verify_error)}"
-                    print(f"[频道创建错误] {error_msg}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.error(f"[频道创建错误] {error_msg}", exc_info=True)
                     # 继续尝试
-                    time.sleep(10)
+                    interruptible_sleep(10)
                     current_url = driver.current_url
-                    print(f"[频道创建] 异常后URL: {current_url}")
+                    logger.info(f"[频道创建] 异常后URL: {current_url}")
                 
                 # 最终检查是否到达YouTube
                 if "youtube.com" not in current_url:
                     error_msg = "步骤4失败: 无法通过验证跳转到YouTube"
-                    print(f"[频道创建-步骤4-错误] {error_msg}")
+                    logger.error(f"[频道创建-步骤4-错误] {error_msg}")
                     add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                     return "failed", "无法通过验证，请手动检查"
                 else:
-                    print(f"[频道创建-步骤4] ✅ 成功到达YouTube")
+                    logger.info(f"[频道创建-步骤4] ✅ 成功到达YouTube")
                     add_channel_log(account_id, browser_env_id, 'success', '步骤4完成: 成功到达YouTube首页')
             else:
                 # 其他情况，真的需要登录
                 error_msg = "步骤4失败: 需要登录Google账号"
-                print(f"[频道创建-步骤4-错误] {error_msg}")
+                logger.error(f"[频道创建-步骤4-错误] {error_msg}")
                 add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                 return "failed", "账号未登录，请先完成登录"
         
         # === 步骤5: 检查登录状态 ===
-        print(f"[频道创建-步骤5] 检查YouTube登录状态...")
+        logger.info(f"[频道创建-步骤5] 检查YouTube登录状态...")
         add_channel_log(account_id, browser_env_id, 'info', '步骤5: 检查YouTube登录状态')
         try:
             # 查找是否有 "Sign in" 或 "Login" 按钮
@@ -823,94 +899,67 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                 try:
                     if btn.is_displayed():
                         has_login_button = True
-                        print(f"[频道创建-步骤5] ⚠️ 检测到登录按钮，说明未登录")
+                        logger.warning(f"[频道创建-步骤5] ⚠️ 检测到登录按钮，说明未登录")
                         break
                 except:
                     pass
             
             if has_login_button:
                 error_msg = "步骤5失败: 检测到页面有登录按钮，账号未登录，需要先完成登录"
-                print(f"[频道创建-步骤5-错误] {error_msg}")
+                logger.error(f"[频道创建-步骤5-错误] {error_msg}")
                 add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                 return "failed", error_msg
             else:
-                print(f"[频道创建-步骤5] ✅ 未检测到登录按钮，账号已登录")
+                logger.info(f"[频道创建-步骤5] ✅ 未检测到登录按钮，账号已登录")
                 add_channel_log(account_id, browser_env_id, 'success', '步骤5完成: 账号已登录，继续创建频道')
                 
         except Exception as e:
-            print(f"[频道创建-步骤5-警告] 检查登录状态时出错: {str(e)}，继续执行")
+            logger.warning(f"[频道创建-步骤5-警告] 检查登录状态时出错: {str(e)}，继续执行")
             add_channel_log(account_id, browser_env_id, 'warning', f'步骤5警告: 检查登录状态出错，继续')
         
         # === 步骤6: 点击创建按钮 ===
-        print(f"[频道创建-步骤6] 查找并点击Create按钮...")
+        logger.info(f"[频道创建-步骤6] 查找并点击Create按钮...")
         add_channel_log(account_id, browser_env_id, 'info', '步骤6: 查找Create按钮')
         try:
             # 多种方式尝试定位Create按钮
             create_button = None
             
-            try:
-                # 方式1: 通过aria-label查找
-                create_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[@aria-label='Create' or @aria-label='创建']"))
-                )
-                print(f"[频道创建] 通过aria-label找到Create按钮")
-            except:
-                try:
-                    # 方式2: 通过title查找
-                    create_button = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, "//button[@title='Create' or @title='创建']"))
-                    )
-                    print(f"[频道创建] 通过title找到Create按钮")
-                except:
-                    try:
-                        # 方式3: 通过yt-icon-button查找包含create的
-                        create_button = driver.find_element(By.XPATH, "//ytd-topbar-menu-button-renderer[contains(@class, 'style-scope')]//button[contains(@aria-label, 'reate')]")
-                        print(f"[频道创建] 通过class找到Create按钮")
-                    except:
-                        # 方式4: 查找所有可见的按钮，找包含create相关图标的
-                        buttons = driver.find_elements(By.TAG_NAME, "button")
-                        for btn in buttons:
-                            aria_label = btn.get_attribute("aria-label") or ""
-                            title = btn.get_attribute("title") or ""
-                            if "create" in aria_label.lower() or "create" in title.lower() or "创建" in aria_label or "创建" in title:
-                                if btn.is_displayed():
-                                    create_button = btn
-                                    print(f"[频道创建] 通过遍历找到Create按钮")
-                                    break
+            # 多种方式一次探测，历史命中最多的优先
+            create_button, method = selector_service.find_first(driver, CREATE_BUTTON_SELECTORS, timeout=10)
+            if create_button:
+                logger.info(f"[频道创建] 通过{method}找到Create按钮")
             
             if not create_button:
                 error_msg = "步骤6失败: 未找到Create按钮"
-                print(f"[频道创建-步骤6-错误] {error_msg}")
+                logger.error(f"[频道创建-步骤6-错误] {error_msg}")
                 add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                 return "failed", "未找到Create按钮，可能页面结构已改变"
             
             # 滚动到按钮可见
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", create_button)
-            time.sleep(1)
+            interruptible_sleep(1)
             
             # 点击按钮
             try:
                 create_button.click()
-                print(f"[频道创建-步骤6] ✅ 已点击Create按钮")
+                logger.info(f"[频道创建-步骤6] ✅ 已点击Create按钮")
                 add_channel_log(account_id, browser_env_id, 'success', '步骤6完成: 已点击Create按钮，等待菜单弹出')
             except:
                 driver.execute_script("arguments[0].click();", create_button)
-                print(f"[频道创建-步骤6] ✅ 已点击Create按钮（JS方式）")
+                logger.info(f"[频道创建-步骤6] ✅ 已点击Create按钮（JS方式）")
                 add_channel_log(account_id, browser_env_id, 'success', '步骤6完成: 已点击Create按钮（JS方式）')
             
             # 等待菜单弹出
-            time.sleep(3)
+            interruptible_sleep(3)
             
         except Exception as e:
             error_msg = f"步骤6失败: 点击Create按钮失败: {str(e)}"
-            print(f"[频道创建-步骤6-错误] {error_msg}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"[频道创建-步骤6-错误] {error_msg}", exc_info=True)
             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
             return "failed", error_msg
         
         # === 步骤7: 在弹出菜单中找到并点击"Upload video"选项 ===
-        print(f"[频道创建-步骤7] 查找并点击'Upload video'选项...")
+        logger.info(f"[频道创建-步骤7] 查找并点击'Upload video'选项...")
         add_channel_log(account_id, browser_env_id, 'info', '步骤7: 查找Upload video选项')
         try:
             # 查找菜单项
@@ -921,7 +970,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                 upload_video_option = WebDriverWait(driver, 10).until(
                     EC.element_to_be_clickable((By.XPATH, "//*[contains(text(), 'Upload video') or contains(text(), '上传视频')]"))
                 )
-                print(f"[频道创建] 通过文本找到'Upload video'选项")
+                logger.info(f"[频道创建] 通过文本找到'Upload video'选项")
             except:
                 try:
                     # 方式2: 通过图标和文本组合查找
@@ -930,44 +979,44 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                         text = elem.text.lower()
                         if "upload" in text and "video" in text or "上传视频" in elem.text:
                             upload_video_option = elem
-                            print(f"[频道创建] 通过遍历找到'Upload video'选项")
+                            logger.info(f"[频道创建] 通过遍历找到'Upload video'选项")
                             break
                 except:
                     pass
             
             if not upload_video_option:
                 error_msg = "步骤7失败: 未找到'Upload video'选项"
-                print(f"[频道创建-步骤7-错误] {error_msg}")
+                logger.error(f"[频道创建-步骤7-错误] {error_msg}")
                 add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                 return "failed", "未找到Upload video选项，菜单结构可能已改变"
             
             # 滚动到选项可见
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", upload_video_option)
-            time.sleep(1)
+            interruptible_sleep(1)
             
             # 点击选项
             try:
                 upload_video_option.click()
-                print(f"[频道创建-步骤7] ✅ 已点击'Upload video'选项")
+                logger.info(f"[频道创建-步骤7] ✅ 已点击'Upload video'选项")
                 add_channel_log(account_id, browser_env_id, 'success', '步骤7完成: 已点击Upload video选项，等待响应')
             except:
                 driver.execute_script("arguments[0].click();", upload_video_option)
-                print(f"[频道创建-步骤7] ✅ 已点击'Upload video'选项（JS方式）")
+                logger.info(f"[频道创建-步骤7] ✅ 已点击'Upload video'选项（JS方式）")
                 add_channel_log(account_id, browser_env_id, 'success', '步骤7完成: 已点击Upload video选项（JS方式）')
             
             # 等待页面响应（可能会弹出创建频道提示）
-            time.sleep(5)
+            interruptible_sleep(5)
             
             # === 步骤8: 检查是否出现创建频道的提示或弹窗 ===
             current_url = driver.current_url
-            print(f"[频道创建-步骤8] 点击Upload video后URL: {current_url}")
+            logger.info(f"[频道创建-步骤8] 点击Upload video后URL: {current_url}")
             add_channel_log(account_id, browser_env_id, 'info', '步骤8: 检查是否需要创建频道')
             
             # 如果没有频道，YouTube会显示创建频道的弹窗
             # 如果已有频道，会直接进入上传页面
             if "upload" in current_url.lower():
                 # 已经有频道了，直接进入了上传页面
-                print(f"[频道创建-步骤8] 检测到已有频道（直接进入上传页面）")
+                logger.info(f"[频道创建-步骤8] 检测到已有频道（直接进入上传页面）")
                 add_channel_log(account_id, browser_env_id, 'info', '步骤8: 检测到账号已有频道，开始提取频道信息')
                 
                 # 从URL提取频道ID
@@ -976,29 +1025,28 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                 if channel_id_match:
                     channel_id = channel_id_match.group(1)
                     channel_url = f"https://www.youtube.com/channel/{channel_id}"
-                    print(f"[频道创建-步骤8] ✅ 已提取频道ID: {channel_id}")
-                    print(f"[频道创建-步骤8] 频道链接: {channel_url}")
+                    logger.info(f"[频道创建-步骤8] ✅ 已提取频道ID: {channel_id}")
+                    logger.info(f"[频道创建-步骤8] 频道链接: {channel_url}")
                     add_channel_log(account_id, browser_env_id, 'success', f'步骤8完成: 已提取频道链接 [{channel_url}]')
                     
                     # 检测创收要求
                     monetization_req = None
                     try:
-                        print(f"[频道创建-步骤8.1] 开始检测创收要求...")
+                        logger.info(f"[频道创建-步骤8.1] 开始检测创收要求...")
                         add_channel_log(account_id, browser_env_id, 'info', '步骤8.1: 检测创收要求')
                         monetization_req = detect_monetization_requirement(driver, channel_url, account_id, browser_env_id)
                         if monetization_req:
-                            print(f"[频道创建-步骤8.1] ✅ 创收要求检测成功: {monetization_req}")
+                            logger.info(f"[频道创建-步骤8.1] ✅ 创收要求检测成功: {monetization_req}")
                             add_channel_log(account_id, browser_env_id, 'success', f'步骤8.1完成: 创收要求为 {monetization_req}')
                         else:
-                            print(f"[频道创建-步骤8.1] ⚠️ 创收要求检测失败")
+                            logger.warning(f"[频道创建-步骤8.1] ⚠️ 创收要求检测失败")
                             add_channel_log(account_id, browser_env_id, 'warning', '步骤8.1: 无法检测创收要求')
                     except Exception as detect_error:
-                        print(f"[频道创建-步骤8.1-警告] 检测创收要求失败: {str(detect_error)}")
+                        logger.warning(f"[频道创建-步骤8.1-警告] 检测创收要求失败: {str(detect_error)}")
                         add_channel_log(account_id, browser_env_id, 'warning', f'步骤8.1: 检测创收要求失败 - {str(detect_error)}')
                     
                     # 更新数据库
                     try:
-                        from models import Account
                         account = Account.query.get(account_id)
                         if account:
                             account.channel_status = 'created'
@@ -1006,32 +1054,32 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                             if monetization_req:
                                 account.monetization_requirement = monetization_req
                             db.session.commit()
-                            print(f"[频道创建-步骤8.2] ✅ 已更新数据库（创收要求: {monetization_req or '未检测到'}）")
+                            logger.info(f"[频道创建-步骤8.2] ✅ 已更新数据库（创收要求: {monetization_req or '未检测到'}）")
                             add_channel_log(account_id, browser_env_id, 'success', f'步骤8.2完成: 已保存频道信息到数据库')
                     except Exception as db_error:
-                        print(f"[频道创建-步骤8.2-错误] 更新数据库失败: {str(db_error)}")
+                        logger.error(f"[频道创建-步骤8.2-错误] 更新数据库失败: {str(db_error)}")
                         add_channel_log(account_id, browser_env_id, 'failed', f'步骤8.2失败: 更新数据库失败 - {str(db_error)}')
                     
                     success_msg = f"✅ 账号已有频道！链接: {channel_url}, 创收要求: {monetization_req or '未检测到'}"
-                    print(f"[频道创建-步骤8] {success_msg}")
+                    logger.info(f"[频道创建-步骤8] {success_msg}")
                     return "success", success_msg
                 else:
                     error_msg = "无法从URL提取频道ID"
-                    print(f"[频道创建-步骤8-错误] {error_msg}")
+                    logger.error(f"[频道创建-步骤8-错误] {error_msg}")
                     add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                     return "failed", f"检测到已有频道但{error_msg}"
             
             # 检查是否出现创建频道弹窗
-            print(f"[频道创建-步骤8] 检查是否出现创建频道弹窗...")
+            logger.info(f"[频道创建-步骤8] 检查是否出现创建频道弹窗...")
             try:
                 # 查找创建频道弹窗的标题 "How you'll appear"
                 channel_dialog = WebDriverWait(driver, 10).until(
                     EC.presence_of_element_located((By.XPATH, "//*[contains(text(), \"How you'll appear\") or contains(text(), '您的显示方式')]"))
                 )
-                print(f"[频道创建-步骤8] ✅ 检测到创建频道弹窗")
+                logger.info(f"[频道创建-步骤8] ✅ 检测到创建频道弹窗")
                 add_channel_log(account_id, browser_env_id, 'success', '步骤8完成: 检测到创建频道弹窗')
             except:
-                print(f"[频道创建-步骤8] 未检测到创建频道弹窗，检查账号是否已有频道...")
+                logger.info(f"[频道创建-步骤8] 未检测到创建频道弹窗，检查账号是否已有频道...")
                 add_channel_log(account_id, browser_env_id, 'warning', '步骤8: 未检测到创建频道弹窗，检查是否已有频道')
                 
                 # 尝试检测是否已有频道
@@ -1039,27 +1087,26 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                     # 如果URL已经变成频道页面，说明账号已有频道
                     current_url = driver.current_url
                     if "channel" in current_url.lower() or "studio" in current_url.lower():
-                        print(f"[频道创建] ✅ 检测到账号已有频道: {current_url}")
+                        logger.info(f"[频道创建] ✅ 检测到账号已有频道: {current_url}")
                         
                         # 保存频道信息到数据库
                         try:
-                            from models import Account
                             account = Account.query.get(account_id)
                             if account:
                                 account.channel_status = 'created'
                                 account.channel_url = current_url
                                 db.session.commit()
-                                print(f"[频道创建] ✅ 已保存已有频道信息到数据库")
+                                logger.info(f"[频道创建] ✅ 已保存已有频道信息到数据库")
                         except Exception as db_error:
-                            print(f"[频道创建警告] 保存频道信息失败: {str(db_error)}")
+                            logger.warning(f"[频道创建警告] 保存频道信息失败: {str(db_error)}")
                         
                         add_channel_log(account_id, browser_env_id, 'success', f'账号已有频道: {current_url}')
                         return "success", f"账号已有频道: {current_url}"
                     
                     # 尝试直接访问频道页面来获取频道链接
-                    print(f"[频道创建] 尝试访问YouTube Studio获取频道信息...")
+                    logger.info(f"[频道创建] 尝试访问YouTube Studio获取频道信息...")
                     driver.get("https://studio.youtube.com")
-                    time.sleep(5)
+                    interruptible_sleep(5)
                     
                     studio_url = driver.current_url
                     if "studio.youtube.com/channel" in studio_url:
@@ -1069,67 +1116,64 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                         if channel_match:
                             channel_id = channel_match.group(1)
                             channel_url = f"https://www.youtube.com/channel/{channel_id}"
-                            print(f"[频道创建] ✅ 从Studio获取到频道链接: {channel_url}")
+                            logger.info(f"[频道创建] ✅ 从Studio获取到频道链接: {channel_url}")
                             
                             # 保存频道信息到数据库
                             try:
-                                from models import Account
                                 account = Account.query.get(account_id)
                                 if account:
                                     account.channel_status = 'created'
                                     account.channel_url = channel_url
                                     db.session.commit()
-                                    print(f"[频道创建] ✅ 已保存频道信息到数据库")
+                                    logger.info(f"[频道创建] ✅ 已保存频道信息到数据库")
                             except Exception as db_error:
-                                print(f"[频道创建警告] 保存频道信息失败: {str(db_error)}")
+                                logger.warning(f"[频道创建警告] 保存频道信息失败: {str(db_error)}")
                             
                             add_channel_log(account_id, browser_env_id, 'success', f'账号已有频道: {channel_url}')
                             return "success", f"账号已有频道: {channel_url}"
                 except Exception as check_error:
-                    print(f"[频道创建-步骤8-调试] 检查已有频道失败: {str(check_error)}")
+                    logger.debug(f"[频道创建-步骤8-调试] 检查已有频道失败: {str(check_error)}")
                 
                 error_msg = "步骤8失败: 未检测到创建频道弹窗"
-                print(f"[频道创建-步骤8-错误] {error_msg}")
+                logger.error(f"[频道创建-步骤8-错误] {error_msg}")
                 add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                 return "failed", "未检测到创建频道弹窗，请手动检查账号状态"
                 
         except Exception as e:
             error_msg = f"步骤7-8失败: 点击Upload video或检测创建频道弹窗失败: {str(e)}"
-            print(f"[频道创建-步骤7-8-错误] {error_msg}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"[频道创建-步骤7-8-错误] {error_msg}", exc_info=True)
             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
             return "failed", error_msg
         
         # === 步骤9: 在频道创建弹窗中上传头像 ===
-        print(f"[频道创建-步骤9] 开始上传头像...")
+        logger.info(f"[频道创建-步骤9] 开始上传头像...")
         add_channel_log(account_id, browser_env_id, 'info', '步骤9: 开始上传头像')
         
         # === 步骤9.1: 点击"Select picture"按钮 ===
-        print(f"[频道创建-步骤9.1] 点击'Select picture'按钮...")
+        logger.info(f"[频道创建-步骤9.1] 点击'Select picture'按钮...")
         add_channel_log(account_id, browser_env_id, 'info', '步骤9.1: 点击Select picture按钮')
         try:
             select_picture_btn = WebDriverWait(driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//button[@aria-label='Select picture' or contains(., 'Select picture')]"))
             )
-            print(f"[频道创建-步骤9.1] 找到'Select picture'按钮")
+            logger.info(f"[频道创建-步骤9.1] 找到'Select picture'按钮")
             
             select_picture_btn.click()
-            print(f"[频道创建-步骤9.1] ✅ 已点击'Select picture'按钮")
+            logger.info(f"[频道创建-步骤9.1] ✅ 已点击'Select picture'按钮")
             add_channel_log(account_id, browser_env_id, 'success', '步骤9.1完成: 已点击Select picture按钮')
             
             # 等待弹窗出现
-            print(f"[频道创建-步骤9.1] 等待'Choose your picture'弹窗出现...")
-            time.sleep(3)  # 先等待弹窗加载
+            logger.info(f"[频道创建-步骤9.1] 等待'Choose your picture'弹窗出现...")
+            interruptible_sleep(3)  # 先等待弹窗加载
             
         except Exception as e:
             error_msg = f"步骤9.1失败: 点击Select picture按钮失败: {str(e)}"
-            print(f"[频道创建-步骤9.1-错误] {error_msg}")
+            logger.error(f"[频道创建-步骤9.1-错误] {error_msg}")
             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
             return "failed", "无法点击Select picture按钮"
         
         # === 步骤9.2: 检查是否需要切换到iframe ===
-        print(f"[频道创建-步骤9.2] 检查是否有iframe...")
+        logger.info(f"[频道创建-步骤9.2] 检查是否有iframe...")
         add_channel_log(account_id, browser_env_id, 'info', '步骤9.2: 检查iframe')
         switched_to_iframe = False
         original_window = None
@@ -1137,7 +1181,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
         try:
             # 查找页面上所有的iframe
             iframes = driver.find_elements(By.TAG_NAME, "iframe")
-            print(f"[频道创建调试] 页面上找到 {len(iframes)} 个iframe")
+            logger.debug(f"[频道创建调试] 页面上找到 {len(iframes)} 个iframe")
             
             # 遍历iframe，查找包含目标内容的
             for i, iframe in enumerate(iframes):
@@ -1148,28 +1192,28 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                     
                     # 获取iframe的src属性
                     iframe_src = iframe.get_attribute("src") or ""
-                    print(f"[频道创建调试] iframe{i+1}: src='{iframe_src[:100]}...' visible={iframe.is_displayed()}")
+                    logger.debug(f"[频道创建调试] iframe{i+1}: src='{iframe_src[:100]}...' visible={iframe.is_displayed()}")
                     
                     # 如果是Google的profile相关iframe，尝试切换
                     if "profile" in iframe_src.lower() or "accounts.google" in iframe_src.lower() or iframe.is_displayed():
-                        print(f"[频道创建] 尝试切换到iframe{i+1}...")
+                        logger.info(f"[频道创建] 尝试切换到iframe{i+1}...")
                         driver.switch_to.frame(iframe)
                         
                         # 检查这个iframe中是否有我们需要的元素
-                        time.sleep(1)
+                        interruptible_sleep(1)
                         test_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'From computer') or contains(text(), 'Illustrations')]")
                         
                         if test_elements:
-                            print(f"[频道创建] ✅ 在iframe{i+1}中找到目标元素！")
+                            logger.info(f"[频道创建] ✅ 在iframe{i+1}中找到目标元素！")
                             switched_to_iframe = True
                             break
                         else:
                             # 没找到，切回主文档继续查找
-                            print(f"[频道创建调试] iframe{i+1}中未找到目标元素，切回主文档")
+                            logger.debug(f"[频道创建调试] iframe{i+1}中未找到目标元素，切回主文档")
                             driver.switch_to.default_content()
                             
                 except Exception as iframe_error:
-                    print(f"[频道创建调试] 处理iframe{i+1}时出错: {str(iframe_error)}")
+                    logger.debug(f"[频道创建调试] 处理iframe{i+1}时出错: {str(iframe_error)}")
                     try:
                         driver.switch_to.default_content()
                     except:
@@ -1177,28 +1221,28 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
             
             # 如果没有找到合适的iframe，尝试直接在主文档查找
             if not switched_to_iframe:
-                print(f"[频道创建] 未在iframe中找到元素，尝试在主文档中查找...")
+                logger.info(f"[频道创建] 未在iframe中找到元素，尝试在主文档中查找...")
                 driver.switch_to.default_content()
                 
                 # 再次检查主文档
                 test_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'From computer')]")
                 if test_elements:
-                    print(f"[频道创建] ✅ 在主文档中找到'From computer'元素")
+                    logger.info(f"[频道创建] ✅ 在主文档中找到'From computer'元素")
                 else:
                     # 尝试查找所有窗口句柄
-                    print(f"[频道创建调试] 检查是否有新窗口...")
+                    logger.debug(f"[频道创建调试] 检查是否有新窗口...")
                     all_windows = driver.window_handles
-                    print(f"[频道创建调试] 当前有 {len(all_windows)} 个窗口")
+                    logger.debug(f"[频道创建调试] 当前有 {len(all_windows)} 个窗口")
                     
         except Exception as e:
-            print(f"[频道创建警告] 检查iframe时出错: {str(e)}")
+            logger.warning(f"[频道创建警告] 检查iframe时出错: {str(e)}")
             try:
                 driver.switch_to.default_content()
             except:
                 pass
         
         # 步骤3: 使用JavaScript在所有frame中查找元素
-        print(f"[频道创建] 使用JavaScript全局查找...")
+        logger.info(f"[频道创建] 使用JavaScript全局查找...")
         try:
             # 使用JavaScript查找所有frame中的元素
             js_find_result = driver.execute_script("""
@@ -1238,40 +1282,40 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                 return {found: false, frameIndex: -1, selector: null};
             """)
             
-            print(f"[频道创建调试] JavaScript查找结果: {js_find_result}")
+            logger.debug(f"[频道创建调试] JavaScript查找结果: {js_find_result}")
             
             if js_find_result and js_find_result.get('found'):
                 frame_index = js_find_result.get('frameIndex', -1)
                 if frame_index >= 0:
-                    print(f"[频道创建] ✅ JavaScript在iframe{frame_index}中找到元素")
+                    logger.info(f"[频道创建] ✅ JavaScript在iframe{frame_index}中找到元素")
                     # 切换到该iframe
                     driver.switch_to.default_content()
                     iframes = driver.find_elements(By.TAG_NAME, "iframe")
                     if frame_index < len(iframes):
                         driver.switch_to.frame(iframes[frame_index])
                         switched_to_iframe = True
-                        print(f"[频道创建] ✅ 已切换到iframe{frame_index}")
+                        logger.info(f"[频道创建] ✅ 已切换到iframe{frame_index}")
                 else:
-                    print(f"[频道创建] ✅ JavaScript在主文档中找到元素")
+                    logger.info(f"[频道创建] ✅ JavaScript在主文档中找到元素")
                     
         except Exception as js_error:
-            print(f"[频道创建调试] JavaScript查找出错: {str(js_error)}")
+            logger.debug(f"[频道创建调试] JavaScript查找出错: {str(js_error)}")
         
         # 等待页面稳定，避免操作过快
-        print(f"[频道创建] 等待页面完全加载...")
-        time.sleep(3)
+        logger.info(f"[频道创建] 等待页面完全加载...")
+        interruptible_sleep(3)
         
         # 步骤3: 点击"From computer"选项卡
-        print(f"[频道创建] 查找'From computer'选项卡...")
+        logger.info(f"[频道创建] 查找'From computer'选项卡...")
         dialog_container = None  # 定义在外层作用域
         
         # 首先尝试在主文档层面使用ActionChains点击（最可靠的方法）
-        print(f"[频道创建] 尝试在主文档层面使用ActionChains点击...")
+        logger.info(f"[频道创建] 尝试在主文档层面使用ActionChains点击...")
         content_switched_early = False
         try:
             # 确保在主文档
             driver.switch_to.default_content()
-            time.sleep(0.5)
+            interruptible_sleep(0.5)
             
             # 找到iframe元素
             target_iframe = None
@@ -1292,7 +1336,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                 iframe_location = target_iframe.location
                 iframe_size = target_iframe.size
                 
-                print(f"[频道创建调试] iframe位置: {iframe_location}, 大小: {iframe_size}")
+                logger.debug(f"[频道创建调试] iframe位置: {iframe_location}, 大小: {iframe_size}")
                 
                 # "From computer" tab大约在iframe的右上角区域
                 # 根据观察，两个tab平分宽度，From computer在右边
@@ -1300,14 +1344,14 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                 offset_x = int(iframe_size['width'] * 0.75)
                 offset_y = 60  # tab大约在顶部60px处
                 
-                print(f"[频道创建] 尝试ActionChains点击iframe内偏移位置: ({offset_x}, {offset_y})")
+                logger.info(f"[频道创建] 尝试ActionChains点击iframe内偏移位置: ({offset_x}, {offset_y})")
                 
                 # 移动到iframe，然后偏移到tab位置并点击
                 actions = ActionChains(driver)
                 actions.move_to_element_with_offset(target_iframe, offset_x, offset_y).click().perform()
                 
-                print(f"[频道创建] ✅ ActionChains点击完成")
-                time.sleep(2)
+                logger.info(f"[频道创建] ✅ ActionChains点击完成")
+                interruptible_sleep(2)
                 
                 # 切换到iframe检查结果
                 driver.switch_to.frame(target_iframe)
@@ -1318,7 +1362,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                     try:
                         if elem.is_displayed():
                             content_switched_early = True
-                            print(f"[频道创建] ✅ ActionChains点击成功，检测到上传界面！")
+                            logger.info(f"[频道创建] ✅ ActionChains点击成功，检测到上传界面！")
                             break
                     except:
                         pass
@@ -1336,20 +1380,20 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                         }
                         return result;
                     """)
-                    print(f"[频道创建调试] Tab状态: {tab_state}")
+                    logger.debug(f"[频道创建调试] Tab状态: {tab_state}")
                     
                     # 检查From computer是否被选中
                     for tab in tab_state:
                         if 'From computer' in tab.get('text', '') and tab.get('selected') == 'true':
                             content_switched_early = True
-                            print(f"[频道创建] ✅ From computer tab已选中")
+                            logger.info(f"[频道创建] ✅ From computer tab已选中")
                             break
                             
                 # 切回主文档，准备后续操作
                 driver.switch_to.default_content()
                 
         except Exception as ac_err:
-            print(f"[频道创建调试] ActionChains点击失败: {str(ac_err)}")
+            logger.debug(f"[频道创建调试] ActionChains点击失败: {str(ac_err)}")
             try:
                 driver.switch_to.default_content()
             except:
@@ -1357,7 +1401,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
         
         # 如果早期点击成功了，跳过后续的点击尝试
         if content_switched_early:
-            print(f"[频道创建] 早期ActionChains点击成功，跳过其他方法")
+            logger.info(f"[频道创建] 早期ActionChains点击成功，跳过其他方法")
             # 切换到iframe继续后续操作
             try:
                 target_iframe = driver.find_element(By.CSS_SELECTOR, 'iframe[src*="profilewidgets.youtube.com"]')
@@ -1366,15 +1410,15 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                 pass
         
         # 确保切换到正确的iframe（profilewidgets.youtube.com）
-        print(f"[频道创建] 确保在正确的iframe中...")
+        logger.info(f"[频道创建] 确保在正确的iframe中...")
         try:
             # 先切回主文档
             driver.switch_to.default_content()
-            time.sleep(0.5)
+            interruptible_sleep(0.5)
             
             # 查找包含profilewidgets的iframe
             all_iframes = driver.find_elements(By.TAG_NAME, "iframe")
-            print(f"[频道创建调试] 主文档中发现 {len(all_iframes)} 个iframe")
+            logger.debug(f"[频道创建调试] 主文档中发现 {len(all_iframes)} 个iframe")
             
             target_iframe = None
             for idx, iframe in enumerate(all_iframes):
@@ -1382,7 +1426,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                     src = iframe.get_attribute("src") or ""
                     if "profilewidgets.youtube.com" in src and iframe.is_displayed():
                         target_iframe = iframe
-                        print(f"[频道创建] 找到目标iframe: {src[:80]}...")
+                        logger.info(f"[频道创建] 找到目标iframe: {src[:80]}...")
                         break
                 except:
                     pass
@@ -1390,18 +1434,18 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
             if target_iframe:
                 # 切换到目标iframe
                 driver.switch_to.frame(target_iframe)
-                print(f"[频道创建] ✅ 已切换到profilewidgets iframe")
-                time.sleep(1)
+                logger.info(f"[频道创建] ✅ 已切换到profilewidgets iframe")
+                interruptible_sleep(1)
             else:
-                print(f"[频道创建调试] 未找到profilewidgets iframe，尝试在主文档中操作")
+                logger.debug(f"[频道创建调试] 未找到profilewidgets iframe，尝试在主文档中操作")
                 
         except Exception as iframe_err:
-            print(f"[频道创建调试] 切换iframe出错: {str(iframe_err)}")
+            logger.debug(f"[频道创建调试] 切换iframe出错: {str(iframe_err)}")
         
         try:
             # 查找"From computer"选项卡
             # 关键修改：不假设ID是正确的，而是遍历所有包含文本的元素，找到可见的那个
-            print(f"[频道创建] 查找可见的'From computer'选项卡...")
+            logger.info(f"[频道创建] 查找可见的'From computer'选项卡...")
             content_switched = False
             
             click_result = driver.execute_script("""
@@ -1478,11 +1522,11 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                 return {success: false, error: 'No visible element found', debug: debugInfo};
             """)
             
-            print(f"[频道创建调试] JavaScript查找点击结果: {click_result}")
+            logger.debug(f"[频道创建调试] JavaScript查找点击结果: {click_result}")
             
             if click_result and click_result.get('success'):
-                print(f"[频道创建] ✅ 已通过JavaScript找到并点击元素 (Method: {click_result.get('method')})")
-                time.sleep(2)
+                logger.info(f"[频道创建] ✅ 已通过JavaScript找到并点击元素 (Method: {click_result.get('method')})")
+                interruptible_sleep(2)
                 
                 # 验证
                 upload_check = driver.find_elements(By.XPATH, "//*[contains(text(), 'Upload from computer') or contains(text(), 'Drag')]")
@@ -1490,14 +1534,14 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                     try:
                         if elem.is_displayed():
                             content_switched = True
-                            print(f"[频道创建] ✅ 检测到上传界面！")
+                            logger.info(f"[频道创建] ✅ 检测到上传界面！")
                             break
                     except:
                         pass
             
             # 如果上面失败了，尝试CDP坐标点击（分步获取坐标）
             if not content_switched:
-                print(f"[频道创建] 尝试CDP坐标点击（分步获取坐标）...")
+                logger.info(f"[频道创建] 尝试CDP坐标点击（分步获取坐标）...")
                 try:
                     # 步骤1: 在iframe中获取元素的相对坐标（当前应该已经在iframe中）
                     tab_rect = driver.execute_script("""
@@ -1529,7 +1573,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                         };
                     """)
                     
-                    print(f"[频道创建调试] iframe内元素坐标: {tab_rect}")
+                    logger.debug(f"[频道创建调试] iframe内元素坐标: {tab_rect}")
                     
                     if tab_rect and tab_rect.get('width', 0) > 0:
                         # 步骤2: 切回主文档获取iframe的位置
@@ -1549,14 +1593,14 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                             };
                         """)
                         
-                        print(f"[频道创建调试] iframe坐标: {iframe_rect}")
+                        logger.debug(f"[频道创建调试] iframe坐标: {iframe_rect}")
                         
                         if iframe_rect:
                             # 步骤3: 计算绝对坐标
                             abs_x = iframe_rect['x'] + tab_rect['x']
                             abs_y = iframe_rect['y'] + tab_rect['y']
                             
-                            print(f"[频道创建] 执行CDP点击: iframe({iframe_rect['x']}, {iframe_rect['y']}) + tab({tab_rect['x']}, {tab_rect['y']}) = ({abs_x}, {abs_y})")
+                            logger.info(f"[频道创建] 执行CDP点击: iframe({iframe_rect['x']}, {iframe_rect['y']}) + tab({tab_rect['x']}, {tab_rect['y']}) = ({abs_x}, {abs_y})")
                             
                             # 步骤4: 使用CDP执行真实点击
                             driver.execute_cdp_cmd('Input.dispatchMouseEvent', {
@@ -1566,7 +1610,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                                 'button': 'left',
                                 'clickCount': 1
                             })
-                            time.sleep(0.1)
+                            interruptible_sleep(0.1)
                             driver.execute_cdp_cmd('Input.dispatchMouseEvent', {
                                 'type': 'mouseReleased',
                                 'x': abs_x,
@@ -1575,8 +1619,8 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                                 'clickCount': 1
                             })
                             
-                            print(f"[频道创建] ✅ CDP坐标点击完成")
-                            time.sleep(2)
+                            logger.info(f"[频道创建] ✅ CDP坐标点击完成")
+                            interruptible_sleep(2)
                             
                             # 切回iframe检查结果
                             target_iframe = driver.find_element(By.CSS_SELECTOR, 'iframe[src*="profilewidgets.youtube.com"]')
@@ -1588,20 +1632,20 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                                 try:
                                     if elem.is_displayed():
                                         content_switched = True
-                                        print(f"[频道创建] ✅ CDP点击成功，检测到上传界面")
+                                        logger.info(f"[频道创建] ✅ CDP点击成功，检测到上传界面")
                                         break
                                 except:
                                     pass
                         else:
-                            print(f"[频道创建调试] 无法获取iframe坐标")
+                            logger.debug(f"[频道创建调试] 无法获取iframe坐标")
                             # 切回iframe
                             target_iframe = driver.find_element(By.CSS_SELECTOR, 'iframe[src*="profilewidgets.youtube.com"]')
                             driver.switch_to.frame(target_iframe)
                     else:
-                        print(f"[频道创建调试] 无法获取元素坐标: {tab_rect}")
+                        logger.debug(f"[频道创建调试] 无法获取元素坐标: {tab_rect}")
                         
                 except Exception as cdp_err:
-                    print(f"[频道创建调试] CDP坐标点击失败: {str(cdp_err)}")
+                    logger.debug(f"[频道创建调试] CDP坐标点击失败: {str(cdp_err)}")
                     # 确保切回iframe
                     try:
                         driver.switch_to.default_content()
@@ -1612,7 +1656,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
             
             # 备用方法5：直接在iframe中使用pyautogui风格的点击
             if not content_switched:
-                print(f"[频道创建] 尝试最后的点击方法...")
+                logger.info(f"[频道创建] 尝试最后的点击方法...")
                 try:
                     # 确保在iframe中
                     # 尝试使用Selenium的execute_script直接调用元素的click
@@ -1684,8 +1728,8 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                         };
                     """)
                     
-                    print(f"[频道创建调试] 综合事件触发结果: {result}")
-                    time.sleep(2)
+                    logger.debug(f"[频道创建调试] 综合事件触发结果: {result}")
+                    interruptible_sleep(2)
                     
                     # 检查是否成功
                     upload_check = driver.find_elements(By.XPATH, "//*[contains(text(), 'Upload from computer') or contains(text(), 'Drag')]")
@@ -1693,13 +1737,13 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                         try:
                             if elem.is_displayed():
                                 content_switched = True
-                                print(f"[频道创建] ✅ 综合事件触发成功，检测到上传界面")
+                                logger.info(f"[频道创建] ✅ 综合事件触发成功，检测到上传界面")
                                 break
                         except:
                             pass
                             
                 except Exception as final_err:
-                    print(f"[频道创建调试] 最后的点击方法失败: {str(final_err)}")
+                    logger.debug(f"[频道创建调试] 最后的点击方法失败: {str(final_err)}")
             
             # 标记为已处理
             from_computer_tab = "processed"
@@ -1707,9 +1751,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                 
         except Exception as e:
             error_msg = f"处理'From computer'选项卡时出错: {str(e)}"
-            print(f"[频道创建错误] {error_msg}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"[频道创建错误] {error_msg}", exc_info=True)
             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
             return "failed", "无法切换到From computer选项卡"
         
@@ -1724,18 +1766,18 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
             pass
         
         # 步骤4: 查找并点击"Upload from computer"按钮
-        print(f"[频道创建] 查找'Upload from computer'按钮...")
+        logger.info(f"[频道创建] 查找'Upload from computer'按钮...")
         upload_btn = None
         
         try:
             # 等待一下确保内容加载
-            time.sleep(2)
+            interruptible_sleep(2)
             
             # 方式1: 直接查找包含特定文本的按钮（最直接）
             try:
                 # 查找所有可见的按钮
                 all_buttons = driver.find_elements(By.XPATH, "//button")
-                print(f"[频道创建调试] 页面上共有 {len(all_buttons)} 个按钮")
+                logger.debug(f"[频道创建调试] 页面上共有 {len(all_buttons)} 个按钮")
                 
                 visible_buttons = []
                 for btn in all_buttons:
@@ -1745,7 +1787,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                             # 检查是否包含"Upload from computer"
                             if "Upload from computer" in btn_text or "upload from computer" in btn_text.lower():
                                 upload_btn = btn
-                                print(f"[频道创建] ✅ 找到'Upload from computer'按钮（文本匹配）")
+                                logger.info(f"[频道创建] ✅ 找到'Upload from computer'按钮（文本匹配）")
                                 break
                             
                             # 记录所有可见按钮用于调试
@@ -1759,12 +1801,12 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                         pass
                 
                 if not upload_btn:
-                    print(f"[频道创建调试] 未找到'Upload from computer'按钮，输出所有可见按钮:")
+                    logger.debug(f"[频道创建调试] 未找到'Upload from computer'按钮，输出所有可见按钮:")
                     for i, btn_info in enumerate(visible_buttons[:20]):
-                        print(f"[频道创建调试] 按钮{i+1}: text='{btn_info['text']}', aria='{btn_info['aria-label']}'")
+                        logger.debug(f"[频道创建调试] 按钮{i+1}: text='{btn_info['text']}', aria='{btn_info['aria-label']}'")
                         
             except Exception as e:
-                print(f"[频道创建] 方式1查找失败: {str(e)}")
+                logger.info(f"[频道创建] 方式1查找失败: {str(e)}")
             
             # 方式2: 通过包含"Upload"和"computer"关键词的按钮
             if not upload_btn:
@@ -1775,10 +1817,10 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                             btn_text = btn.text.lower()
                             if "upload" in btn_text and "computer" in btn_text:
                                 upload_btn = btn
-                                print(f"[频道创建] ✅ 找到包含upload和computer的按钮: '{btn.text}'")
+                                logger.info(f"[频道创建] ✅ 找到包含upload和computer的按钮: '{btn.text}'")
                                 break
                 except Exception as e:
-                    print(f"[频道创建] 方式2查找失败: {str(e)}")
+                    logger.info(f"[频道创建] 方式2查找失败: {str(e)}")
             
             # 方式3: 查找特定class的按钮（从源码分析可能的class模式）
             if not upload_btn:
@@ -1790,205 +1832,218 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                             btn_text = btn.text.lower()
                             if "upload" in btn_text:
                                 upload_btn = btn
-                                print(f"[频道创建] ✅ 通过class找到上传按钮: '{btn.text}'")
+                                logger.info(f"[频道创建] ✅ 通过class找到上传按钮: '{btn.text}'")
                                 break
                 except:
                     pass
         
         except Exception as e:
-            print(f"[频道创建错误] 查找按钮过程出错: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"[频道创建错误] 查找按钮过程出错: {str(e)}", exc_info=True)
         
         if not upload_btn:
             error_msg = "找不到'Upload from computer'按钮，可能需要先切换到From computer选项卡"
-            print(f"[频道创建错误] {error_msg}")
+            logger.error(f"[频道创建错误] {error_msg}")
             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
             return "failed", error_msg
         
+        # 拦截系统文件对话框，点击后直接拿到页面的 input[type=file]
+        install_file_chooser_hook(driver)
+        
         # 点击Upload from computer按钮
-        print(f"[频道创建] 准备点击'Upload from computer'按钮...")
+        logger.info(f"[频道创建] 准备点击'Upload from computer'按钮...")
         try:
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", upload_btn)
-            time.sleep(1)
+            interruptible_sleep(1)
             upload_btn.click()
-            print(f"[频道创建] 已点击'Upload from computer'按钮")
+            logger.info(f"[频道创建] 已点击'Upload from computer'按钮")
             add_channel_log(account_id, browser_env_id, 'info', '已点击Upload from computer按钮')
         except:
             try:
                 driver.execute_script("arguments[0].click();", upload_btn)
-                print(f"[频道创建] 已点击'Upload from computer'按钮（JS方式）")
+                logger.info(f"[频道创建] 已点击'Upload from computer'按钮（JS方式）")
                 add_channel_log(account_id, browser_env_id, 'info', '已点击Upload from computer按钮（JS方式）')
             except Exception as click_error:
                 error_msg = f"点击Upload from computer按钮失败: {str(click_error)}"
-                print(f"[频道创建错误] {error_msg}")
+                logger.error(f"[频道创建错误] {error_msg}")
                 add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                 return "failed", error_msg
         
-        time.sleep(2)
+        interruptible_sleep(2)
         
         # 步骤8: 在文件选择器中输入图片路径
-        print(f"[频道创建] 查找文件上传input...")
+        captured_input = get_captured_file_input(driver)
+        if captured_input:
+            # 页面打开文件选择框时已被拦截，直接设置文件，不经过系统对话框（可并行）
+            try:
+                captured_input.send_keys(upload_path)
+                logger.info(f"[频道创建] ✅ 已通过拦截的文件input设置头像: {upload_path}")
+                add_channel_log(account_id, browser_env_id, 'info', f'已选择头像文件: {os.path.basename(avatar_path)}')
+            except Exception as e:
+                logger.warning(f"[频道创建警告] 通过拦截的文件input设置头像失败，改用查找input: {str(e)}")
+                captured_input = None
+        
         try:
-            # 使用强大的JavaScript递归查找input[type='file']，支持Shadow DOM和iframe
-            file_input_info = driver.execute_script("""
-                function findFileInput(root, depth = 0) {
-                    if (depth > 20) return null; // 防止死循环
+            if not captured_input:
+                logger.info(f"[频道创建] 查找文件上传input...")
+                # 使用强大的JavaScript递归查找input[type='file']，支持Shadow DOM和iframe
+                file_input_info = driver.execute_script("""
+                    function findFileInput(root, depth = 0) {
+                        if (depth > 20) return null; // 防止死循环
                     
-                    // 1. 检查当前root下的input
-                    var inputs = root.querySelectorAll('input[type="file"]');
-                    if (inputs.length > 0) {
-                        return {found: true, type: 'direct', element: inputs[0]};
-                    }
+                        // 1. 检查当前root下的input
+                        var inputs = root.querySelectorAll('input[type="file"]');
+                        if (inputs.length > 0) {
+                            return {found: true, type: 'direct', element: inputs[0]};
+                        }
                     
-                    // 2. 检查Shadow DOM
-                    var walker = document.createTreeWalker(
-                        root, 
-                        NodeFilter.SHOW_ELEMENT, 
-                        null, 
-                        false
-                    );
+                        // 2. 检查Shadow DOM
+                        var walker = document.createTreeWalker(
+                            root, 
+                            NodeFilter.SHOW_ELEMENT, 
+                            null, 
+                            false
+                        );
                     
-                    while(walker.nextNode()) {
-                        var node = walker.currentNode;
-                        if (node.shadowRoot) {
-                            var result = findFileInput(node.shadowRoot, depth + 1);
-                            if (result) return result;
+                        while(walker.nextNode()) {
+                            var node = walker.currentNode;
+                            if (node.shadowRoot) {
+                                var result = findFileInput(node.shadowRoot, depth + 1);
+                                if (result) return result;
+                            }
                         }
-                    }
                     
-                    return null;
-                }
+                        return null;
+                    }
                 
-                // 在主文档查找
-                var result = findFileInput(document.body);
-                if (result) return result;
+                    // 在主文档查找
+                    var result = findFileInput(document.body);
+                    if (result) return result;
                 
-                // 遍历所有iframe
-                var iframes = document.querySelectorAll('iframe');
-                for (var i = 0; i < iframes.length; i++) {
-                    try {
-                        var iframeDoc = iframes[i].contentDocument || iframes[i].contentWindow.document;
-                        if (iframeDoc) {
-                            var iframeResult = findFileInput(iframeDoc.body);
-                            if (iframeResult) {
-                                return {found: true, type: 'iframe', index: i, element: iframeResult.element};
+                    // 遍历所有iframe
+                    var iframes = document.querySelectorAll('iframe');
+                    for (var i = 0; i < iframes.length; i++) {
+                        try {
+                            var iframeDoc = iframes[i].contentDocument || iframes[i].contentWindow.document;
+                            if (iframeDoc) {
+                                var iframeResult = findFileInput(iframeDoc.body);
+                                if (iframeResult) {
+                                    return {found: true, type: 'iframe', index: i, element: iframeResult.element};
+                                }
                             }
+                        } catch(e) {
+                            // 跨域访问限制，忽略
                         }
-                    } catch(e) {
-                        // 跨域访问限制，忽略
                     }
-                }
                 
-                return null;
-            """)
+                    return null;
+                """)
             
-            print(f"[频道创建调试] input file查找结果: {file_input_info}")
+                logger.debug(f"[频道创建调试] input file查找结果: {file_input_info}")
             
-            file_input = None
-            if file_input_info and file_input_info.get('found'):
-                if file_input_info.get('type') == 'iframe':
-                    # 如果在iframe中，需要切换过去
-                    iframe_index = file_input_info.get('index')
-                    print(f"[频道创建] input在iframe {iframe_index} 中，切换上下文...")
-                    driver.switch_to.default_content()
+                file_input = None
+                if file_input_info and file_input_info.get('found'):
+                    if file_input_info.get('type') == 'iframe':
+                        # 如果在iframe中，需要切换过去
+                        iframe_index = file_input_info.get('index')
+                        logger.info(f"[频道创建] input在iframe {iframe_index} 中，切换上下文...")
+                        driver.switch_to.default_content()
+                        all_iframes = driver.find_elements(By.TAG_NAME, "iframe")
+                        if len(all_iframes) > iframe_index:
+                            driver.switch_to.frame(all_iframes[iframe_index])
+                            # 再次查找（因为切换了上下文，element引用可能失效）
+                            file_input = driver.find_element(By.XPATH, "//input[@type='file']")
+                    else:
+                        # 在当前文档或Shadow DOM中
+                        # 注意：如果是在Shadow DOM中，Selenium直接find_element可能找不到
+                        # 这里简化处理，如果是direct找到的（execute_script返回的element），直接使用
+                        file_input = file_input_info.get('element')
+            
+                # 如果JS查找失败，尝试回退到暴力遍历iframe查找
+                if not file_input:
+                    logger.info(f"[频道创建] JS查找失败，尝试遍历iframe查找...")
                     all_iframes = driver.find_elements(By.TAG_NAME, "iframe")
-                    if len(all_iframes) > iframe_index:
-                        driver.switch_to.frame(all_iframes[iframe_index])
-                        # 再次查找（因为切换了上下文，element引用可能失效）
-                        file_input = driver.find_element(By.XPATH, "//input[@type='file']")
-                else:
-                    # 在当前文档或Shadow DOM中
-                    # 注意：如果是在Shadow DOM中，Selenium直接find_element可能找不到
-                    # 这里简化处理，如果是direct找到的（execute_script返回的element），直接使用
-                    file_input = file_input_info.get('element')
-            
-            # 如果JS查找失败，尝试回退到暴力遍历iframe查找
-            if not file_input:
-                print(f"[频道创建] JS查找失败，尝试遍历iframe查找...")
-                all_iframes = driver.find_elements(By.TAG_NAME, "iframe")
                 
-                # 先检查当前位置
-                try:
-                    inputs = driver.find_elements(By.XPATH, "//input[@type='file']")
-                    if inputs:
-                        file_input = inputs[0]
-                        print(f"[频道创建] 在当前上下文中找到input")
-                except:
-                    pass
+                    # 先检查当前位置
+                    try:
+                        inputs = driver.find_elements(By.XPATH, "//input[@type='file']")
+                        if inputs:
+                            file_input = inputs[0]
+                            logger.info(f"[频道创建] 在当前上下文中找到input")
+                    except:
+                        pass
                 
-                if not file_input:
-                    for i, iframe in enumerate(all_iframes):
-                        try:
-                            driver.switch_to.default_content()
-                            driver.switch_to.frame(iframe)
-                            inputs = driver.find_elements(By.XPATH, "//input[@type='file']")
-                            if inputs:
-                                file_input = inputs[0]
-                                print(f"[频道创建] ✅ 在iframe {i} 中找到文件上传input")
-                                break
-                        except:
-                            pass
+                    if not file_input:
+                        for i, iframe in enumerate(all_iframes):
+                            try:
+                                driver.switch_to.default_content()
+                                driver.switch_to.frame(iframe)
+                                inputs = driver.find_elements(By.XPATH, "//input[@type='file']")
+                                if inputs:
+                                    file_input = inputs[0]
+                                    logger.info(f"[频道创建] ✅ 在iframe {i} 中找到文件上传input")
+                                    break
+                            except:
+                                pass
 
-            # 如果最终找到了input
-            if file_input:
-                # 确保input没有被disabled，并尝试显示它（以便调试）
-                driver.execute_script("""
-                    arguments[0].removeAttribute('disabled');
-                    arguments[0].style.display = 'block';
-                    arguments[0].style.visibility = 'visible';
-                    arguments[0].style.opacity = '1';
-                    arguments[0].style.width = '1px';
-                    arguments[0].style.height = '1px';
-                """, file_input)
+                # 如果最终找到了input
+                if file_input:
+                    # 确保input没有被disabled，并尝试显示它（以便调试）
+                    driver.execute_script("""
+                        arguments[0].removeAttribute('disabled');
+                        arguments[0].style.display = 'block';
+                        arguments[0].style.visibility = 'visible';
+                        arguments[0].style.opacity = '1';
+                        arguments[0].style.width = '1px';
+                        arguments[0].style.height = '1px';
+                    """, file_input)
                 
-                # 直接设置文件路径
-                file_input.send_keys(avatar_path)
-                print(f"[频道创建] 已设置头像文件路径: {avatar_path}")
-                add_channel_log(account_id, browser_env_id, 'info', f'已选择头像文件: {os.path.basename(avatar_path)}')
+                    # 直接设置文件路径
+                    file_input.send_keys(upload_path)
+                    logger.info(f"[频道创建] 已设置头像文件路径: {upload_path}")
+                    add_channel_log(account_id, browser_env_id, 'info', f'已选择头像文件: {os.path.basename(avatar_path)}')
                 
-                # 恢复到profilewidgets iframe（为了点击Done按钮）
-                try:
-                    time.sleep(1)
-                    driver.switch_to.default_content()
+                    # 恢复到profilewidgets iframe（为了点击Done按钮）
+                    try:
+                        interruptible_sleep(1)
+                        driver.switch_to.default_content()
 
-                    # 重新查找目标iframe
-                    target_iframe = None
-                    all_iframes = driver.find_elements(By.TAG_NAME, "iframe")
-                    for iframe in all_iframes:
-                        if "profilewidgets.youtube.com" in (iframe.get_attribute("src") or ""):
-                            target_iframe = iframe
-                            break
+                        # 重新查找目标iframe
+                        target_iframe = None
+                        all_iframes = driver.find_elements(By.TAG_NAME, "iframe")
+                        for iframe in all_iframes:
+                            if "profilewidgets.youtube.com" in (iframe.get_attribute("src") or ""):
+                                target_iframe = iframe
+                                break
 
-                    if target_iframe:
-                        driver.switch_to.frame(target_iframe)
-                    else:
-                        print(f"[频道创建警告] 未找到profilewidgets iframe，Done按钮点击可能失败")
-                except Exception as e:
-                    print(f"[频道创建警告] 恢复iframe上下文失败: {str(e)}")
-            else:
-                print(f"[频道创建警告] 在任何位置都未找到input[type='file']，尝试处理系统弹窗...")
-                
-                # 尝试使用 pyautogui 处理系统弹窗
-                if handle_system_upload_dialog(avatar_path):
-                    print(f"[频道创建] 系统弹窗处理完成，直接等待裁剪界面...")
-                    add_channel_log(account_id, browser_env_id, 'info', '已通过系统弹窗上传头像')
-                    # 不做任何等待，直接跳到等待裁剪界面的步骤
+                        if target_iframe:
+                            driver.switch_to.frame(target_iframe)
+                        else:
+                            logger.warning(f"[频道创建警告] 未找到profilewidgets iframe，Done按钮点击可能失败")
+                    except Exception as e:
+                        logger.warning(f"[频道创建警告] 恢复iframe上下文失败: {str(e)}")
                 else:
-                    return "failed", "无法定位文件上传控件且系统交互失败"
+                    logger.warning(f"[频道创建警告] 在任何位置都未找到input[type='file']，尝试处理系统弹窗...")
+                
+                    # 尝试使用 pyautogui 处理系统弹窗（全局排队，同一时间只有一个线程操作）
+                    if handle_system_upload_dialog(upload_path):
+                        logger.info(f"[频道创建] 系统弹窗处理完成，直接等待裁剪界面...")
+                        add_channel_log(account_id, browser_env_id, 'info', '已通过系统弹窗上传头像')
+                        # 不做任何等待，直接跳到等待裁剪界面的步骤
+                    else:
+                        return "failed", "无法定位文件上传控件且系统交互失败"
             
             # 步骤9: 等待裁剪界面 - 使用纯等待，不轮询DOM以避免干扰
-            print(f"[频道创建] 等待裁剪界面加载（纯等待模式，不干扰浏览器）...")
-            print(f"[频道创建] 等待15秒让裁剪界面完全加载...")
+            logger.info(f"[频道创建] 等待裁剪界面加载（纯等待模式，不干扰浏览器）...")
+            logger.info(f"[频道创建] 等待15秒让裁剪界面完全加载...")
             
-            # 关键：使用纯 time.sleep，不做任何 Selenium 操作
+            # 关键：使用纯等待，不做任何 Selenium 操作
             # 这样可以避免干扰正在进行的上传和界面渲染
             for i in range(15):
-                time.sleep(1)
+                interruptible_sleep(1)
                 if i % 5 == 4:  # 每5秒打印一次进度
-                    print(f"[频道创建] 已等待 {i+1} 秒...")
+                    logger.info(f"[频道创建] 已等待 {i+1} 秒...")
             
-            print(f"[频道创建] 等待完成，开始查找裁剪界面Done按钮...")
+            logger.info(f"[频道创建] 等待完成，开始查找裁剪界面Done按钮...")
             
             # 步骤10: 查找裁剪界面的Done按钮 (jsname="yTKzd")
             done_button = None
@@ -1998,7 +2053,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                 try:
                     done_button = driver.find_element(By.CSS_SELECTOR, 'button[jsname="yTKzd"]')
                     if done_button and done_button.is_displayed():
-                        print(f"[频道创建] ✅ 通过jsname找到裁剪界面Done按钮")
+                        logger.info(f"[频道创建] ✅ 通过jsname找到裁剪界面Done按钮")
                         break
                 except:
                     pass
@@ -2014,7 +2069,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                                     parent_html = btn.get_attribute("outerHTML")
                                     if 'jsname="yTKzd"' in parent_html or 'jslog="89765"' in parent_html:
                                         done_button = btn
-                                        print(f"[频道创建] ✅ 通过文本找到裁剪界面Done按钮")
+                                        logger.info(f"[频道创建] ✅ 通过文本找到裁剪界面Done按钮")
                                         break
                             except:
                                 pass
@@ -2025,71 +2080,49 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                     break
                     
                 if attempt < 5:
-                    print(f"[频道创建] 第{attempt+1}次未找到Done按钮，等待3秒后重试...")
-                    time.sleep(3)
+                    logger.info(f"[频道创建] 第{attempt+1}次未找到Done按钮，等待3秒后重试...")
+                    interruptible_sleep(3)
             
             if done_button:
-                print(f"[频道创建] 找到裁剪界面Done按钮，准备点击...")
+                logger.info(f"[频道创建] 找到裁剪界面Done按钮，准备点击...")
                 try:
                     driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", done_button)
-                    time.sleep(0.5)
+                    interruptible_sleep(0.5)
                     done_button.click()
-                    print(f"[频道创建] 已点击裁剪界面Done按钮")
+                    logger.info(f"[频道创建] 已点击裁剪界面Done按钮")
                 except:
                     try:
                         driver.execute_script("arguments[0].click();", done_button)
-                        print(f"[频道创建] 已点击裁剪界面Done按钮（JS方式）")
+                        logger.info(f"[频道创建] 已点击裁剪界面Done按钮（JS方式）")
                     except Exception as e:
-                        print(f"[频道创建警告] 点击Done按钮失败: {str(e)}")
+                        logger.warning(f"[频道创建警告] 点击Done按钮失败: {str(e)}")
                 
-                time.sleep(2)
+                interruptible_sleep(2)
                 
                 # 步骤11: 处理确认对话框 - 点击 "Save as profile picture" 按钮
-                print(f"[频道创建] 查找'Save as profile picture'按钮...")
-                save_button = None
-                
-                try:
-                    # 通过jsname查找 (jsname="WCwAu")
-                    save_button = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[jsname="WCwAu"]'))
-                    )
-                    print(f"[频道创建] 通过jsname找到Save按钮")
-                except:
-                    pass
-                
-                # 方法2: 通过文本查找
-                if not save_button:
-                    try:
-                        buttons = driver.find_elements(By.TAG_NAME, "button")
-                        for btn in buttons:
-                            try:
-                                btn_text = btn.text.lower()
-                                if btn.is_displayed() and ("save as profile" in btn_text or "save" in btn_text):
-                                    save_button = btn
-                                    print(f"[频道创建] 通过文本找到Save按钮: {btn.text}")
-                                    break
-                            except:
-                                pass
-                    except:
-                        pass
+                logger.info(f"[频道创建] 查找'Save as profile picture'按钮...")
+                # 通过jsname或按钮文字查找，一次探测
+                save_button, method = selector_service.find_first(driver, SAVE_AVATAR_SELECTORS, timeout=5)
+                if save_button:
+                    logger.info(f"[频道创建] 通过{method}找到Save按钮")
                 
                 if save_button:
-                    print(f"[频道创建] 找到Save按钮，准备点击...")
+                    logger.info(f"[频道创建] 找到Save按钮，准备点击...")
                     try:
                         save_button.click()
-                        print(f"[频道创建] 已点击'Save as profile picture'按钮")
+                        logger.info(f"[频道创建] 已点击'Save as profile picture'按钮")
                     except:
                         try:
                             driver.execute_script("arguments[0].click();", save_button)
-                            print(f"[频道创建] 已点击'Save as profile picture'按钮（JS方式）")
+                            logger.info(f"[频道创建] 已点击'Save as profile picture'按钮（JS方式）")
                         except Exception as e:
-                            print(f"[频道创建警告] 点击Save按钮失败: {str(e)}")
+                            logger.warning(f"[频道创建警告] 点击Save按钮失败: {str(e)}")
                     
                     add_channel_log(account_id, browser_env_id, 'success', '头像上传成功')
                 else:
-                    print(f"[频道创建警告] 未找到Save按钮，可能已自动保存")
+                    logger.warning(f"[频道创建警告] 未找到Save按钮，可能已自动保存")
             else:
-                print(f"[频道创建警告] 未找到裁剪界面Done按钮")
+                logger.warning(f"[频道创建警告] 未找到裁剪界面Done按钮")
                 # 输出当前页面所有可见按钮用于调试
                 try:
                     buttons = driver.find_elements(By.TAG_NAME, "button")
@@ -2100,7 +2133,7 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                                 visible_btns.append(btn.text.strip()[:30])
                         except:
                             pass
-                    print(f"[频道创建调试] 当前可见按钮: {visible_btns}")
+                    logger.debug(f"[频道创建调试] 当前可见按钮: {visible_btns}")
                 except:
                     pass
             
@@ -2111,83 +2144,79 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                 pass
             
             # 等待保存完成
-            time.sleep(3)
-            print(f"[频道创建] ✅ 头像上传流程完成")
+            interruptible_sleep(3)
+            logger.info(f"[频道创建] ✅ 头像上传流程完成")
             
         except Exception as e:
             error_msg = f"上传头像文件失败: {str(e)}"
-            print(f"[频道创建错误] {error_msg}")
+            logger.error(f"[频道创建错误] {error_msg}", exc_info=True)
             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
-            import traceback
-            traceback.print_exc()
             return "failed", "头像上传失败"
         
         # === 步骤12: 填写频道名称 ===
-        print(f"[频道创建-步骤12] 填写频道名称...")
+        logger.info(f"[频道创建-步骤12] 填写频道名称...")
         add_channel_log(account_id, browser_env_id, 'info', '步骤12: 填写频道名称')
         try:
             # 生成随机名称
             channel_name = get_random_name(10)
-            print(f"[频道创建-步骤12] 生成的频道名称: {channel_name}")
+            logger.info(f"[频道创建-步骤12] 生成的频道名称: {channel_name}")
             add_channel_log(account_id, browser_env_id, 'info', f'步骤12: 生成频道名称 [{channel_name}]')
             
             # 查找Name输入框（第一个有maxlength="50"的输入框）
-            print(f"[频道创建-步骤12] 查找Name输入框...")
+            logger.info(f"[频道创建-步骤12] 查找Name输入框...")
             try:
                 name_input = WebDriverWait(driver, 10).until(
                     EC.presence_of_element_located((By.XPATH, "//input[@maxlength='50' and @required]"))
                 )
-                print(f"[频道创建-步骤12] 找到Name输入框")
+                logger.info(f"[频道创建-步骤12] 找到Name输入框")
             except:
                 # 备用方式：通过aria-labelledby查找
                 try:
                     name_input = driver.find_element(By.XPATH, "//input[@aria-labelledby='paper-input-label-1']")
-                    print(f"[频道创建-步骤12] 通过aria-labelledby找到Name输入框")
+                    logger.info(f"[频道创建-步骤12] 通过aria-labelledby找到Name输入框")
                 except:
                     # 最后尝试：找所有required的input，取第一个
                     inputs = driver.find_elements(By.XPATH, "//input[@required and contains(@class, 'tp-yt-paper-input')]")
                     if inputs:
                         name_input = inputs[0]
-                        print(f"[频道创建-步骤12] 通过required属性找到Name输入框")
+                        logger.info(f"[频道创建-步骤12] 通过required属性找到Name输入框")
                     else:
                         error_msg = "步骤12失败: 未找到Name输入框"
-                        print(f"[频道创建-步骤12-错误] {error_msg}")
+                        logger.error(f"[频道创建-步骤12-错误] {error_msg}")
                         add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                         return "failed", "未找到频道名称输入框"
             
             # 滚动到输入框
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", name_input)
-            time.sleep(1)
+            interruptible_sleep(1)
             
             # 输入名称
-            print(f"[频道创建-步骤12] 输入频道名称...")
+            logger.info(f"[频道创建-步骤12] 输入频道名称...")
             try:
                 name_input.click()
-                time.sleep(0.5)
+                interruptible_sleep(0.5)
                 name_input.clear()
                 name_input.send_keys(channel_name)
-                print(f"[频道创建-步骤12] ✅ 已输入频道名称: {channel_name}")
+                logger.info(f"[频道创建-步骤12] ✅ 已输入频道名称: {channel_name}")
                 add_channel_log(account_id, browser_env_id, 'success', f'步骤12完成: 已输入频道名称 [{channel_name}]')
             except:
                 # 使用JS方式
                 driver.execute_script(f"arguments[0].value = '{channel_name}';", name_input)
                 driver.execute_script("arguments[0].dispatchEvent(new Event('input', { bubbles: true }));", name_input)
                 driver.execute_script("arguments[0].dispatchEvent(new Event('change', { bubbles: true }));", name_input)
-                print(f"[频道创建-步骤12] ✅ 已输入频道名称（JS方式）: {channel_name}")
+                logger.info(f"[频道创建-步骤12] ✅ 已输入频道名称（JS方式）: {channel_name}")
                 add_channel_log(account_id, browser_env_id, 'success', f'步骤12完成: 已输入频道名称（JS方式）[{channel_name}]')
             
-            time.sleep(2)
+            interruptible_sleep(2)
             # Handle会根据频道名称自动生成，不需要手动填写
             
         except Exception as e:
             error_msg = f"填写频道名称失败: {str(e)}"
-            print(f"[频道创建错误] {error_msg}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"[频道创建错误] {error_msg}", exc_info=True)
             return "failed", error_msg
         
         # 13. 点击"Create channel"按钮
-        print(f"[频道创建] 查找并点击'Create channel'按钮...")
+        logger.info(f"[频道创建] 查找并点击'Create channel'按钮...")
         add_channel_log(account_id, browser_env_id, 'info', '查找Create channel按钮')
         try:
             create_channel_button = None
@@ -2197,17 +2226,17 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                 create_channel_button = WebDriverWait(driver, 10).until(
                     EC.element_to_be_clickable((By.XPATH, "//button[@aria-label='Create channel' or @aria-label='创建频道']"))
                 )
-                print(f"[频道创建] 通过aria-label找到'Create channel'按钮")
+                logger.info(f"[频道创建] 通过aria-label找到'Create channel'按钮")
             except:
                 try:
                     # 方式2: 通过包含特定class和文本的按钮
                     create_channel_button = driver.find_element(By.XPATH, "//button[contains(@class, 'yt-spec-button-shape-next--call-to-action')]//span[contains(text(), 'Create channel')]/..")
-                    print(f"[频道创建] 通过class和文本找到'Create channel'按钮")
+                    logger.info(f"[频道创建] 通过class和文本找到'Create channel'按钮")
                 except:
                     try:
                         # 方式3: 查找id为create-channel-button的元素下的button
                         create_channel_button = driver.find_element(By.XPATH, "//ytd-button-renderer[@id='create-channel-button']//button")
-                        print(f"[频道创建] 通过id找到'Create channel'按钮")
+                        logger.info(f"[频道创建] 通过id找到'Create channel'按钮")
                     except:
                         # 方式4: 查找所有button，找包含create channel的
                         buttons = driver.find_elements(By.TAG_NAME, "button")
@@ -2221,96 +2250,96 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                                 "创建频道" in btn_text
                             ):
                                 create_channel_button = btn
-                                print(f"[频道创建] 通过遍历找到'Create channel'按钮")
+                                logger.info(f"[频道创建] 通过遍历找到'Create channel'按钮")
                                 break
             
             if not create_channel_button:
                 error_msg = "步骤13失败: 未找到'Create channel'按钮"
-                print(f"[频道创建-步骤13-错误] {error_msg}")
+                logger.error(f"[频道创建-步骤13-错误] {error_msg}")
                 add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                 return "failed", "未找到创建频道按钮"
             
             # 滚动到按钮
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", create_channel_button)
-            time.sleep(1)
+            interruptible_sleep(1)
             
             # === 步骤13: 点击Create channel按钮 ===
-            print(f"[频道创建-步骤13] 点击'Create channel'按钮...")
+            logger.info(f"[频道创建-步骤13] 点击'Create channel'按钮...")
             add_channel_log(account_id, browser_env_id, 'info', '步骤13: 点击Create channel按钮')
             try:
                 create_channel_button.click()
-                print(f"[频道创建-步骤13] ✅ 已点击'Create channel'按钮")
+                logger.info(f"[频道创建-步骤13] ✅ 已点击'Create channel'按钮")
                 add_channel_log(account_id, browser_env_id, 'success', '步骤13完成: 已点击Create channel按钮，等待创建完成')
             except:
                 driver.execute_script("arguments[0].click();", create_channel_button)
-                print(f"[频道创建-步骤13] ✅ 已点击'Create channel'按钮（JS方式）")
+                logger.info(f"[频道创建-步骤13] ✅ 已点击'Create channel'按钮（JS方式）")
                 add_channel_log(account_id, browser_env_id, 'success', '步骤13完成: 已点击Create channel按钮（JS方式）')
             
             # 等待频道创建完成
-            print(f"[频道创建-步骤13] 等待频道创建完成...")
-            time.sleep(10)
+            logger.info(f"[频道创建-步骤13] 等待频道创建完成...")
+            interruptible_sleep(10)
             
         except Exception as e:
             error_msg = f"步骤13失败: 点击'Create channel'按钮失败: {str(e)}"
-            print(f"[频道创建-步骤13-错误] {error_msg}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"[频道创建-步骤13-错误] {error_msg}", exc_info=True)
             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
             return "failed", error_msg
         
         # === 步骤14: 检查频道是否创建成功 ===
-        print(f"[频道创建-步骤14] 检查频道是否创建成功...")
+        logger.info(f"[频道创建-步骤14] 检查频道是否创建成功...")
         add_channel_log(account_id, browser_env_id, 'info', '步骤14: 检查频道创建结果')
         try:
             current_url = driver.current_url
-            print(f"[频道创建-步骤14] 创建后URL: {current_url}")
+            logger.info(f"[频道创建-步骤14] 创建后URL: {current_url}")
             
             # 检查URL或页面元素判断是否成功
             # 成功的话通常会跳转到频道页面或Studio页面
             if "channel" in current_url.lower() or "studio" in current_url.lower():
-                print(f"[频道创建-步骤14] ✅ 频道创建成功")
+                logger.info(f"[频道创建-步骤14] ✅ 频道创建成功")
                 add_channel_log(account_id, browser_env_id, 'success', '步骤14: 检测到频道创建成功')
                 channel_url = current_url
-                print(f"[频道创建] 频道链接: {channel_url}")
+                logger.info(f"[频道创建] 频道链接: {channel_url}")
                 
                 # 15. 检测创收要求（3m或10m）
                 monetization_req = None
                 try:
-                    print(f"[频道创建] 开始检测创收要求...")
+                    logger.info(f"[频道创建] 开始检测创收要求...")
                     monetization_req = detect_monetization_requirement(driver, channel_url, account_id, browser_env_id)
                     if monetization_req:
-                        print(f"[频道创建] ✅ 创收要求检测成功: {monetization_req}")
+                        logger.info(f"[频道创建] ✅ 创收要求检测成功: {monetization_req}")
                     else:
-                        print(f"[频道创建] ⚠️ 创收要求检测失败，将保存为空")
+                        logger.warning(f"[频道创建] ⚠️ 创收要求检测失败，将保存为空")
                 except Exception as detect_error:
-                    print(f"[频道创建警告] 检测创收要求失败: {str(detect_error)}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.warning(f"[频道创建警告] 检测创收要求失败: {str(detect_error)}", exc_info=True)
                 
                 # 16. 保存频道信息到数据库（包括创收要求）
                 try:
-                    from models import Account
                     account = Account.query.get(account_id)
                     if account:
                         account.channel_status = 'created'
                         account.channel_url = channel_url
                         account.monetization_requirement = monetization_req
                         db.session.commit()
-                        print(f"[频道创建] ✅ 已保存频道信息到数据库（创收要求: {monetization_req or '未检测到'}）")
+                        logger.info(f"[频道创建] ✅ 已保存频道信息到数据库（创收要求: {monetization_req or '未检测到'}）")
                 except Exception as db_error:
-                    print(f"[频道创建警告] 保存频道信息失败: {str(db_error)}")
+                    logger.warning(f"[频道创建警告] 保存频道信息失败: {str(db_error)}")
                 
-                # 17. 删除使用的头像
+                # 17. 记录头像已使用并删除
+                try:
+                    avatar_service.mark_avatar_used(avatar_path, account_id)
+                    avatar_used = True
+                except Exception as mark_error:
+                    logger.warning(f"[频道创建警告] 记录头像使用失败: {str(mark_error)}")
                 try:
                     if avatar_path and os.path.exists(avatar_path):
                         os.remove(avatar_path)
-                        print(f"[频道创建] 已删除使用的头像: {avatar_path}")
+                        logger.info(f"[频道创建] 已删除使用的头像: {avatar_path}")
                         add_channel_log(account_id, browser_env_id, 'info', f'已删除使用的头像: {os.path.basename(avatar_path)}')
                 except Exception as del_error:
-                    print(f"[频道创建警告] 删除头像失败: {str(del_error)}")
+                    logger.warning(f"[频道创建警告] 删除头像失败: {str(del_error)}")
                 
                 success_msg = f"✅ 频道创建成功！名称: {channel_name}, 链接: {channel_url}, 创收要求: {monetization_req or '未检测到'}"
-                print(f"[频道创建-步骤14] {success_msg}")
+                logger.info(f"[频道创建-步骤14] {success_msg}")
                 add_channel_log(account_id, browser_env_id, 'success', f'步骤14完成: {success_msg}')
                 return "success", success_msg
             else:
@@ -2320,10 +2349,9 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                     if error_elements:
                         error_text = " ".join([elem.text for elem in error_elements if elem.text])
                         error_msg = f"步骤14失败: 检测到错误: {error_text}"
-                        print(f"[频道创建-步骤14-错误] {error_msg}")
+                        logger.error(f"[频道创建-步骤14-错误] {error_msg}")
                         # 更新数据库状态为失败
                         try:
-                            from models import Account
                             account = Account.query.get(account_id)
                             if account:
                                 account.channel_status = 'failed'
@@ -2336,46 +2364,56 @@ def create_youtube_channel(driver, account_id=None, browser_env_id=None):
                     pass
                 
                 error_msg = f"步骤14失败: 未明确确认频道创建成功，当前URL: {current_url}"
-                print(f"[频道创建-步骤14-错误] {error_msg}")
+                logger.error(f"[频道创建-步骤14-错误] {error_msg}")
                 add_channel_log(account_id, browser_env_id, 'failed', error_msg)
                 return "failed", "频道创建状态不明确，请手动检查"
             
         except Exception as e:
             error_msg = f"步骤14失败: 检查创建结果失败: {str(e)}"
-            print(f"[频道创建-步骤14-错误] {error_msg}")
+            logger.error(f"[频道创建-步骤14-错误] {error_msg}")
             add_channel_log(account_id, browser_env_id, 'failed', error_msg)
             return "failed", error_msg
         
     except Exception as e:
         error_msg = f"创建频道过程发生未预期的异常: {str(e)}"
-        print(f"[频道创建-异常] {error_msg}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"[频道创建-异常] {error_msg}", exc_info=True)
         add_channel_log(account_id, browser_env_id, 'failed', f'频道创建异常: {str(e)}')
         
-        # 如果出错且头像已获取，尝试删除（可选）
-        # 如果不确定是否使用了头像，可以选择不删除
-        
         return "failed", error_msg
+    
+    finally:
+        # 未成功使用的头像归还头像目录，供其他账号使用
+        if avatar_path and not avatar_used:
+            try:
+                avatar_service.release_avatar(avatar_path)
+            except Exception as release_error:
+                logger.warning(f"[频道创建警告] 归还头像失败: {str(release_error)}")
+
 
+# 批量创建频道并发数（多个 HubStudio 实例时为各实例容量之和，见 hubstudio_service.batch_concurrency）
+BATCH_CONCURRENCY = 3
+# 每个工作线程处理完一个账号后的等待时间范围（秒）
+ITEM_INTERVAL = (1, 2)
 
-# 批量任务停止标志
-stop_batch_tasks = False
 
+def batch_create_channel_task(app, account_ids, job=None):
+    """批量创建频道任务（速率控制：默认最多3个并发，间隔1-2秒）
 
-def batch_create_channel_task(app, account_ids):
-    """批量创建频道任务（速率控制：最多3个并发，间隔1-2秒）"""
+    Args:
+        app: Flask 应用
+        account_ids: 账号ID列表
+        job: 进度任务（job_service.BatchJob），用于实时上报每个账号的结果，
+            其取消令牌用于停止本批次（不影响其他批次）
+    """
     import random
     import threading
     from queue import Queue
-    from models import Account
     from services import hubstudio_service
     
-    global stop_batch_tasks
-    stop_batch_tasks = False
+    token = job.cancel_token if job else CancelToken()
     
     with app.app_context():
-        print(f"\n========== 开始批量创建频道 {len(account_ids)} 个账号 ==========")
+        logger.info(f"========== 开始批量创建频道 {len(account_ids)} 个账号 ==========")
         
         # 创建任务队列
         task_queue = Queue()
@@ -2384,75 +2422,92 @@ def batch_create_channel_task(app, account_ids):
         
         # 工作线程函数
         def worker():
-            with app.app_context():
-                while not task_queue.empty() and not stop_batch_tasks:
+            with app.app_context(), log_context(stage='create_channel'), cancel_scope(token):
+                while not task_queue.empty() and not token.cancelled:
                     driver = None
                     account_id = None
                     browser_env_id = None
+                    # 处理结果 (是否成功, 说明)，用于上报任务进度
+                    outcome = None
                     
                     try:
                         account_id = task_queue.get(timeout=1)
-                        print(f"[批量创建频道] 开始处理账号 ID: {account_id}")
+                        update_log_context(account_id=account_id, env_id=None)
+                        logger.info(f"[批量创建频道] 开始处理账号 ID: {account_id}")
+                        if job:
+                            job.start_item(account_id)
+                        
+                        # 获取账号信息（短会话，取出需要的字段，浏览器操作期间不持有连接和 ORM 对象）
+                        with session_scope():
+                            account = Account.query.get(account_id)
+                            if account:
+                                account_name = account.account
+                                login_status = account.login_status
+                                browser_env_id = account.browser_env_id
+                                channel_url = account.channel_url
+                                is_channel_created = account.channel_status == 'created' and account.channel_url
                         
-                        # 获取账号信息
-                        account = Account.query.get(account_id)
                         if not account:
-                            print(f"[批量创建频道错误] 账号不存在: ID {account_id}")
+                            logger.error(f"[批量创建频道错误] 账号不存在: ID {account_id}")
+                            outcome = (False, '账号不存在')
                             task_queue.task_done()
                             continue
                         
                         # 检查是否已登录
-                        if account.login_status not in ['success', 'success_with_verification']:
+                        if login_status not in ['success', 'success_with_verification']:
                             add_channel_log(account_id, None, 'failed', '账号未登录，无法创建频道')
-                            print(f"[批量创建频道] 账号 {account.account} 未登录")
+                            logger.info(f"[批量创建频道] 账号 {account_name} 未登录")
+                            outcome = (False, '账号未登录，无法创建频道')
                             task_queue.task_done()
                             continue
                         
                         # 检查是否有绑定的浏览器环境
-                        if not account.browser_env_id:
+                        if not browser_env_id:
                             add_channel_log(account_id, None, 'failed', '账号未绑定浏览器环境')
-                            print(f"[批量创建频道] 账号 {account.account} 未绑定浏览器环境")
+                            logger.info(f"[批量创建频道] 账号 {account_name} 未绑定浏览器环境")
+                            outcome = (False, '账号未绑定浏览器环境')
                             task_queue.task_done()
                             continue
                         
-                        browser_env_id = account.browser_env_id
+                        update_log_context(env_id=browser_env_id)
                         
                         # 判断是创建频道还是检测创收要求
-                        is_channel_created = account.channel_status == 'created' and account.channel_url
-                        
                         if is_channel_created:
                             # 已创建频道，执行检测操作
-                            print(f"[批量创建频道] 账号 {account.account} 已有频道，开始检测创收要求...")
+                            logger.info(f"[批量创建频道] 账号 {account_name} 已有频道，开始检测创收要求...")
                             add_channel_log(account_id, browser_env_id, 'info', '开始检测创收要求')
                             
                             # 打开浏览器
                             driver = hubstudio_service.open_browser(browser_env_id)
                             if not driver:
                                 add_channel_log(account_id, browser_env_id, 'failed', '浏览器启动失败')
-                                print(f"[批量创建频道错误] 浏览器启动失败")
+                                logger.error(f"[批量创建频道错误] 浏览器启动失败")
+                                outcome = (False, '浏览器启动失败')
                                 task_queue.task_done()
                                 continue
                             
                             # 检测创收要求
-                            result = detect_monetization_requirement(driver, account.channel_url, account_id, browser_env_id)
+                            result = detect_monetization_requirement(driver, channel_url, account_id, browser_env_id)
                             
                             if result:
-                                account.monetization_requirement = result
-                                db.session.commit()
+                                Account.update_by_id(account_id, monetization_requirement=result)
                                 add_channel_log(account_id, browser_env_id, 'success', f'检测成功，创收要求: {result}')
-                                print(f"[批量创建频道] 检测成功: {result}")
+                                logger.info(f"[批量创建频道] 检测成功: {result}")
+                                outcome = (True, f'检测成功，创收要求: {result}')
                             else:
                                 add_channel_log(account_id, browser_env_id, 'failed', '无法检测创收要求')
-                                print(f"[批量创建频道] 检测失败")
+                                logger.info(f"[批量创建频道] 检测失败")
+                                outcome = (False, '无法检测创收要求')
                         else:
                             # 未创建频道，执行创建操作
-                            print(f"[批量创建频道] 账号 {account.account} 开始创建频道...")
+                            logger.info(f"[批量创建频道] 账号 {account_name} 开始创建频道...")
                             
                             # 检查头像可用性 (返回元组: 是否可用, 可用数量, 错误信息)
                             is_available, avatar_count, error_msg = check_avatar_availability()
                             if not is_available:
                                 add_channel_log(account_id, browser_env_id, 'failed', error_msg)
-                                print(f"[批量创建频道错误] {error_msg}")
+                                logger.error(f"[批量创建频道错误] {error_msg}")
+                                outcome = (False, error_msg)
                                 task_queue.task_done()
                                 continue
                             
@@ -2460,7 +2515,8 @@ def batch_create_channel_task(app, account_ids):
                             driver = hubstudio_service.open_browser(browser_env_id)
                             if not driver:
                                 add_channel_log(account_id, browser_env_id, 'failed', '浏览器启动失败')
-                                print(f"[批量创建频道错误] 浏览器启动失败")
+                                logger.error(f"[批量创建频道错误] 浏览器启动失败")
+                                outcome = (False, '浏览器启动失败')
                                 task_queue.task_done()
                                 continue
                             
@@ -2469,29 +2525,42 @@ def batch_create_channel_task(app, account_ids):
                             
                             # 更新账号状态
                             if channel_status == "success":
-                                # 从result_msg中提取频道URL（但create_youtube_channel已经保存到数据库了，这里可能是冗余的）
-                                # 注意：create_youtube_channel函数内部已经更新了数据库，这里实际上不需要再次更新
-                                # 但为了保持一致性，我们刷新账号对象
-                                db.session.refresh(account)
-                                print(f"[批量创建频道] 频道创建成功: {account.channel_url}")
+                                # create_youtube_channel 内部已经保存了频道信息，这里只读取链接用于日志
+                                with session_scope():
+                                    channel_url = db.session.query(Account.channel_url).filter_by(id=account_id).scalar()
+                                logger.info(f"[批量创建频道] 频道创建成功: {channel_url}")
+                                outcome = (True, '频道创建成功')
                             else:
-                                account.channel_status = 'failed'
-                                db.session.commit()
-                                print(f"[批量创建频道] 频道创建失败: {result_msg}")
+                                Account.update_by_id(account_id, channel_status='failed')
+                                logger.info(f"[批量创建频道] 频道创建失败: {result_msg}")
+                                outcome = (False, result_msg)
                         
                         # 任务完成后等待1-2秒
                         if not task_queue.empty():
-                            wait_time = random.uniform(1, 2)
-                            print(f"[批量创建频道] 等待 {wait_time:.1f} 秒后继续下一个...")
-                            time.sleep(wait_time)
+                            wait_time = random.uniform(*ITEM_INTERVAL)
+                            logger.info(f"[批量创建频道] 等待 {wait_time:.1f} 秒后继续下一个...")
+                            interruptible_sleep(wait_time)
                     
                         task_queue.task_done()
+                    except TaskCancelled:
+                        logger.info(f"[批量创建频道] 任务已停止，中断处理")
+                        # 已有处理结果（如在账号间隔等待时被停止）则照常上报结果
+                        if account_id and not outcome:
+                            add_channel_log(account_id, browser_env_id, 'cancelled', '任务已停止，处理中断')
+                            if job:
+                                job.cancel_item(account_id)
+                        break
                     except Exception as e:
-                        print(f"[批量创建频道错误] {str(e)}")
+                        logger.error(f"[批量创建频道错误] {str(e)}")
                         if account_id:
                             add_channel_log(account_id, browser_env_id, 'failed', f'创建失败: {str(e)}')
+                            outcome = (False, f'创建失败: {str(e)}')
                         task_queue.task_done()
                     finally:
+                        if job and account_id and outcome:
+                            job.finish_item(account_id, *outcome)
+                        # 结束本账号的会话，归还连接并清空已加载的对象
+                        db.session.close()
                         # 关闭浏览器
                         if driver:
                             try:
@@ -2504,23 +2573,27 @@ def batch_create_channel_task(app, account_ids):
                             except:
                                 pass
         
-        # 创建3个工作线程
+        # 创建工作线程
         threads = []
-        for i in range(3):
+        concurrency = hubstudio_service.batch_concurrency(BATCH_CONCURRENCY)
+        for i in range(concurrency):
             thread = threading.Thread(target=worker)
             thread.daemon = True
             thread.start()
             threads.append(thread)
             # 启动线程时也间隔一下
-            if i < 2:
+            if i < concurrency - 1:
                 time.sleep(0.5)
         
         # 等待所有任务完成
         for thread in threads:
             thread.join()
         
-        if stop_batch_tasks:
-            print(f"========== 批量创建频道已被用户停止 ==========\n")
+        if job:
+            job.finish()
+        
+        if token.cancelled:
+            logger.info(f"========== 批量创建频道已被用户停止 ==========")
         else:
-            print(f"========== 批量创建频道完成 ==========\n")
+            logger.info(f"========== 批量创建频道完成 ==========")
 
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+配置热加载服务
+
+- 后台线程轮询 config.json 的修改时间，变化后重新读取，无需重启应用
+- 新配置完整解析成功后才整体替换（解析失败时保留当前配置）
+- 配置变化后通知订阅者（HubStudio 客户端、头像目录、申诉文案库等）
+
+读取配置请使用 config.XXX（如 config.HUBSTUDIO_CONFIG），每次读取都是当前配置。
+"""
+import os
+import threading
+import time
+
+import config
+from services.log_service import get_logger
+
+logger = get_logger('config')
+
+# 文件变化检测间隔（秒）
+WATCH_INTERVAL = 2
+
+# 修改后需要重启才能生效的配置（数据库连接、日志处理器、Web 服务线程在启动时创建）
+RESTART_REQUIRED = ('DATABASE_CONFIG', 'MYSQL_CONFIG', 'DB_POOL_CONFIG', 'LOG_CONFIG', 'SERVER_CONFIG')
+
+_lock = threading.Lock()
+# [(关注的配置变量名元组，空表示全部, 回调)]
+_subscribers = []
+_watcher = None
+
+
+def _current_mtime():
+    try:
+        return os.stat(config.CONFIG_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+
+# config 模块导入时已经读取过一次
+_mtime = _current_mtime()
+
+
+def subscribe(callback, *names):
+    """订阅配置变化
+
+    Args:
+        callback: 回调函数，参数为发生变化的配置变量名列表；在执行重新加载的线程中调用
+        names: 关注的配置变量名（如 'HUBSTUDIO_CONFIG'），不传表示关注全部
+    """
+    with _lock:
+        _subscribers.append((names, callback))
+
+
+def reload(force=False):
+    """重新读取 config.json，文件未变化时跳过（force=True 时总是读取）
+
+    Returns:
+        list: 发生变化的配置变量名
+    """
+    global _mtime
+
+    with _lock:
+        mtime = _current_mtime()
+        if mtime is None or (mtime == _mtime and not force):
+            return []
+        _mtime = mtime
+        try:
+            values = config.read_config_file()
+        except (OSError, ValueError) as e:
+            logger.error(f"[配置] 读取 config.json 失败，继续使用当前配置: {str(e)}")
+            return []
+        changed = config.apply_config(values)
+        subscribers = list(_subscribers)
+
+    if not changed:
+        return []
+
+    logger.info(f"[配置] 配置已重新加载，变化: {', '.join(changed)}")
+    restart = [name for name in changed if name in RESTART_REQUIRED]
+    if restart:
+        logger.warning(f"[配置] {', '.join(restart)} 需要重启应用后生效")
+
+    for names, callback in subscribers:
+        hits = [name for name in changed if not names or name in names]
+        if not hits:
+            continue
+        try:
+            callback(hits)
+        except Exception as e:
+            logger.error(f"[配置] 通知配置变化失败: {str(e)}", exc_info=True)
+    return changed
+
+
+def _watch():
+    while True:
+        time.sleep(WATCH_INTERVAL)
+        try:
+            reload()
+        except Exception as e:
+            logger.error(f"[配置] 检查配置文件变化失败: {str(e)}", exc_info=True)
+
+
+def start_watcher():
+    """启动配置文件监控线程（重复调用只启动一次）"""
+    global _watcher
+
+    with _lock:
+        if _watcher is None:
+            _watcher = threading.Thread(target=_watch, name='config-watcher', daemon=True)
+            _watcher.start()
@@ -1,28 +1,271 @@
 # -*- coding: utf-8 -*-
 """
 HubStudio 浏览器服务
+
+支持多个 HubStudio 实例（多台电脑各运行一个 HubStudio）：HUBSTUDIO_CONFIG 顶层的
+base_url / app_id / app_secret 为默认实例，instances 中每一项为一个额外实例。
+每个实例有自己的浏览器环境（BrowserEnv.instance 记录所属实例）和容量（capacity，
+同时运行的浏览器数，0 为不限）：
+- 启动/关闭浏览器按环境所属实例调用对应的 API
+- 启动浏览器时实例已满则等待其他浏览器关闭（可被任务停止打断）
+- 分配新环境时优先选择空闲容量最多的实例（instances_by_free_capacity）
+运行中的浏览器记录在 hubstudio_slots 表中（每个运行名额一行），Web 进程和单独部署的
+工作进程共享同一份容量；只有一个实例且不限容量时不记录。
 """
+import itertools
+import threading
+from datetime import datetime, timedelta
+
 import requests
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from config import HUBSTUDIO_CONFIG
+from sqlalchemy.exc import IntegrityError
+
+import config
+from services import config_service
+from services.job_service import check_cancelled
+from services.log_service import get_logger
+
+logger = get_logger('hubstudio')
+
+# 默认实例（HUBSTUDIO_CONFIG 顶层配置）的名称
+DEFAULT_INSTANCE = 'default'
+# 启动后超过该时长（秒）仍未关闭的浏览器不再计入运行数（进程异常退出未关闭时避免一直占用容量）
+RUNNING_TIMEOUT = 3600
+
+
+class HubStudioInstance:
+    """一个 HubStudio 实例：API 地址、请求头及容量"""
+
+    def __init__(self, name, base_url, app_id, app_secret, capacity=0):
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.headers = {
+            "Content-Type": "application/json",
+            "app-id": app_id,
+            "app-secret": app_secret
+        }
+        self.capacity = int(capacity or 0)
+
+    def free_capacity(self, running):
+        """空闲容量（不限容量时为无穷大）"""
+        if not self.capacity:
+            return float('inf')
+        return self.capacity - running
+
+
+# 实例列表缓存（配置变化时重建）；本进程关闭浏览器时通过 _condition 唤醒等待名额的线程
+_instances = None
+_condition = threading.Condition()
+# 容器编码 -> 实例名称
+_env_instances = {}
+
+
+def _build_instances():
+    hubstudio_config = config.HUBSTUDIO_CONFIG
+    instances = [HubStudioInstance(
+        DEFAULT_INSTANCE, hubstudio_config['base_url'], hubstudio_config['app_id'],
+        hubstudio_config['app_secret'], hubstudio_config.get('capacity', 0)
+    )]
+    for item in hubstudio_config.get('instances') or []:
+        name = item.get('name') or item['base_url']
+        if any(instance.name == name for instance in instances):
+            logger.warning(f"[HubStudio] 实例名称重复，已忽略: {name}")
+            continue
+        instances.append(HubStudioInstance(
+            name, item['base_url'], item.get('app_id', hubstudio_config['app_id']),
+            item.get('app_secret', hubstudio_config['app_secret']), item.get('capacity', 0)
+        ))
+    return instances
+
+
+def get_instances():
+    """全部 HubStudio 实例（第一个为默认实例）"""
+    global _instances
+    with _condition:
+        if _instances is None:
+            _instances = _build_instances()
+        return _instances
+
+
+def is_multi_instance():
+    return len(get_instances()) > 1
+
+
+def get_instance(name=None):
+    """按名称获取实例，名称为空或未配置时返回默认实例"""
+    instances = get_instances()
+    return next((instance for instance in instances if instance.name == name), instances[0])
+
+
+def tracks_running():
+    """是否记录运行中的浏览器：多个实例（按运行数分配环境）或设置了容量时"""
+    return is_multi_instance() or bool(get_instance().capacity)
+
+
+def running_counts():
+    """实例名称 -> 运行中的浏览器数（所有进程合计，启动超过 RUNNING_TIMEOUT 秒的不计）"""
+    if not tracks_running():
+        return {}
+    from models import db, HubStudioSlot
+
+    deadline = datetime.now() - timedelta(seconds=RUNNING_TIMEOUT)
+    with db.engine.connect() as connection:
+        rows = connection.execute(
+            db.select(HubStudioSlot.instance, db.func.count(HubStudioSlot.id))
+            .where(HubStudioSlot.acquired_at >= deadline)
+            .group_by(HubStudioSlot.instance)
+        )
+        return dict(rows.all())
+
+
+def instances_by_free_capacity():
+    """按空闲容量从多到少排列的实例（空闲容量相同时运行数少的在前），用于分配新环境"""
+    counts = running_counts()
+    return sorted(get_instances(), key=lambda instance: (
+        -instance.free_capacity(counts.get(instance.name, 0)), counts.get(instance.name, 0)))
+
+
+def instance_for_new_env(env_counts):
+    """选择创建新环境的实例：已有环境数与容量之比最小的实例（不限容量的实例按容量 1 计）
+
+    Args:
+        env_counts: 实例名称 -> 已有环境数，调用方每创建一个环境后自行加 1
+    """
+    return min(get_instances(), key=lambda instance: env_counts.get(instance.name, 0) / (instance.capacity or 1))
+
+
+def batch_concurrency(default):
+    """批量任务的并发数：单实例时为 default；多实例时为各实例容量之和（不限容量的实例按 default 计）"""
+    instances = get_instances()
+    if len(instances) == 1:
+        return default
+    return sum(instance.capacity or default for instance in instances)
+
+
+def remember_env_instance(container_code, instance_name):
+    """记录环境所属实例（同步、创建环境后调用，省去启动浏览器时的查询）"""
+    _env_instances[container_code] = instance_name or DEFAULT_INSTANCE
+
+
+def instance_for_env(container_code):
+    """环境所属的实例（单实例时直接返回默认实例）"""
+    if not is_multi_instance():
+        return get_instance()
+    name = _env_instances.get(container_code)
+    if name is None:
+        from models import db, BrowserEnv
+
+        # 使用独立连接查询，不影响调用方会话中的对象和事务
+        with db.engine.connect() as connection:
+            name = connection.execute(
+                db.select(BrowserEnv.instance).where(BrowserEnv.container_code == container_code)
+            ).scalar()
+        remember_env_instance(container_code, name)
+        name = _env_instances[container_code]
+    return get_instance(name)
+
+
+def _acquire_slot(instance, container_code):
+    """占用实例的一个运行名额，已满时等待
+
+    其他进程关闭浏览器不会唤醒本进程，因此每秒重试一次，同时检查任务是否已停止。
+    """
+    if not tracks_running():
+        return
+    waited = False
+    while not _try_acquire_slot(instance, container_code):
+        if not waited:
+            logger.info(f"[HubStudio] 实例 {instance.name} 已达容量 {instance.capacity}，等待其他浏览器关闭")
+            waited = True
+        with _condition:
+            _condition.wait(1)
+        check_cancelled()
+
 
+def _try_acquire_slot(instance, container_code):
+    """插入一行名额记录；名额编号由唯一约束保证不会被两个进程同时占用
 
-def get_hubstudio_headers():
+    使用独立连接，不影响调用方会话中的对象和事务。
+
+    Returns:
+        bool: 是否占用成功（设置了容量且已满时为 False）
+    """
+    from models import db, HubStudioSlot
+
+    slots = HubStudioSlot.__table__
+    now = datetime.now()
+    with db.engine.begin() as connection:
+        expired = connection.execute(slots.delete().where(
+            slots.c.instance == instance.name,
+            slots.c.acquired_at < now - timedelta(seconds=RUNNING_TIMEOUT)
+        )).rowcount
+        if expired:
+            logger.warning(f"[HubStudio] 实例 {instance.name} 有 {expired} 个浏览器启动超过 {RUNNING_TIMEOUT} 秒未关闭，"
+                           f"不再计入运行数")
+        # 同一环境重复启动时沿用已占用的名额
+        if connection.execute(slots.update().where(
+            slots.c.instance == instance.name, slots.c.container_code == container_code
+        ).values(acquired_at=now)).rowcount:
+            return True
+        occupied = set(connection.execute(
+            db.select(slots.c.slot).where(slots.c.instance == instance.name)
+        ).scalars())
+
+    # 不限容量时编号只用于区分记录，总能找到未占用的编号
+    for slot in range(instance.capacity) if instance.capacity else itertools.count():
+        if slot in occupied:
+            continue
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(slots.insert().values(
+                    instance=instance.name, slot=slot, container_code=container_code, acquired_at=now
+                ))
+            return True
+        except IntegrityError:
+            # 其他进程刚占用了这个名额
+            continue
+    return False
+
+
+def _release_slot(instance, container_code):
+    if not tracks_running():
+        return
+    from models import db, HubStudioSlot
+
+    slots = HubStudioSlot.__table__
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(slots.delete().where(
+                slots.c.instance == instance.name, slots.c.container_code == container_code
+            ))
+    except Exception as e:
+        logger.warning(f"[HubStudio] 释放实例 {instance.name} 的运行名额失败（{RUNNING_TIMEOUT} 秒后自动失效）: {e}")
+    with _condition:
+        _condition.notify_all()
+
+
+def get_hubstudio_headers(instance=None):
     """获取HubStudio API请求头"""
-    return {
-        "Content-Type": "application/json",
-        "app-id": HUBSTUDIO_CONFIG["app_id"],
-        "app-secret": HUBSTUDIO_CONFIG["app_secret"]
-    }
+    return get_instance(instance).headers
 
 
-def check_api_status():
-    """检查HubStudio API连接状态"""
+def _on_config_changed(names):
+    global _instances
+    with _condition:
+        _instances = _build_instances()
+    logger.info(f"[HubStudio] 配置已更新，API地址: "
+                f"{', '.join(f'{instance.name}={instance.base_url}' for instance in _instances)}")
+
+
+config_service.subscribe(_on_config_changed, 'HUBSTUDIO_CONFIG')
+
+
+def check_api_status(instance=None):
+    """检查HubStudio API连接状态（instance 为实例名称，默认为默认实例）"""
+    instance = get_instance(instance)
     try:
         response = requests.post(
-            f"{HUBSTUDIO_CONFIG['base_url']}/api/v1/group/list",
-            headers=get_hubstudio_headers(),
+            f"{instance.base_url}/api/v1/group/list",
+            headers=instance.headers,
             timeout=5
         )
         if response.status_code == 200:
@@ -33,12 +276,13 @@ def check_api_status():
         return False
 
 
-def get_groups():
+def get_groups(instance=None):
     """获取HubStudio分组列表"""
+    instance = get_instance(instance)
     try:
         response = requests.post(
-            f"{HUBSTUDIO_CONFIG['base_url']}/api/v1/group/list",
-            headers=get_hubstudio_headers(),
+            f"{instance.base_url}/api/v1/group/list",
+            headers=instance.headers,
             timeout=10
         )
         if response.status_code == 200:
@@ -50,8 +294,9 @@ def get_groups():
         return []
 
 
-def get_browsers(page=1, page_size=20, search='', group_code=''):
+def get_browsers(page=1, page_size=20, search='', group_code='', instance=None):
     """获取HubStudio浏览器窗口列表"""
+    instance = get_instance(instance)
     try:
         request_data = {
             "page": page,
@@ -64,8 +309,8 @@ def get_browsers(page=1, page_size=20, search='', group_code=''):
             request_data["tagCode"] = group_code
         
         response = requests.post(
-            f"{HUBSTUDIO_CONFIG['base_url']}/api/v1/env/list",
-            headers=get_hubstudio_headers(),
+            f"{instance.base_url}/api/v1/env/list",
+            headers=instance.headers,
             json=request_data,
             timeout=10
         )
@@ -83,93 +328,145 @@ def get_browsers(page=1, page_size=20, search='', group_code=''):
         return {'browsers': [], 'total': 0}
 
 
-def open_browser(container_code, is_headless=False):
-    """打开HubStudio浏览器并返回WebDriver"""
+def get_all_browsers(page_size=500, search='', group_code='', instance=None):
+    """分页获取全部HubStudio浏览器窗口（环境数量超过一页时逐页读取）"""
+    browsers = []
+    page = 1
+    while True:
+        result = get_browsers(page, page_size, search, group_code, instance)
+        browsers.extend(result['browsers'])
+        if not result['browsers'] or len(browsers) >= result['total']:
+            return browsers
+        page += 1
+
+
+def start_browser(container_code, is_headless=False):
+    """调用环境所属实例的HubStudio接口启动浏览器环境
+
+    实例设置了容量且已满时，先等待该实例上其他浏览器关闭。
+
+    Returns:
+        dict: 启动信息，包含 debuggingPort、webdriver
+
+    Raises:
+        Exception: 接口请求失败或返回数据不完整（连接错误、超时为 requests 的异常）
+    """
+    instance = instance_for_env(container_code)
+    request_data = {
+        "containerCode": container_code,
+        "isHeadless": is_headless,
+        "isWebDriverReadOnlyMode": False
+    }
+    
+    _acquire_slot(instance, container_code)
     try:
-        print(f"[HubStudio] 准备启动浏览器环境: {container_code}")
-        request_data = {
-            "containerCode": container_code,
-            "isHeadless": is_headless,
-            "isWebDriverReadOnlyMode": False
-        }
-        
-        print(f"[HubStudio] 发送启动请求到: {HUBSTUDIO_CONFIG['base_url']}/api/v1/browser/start")
+        logger.info(f"[HubStudio] 发送启动请求到: {instance.base_url}/api/v1/browser/start")
         response = requests.post(
-            f"{HUBSTUDIO_CONFIG['base_url']}/api/v1/browser/start",
-            headers=get_hubstudio_headers(),
+            f"{instance.base_url}/api/v1/browser/start",
+            headers=instance.headers,
             json=request_data,
             timeout=30
         )
+        debug_info = _parse_start_response(response)
+    except BaseException:
+        _release_slot(instance, container_code)
+        raise
+    return debug_info
+
+
+def _parse_start_response(response):
+    """校验启动接口的响应，返回启动信息"""
+    logger.info(f"[HubStudio] API 响应状态码: {response.status_code}")
+    
+    if response.status_code != 200:
+        error_msg = f"API请求失败: HTTP {response.status_code}"
+        logger.error(f"[HubStudio错误] {error_msg}")
+        raise Exception(error_msg)
+    
+    data = response.json()
+    logger.info(f"[HubStudio] API 响应数据: code={data.get('code')}, msg={data.get('msg')}")
+    
+    if data.get("code") != 0:
+        error_msg = f"启动浏览器失败: {data.get('msg', '未知错误')}"
+        logger.error(f"[HubStudio错误] {error_msg}")
+        raise Exception(error_msg)
+    
+    debug_info = data.get("data", {})
+    debugging_port = debug_info.get("debuggingPort")
+    webdriver_path = debug_info.get("webdriver")
+    
+    logger.info(f"[HubStudio] 调试端口: {debugging_port}, WebDriver路径: {webdriver_path}")
+    
+    if not debugging_port or not webdriver_path:
+        error_msg = f"响应数据不完整: debuggingPort={debugging_port}, webdriver={webdriver_path}"
+        logger.error(f"[HubStudio错误] {error_msg}")
+        raise Exception(error_msg)
+    return debug_info
+
+
+def open_browser(container_code, is_headless=False):
+    """打开HubStudio浏览器并返回WebDriver"""
+    try:
+        logger.info(f"[HubStudio] 准备启动浏览器环境: {container_code}")
+        debug_info = start_browser(container_code, is_headless)
+        debugging_port = debug_info["debuggingPort"]
+        webdriver_path = debug_info["webdriver"]
         
-        print(f"[HubStudio] API 响应状态码: {response.status_code}")
-        
-        if response.status_code != 200:
-            error_msg = f"API请求失败: HTTP {response.status_code}"
-            print(f"[HubStudio错误] {error_msg}")
-            raise Exception(error_msg)
-        
-        data = response.json()
-        print(f"[HubStudio] API 响应数据: code={data.get('code')}, msg={data.get('msg')}")
-        
-        if data.get("code") != 0:
-            error_msg = f"启动浏览器失败: {data.get('msg', '未知错误')}"
-            print(f"[HubStudio错误] {error_msg}")
-            raise Exception(error_msg)
-        
-        debug_info = data.get("data", {})
-        debugging_port = debug_info.get("debuggingPort")
-        webdriver_path = debug_info.get("webdriver")
-        
-        print(f"[HubStudio] 调试端口: {debugging_port}, WebDriver路径: {webdriver_path}")
-        
-        if not debugging_port or not webdriver_path:
-            error_msg = f"响应数据不完整: debuggingPort={debugging_port}, webdriver={webdriver_path}"
-            print(f"[HubStudio错误] {error_msg}")
-            raise Exception(error_msg)
-        
-        chrome_options = webdriver.ChromeOptions()
-        chrome_options.add_experimental_option("debuggerAddress", f"localhost:{debugging_port}")
-        
-        print(f"[HubStudio] 正在连接到浏览器...")
-        chrome_service = Service(webdriver_path)
-        driver = webdriver.Chrome(service=chrome_service, options=chrome_options)
-        print(f"[HubStudio] 浏览器连接成功！")
+        try:
+            # selenium 较重，只在打开浏览器时导入
+            from selenium import webdriver
+            from selenium.webdriver.chrome.service import Service
+            
+            chrome_options = webdriver.ChromeOptions()
+            chrome_options.add_experimental_option("debuggerAddress", f"localhost:{debugging_port}")
+            
+            logger.info(f"[HubStudio] 正在连接到浏览器...")
+            chrome_service = Service(webdriver_path)
+            driver = webdriver.Chrome(service=chrome_service, options=chrome_options)
+        except Exception:
+            # 浏览器已启动但连接失败：关闭浏览器，释放实例的运行名额
+            close_browser(container_code)
+            raise
+        logger.info(f"[HubStudio] 浏览器连接成功！")
         return driver
         
     except requests.exceptions.ConnectionError as e:
-        error_msg = f"无法连接到 HubStudio API ({HUBSTUDIO_CONFIG['base_url']}): {str(e)}"
-        print(f"[HubStudio连接错误] {error_msg}")
-        print(f"[HubStudio提示] 请检查: 1) HubStudio 是否正在运行 2) API 地址是否正确")
+        error_msg = f"无法连接到 HubStudio API ({instance_for_env(container_code).base_url}): {str(e)}"
+        logger.error(f"[HubStudio连接错误] {error_msg}")
+        logger.info(f"[HubStudio提示] 请检查: 1) HubStudio 是否正在运行 2) API 地址是否正确")
         return None
     except requests.exceptions.Timeout as e:
         error_msg = f"连接 HubStudio API 超时: {str(e)}"
-        print(f"[HubStudio超时错误] {error_msg}")
+        logger.error(f"[HubStudio超时错误] {error_msg}")
         return None
     except Exception as e:
         error_msg = f"打开浏览器失败: {str(e)}"
-        print(f"[HubStudio错误] {error_msg}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"[HubStudio错误] {error_msg}", exc_info=True)
         return None
 
 
 def close_browser(container_code):
-    """关闭HubStudio浏览器"""
+    """关闭HubStudio浏览器（并释放所属实例的运行名额）"""
+    instance = instance_for_env(container_code)
     try:
         response = requests.post(
-            f"{HUBSTUDIO_CONFIG['base_url']}/api/v1/browser/stop",
-            headers=get_hubstudio_headers(),
+            f"{instance.base_url}/api/v1/browser/stop",
+            headers=instance.headers,
             json={"containerCode": container_code},
             timeout=10
         )
         return response.status_code == 200
     except Exception as e:
-        print(f"关闭浏览器失败: {e}")
+        logger.warning(f"[HubStudio] 关闭浏览器失败: {e}")
         return False
+    finally:
+        _release_slot(instance, container_code)
 
 
-def create_environment(env_name, group_name, proxy_server, proxy_port, proxy_account, proxy_password, core_version):
-    """创建HubStudio浏览器环境"""
+def create_environment(env_name, group_name, proxy_server, proxy_port, proxy_account, proxy_password, core_version,
+                       instance=None):
+    """在指定实例（默认为默认实例）上创建HubStudio浏览器环境"""
+    instance = get_instance(instance)
     try:
         request_data = {
             "containerName": env_name,
@@ -184,8 +481,8 @@ def create_environment(env_name, group_name, proxy_server, proxy_port, proxy_acc
         }
         
         response = requests.post(
-            f"{HUBSTUDIO_CONFIG['base_url']}/api/v1/env/create",
-            headers=get_hubstudio_headers(),
+            f"{instance.base_url}/api/v1/env/create",
+            headers=instance.headers,
             json=request_data,
             timeout=30
         )
@@ -193,7 +490,9 @@ def create_environment(env_name, group_name, proxy_server, proxy_port, proxy_acc
         if response.status_code == 200:
             result = response.json()
             if result.get("code") == 0:
-                return True, result.get("data", {}).get("containerCode", "")
+                container_code = result.get("data", {}).get("containerCode", "")
+                remember_env_instance(container_code, instance.name)
+                return True, container_code
             else:
                 return False, result.get('msg', '未知错误')
         else:
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""
+批量任务服务
+
+批量任务通过数据库（jobs 表）排队：Web 端只负责入队、停止和查询进度，
+工作进程（python -m services.worker，或 Web 进程内嵌的工作线程）领取任务执行，
+执行中用 BatchJob 记录每个账号的开始/结束，并定期把进度快照回写到任务记录。
+
+每个任务带一个取消令牌：工作线程通过 cancel_scope 绑定令牌后，
+业务代码中的 interruptible_sleep / check_cancelled 会在任务被停止时
+抛出 TaskCancelled，使正在进行的账号在数秒内退出并释放浏览器。
+停止请求通过任务记录的 cancel_requested 传给工作进程。
+"""
+import contextvars
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from models import Job, format_datetime, session_scope
+
+# 已结束任务在任务列表中显示的时长（秒）
+FINISHED_JOB_TTL = 3600
+# 每个任务保留的最近账号事件数（回写到任务记录，用于新打开的页面回放）
+MAX_JOB_EVENTS = 50
+
+# 任务类型显示名称
+JOB_TYPES = {
+    'batch_login': '批量登录',
+    'batch_create_channel': '批量创建频道',
+    'monetization_sweep': '创收要求复查',
+}
+
+# 当前线程绑定的取消令牌
+_current_token = contextvars.ContextVar('cancel_token', default=None)
+
+
+class TaskCancelled(BaseException):
+    """任务已被停止
+
+    继承 BaseException，避免被业务代码中大量的 except Exception 吞掉。
+    """
+
+
+class CancelToken:
+    """协作式取消令牌（每个批量任务一个，互不影响）"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def wait(self, seconds):
+        """等待指定秒数，期间被取消则提前返回 True"""
+        return self._event.wait(seconds)
+
+
+@contextmanager
+def cancel_scope(token):
+    """在当前线程内绑定取消令牌"""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def check_cancelled():
+    """当前任务已被停止时抛出 TaskCancelled（未绑定令牌时什么都不做）"""
+    token = _current_token.get()
+    if token is not None and token.cancelled:
+        raise TaskCancelled()
+
+
+def interruptible_sleep(seconds):
+    """可被任务停止打断的 time.sleep"""
+    token = _current_token.get()
+    if token is None:
+        time.sleep(seconds)
+    elif token.cancelled or token.wait(seconds):
+        raise TaskCancelled()
+
+
+class BatchJob:
+    """一次批量任务的进度状态"""
+
+    def __init__(self, job_type, account_ids, concurrency=1, job_id=None):
+        self.id = job_id or uuid.uuid4().hex[:12]
+        self.type = job_type
+        self.total = len(account_ids)
+        self.concurrency = concurrency
+        self.queued = self.total
+        self.running = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.cancelled = 0
+        # 自动重试的次数（重试的账号会重新计入 queued）
+        self.retried = 0
+        # running / stopped / finished
+        self.status = 'running'
+        self.created_at = time.time()
+        self.finished_at = None
+        self.events = deque(maxlen=MAX_JOB_EVENTS)
+        # 事件序号，每发布一个事件加一（回写进度时据此判断是否有变化）
+        self.seq = 0
+        self._running_since = {}
+        self._lock = threading.Lock()
+        self.cancel_token = CancelToken()
+
+    # ---------- 工作线程调用 ----------
+
+    def start_item(self, account_id, message=''):
+        """标记某个账号开始处理"""
+        with self._lock:
+            self.queued = max(self.queued - 1, 0)
+            self.running += 1
+            self._running_since[account_id] = time.time()
+            self._publish_locked('item', account_id=account_id, state='running', message=message)
+
+    def finish_item(self, account_id, success, message=''):
+        """标记某个账号处理结束"""
+        with self._lock:
+            started = self._running_since.pop(account_id, None)
+            if started is None:
+                # 未经过 start_item 直接结束（如提前校验失败）
+                self.queued = max(self.queued - 1, 0)
+            else:
+                self.running = max(self.running - 1, 0)
+            if success:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            duration = round(time.time() - started, 1) if started else 0
+            self._publish_locked(
+                'item',
+                account_id=account_id,
+                state='succeeded' if success else 'failed',
+                message=message,
+                duration=duration
+            )
+
+    def retry_item(self, account_id, message='', delay=0):
+        """标记某个账号处理失败、已重新入队等待重试"""
+        with self._lock:
+            started = self._running_since.pop(account_id, None)
+            if started is not None:
+                self.running = max(self.running - 1, 0)
+            self.queued += 1
+            self.retried += 1
+            self._publish_locked('item', account_id=account_id, state='retrying', message=message, retry_in=int(delay))
+
+    def cancel_item(self, account_id, message='任务已停止'):
+        """标记某个账号因任务停止而中断"""
+        with self._lock:
+            started = self._running_since.pop(account_id, None)
+            if started is None:
+                self.queued = max(self.queued - 1, 0)
+            else:
+                self.running = max(self.running - 1, 0)
+            self.cancelled += 1
+            self._publish_locked('item', account_id=account_id, state='cancelled', message=message)
+
+    def cancel(self):
+        """停止任务：正在处理的账号会在下一次等待/轮询时中断"""
+        self.cancel_token.cancel()
+        with self._lock:
+            if self.finished_at is None:
+                self._publish_locked('stopping')
+
+    def finish(self):
+        """标记整个任务结束"""
+        with self._lock:
+            if self.finished_at is not None:
+                return
+            self.status = 'stopped' if self.cancel_token.cancelled else 'finished'
+            # 停止时尚未开始的账号一并计为已取消
+            self.cancelled += self.queued
+            self.queued = 0
+            self.finished_at = time.time()
+            self._publish_locked('done')
+
+    # ---------- 查询 ----------
+
+    def eta_seconds(self):
+        """根据已完成账号的吞吐量估算剩余时间（秒），无法估算时返回 None"""
+        done = self.succeeded + self.failed
+        remaining = self.queued + self.running
+        if self.finished_at is not None or remaining == 0:
+            return 0
+        if done == 0:
+            return None
+        elapsed = time.time() - self.created_at
+        return int(elapsed / done * remaining)
+
+    def counts(self):
+        return {
+            'total': self.total,
+            'queued': self.queued,
+            'running': self.running,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'retried': self.retried,
+        }
+
+    def snapshot(self):
+        """进度快照（回写到任务记录的 progress 字段）"""
+        with self._lock:
+            return {
+                'seq': self.seq,
+                'counts': self.counts(),
+                'eta': self.eta_seconds(),
+                'events': list(self.events),
+            }
+
+    def _publish_locked(self, event_type, **payload):
+        self.seq += 1
+        event = {
+            'seq': self.seq,
+            'type': event_type,
+            'job_id': self.id,
+            'time': time.strftime('%H:%M:%S'),
+            'status': self.status,
+            'counts': self.counts(),
+            'eta': self.eta_seconds(),
+        }
+        event.update(payload)
+        self.events.append(event)
+
+
+# ---------- Web 端：入队、查询、停止 ----------
+
+def _load_progress(record):
+    if record.progress:
+        try:
+            return json.loads(record.progress)
+        except ValueError:
+            pass
+    total = len(json.loads(record.account_ids))
+    counts = {'total': total, 'queued': total, 'running': 0, 'succeeded': 0,
+              'failed': 0, 'cancelled': 0, 'retried': 0}
+    return {'seq': 0, 'counts': counts, 'eta': None, 'events': []}
+
+
+def job_to_dict(record, with_events=False):
+    """任务记录 -> 接口返回的数据（与 SSE 事件中的字段一致）"""
+    progress = _load_progress(record)
+    end = record.finished_at or datetime.now()
+    data = {
+        'id': record.id,
+        'type': record.type,
+        'type_text': JOB_TYPES.get(record.type, record.type),
+        'status': record.status,
+        'cancel_requested': bool(record.cancel_requested),
+        'worker': record.worker or '',
+        'seq': progress['seq'],
+        'counts': progress['counts'],
+        'eta': progress['eta'] if record.status == 'running' else (None if record.status == 'queued' else 0),
+        'created_at': format_datetime(record.created_at),
+        'elapsed': int((end - record.created_at).total_seconds()) if record.created_at else 0,
+    }
+    if with_events:
+        data['events'] = progress['events']
+    return data
+
+
+def create_job(job_type, account_ids, job_id=None):
+    """批量任务入队，由工作进程领取执行
+
+    Args:
+        job_id: 指定任务ID（默认随机生成）；ID 已存在时插入失败（IntegrityError），
+            多个进程可以用同一个确定的ID抢占入队，只有一个成功
+
+    Returns:
+        str: 任务ID
+    """
+    job_id = job_id or uuid.uuid4().hex[:12]
+    with session_scope() as session:
+        session.add(Job(
+            id=job_id,
+            type=job_type,
+            account_ids=json.dumps(list(account_ids)),
+            status='queued',
+            cancel_requested=False,
+        ))
+    return job_id
+
+
+def get_job(job_id, with_events=False):
+    """按ID获取任务，不存在返回 None"""
+    record = Job.query.get(job_id)
+    return job_to_dict(record, with_events) if record else None
+
+
+def list_jobs():
+    """获取排队中、运行中以及最近结束的任务（最新的在前）"""
+    since = datetime.now() - timedelta(seconds=FINISHED_JOB_TTL)
+    records = Job.query.filter(
+        Job.status.in_(['queued', 'running']) | (Job.finished_at >= since)
+    ).order_by(Job.created_at.desc()).limit(100).all()
+    return [job_to_dict(record) for record in records]
+
+
+def _stop_queued_jobs(query):
+    """停止尚未开始的任务（直接标记为已停止，全部账号计为已取消），返回停止的任务数"""
+    count = 0
+    for record in query.filter(Job.status == 'queued').all():
+        progress = _load_progress(record)
+        counts = progress['counts']
+        counts['cancelled'] += counts['queued']
+        counts['queued'] = 0
+        progress['eta'] = 0
+        # 条件更新：工作进程可能刚好领取了该任务
+        count += Job.query.filter_by(id=record.id, status='queued').update({
+            'status': 'stopped',
+            'cancel_requested': True,
+            'progress': json.dumps(progress, ensure_ascii=False),
+            'finished_at': datetime.now(),
+        }, synchronize_session=False)
+    return count
+
+
+def cancel_job(job_id):
+    """停止指定任务，任务不存在返回 False
+
+    运行中的任务由工作进程在数秒内读取停止请求并中断正在处理的账号
+    """
+    with session_scope():
+        if not Job.query.get(job_id):
+            return False
+        if not _stop_queued_jobs(Job.query.filter_by(id=job_id)):
+            Job.query.filter_by(id=job_id, status='running').update(
+                {'cancel_requested': True}, synchronize_session=False)
+    return True
+
+
+def cancel_all_jobs():
+    """停止所有排队中和运行中的任务，返回停止的任务数"""
+    with session_scope():
+        count = _stop_queued_jobs(Job.query)
+        count += Job.query.filter(Job.status == 'running', Job.cancel_requested.is_(False)).update(
+            {'cancel_requested': True}, synchronize_session=False)
+    return count
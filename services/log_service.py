@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+结构化日志服务
+
+- 统一的分级日志（替代 print）
+- 账号上下文（account_id / env_id / stage）自动附加到每条日志
+- 基于队列的非阻塞写入：业务线程只负责入队，由后台线程写入按大小轮转的 JSON 文件
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import config
+
+# 日志根名称，所有业务日志挂在该命名空间下
+ROOT_LOGGER_NAME = 'gam'
+
+# 当前线程（协程）的日志上下文
+_log_context = contextvars.ContextVar('log_context', default={})
+
+_setup_lock = threading.Lock()
+_listener = None
+
+
+class ContextFilter(logging.Filter):
+    """把当前日志上下文写入 LogRecord"""
+
+    def filter(self, record):
+        context = _log_context.get()
+        record.account_id = context.get('account_id')
+        record.env_id = context.get('env_id')
+        record.stage = context.get('stage')
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON 行格式，便于按账号筛选日志"""
+
+    def format(self, record):
+        data = {
+            'time': datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'account_id': getattr(record, 'account_id', None),
+            'env_id': getattr(record, 'env_id', None),
+            'stage': getattr(record, 'stage', None),
+            'message': record.getMessage(),
+        }
+        if record.exc_text:
+            data['exc'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """控制台格式，带上账号上下文"""
+
+    def format(self, record):
+        prefix = ''
+        account_id = getattr(record, 'account_id', None)
+        if account_id is not None:
+            prefix = f"[账号{account_id}] "
+        message = f"{self.formatTime(record, '%H:%M:%S')} {record.levelname:<7} {prefix}{record.getMessage()}"
+        if record.exc_text:
+            message += '\n' + record.exc_text
+        return message
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """入队前只做最少的工作：合并消息参数，异常堆栈单独保存"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def setup_logging():
+    """初始化日志管道（幂等）"""
+    global _listener
+
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        handlers = []
+
+        log_dir = config.LOG_CONFIG.get('dir') or 'logs'
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, config.LOG_CONFIG.get('file', 'app.log')),
+            maxBytes=config.LOG_CONFIG.get('max_bytes', 10 * 1024 * 1024),
+            backupCount=config.LOG_CONFIG.get('backup_count', 5),
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+        if config.LOG_CONFIG.get('console', True):
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(config.LOG_CONFIG.get('console_level', 'INFO'))
+            console_handler.setFormatter(ConsoleFormatter())
+            handlers.append(console_handler)
+
+        # 业务线程只做入队，不承担任何 I/O
+        log_queue = queue.SimpleQueue()
+        queue_handler = ContextQueueHandler(log_queue)
+        queue_handler.addFilter(ContextFilter())
+
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        root.setLevel(config.LOG_CONFIG.get('level', 'INFO'))
+        root.addHandler(queue_handler)
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """停止后台写入线程并刷新剩余日志"""
+    global _listener
+
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def get_logger(name):
+    """获取业务日志记录器
+
+    Args:
+        name: 模块名，如 'login'、'channel'
+
+    Returns:
+        logging.Logger
+    """
+    setup_logging()
+    return logging.getLogger(f'{ROOT_LOGGER_NAME}.{name}')
+
+
+@contextmanager
+def log_context(**kwargs):
+    """在当前线程内附加日志上下文
+
+    用法:
+        with log_context(account_id=1, env_id='xxx', stage='login'):
+            logger.info('...')
+
+    嵌套使用时内层覆盖外层的同名字段，退出后自动恢复。
+    """
+    context = dict(_log_context.get())
+    context.update({k: v for k, v in kwargs.items() if v is not None})
+    token = _log_context.set(context)
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def update_log_context(**kwargs):
+    """更新当前日志上下文（值为 None 表示清除该字段）
+
+    用于在 log_context 作用域内补充后续才确定的信息（如分配到的环境ID），
+    退出外层 log_context 时会一并恢复。
+    """
+    context = dict(_log_context.get())
+    for key, value in kwargs.items():
+        if value is None:
+            context.pop(key, None)
+        else:
+            context[key] = value
+    _log_context.set(context)
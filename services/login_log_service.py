@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+登录/创建频道日志（login_logs 表）写入
+
+登录和创建频道流程每一步都会写一条日志。MySQL 下逐条写入；
+SQLite 同一时间只允许一个写事务，批量任务的多个工作线程逐条写入时会频繁争用写锁，
+因此改为入队后由后台线程合并写入：每批最多 DATABASE_CONFIG['log_batch_size'] 条，
+最多等待 log_flush_interval 秒，一批一个事务。页面查看日志时最新几条可能延迟不到 1 秒出现。
+"""
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+
+import config
+from models import db, LoginLog, session_scope
+from services.log_service import get_logger
+
+logger = get_logger('login_log')
+
+# 进程退出时等待剩余日志写入的最长秒数
+FLUSH_TIMEOUT = 5
+
+_queue = queue.Queue()
+_writer_lock = threading.Lock()
+_writer = None
+
+
+def batching_enabled():
+    """是否合并写入（SQLite 且每批条数大于 1）"""
+    database_config = config.DATABASE_CONFIG
+    return database_config['backend'] == 'sqlite' and database_config.get('log_batch_size', 200) > 1
+
+
+def write(account_id, browser_env_id, action, status, message):
+    """写入一条日志（需要在应用上下文中调用）"""
+    if not batching_enabled():
+        log = LoginLog(
+            account_id=account_id,
+            browser_env_id=browser_env_id,
+            action=action,
+            status=status,
+            message=message
+        )
+        db.session.add(log)
+        db.session.commit()
+        return
+
+    _ensure_writer(current_app._get_current_object())
+    _queue.put({
+        'account_id': account_id,
+        'browser_env_id': browser_env_id,
+        'action': action,
+        'status': status,
+        'message': message,
+        'created_at': datetime.now(),
+    })
+    # 与逐条写入时一样提交当前会话：调用方未提交的修改随之提交，连接归还连接池
+    db.session.commit()
+
+
+def _ensure_writer(app):
+    global _writer
+
+    if _writer is not None:
+        return
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_run, args=(app,), name='login-log-writer', daemon=True)
+            _writer.start()
+            atexit.register(flush)
+
+
+def _run(app):
+    with app.app_context():
+        while True:
+            rows = [_queue.get()]
+            database_config = config.DATABASE_CONFIG
+            batch_size = database_config.get('log_batch_size', 200)
+            deadline = time.monotonic() + database_config.get('log_flush_interval', 0.5)
+            while len(rows) < batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    rows.append(_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            _insert(rows)
+
+
+def _insert(rows):
+    try:
+        try:
+            with session_scope():
+                db.session.execute(LoginLog.__table__.insert(), rows)
+        except Exception as e:
+            if len(rows) == 1:
+                logger.error(f"[日志写入] 登录日志写入失败: {e}")
+                return
+            # 整批回滚后逐条重试，只丢弃写不进去的那几条（如账号已被删除）
+            logger.warning(f"[日志写入] {len(rows)} 条登录日志合并写入失败，改为逐条写入: {e}")
+            for row in rows:
+                try:
+                    with session_scope():
+                        db.session.execute(LoginLog.__table__.insert(), row)
+                except Exception as row_error:
+                    logger.error(f"[日志写入] 账号 {row['account_id']} 的登录日志写入失败: {row_error}")
+    finally:
+        for _ in rows:
+            _queue.task_done()
+
+
+def flush(timeout=FLUSH_TIMEOUT):
+    """等待已入队的日志写入完成（进程退出时自动调用）
+
+    Returns:
+        bool: 是否全部写入
+    """
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks:
+        if _writer is None or not _writer.is_alive() or time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
+    return True
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+创收要求定期复查服务
+
+已创建频道的创收要求（3m/10m）会变化，也可能在创建时未检测成功。
+按 monetization_checked_at 找出从未检测、检测失败或检测已过期的频道，
+由工作进程分小批（monetization_sweep 任务）逐个打开浏览器复查；
+登录成功时如果该账号需要复查，复用已打开的浏览器顺便检测，不再单独打开。
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+import config
+from models import db, Account, Job, session_scope
+from services import hubstudio_service, job_service
+from services.log_service import get_logger, log_context
+from services.job_service import CancelToken, TaskCancelled, cancel_scope, interruptible_sleep
+
+logger = get_logger('monetization')
+
+# 复查任务逐个处理（每个频道都要打开浏览器）
+BATCH_CONCURRENCY = 1
+
+# 选取复查账号时每次读取的候选数（相对于 batch_size 的倍数）和最多读取的次数；
+# 候选全部被其他任务占用时不再继续往后找，等下次复查
+LOOKAHEAD_FACTOR = 4
+LOOKAHEAD_PAGES = 5
+
+_sweep_lock = threading.Lock()
+_last_sweep = 0
+# 任务ID -> 账号ID集合（任务的账号列表入队后不再变化，每个任务只解析一次）
+_job_accounts = {}
+
+
+def _stale_condition(now=None):
+    """需要复查的条件：从未检测、检测失败且已过重试间隔、或检测已过期"""
+    check_config = config.MONETIZATION_CHECK_CONFIG
+    now = now or datetime.now()
+    expired = now - timedelta(days=check_config['max_age_days'])
+    retry = now - timedelta(hours=check_config['retry_hours'])
+    return db.or_(
+        Account.monetization_checked_at.is_(None),
+        Account.monetization_checked_at < expired,
+        db.and_(Account.monetization_requirement.is_(None), Account.monetization_checked_at < retry),
+    )
+
+
+def needs_check(account_id):
+    """账号的频道是否需要复查创收要求"""
+    return db.session.query(Account.id).filter(
+        Account.id == account_id,
+        Account.channel_status == 'created',
+        _stale_condition(),
+    ).first() is not None
+
+
+def _busy_account_ids():
+    """排队中和运行中的批量任务涉及的账号（避免与其他任务同时操作同一个浏览器环境）
+
+    按筛选条件入队的任务可能有数万个账号，只解析新出现的任务，已结束的任务从缓存中移除。
+    """
+    active_ids = [job_id for (job_id,) in db.session.query(Job.id).filter(Job.status.in_(['queued', 'running']))]
+    for job_id in set(_job_accounts) - set(active_ids):
+        del _job_accounts[job_id]
+    new_ids = [job_id for job_id in active_ids if job_id not in _job_accounts]
+    if new_ids:
+        for job_id, account_ids in db.session.query(Job.id, Job.account_ids).filter(Job.id.in_(new_ids)):
+            _job_accounts[job_id] = frozenset(json.loads(account_ids))
+    busy = set()
+    for account_ids in _job_accounts.values():
+        busy.update(account_ids)
+    return busy
+
+
+def select_accounts(limit):
+    """选出需要复查的账号ID（最久未检测的在前）
+
+    分页读取候选并排除其他任务占用的账号，最多读取 LOOKAHEAD_PAGES 页。
+    """
+    busy = _busy_account_ids()
+    query = db.session.query(Account.id).filter(
+        Account.channel_status == 'created',
+        Account.channel_url.isnot(None),
+        Account.channel_url != '',
+        Account.browser_env_id.isnot(None),
+        Account.login_status.in_(['success', 'success_with_verification']),
+        _stale_condition(),
+    ).order_by(Account.monetization_checked_at, Account.id)
+    page_size = max(limit * LOOKAHEAD_FACTOR, 1)
+    selected = []
+    for page in range(LOOKAHEAD_PAGES):
+        rows = query.offset(page * page_size).limit(page_size).all()
+        selected.extend(account_id for (account_id,) in rows if account_id not in busy)
+        if len(selected) >= limit or len(rows) < page_size:
+            break
+    return selected[:limit]
+
+
+def schedule_sweep():
+    """按间隔把一小批需要复查的频道加入任务队列（由工作进程的领取循环调用）
+
+    同一时间只保留一个排队中或运行中的复查任务，返回新任务ID或 None。
+    多个工作进程同时调度时，任务ID由复查间隔的时间段决定（同一时间段的ID相同），
+    靠主键冲突保证同一时间段只有一个进程入队成功。
+    """
+    global _last_sweep
+
+    check_config = config.MONETIZATION_CHECK_CONFIG
+    if not check_config['enabled']:
+        return None
+    with _sweep_lock:
+        if time.time() - _last_sweep < check_config['interval']:
+            return None
+        _last_sweep = time.time()
+
+    with session_scope():
+        pending = Job.query.filter(Job.type == 'monetization_sweep', Job.status.in_(['queued', 'running'])).count()
+        account_ids = [] if pending else select_accounts(check_config['batch_size'])
+    if not account_ids:
+        return None
+
+    try:
+        job_id = job_service.create_job('monetization_sweep', account_ids,
+                                        job_id=f"sweep{int(time.time() // max(check_config['interval'], 1))}")
+    except IntegrityError:
+        logger.debug("[创收复查] 本时间段的复查任务已由其他进程加入")
+        return None
+    logger.info(f"[创收复查] 已加入复查任务 {job_id}，{len(account_ids)} 个频道")
+    return job_id
+
+
+def record_check(account_id, requirement):
+    """记录一次创收要求检测（检测失败时只更新检测时间，保留原有的创收要求）"""
+    values = {'monetization_checked_at': datetime.now()}
+    if requirement:
+        values['monetization_requirement'] = requirement
+    Account.update_by_id(account_id, **values)
+
+
+def recheck_if_stale(driver, account_id, browser_env_id):
+    """复用已打开的浏览器（如登录成功后），频道需要复查时顺便检测创收要求
+
+    Returns:
+        str: 检测结果 "3m" / "10m"；未检测或检测失败返回 None
+    """
+    if not config.MONETIZATION_CHECK_CONFIG['on_login']:
+        return None
+    with session_scope():
+        if not needs_check(account_id):
+            return None
+        channel_url = db.session.query(Account.channel_url).filter_by(id=account_id).scalar()
+    if not channel_url:
+        return None
+
+    from services.channel_service import detect_monetization_requirement
+    logger.info(f"[创收复查] 账号 ID: {account_id} 的创收要求需要复查，使用当前浏览器检测")
+    return detect_monetization_requirement(driver, channel_url, account_id, browser_env_id)
+
+
+def check_account(account_id):
+    """打开账号绑定的浏览器环境复查创收要求
+
+    Returns:
+        tuple: (是否成功, 说明)
+    """
+    from services.channel_service import detect_monetization_requirement
+
+    with session_scope():
+        account = Account.query.get(account_id)
+        if not account:
+            return False, '账号不存在'
+        env_id, channel_url = account.browser_env_id, account.channel_url
+    # 无法检测时也记录检测时间，按 retry_hours 退避，避免这些账号每轮都排在最前面
+    if not env_id or not channel_url:
+        record_check(account_id, None)
+        return False, '账号未绑定浏览器环境或没有频道链接'
+
+    driver = None
+    try:
+        driver = hubstudio_service.open_browser(env_id)
+        if not driver:
+            record_check(account_id, None)
+            return False, '无法打开浏览器'
+        result = detect_monetization_requirement(driver, channel_url, account_id, env_id)
+        if not result:
+            return False, '未检测到创收要求'
+        return True, f'创收要求: {result}'
+    finally:
+        if driver:
+            try:
+                driver.quit()
+            except:
+                pass
+            hubstudio_service.close_browser(env_id)
+
+
+def batch_check_task(app, account_ids, job=None):
+    """复查一批频道的创收要求（逐个处理，相邻两个之间按配置间隔，避免频繁打开浏览器）"""
+    token = job.cancel_token if job else CancelToken()
+
+    with app.app_context(), cancel_scope(token):
+        for index, account_id in enumerate(account_ids):
+            if token.cancelled:
+                break
+            if job:
+                job.start_item(account_id)
+            try:
+                with log_context(account_id=account_id):
+                    success, message = check_account(account_id)
+            except TaskCancelled:
+                if job:
+                    job.cancel_item(account_id)
+                break
+            except Exception as e:
+                logger.error(f"[创收复查] 账号 ID: {account_id} 复查失败: {str(e)}", exc_info=True)
+                success, message = False, f'复查异常: {str(e)}'
+            finally:
+                db.session.close()
+            if job:
+                job.finish_item(account_id, success, message)
+
+            if index < len(account_ids) - 1:
+                try:
+                    interruptible_sleep(config.MONETIZATION_CHECK_CONFIG['delay'])
+                except TaskCancelled:
+                    break
+
+        if job:
+            job.finish()
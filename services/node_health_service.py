@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+节点（SOCKS5 代理）健康检测服务
+
+- 并发探测节点：TCP 连接 + SOCKS5 握手/认证 + 通过代理连接目标站点，记录总延迟
+- 根据结果计算 0-100 的健康评分（0 表示不可用），与历史评分平滑
+- 创建浏览器环境时优先选择健康、低延迟的节点
+"""
+import socket
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_
+
+import config
+from models import db, Node
+from services.log_service import get_logger
+
+logger = get_logger('node_health')
+
+SOCKS_VERSION = 0x05
+AUTH_NONE = 0x00
+AUTH_USERPASS = 0x02
+AUTH_NO_ACCEPTABLE = 0xFF
+
+# 新评分在平滑评分中的权重
+SCORE_SMOOTHING = 0.7
+
+
+class ProbeError(Exception):
+    """探测失败"""
+
+    def __init__(self, message, auth_ok=None):
+        super().__init__(message)
+        self.auth_ok = auth_ok
+
+
+def _recv_exact(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ProbeError('代理提前关闭了连接')
+        data += chunk
+    return data
+
+
+def _handshake(sock, username, password):
+    """SOCKS5 协商认证方式并完成用户名/密码认证（RFC 1928 / RFC 1929）"""
+    methods = bytes([AUTH_NONE, AUTH_USERPASS]) if username else bytes([AUTH_NONE])
+    sock.sendall(bytes([SOCKS_VERSION, len(methods)]) + methods)
+
+    version, method = _recv_exact(sock, 2)
+    if version != SOCKS_VERSION:
+        raise ProbeError('不是 SOCKS5 代理')
+    if method == AUTH_NO_ACCEPTABLE:
+        raise ProbeError('代理不接受提供的认证方式', auth_ok=False)
+    if method == AUTH_USERPASS:
+        user = (username or '').encode('utf-8')
+        pwd = (password or '').encode('utf-8')
+        sock.sendall(bytes([0x01, len(user)]) + user + bytes([len(pwd)]) + pwd)
+        _, status = _recv_exact(sock, 2)
+        if status != 0x00:
+            raise ProbeError('代理认证失败（用户名或密码错误）', auth_ok=False)
+    elif method != AUTH_NONE:
+        raise ProbeError(f'代理要求不支持的认证方式: {method}', auth_ok=False)
+
+
+def _connect_target(sock, host, port):
+    """通过代理连接目标地址，确认代理可以出网"""
+    host_bytes = host.encode('idna')
+    sock.sendall(bytes([SOCKS_VERSION, 0x01, 0x00, 0x03, len(host_bytes)]) + host_bytes + struct.pack('>H', port))
+
+    _, reply, _, address_type = _recv_exact(sock, 4)
+    if reply != 0x00:
+        raise ProbeError(f'代理无法连接目标 {host}:{port}（错误码 {reply}）', auth_ok=True)
+    # 读取并丢弃绑定地址
+    if address_type == 0x01:
+        _recv_exact(sock, 4 + 2)
+    elif address_type == 0x04:
+        _recv_exact(sock, 16 + 2)
+    elif address_type == 0x03:
+        _recv_exact(sock, _recv_exact(sock, 1)[0] + 2)
+
+
+def probe_socks5(ip, port, username=None, password=None, timeout=None, target_host=None, target_port=None):
+    """探测一个 SOCKS5 代理
+
+    Args:
+        ip, port, username, password: 代理信息
+        timeout: 超时秒数，默认读取 config.NODE_CHECK_CONFIG
+        target_host, target_port: 通过代理连接的目标，默认读取 config.NODE_CHECK_CONFIG；
+            target_host 为空字符串时只检测握手和认证
+
+    Returns:
+        dict: {'ok': 是否可用, 'auth_ok': 认证是否成功（未到认证阶段为 None）,
+               'latency': 总耗时毫秒, 'message': 结果说明}
+    """
+    timeout = timeout or config.NODE_CHECK_CONFIG.get('timeout', 5)
+    if target_host is None:
+        target_host = config.NODE_CHECK_CONFIG.get('target_host', '')
+    if target_port is None:
+        target_port = config.NODE_CHECK_CONFIG.get('target_port', 443)
+
+    start = time.perf_counter()
+    try:
+        with socket.create_connection((ip, int(port)), timeout=timeout) as sock:
+            sock.settimeout(timeout)
+            _handshake(sock, username, password)
+            if target_host:
+                _connect_target(sock, target_host, int(target_port))
+        latency = int((time.perf_counter() - start) * 1000)
+        return {'ok': True, 'auth_ok': True, 'latency': latency, 'message': f'可用，延迟 {latency}ms'}
+    except ProbeError as e:
+        return {'ok': False, 'auth_ok': e.auth_ok, 'latency': None, 'message': str(e)}
+    except socket.timeout:
+        return {'ok': False, 'auth_ok': None, 'latency': None, 'message': f'连接超时（{timeout}秒）'}
+    except OSError as e:
+        return {'ok': False, 'auth_ok': None, 'latency': None, 'message': f'连接失败: {e}'}
+
+
+def compute_score(result, previous_score=None):
+    """根据探测结果计算健康评分
+
+    不可用为 0；可用时按延迟折算（200ms≈90 分，1s≈50 分，最低 10 分），
+    并与上一次的有效评分平滑，避免单次抖动导致排序剧烈变化。
+    """
+    if not result['ok']:
+        return 0
+    score = max(10, min(100, 100 - result['latency'] // 20))
+    if previous_score:
+        score = SCORE_SMOOTHING * score + (1 - SCORE_SMOOTHING) * previous_score
+    return int(round(score))
+
+
+def check_nodes(nodes):
+    """并发检测节点并保存结果（需要在应用上下文中调用）
+
+    Args:
+        nodes: Node 列表
+
+    Returns:
+        list: [(node, result), ...]
+    """
+    if not nodes:
+        return []
+
+    # 探测线程中不访问数据库对象，只传入连接参数
+    targets = [(node.ip, node.port, node.username, node.password) for node in nodes]
+    workers = max(1, min(config.NODE_CHECK_CONFIG.get('workers', 20), len(targets)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='node-check') as executor:
+        results = list(executor.map(lambda target: probe_socks5(*target), targets))
+
+    now = datetime.now()
+    for node, result in zip(nodes, results):
+        node.health_score = compute_score(result, node.health_score)
+        node.latency = result['latency']
+        node.check_message = result['message'][:255]
+        node.last_check_at = now
+    db.session.commit()
+
+    healthy = sum(1 for result in results if result['ok'])
+    logger.info(f"[节点检测] 检测 {len(nodes)} 个节点，可用 {healthy} 个，不可用 {len(nodes) - healthy} 个")
+    return list(zip(nodes, results))
+
+
+def select_nodes(count, check=True):
+    """为创建浏览器环境选择未使用的节点，优先健康、低延迟的节点
+
+    Args:
+        count: 需要的节点数
+        check: 是否先检测候选节点中长时间未检测的节点（检测不可用的会被替换）
+
+    Returns:
+        list: Node 列表（可能少于 count）
+    """
+    # 已检测可用的节点按评分、延迟排序；未检测的节点排在最后；不可用的节点不选
+    query = Node.query.filter(
+        Node.status == False,
+        or_(Node.health_score.is_(None), Node.health_score > 0)
+    ).order_by(
+        Node.health_score.is_(None),
+        Node.health_score.desc(),
+        Node.latency.asc()
+    )
+
+    cutoff = datetime.now() - timedelta(seconds=config.NODE_CHECK_CONFIG.get('max_age', 1800))
+    while True:
+        candidates = query.limit(count).all()
+        if not check:
+            return candidates
+        stale = [node for node in candidates if not node.last_check_at or node.last_check_at < cutoff]
+        if not stale:
+            return candidates
+        # 每轮检测后，过期节点要么刷新为有效评分，要么变为不可用被排除，循环必然结束
+        check_nodes(stale)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+接口响应层
+
+- JSON 使用 orjson 序列化（比标准库 json 快数倍；未安装时使用 Flask 默认实现）
+- GET 接口的 JSON 响应带 ETag，页面定时刷新时内容未变化返回 304，不再重复传输
+- 超过 RESPONSE_CONFIG['compress_min_size'] 的响应按客户端支持压缩（br 优先，需安装 brotli，否则 gzip）
+
+SSE 推送和文件下载（流式响应）不做处理。配置修改后立即生效（每个请求读取 config.RESPONSE_CONFIG）。
+"""
+import gzip
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+import config
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # 可选依赖
+    brotli = None
+
+# 可压缩的响应类型
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/css', 'text/plain', 'application/javascript'}
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """使用 orjson 的 JSON 序列化（jsonify / app.json.dumps）
+
+    与 Flask 默认实现的区别：直接输出 UTF-8（不转义中文）、不排序键。
+    orjson 不支持的类型（Decimal 等）交给 Flask 默认的 default 处理。
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # 显式指定了 indent 等参数时保持标准库行为
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        data = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(data, mimetype=self.mimetype)
+
+
+def _accepted_encoding():
+    """客户端支持的压缩方式（br / gzip），都不支持时返回 None"""
+    encodings = request.accept_encodings
+    if brotli is not None and encodings['br']:
+        return 'br'
+    if encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compress(data, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(data, quality=min(max(level - 2, 1), 11))
+    return gzip.compress(data, compresslevel=level)
+
+
+def finalize_response(response):
+    """after_request：ETag / 304 和压缩"""
+    # 流式响应（SSE、send_file）的内容在返回后才产生，不处理
+    if response.is_streamed or response.direct_passthrough:
+        return response
+    if response.status_code != 200 or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    response_config = config.RESPONSE_CONFIG
+    if (response_config.get('etag', True) and request.method in ('GET', 'HEAD')
+            and response.mimetype == 'application/json'):
+        # 同一内容的 gzip / br 版本语义相同，使用弱 ETag
+        response.add_etag(weak=True)
+        # 每次都向服务端确认（内容未变化时返回 304），避免浏览器直接使用缓存的旧数据
+        response.headers.setdefault('Cache-Control', 'no-cache')
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    if not response_config.get('compress', True) or 'Content-Encoding' in response.headers:
+        return response
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < response_config.get('compress_min_size', 1024):
+        return response
+    encoding = _accepted_encoding()
+    if encoding is None:
+        return response
+    response.set_data(_compress(data, encoding, response_config.get('compress_level', 6)))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    """为应用启用 orjson 序列化和响应后处理"""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    app.after_request(finalize_response)
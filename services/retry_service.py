@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+登录失败重试策略服务
+
+- 按登录结果（状态 + 失败信息）归类失败原因，映射到 重试 / 放弃 规则
+- 批量登录时自动把可重试的账号重新入队，按指数退避等待
+- 代理相关的失败会让该浏览器环境（每个环境绑定一个代理节点）进入冷却期
+"""
+import heapq
+import random
+import threading
+import time
+
+import config
+
+ACTION_DONE = 'done'
+ACTION_RETRY = 'retry'
+ACTION_GIVE_UP = 'give_up'
+
+# 重试规则，按顺序匹配第一条：
+# - status: 登录状态
+# - keywords: 失败信息包含任一关键字时匹配（None 表示不限）
+# - reason: 失败原因（用于日志和统计）
+# - action: done 已完成 / retry 重试 / give_up 放弃（需要人工处理）
+# - max_retries: 最大重试次数
+# - backoff: 首次重试的等待秒数，之后每次翻倍
+# - proxy_cooldown: 是否让当前代理进入冷却
+RETRY_RULES = [
+    {'status': 'success', 'reason': 'success', 'action': ACTION_DONE},
+    {'status': 'success_with_verification', 'reason': 'success', 'action': ACTION_DONE},
+    {'status': 'appeal_success', 'reason': 'appeal_success', 'action': ACTION_DONE},
+
+    # 账号本身的问题，重试没有意义
+    {'status': 'password_error', 'reason': 'password_error', 'action': ACTION_GIVE_UP},
+    {'status': 'disabled', 'reason': 'disabled', 'action': ACTION_GIVE_UP},
+    {'status': 'appeal_failed', 'reason': 'appeal_failed', 'action': ACTION_GIVE_UP},
+
+    # 设备/网络不被信任，换个时间窗口并让代理冷却后再试
+    {'status': 'identity_verification_failed', 'reason': 'identity_verification',
+     'action': ACTION_RETRY, 'max_retries': 2, 'backoff': 600, 'proxy_cooldown': True},
+    {'status': 'need_retry', 'reason': 'need_retry',
+     'action': ACTION_RETRY, 'max_retries': 3, 'backoff': 30},
+
+    # 缺少配置或资源（手机号、接码URL、辅助邮箱、2captcha），需要人工补全
+    {'status': 'failed', 'keywords': ['未配置', '未启用', '没有可用的', '没有配置', '未设置'],
+     'reason': 'missing_resource', 'action': ACTION_GIVE_UP},
+
+    # 接码 / 人机验证超时或失败
+    {'status': 'failed', 'keywords': ['获取验证码失败'], 'reason': 'sms_timeout',
+     'action': ACTION_RETRY, 'max_retries': 2, 'backoff': 120},
+    {'status': 'failed', 'keywords': ['人机验证'], 'reason': 'captcha_failed',
+     'action': ACTION_RETRY, 'max_retries': 3, 'backoff': 60},
+
+    # 登录流程超时（总时长或最大尝试次数）
+    {'status': 'failed', 'keywords': ['超过'], 'reason': 'login_timeout',
+     'action': ACTION_RETRY, 'max_retries': 2, 'backoff': 120, 'proxy_cooldown': True},
+
+    # 浏览器 / 网络 / 代理异常
+    {'status': 'failed', 'keywords': ['网络', '代理', '无法访问'], 'reason': 'network_error',
+     'action': ACTION_RETRY, 'max_retries': 3, 'backoff': 60, 'proxy_cooldown': True},
+    {'status': 'failed', 'keywords': ['浏览器'], 'reason': 'browser_error',
+     'action': ACTION_RETRY, 'max_retries': 3, 'backoff': 30},
+
+    # 其他失败
+    {'status': 'failed', 'reason': 'failed', 'action': ACTION_RETRY, 'max_retries': 1, 'backoff': 60},
+]
+
+# 未匹配任何规则时的处理方式
+DEFAULT_RULE = {'reason': 'unknown', 'action': ACTION_GIVE_UP}
+
+
+def match_rule(status, message=''):
+    """根据登录结果匹配重试规则
+
+    Args:
+        status: 登录状态
+        message: 失败信息
+
+    Returns:
+        dict: 匹配到的规则
+    """
+    message = message or ''
+    for rule in RETRY_RULES:
+        if rule['status'] != status:
+            continue
+        keywords = rule.get('keywords')
+        if keywords and not any(keyword in message for keyword in keywords):
+            continue
+        return rule
+    return DEFAULT_RULE
+
+
+def backoff_delay(rule, retry_count):
+    """计算第 retry_count 次重试（从1开始）前的等待秒数（带 ±20% 抖动）"""
+    delay = rule.get('backoff', 60) * (2 ** (retry_count - 1))
+    delay = min(delay, config.RETRY_CONFIG.get('max_delay', 1800))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def decide(status, message, retry_count):
+    """决定一次登录结果之后的处理方式
+
+    Args:
+        status: 登录状态
+        message: 失败信息
+        retry_count: 该账号已经重试过的次数
+
+    Returns:
+        dict: {'action', 'reason', 'delay', 'proxy_cooldown'}
+    """
+    rule = match_rule(status, message)
+    action = rule['action']
+    if action == ACTION_RETRY:
+        if not config.RETRY_CONFIG.get('enabled', True) or retry_count >= rule.get('max_retries', 0):
+            action = ACTION_GIVE_UP
+    return {
+        'action': action,
+        'reason': rule['reason'],
+        'delay': backoff_delay(rule, retry_count + 1) if action == ACTION_RETRY else 0,
+        'proxy_cooldown': bool(rule.get('proxy_cooldown')) and action != ACTION_DONE,
+    }
+
+
+class RetryQueue:
+    """支持延迟重试和代理冷却的批量任务队列（线程安全）
+
+    工作线程循环调用 get() 取账号，处理完后调用 report() 上报结果；
+    处理过程中出现异常或被停止时调用 release()。
+    当没有待处理、等待重试和处理中的账号时 get() 返回 None。
+    """
+
+    def __init__(self, account_ids, cancel_token=None):
+        self._ready = list(account_ids)
+        self._ready.reverse()  # 从尾部弹出，保持原有顺序
+        self._delayed = []  # 堆：(可执行时间, 序号, account_id)
+        self._seq = 0
+        self._in_flight = 0
+        self._retry_counts = {}
+        self._proxy_cooldown_until = {}
+        self._cancel_token = cancel_token
+        self._cond = threading.Condition()
+
+    def get(self):
+        """取下一个可执行的账号ID，全部完成或任务停止时返回 None"""
+        with self._cond:
+            while True:
+                if self._cancel_token is not None and self._cancel_token.cancelled:
+                    return None
+
+                now = time.time()
+                while self._delayed and self._delayed[0][0] <= now:
+                    _, _, account_id = heapq.heappop(self._delayed)
+                    self._ready.append(account_id)
+
+                if self._ready:
+                    self._in_flight += 1
+                    return self._ready.pop()
+
+                if not self._delayed and self._in_flight == 0:
+                    return None
+
+                # 等待下一个重试到期（最长1秒，以便及时响应停止）
+                timeout = 1
+                if self._delayed:
+                    timeout = min(timeout, max(self._delayed[0][0] - now, 0))
+                self._cond.wait(timeout)
+
+    def report(self, account_id, status, message='', proxy_key=None):
+        """上报一次处理结果，可重试时自动重新入队
+
+        Args:
+            account_id: 账号ID
+            status: 登录状态
+            message: 失败信息
+            proxy_key: 代理标识（浏览器环境ID），用于代理冷却
+
+        Returns:
+            dict: decide() 的结果，另含 retry_count（重试时为本次是第几次重试）
+        """
+        with self._cond:
+            retry_count = self._retry_counts.get(account_id, 0)
+            decision = decide(status, message, retry_count)
+
+            now = time.time()
+            if decision['proxy_cooldown'] and proxy_key:
+                self._proxy_cooldown_until[proxy_key] = now + config.RETRY_CONFIG.get('proxy_cooldown', 600)
+
+            if decision['action'] == ACTION_RETRY:
+                retry_count += 1
+                self._retry_counts[account_id] = retry_count
+                ready_at = now + decision['delay']
+                if proxy_key:
+                    ready_at = max(ready_at, self._proxy_cooldown_until.get(proxy_key, 0))
+                decision['delay'] = ready_at - now
+                self._seq += 1
+                heapq.heappush(self._delayed, (ready_at, self._seq, account_id))
+
+            decision['retry_count'] = retry_count
+            self._in_flight -= 1
+            self._cond.notify_all()
+            return decision
+
+    def release(self, account_id):
+        """账号处理异常中断（不再重试）"""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def pending_count(self):
+        """待处理（含等待重试）的账号数"""
+        with self._cond:
+            return len(self._ready) + len(self._delayed)
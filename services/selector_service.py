@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+自适应选择器注册表
+
+页面改版后，多种备用定位方式中排在前面的往往已经失效，按固定顺序逐个 WebDriverWait
+每次都要先等完失效选择器的超时。这里为每组备用选择器记录命中率和耗时：
+
+- 按历史命中率（平滑后）和平均耗时排序，最常命中的选择器排在最前
+- 每次轮询用一次脚本调用同时探测整组选择器，返回排序最靠前的可见元素，
+  整组最多等待一个超时，而不是每个选择器各等一次
+- 统计保存在 selector_stats.json 中，重启后继续使用
+
+用法:
+    TRY_AGAIN = register('login.try_again', [
+        ('aria-label', By.XPATH, "//a[@aria-label='Try again']"),
+        ('jsname', By.XPATH, "//a[@jsname='hSRGPd']"),
+    ])
+    label = click_first(driver, TRY_AGAIN, timeout=3)
+"""
+import atexit
+import json
+import os
+import threading
+import time
+
+from selenium.webdriver.common.by import By
+
+import config
+from services.log_service import get_logger
+from services.job_service import check_cancelled, interruptible_sleep
+
+logger = get_logger('selector')
+
+STATS_FILE = os.path.join(os.path.dirname(config.CONFIG_FILE), 'selector_stats.json')
+# 统计变化后最多间隔多久写回文件（秒）
+SAVE_INTERVAL = 30
+# 两次探测之间的间隔（秒）
+POLL_INTERVAL = 0.25
+# 平均耗时的平滑系数（新样本的权重）
+LATENCY_ALPHA = 0.3
+
+# 一次探测整组选择器：按顺序返回第一个可见（可点击时还要求未禁用）的元素及各选择器是否命中
+PROBE_JS = """
+var selectors = arguments[0], clickable = arguments[1];
+function usable(el) {
+    if (!el || !(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) return false;
+    return !clickable || !(el.disabled || el.getAttribute('aria-disabled') === 'true');
+}
+function find(selector) {
+    try {
+        if (selector[0] === 'xpath') {
+            var result = document.evaluate(selector[1], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < result.snapshotLength; i++) {
+                if (usable(result.snapshotItem(i))) return result.snapshotItem(i);
+            }
+        } else {
+            var nodes = document.querySelectorAll(selector[1]);
+            for (var j = 0; j < nodes.length; j++) {
+                if (usable(nodes[j])) return nodes[j];
+            }
+        }
+    } catch (e) {}
+    return null;
+}
+var element = null, index = -1, matched = [];
+for (var k = 0; k < selectors.length; k++) {
+    var found = find(selectors[k]);
+    matched.push(!!found);
+    if (found && !element) {
+        element = found;
+        index = k;
+    }
+}
+return [index, element, matched];
+"""
+
+
+def _css_escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _to_query(by, value):
+    """Selenium 定位方式 -> 页面脚本中的 (xpath|css, 表达式)"""
+    if by == By.XPATH:
+        return ['xpath', value]
+    if by == By.CSS_SELECTOR:
+        return ['css', value]
+    if by == By.ID:
+        return ['css', f'[id="{_css_escape(value)}"]']
+    if by == By.NAME:
+        return ['css', f'[name="{_css_escape(value)}"]']
+    if by == By.TAG_NAME:
+        return ['css', value]
+    if by == By.CLASS_NAME:
+        return ['css', f'.{value}']
+    raise ValueError(f'不支持的定位方式: {by}')
+
+
+class SelectorGroup:
+    """一组可互相替代的选择器及其命中统计"""
+
+    def __init__(self, name, selectors):
+        self.name = name
+        # [(说明, 定位方式, 表达式)]
+        self.selectors = list(selectors)
+        self.queries = {label: _to_query(by, value) for label, by, value in self.selectors}
+
+    def ordered(self):
+        """按历史表现排序的选择器说明列表（未有统计的保持注册顺序）"""
+        stats = _stats_for(self.name)
+
+        def score(item):
+            index, label = item
+            stat = stats.get(label, {})
+            hits, misses = stat.get('hits', 0), stat.get('misses', 0)
+            # 拉普拉斯平滑的命中率，命中率相同时耗时短的优先，再按注册顺序
+            return (-(hits + 1) / (hits + misses + 2), stat.get('latency', 0), index)
+
+        return [label for index, label in sorted(enumerate(label for label, _, _ in self.selectors), key=score)]
+
+
+_registry = {}
+_stats = {}
+_stats_lock = threading.Lock()
+_loaded = False
+_dirty_since = None
+
+
+def register(name, selectors):
+    """注册一组备用选择器（同名重复注册时以最后一次为准）"""
+    group = SelectorGroup(name, selectors)
+    _registry[name] = group
+    return group
+
+
+def _load():
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    try:
+        with open(STATS_FILE, 'r', encoding='utf-8') as f:
+            _stats.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning(f"[选择器] 读取选择器统计失败，重新统计: {str(e)}")
+
+
+def _stats_for(name):
+    with _stats_lock:
+        _load()
+        return {label: dict(stat) for label, stat in _stats.get(name, {}).items()}
+
+
+def _record(group, order, matched, winner, elapsed):
+    """记录一次探测结果：命中的选择器计一次命中，未命中的计一次未命中"""
+    global _dirty_since
+
+    with _stats_lock:
+        _load()
+        group_stats = _stats.setdefault(group.name, {})
+        for label, hit in zip(order, matched):
+            stat = group_stats.setdefault(label, {'hits': 0, 'misses': 0, 'latency': 0})
+            if hit:
+                stat['hits'] += 1
+            else:
+                stat['misses'] += 1
+        stat = group_stats[winner]
+        stat['latency'] = round(elapsed if not stat['latency']
+                                else stat['latency'] * (1 - LATENCY_ALPHA) + elapsed * LATENCY_ALPHA, 3)
+        if _dirty_since is None:
+            _dirty_since = time.time()
+        save_due = time.time() - _dirty_since >= SAVE_INTERVAL
+    if save_due:
+        save()
+
+
+def save():
+    """把统计写回文件（先写临时文件再替换，避免多个进程同时写坏文件）"""
+    global _dirty_since
+
+    with _stats_lock:
+        if _dirty_since is None:
+            return
+        data = json.dumps(_stats, ensure_ascii=False, indent=2)
+        _dirty_since = None
+    temp_file = f'{STATS_FILE}.{os.getpid()}.tmp'
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(temp_file, STATS_FILE)
+    except OSError as e:
+        logger.warning(f"[选择器] 保存选择器统计失败: {str(e)}")
+
+
+atexit.register(save)
+
+
+def find_first(driver, group, timeout=10, clickable=True):
+    """按历史表现顺序查找整组选择器中第一个可用的元素
+
+    每次轮询只调用一次脚本探测整组选择器，整组最多等待 timeout 秒。
+
+    Returns:
+        tuple: (元素, 命中的选择器说明)，超时返回 (None, None)
+    """
+    order = group.ordered()
+    queries = [group.queries[label] for label in order]
+    start = time.time()
+    while True:
+        check_cancelled()
+        try:
+            index, element, matched = driver.execute_script(PROBE_JS, queries, clickable)
+        except Exception as e:
+            logger.info(f"[选择器] {group.name} 探测失败: {str(e)}")
+            index, element, matched = -1, None, []
+        elapsed = time.time() - start
+        if element is not None and index >= 0:
+            winner = order[index]
+            _record(group, order, matched, winner, elapsed)
+            logger.info(f"[选择器] {group.name} 命中: {winner}（{elapsed:.1f}秒）")
+            return element, winner
+        if elapsed >= timeout:
+            logger.info(f"[选择器] {group.name} 在 {timeout} 秒内未找到（尝试顺序: {', '.join(order)}）")
+            return None, None
+        interruptible_sleep(min(POLL_INTERVAL, max(timeout - elapsed, 0)))
+
+
+def click_first(driver, group, timeout=10):
+    """查找并点击整组选择器中第一个可用的元素（普通点击失败时用 JS 点击）
+
+    Returns:
+        str: 命中的选择器说明，未找到或点击失败返回 None
+    """
+    element, label = find_first(driver, group, timeout=timeout, clickable=True)
+    if element is None:
+        return None
+    try:
+        element.click()
+    except Exception:
+        try:
+            driver.execute_script("arguments[0].click();", element)
+        except Exception as e:
+            logger.info(f"[选择器] {group.name} 点击失败（{label}）: {str(e)}")
+            return None
+    return label
+
+
+def get_stats():
+    """各组选择器的命中统计（按当前排序）"""
+    result = {}
+    for name, group in _registry.items():
+        stats = _stats_for(name)
+        result[name] = [dict(stats.get(label, {'hits': 0, 'misses': 0, 'latency': 0}), selector=label)
+                        for label in group.ordered()]
+    return result
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+生产环境 Web 服务（waitress 多线程 WSGI 服务器，Windows 下同样可用）
+
+waitress 每个请求占用一个工作线程直到响应结束，SSE 长连接会一直占住线程。
+为保证普通 API 请求始终有线程可用，SSE 连接数限制在 SERVER_CONFIG['sse_streams'] 以内，
+超出时返回 503，页面改为轮询任务进度。
+"""
+import threading
+
+import config
+from services.log_service import get_logger
+
+logger = get_logger('server')
+
+_stream_lock = threading.Lock()
+_open_streams = 0
+
+
+def stream_limit():
+    """SSE 连接数上限（至少为普通请求保留一半线程）"""
+    server_config = config.SERVER_CONFIG
+    return max(1, min(server_config['sse_streams'], server_config['threads'] // 2))
+
+
+def acquire_stream():
+    """占用一个 SSE 连接名额，已达上限时返回 False"""
+    global _open_streams
+
+    with _stream_lock:
+        if _open_streams >= stream_limit():
+            return False
+        _open_streams += 1
+        return True
+
+
+def release_stream():
+    """释放 SSE 连接名额（响应关闭时调用）"""
+    global _open_streams
+
+    with _stream_lock:
+        _open_streams = max(0, _open_streams - 1)
+
+
+def limit_stream(response):
+    """SSE 响应关闭（推送结束或客户端断开）时释放名额，与 acquire_stream 配对使用"""
+    response.call_on_close(release_stream)
+    return response
+
+
+def serve(app):
+    """使用 waitress 启动 Web 服务（阻塞）"""
+    from waitress import serve as waitress_serve
+
+    server_config = config.SERVER_CONFIG
+    host, port = config.APP_CONFIG['HOST'], config.APP_CONFIG['PORT']
+    logger.info(f"[服务] waitress 启动: http://{host}:{port}，工作线程 {server_config['threads']} 个，"
+                f"SSE 连接上限 {stream_limit()} 个")
+    waitress_serve(
+        app,
+        host=host,
+        port=port,
+        threads=server_config['threads'],
+        connection_limit=server_config['connection_limit'],
+        channel_timeout=server_config['channel_timeout'],
+        ident='GoogleAccountManagement',
+    )
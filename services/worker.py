@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+批量任务工作进程
+
+从数据库（jobs 表）领取排队中的批量任务并执行（浏览器自动化），
+执行过程中定期回写进度和心跳、读取停止请求。Web 端只负责入队和查询进度。
+
+运行方式:
+    python -m services.worker                 # 独立工作进程，可在一台机器上启动多个
+    python -m services.worker --max-jobs 2    # 单个进程同时执行的任务数
+
+config.json 中 worker.embedded 为 true（默认）时，Web 进程内也会启动一个工作线程，
+单机部署无需另外启动工作进程；需要多进程扩展时设为 false 并启动若干个工作进程。
+"""
+import argparse
+import importlib
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+from datetime import datetime, timedelta
+
+import config
+from models import db, Job, session_scope
+from services import hubstudio_service, job_service, monetization_service
+from services.log_service import get_logger, log_context
+
+logger = get_logger('worker')
+
+# 任务类型 -> 执行函数（模块路径, 函数名），签名为 (app, account_ids, job)；
+# 模块中的 BATCH_CONCURRENCY 为任务内并发处理的账号数
+JOB_HANDLERS = {
+    'batch_login': ('services.login_service', 'batch_login_task'),
+    'batch_create_channel': ('services.channel_service', 'batch_create_channel_task'),
+    'monetization_sweep': ('services.monetization_service', 'batch_check_task'),
+}
+
+# 回写进度、检查停止请求的间隔（秒）
+SYNC_INTERVAL = 1
+
+WORKER_NAME = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _get_handler(job_type):
+    """返回 (执行函数, 并发数)"""
+    module_name, func_name = JOB_HANDLERS[job_type]
+    module = importlib.import_module(module_name)
+    concurrency = getattr(module, 'BATCH_CONCURRENCY', 1)
+    if concurrency > 1:
+        # 并发执行的任务随 HubStudio 实例扩展（逐个执行的巡检任务不变）
+        concurrency = hubstudio_service.batch_concurrency(concurrency)
+    return getattr(module, func_name), concurrency
+
+
+def claim_job(worker_name=WORKER_NAME):
+    """领取最早入队的任务
+
+    用带状态条件的 UPDATE 抢占，多个工作进程同时领取时只有一个成功（MySQL / SQLite 均适用）
+
+    Returns:
+        tuple: (任务ID, 任务类型, 账号ID列表)，没有可领取的任务时返回 None
+    """
+    with session_scope():
+        candidates = db.session.query(Job.id).filter(
+            Job.status == 'queued', Job.type.in_(list(JOB_HANDLERS))
+        ).order_by(Job.created_at).limit(5).all()
+        for (job_id,) in candidates:
+            claimed = Job.query.filter_by(id=job_id, status='queued').update({
+                'status': 'running',
+                'worker': worker_name,
+                'started_at': datetime.now(),
+                'heartbeat_at': datetime.now(),
+            }, synchronize_session=False)
+            if claimed:
+                record = Job.query.get(job_id)
+                return record.id, record.type, json.loads(record.account_ids)
+    return None
+
+
+def recover_stale_jobs():
+    """把心跳超时（工作进程已退出或卡死）的运行中任务标记为已停止，返回处理的任务数"""
+    deadline = datetime.now() - timedelta(seconds=config.WORKER_CONFIG['stale_timeout'])
+    count = 0
+    with session_scope():
+        for record in Job.query.filter(Job.status == 'running', Job.heartbeat_at < deadline).all():
+            progress = job_service.job_to_dict(record, with_events=True)
+            counts = progress['counts']
+            counts['cancelled'] += counts['queued'] + counts['running']
+            counts['queued'] = counts['running'] = 0
+            snapshot = {'seq': progress['seq'], 'counts': counts, 'eta': 0, 'events': progress['events']}
+            count += Job.query.filter_by(id=record.id, status='running').update({
+                'status': 'stopped',
+                'progress': json.dumps(snapshot, ensure_ascii=False),
+                'finished_at': datetime.now(),
+            }, synchronize_session=False)
+            logger.warning(f"[工作进程] 任务 {record.id} 的工作进程 {record.worker} 已无响应，标记为已停止")
+    return count
+
+
+class JobRunner(threading.Thread):
+    """执行一个已领取的任务：在子线程中运行任务函数，本线程负责回写进度和同步停止请求"""
+
+    def __init__(self, app, job_id, job_type, account_ids):
+        super().__init__(name=f'job-{job_id}', daemon=True)
+        self.app = app
+        self.handler, concurrency = _get_handler(job_type)
+        self.job = job_service.BatchJob(job_type, account_ids, concurrency, job_id=job_id)
+        self.account_ids = account_ids
+        self._synced_seq = -1
+
+    def run(self):
+        job = self.job
+        with self.app.app_context(), log_context(job_id=job.id):
+            logger.info(f"[工作进程] 开始执行任务 {job.id}（{job_service.JOB_TYPES.get(job.type, job.type)}，"
+                        f"{job.total} 个账号）")
+            task = threading.Thread(target=self._execute, name=f'job-{job.id}-task', daemon=True)
+            task.start()
+            while task.is_alive():
+                task.join(SYNC_INTERVAL)
+                self._sync()
+            # 任务函数异常退出时也要结束任务
+            job.finish()
+            self._sync(final=True)
+            logger.info(f"[工作进程] 任务 {job.id} 结束: {job.status}")
+
+    def cancel(self):
+        self.job.cancel()
+
+    def _execute(self):
+        try:
+            self.handler(self.app, self.account_ids, self.job)
+        except Exception as e:
+            logger.error(f"[工作进程] 任务 {self.job.id} 执行异常: {str(e)}", exc_info=True)
+
+    def _sync(self, final=False):
+        """回写进度和心跳；读取停止请求"""
+        job = self.job
+        try:
+            with session_scope():
+                values = {'heartbeat_at': datetime.now()}
+                snapshot = job.snapshot()
+                if snapshot['seq'] != self._synced_seq:
+                    values['progress'] = json.dumps(snapshot, ensure_ascii=False)
+                if final:
+                    values['status'] = job.status
+                    values['finished_at'] = datetime.now()
+                Job.query.filter_by(id=job.id).update(values, synchronize_session=False)
+                cancel_requested = db.session.query(Job.cancel_requested).filter_by(id=job.id).scalar()
+            self._synced_seq = snapshot['seq']
+        except Exception as e:
+            logger.warning(f"[工作进程] 回写任务 {job.id} 进度失败: {str(e)}")
+            return
+        if cancel_requested and not job.cancel_token.cancelled:
+            logger.info(f"[工作进程] 任务 {job.id} 收到停止请求")
+            job.cancel()
+
+
+class Worker:
+    """工作循环：按间隔领取任务，同时执行的任务数不超过 max_jobs"""
+
+    def __init__(self, app, max_jobs=None, name=WORKER_NAME):
+        self.app = app
+        self.max_jobs = max_jobs
+        self.name = name
+        self.runners = []
+        self._stop = threading.Event()
+
+    def run(self):
+        logger.info(f"[工作进程] {self.name} 已启动，等待任务...")
+        with self.app.app_context():
+            while not self._stop.is_set():
+                try:
+                    self._poll()
+                except Exception as e:
+                    logger.error(f"[工作进程] 领取任务失败: {str(e)}", exc_info=True)
+                finally:
+                    db.session.close()
+                self._stop.wait(config.WORKER_CONFIG['poll_interval'])
+
+    def _poll(self):
+        self.runners = [runner for runner in self.runners if runner.is_alive()]
+        recover_stale_jobs()
+        monetization_service.schedule_sweep()
+        max_jobs = self.max_jobs or config.WORKER_CONFIG['max_jobs']
+        while len(self.runners) < max_jobs and not self._stop.is_set():
+            claimed = claim_job(self.name)
+            if not claimed:
+                break
+            try:
+                runner = JobRunner(self.app, *claimed)
+            except Exception as e:
+                # 任务函数所在模块无法导入（如缺少依赖），结束任务而不是等待心跳超时
+                logger.error(f"[工作进程] 任务 {claimed[0]} 无法执行: {str(e)}", exc_info=True)
+                with session_scope():
+                    Job.query.filter_by(id=claimed[0]).update(
+                        {'status': 'stopped', 'finished_at': datetime.now()}, synchronize_session=False)
+                continue
+            runner.start()
+            self.runners.append(runner)
+
+    def stop(self, timeout=60):
+        """停止领取新任务，中断正在执行的任务并等待其结束"""
+        self._stop.set()
+        for runner in self.runners:
+            runner.cancel()
+        for runner in self.runners:
+            runner.join(timeout)
+
+
+def start_embedded(app):
+    """在 Web 进程内启动工作线程（worker.embedded 为 true 时）"""
+    worker = Worker(app, name=f'{WORKER_NAME}:web')
+    threading.Thread(target=worker.run, name='job-worker', daemon=True).start()
+    return worker
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='批量任务工作进程')
+    parser.add_argument('--max-jobs', type=int, default=None,
+                        help='同时执行的任务数（默认使用 config.json 中的 worker.max_jobs）')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+
+    from main import app
+    from services import config_service
+    config_service.start_watcher()
+
+    worker = Worker(app, max_jobs=options.max_jobs)
+
+    def shutdown(signum, frame):
+        logger.info("[工作进程] 正在停止，中断正在执行的任务...")
+        worker.stop()
+        sys.exit(0)
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+    worker.run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
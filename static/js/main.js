@@ -112,6 +112,11 @@ function updateSelection() {
     } else {
         batchBar.classList.remove('show');
     }
+    
+    // 页面可定义 onSelectionChange 扩展选择逻辑（如账号页的"选择全部符合筛选条件的账号"）
+    if (typeof onSelectionChange === 'function') {
+        onSelectionChange(totalSelected);
+    }
 }
 
 function getSelectedIds() {
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+接口基准测试：在大数据量的测试库上测量各接口的耗时（p50/p95）和 SQL 查询次数
+
+先用 tools.datagen 生成数据，再运行本脚本；通过 Flask 测试客户端调用真实的路由，
+不经过网络。--save-baseline 保存结果作为基线，之后用 --baseline 对比：
+p50 比基线慢超过 --tolerance 且超过 --min-delta 毫秒、或查询次数增加时视为回归，退出码为 1。
+
+用法:
+    python -m tools.api_benchmark --database-uri sqlite:///bench.db --save-baseline bench_baseline.json
+    python -m tools.api_benchmark --database-uri sqlite:///bench.db --baseline bench_baseline.json
+    python -m tools.api_benchmark --database-uri sqlite:///bench.db --case accounts. --skip-heavy
+
+导入类用例会写入带 apibench 标记的数据，每次运行后删除；请使用测试库。
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from io import BytesIO
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import config  # noqa: E402
+
+MARKER = 'apibench'
+
+
+class Case:
+    """一个接口用例
+
+    Args:
+        name: 用例名（分组.名称）
+        path: 请求路径，或根据样本数据生成路径的函数 path(samples)
+        method: 请求方法
+        heavy: 是否为全表导出/导入等耗时用例（只运行 --heavy-runs 次）
+        upload: 生成上传文件内容的函数 upload(options)，用于导入接口
+        cleanup: 每次运行后清理写入数据的函数 cleanup()
+    """
+
+    def __init__(self, name, path, method='GET', heavy=False, upload=None, cleanup=None):
+        self.name = name
+        self.path = path
+        self.method = method
+        self.heavy = heavy
+        self.upload = upload
+        self.cleanup = cleanup
+
+    def resolve(self, samples):
+        return self.path(samples) if callable(self.path) else self.path
+
+
+def _excel(rows):
+    import pandas as pd
+
+    output = BytesIO()
+    pd.DataFrame(rows).to_excel(output, index=False, engine='openpyxl')
+    return output.getvalue()
+
+
+def _account_rows(options):
+    return _excel([{'账号': f'{MARKER}_{i}@gmail.com', '密码': 'password', '辅助邮箱': '', '状态': '未使用'}
+                   for i in range(options.import_rows)])
+
+
+def _phone_rows(options):
+    return _excel([{'手机号': f'{MARKER}{i}', '接码URL': 'https://sms.example.com/receive',
+                    '过期时间': '2030-12-31', '状态': '未使用'} for i in range(options.import_rows)])
+
+
+def _node_rows(options):
+    return _excel([{'节点IP': f'198.18.{i // 250}.{i % 250 + 1}', '端口': 1080, '用户名': MARKER,
+                    '密码': 'password', '状态': '未使用'} for i in range(options.import_rows)])
+
+
+def _delete(model, column, pattern):
+    from models import session_scope
+
+    with session_scope():
+        model.query.filter(column.like(pattern)).delete(synchronize_session=False)
+
+
+def _cleanup_accounts():
+    from models import Account
+    _delete(Account, Account.account, f'{MARKER}_%')
+
+
+def _cleanup_phones():
+    from models import Phone
+    _delete(Phone, Phone.phone_number, f'{MARKER}%')
+
+
+def _cleanup_nodes():
+    from models import Node
+    _delete(Node, Node.username, MARKER)
+
+
+CASES = [
+    Case('accounts.list', '/api/accounts?page=1&page_size=20'),
+    Case('accounts.list_deep_page', lambda s: f"/api/accounts?page={s['deep_page']}&page_size=20"),
+    Case('accounts.list_page_size_100', '/api/accounts?page=1&page_size=100'),
+    Case('accounts.filter_login_failed', '/api/accounts?login_status=failed'),
+    Case('accounts.filter_not_logged', '/api/accounts?login_status=not_logged'),
+    Case('accounts.filter_combined',
+         '/api/accounts?login_status=success&login_status=success_with_verification'
+         '&channel_status=created&monetization=10m'),
+    Case('accounts.search_account', lambda s: f"/api/accounts?account={s['account_search']}"),
+    Case('accounts.search_env', lambda s: f"/api/accounts?env_id={s['env_search']}"),
+    Case('accounts.search_phone', lambda s: f"/api/accounts?phone={s['phone_search']}"),
+    Case('accounts.logs', lambda s: f"/api/accounts/{s['account_with_logs']}/logs"),
+    Case('phones.list', '/api/phones?page=1&page_size=20'),
+    Case('phones.search', lambda s: f"/api/phones?phone_number={s['phone_search']}"),
+    Case('phones.filter_status', '/api/phones?status=false'),
+    Case('nodes.list', '/api/nodes?page=1&page_size=20'),
+    Case('nodes.search_ip', '/api/nodes?ip=10.'),
+    Case('nodes.available_count', '/api/nodes/available-count'),
+    Case('browser_envs.available_count', '/api/browser-envs/available-count'),
+    Case('browser_envs.list', '/api/browser-envs', heavy=True),
+    Case('accounts.export', '/api/accounts/export', heavy=True),
+    Case('phones.export', '/api/phones/export', heavy=True),
+    Case('nodes.export', '/api/nodes/export', heavy=True),
+    Case('accounts.import', '/api/accounts/import', 'POST', heavy=True, upload=_account_rows, cleanup=_cleanup_accounts),
+    Case('phones.import', '/api/phones/import', 'POST', heavy=True, upload=_phone_rows, cleanup=_cleanup_phones),
+    Case('nodes.import', '/api/nodes/import', 'POST', heavy=True, upload=_node_rows, cleanup=_cleanup_nodes),
+]
+
+
+def collect_samples():
+    """从测试库中选取用于构造请求的样本值"""
+    from models import db, Account, LoginLog, Phone
+
+    total = Account.query.count()
+    first = Account.query.order_by(Account.id).first()
+    phone = Phone.query.order_by(Phone.id).first()
+    env_account = Account.query.filter(Account.browser_env_id.isnot(None)).order_by(Account.id).first()
+    return {
+        'accounts': total,
+        'deep_page': max(1, total // 20 // 2),
+        'account_search': first.account[:8] if first else 'user',
+        'env_search': env_account.browser_env_id[-6:] if env_account else '9000',
+        'phone_search': phone.phone_number[-4:] if phone else '138',
+        'account_with_logs': db.session.query(LoginLog.account_id).order_by(LoginLog.id.desc()).limit(1).scalar()
+                             or (first.id if first else 1),
+    }
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def percentile(values, percent):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
+
+
+def run_case(app, case, samples, queries, options):
+    from models import db
+
+    path = case.resolve(samples)
+    runs = options.heavy_runs if case.heavy else options.runs
+    upload = case.upload(options) if case.upload else None
+    client = app.test_client()
+
+    def request_once():
+        kwargs = {}
+        if upload is not None:
+            kwargs = {'data': {'file': (BytesIO(upload), 'import.xlsx')}, 'content_type': 'multipart/form-data'}
+        queries.count = 0
+        start = time.perf_counter()
+        response = client.open(path, method=case.method, **kwargs)
+        response.get_data()
+        elapsed = time.perf_counter() - start
+        db.session.remove()
+        if case.cleanup:
+            case.cleanup()
+        return response.status_code, elapsed, queries.count
+
+    if not case.heavy:
+        request_once()  # 预热（编译查询、填充缓存）
+    timings = []
+    query_counts = []
+    status_codes = set()
+    for _ in range(max(runs, 1)):
+        status, elapsed, count = request_once()
+        status_codes.add(status)
+        timings.append(elapsed * 1000)
+        query_counts.append(count)
+    return {
+        'path': path,
+        'runs': len(timings),
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'queries': max(query_counts),
+        'status': sorted(status_codes),
+    }
+
+
+def compare(name, result, baseline, options):
+    """与基线对比，返回回归说明列表"""
+    base = baseline.get(name)
+    if not base:
+        return []
+    problems = []
+    # p95 在运行次数不多时接近最大值，受偶发抖动影响大，耗时回归按 p50 判断
+    if (result['p50_ms'] > base['p50_ms'] * (1 + options.tolerance)
+            and result['p50_ms'] - base['p50_ms'] > options.min_delta):
+        problems.append(f"p50 {base['p50_ms']:.1f} -> {result['p50_ms']:.1f} ms")
+    if result['queries'] > base['queries']:
+        problems.append(f"查询 {base['queries']} -> {result['queries']} 次")
+    return problems
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='接口基准测试')
+    parser.add_argument('--database-uri', default=None, help='数据库地址（默认使用 config.json 中的 MySQL，请使用测试库）')
+    parser.add_argument('--case', action='append', default=None, help='只运行名称以此开头的用例（可重复）')
+    parser.add_argument('--runs', type=int, default=20, help='普通用例的运行次数')
+    parser.add_argument('--heavy-runs', type=int, default=1, help='导出/导入等耗时用例的运行次数')
+    parser.add_argument('--skip-heavy', action='store_true', help='跳过导出/导入等耗时用例')
+    parser.add_argument('--import-rows', type=int, default=1000, help='导入用例的行数')
+    parser.add_argument('--baseline', default=None, help='对比的基线文件')
+    parser.add_argument('--save-baseline', default=None, help='把本次结果保存为基线文件')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='p50 允许比基线慢的比例')
+    parser.add_argument('--min-delta', type=float, default=5, help='p50 至少慢多少毫秒才算回归')
+    parser.add_argument('--log-level', default='WARNING', help='业务日志级别（默认 WARNING）')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    if options.database_uri:
+        config.DATABASE_URI = options.database_uri
+    # 使用主程序的应用（全部路由和连接池配置）
+    from main import app
+    from models import db
+    from services.log_service import ROOT_LOGGER_NAME
+
+    logging.getLogger(ROOT_LOGGER_NAME).setLevel(options.log_level)
+    cases = [case for case in CASES
+             if (not options.case or any(case.name.startswith(prefix) for prefix in options.case))
+             and not (options.skip_heavy and case.heavy)]
+    baseline = {}
+    if options.baseline:
+        with open(options.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    failed = []
+    with app.app_context():
+        queries = QueryCounter(db.engine)
+        samples = collect_samples()
+        db.session.remove()
+        print(f"数据库: {app.config['SQLALCHEMY_DATABASE_URI'].split('@')[-1]}，账号 {samples['accounts']} 个")
+        print(f"{'用例':<32}{'p50(ms)':>10}{'p95(ms)':>10}{'查询':>6}  结果")
+        for case in cases:
+            result = run_case(app, case, samples, queries, options)
+            results[case.name] = result
+            problems = compare(case.name, result, baseline, options)
+            if result['status'] != [200]:
+                problems.append(f"HTTP {', '.join(map(str, result['status']))}")
+            if problems:
+                failed.append(case.name)
+            mark = '❌ ' + '；'.join(problems) if problems else '✅'
+            print(f"{case.name:<32}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['queries']:>6}  {mark}")
+
+    if options.save_baseline:
+        with open(options.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({'samples': samples, 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"基线已保存到 {options.save_baseline}")
+
+    print()
+    if failed:
+        print(f"❌ {len(failed)} 个用例出错或相对基线回归: {', '.join(failed)}")
+        return 1
+    print(f"✅ {len(results)} 个用例{'均未回归' if baseline else '运行完成'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+数据库连接池压力测试：模拟大量后台工作线程按短会话方式访问数据库
+
+每个工作线程循环处理账号：短会话读取账号 -> 模拟浏览器操作（不持有连接）->
+短会话更新状态 -> 写登录日志，与批量登录/创建频道的工作线程一致。
+统计连接池同时借出连接数的峰值和获取连接超时次数，出现超时或连接错误时退出码为 1。
+
+用法:
+    python -m tools.db_pool_loadtest                        # 使用 config.json 中的 MySQL
+    python -m tools.db_pool_loadtest --workers 50 --items 500 --work 0.2
+    python -m tools.db_pool_loadtest --database-uri sqlite:///loadtest.db
+
+测试会在目标数据库中创建账号和日志数据，请使用测试库。
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from flask import Flask  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError  # noqa: E402
+
+import config  # noqa: E402
+from models import db, Account, LoginLog, session_scope  # noqa: E402
+
+LOADTEST_PREFIX = 'loadtest_'
+
+
+class PoolStats:
+    """通过连接池事件统计借出连接数"""
+
+    def __init__(self, engine):
+        self._lock = threading.Lock()
+        self.checked_out = 0
+        self.peak = 0
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+
+    def _on_checkout(self, *args):
+        with self._lock:
+            self.checked_out += 1
+            self.peak = max(self.peak, self.checked_out)
+
+    def _on_checkin(self, *args):
+        with self._lock:
+            self.checked_out -= 1
+
+
+def create_app(database_uri):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(config.DB_POOL_CONFIG)
+    db.init_app(app)
+    return app
+
+
+def seed_accounts(count):
+    """创建测试账号，返回账号ID列表"""
+    with session_scope():
+        LoginLog.query.filter(LoginLog.account_id.in_(
+            db.session.query(Account.id).filter(Account.account.like(f'{LOADTEST_PREFIX}%'))
+        )).delete(synchronize_session=False)
+        Account.query.filter(Account.account.like(f'{LOADTEST_PREFIX}%')).delete(synchronize_session=False)
+    with session_scope():
+        db.session.add_all([Account(account=f'{LOADTEST_PREFIX}{i}@gmail.com', password='password')
+                            for i in range(count)])
+    with session_scope():
+        return [row.id for row in db.session.query(Account.id).filter(Account.account.like(f'{LOADTEST_PREFIX}%'))]
+
+
+def process_account(account_id, work_seconds):
+    """按后台任务的方式处理一个账号"""
+    with session_scope():
+        account = Account.query.get(account_id)
+        account.login_status = 'logging'
+        username = account.account
+
+    # 模拟浏览器操作，期间不持有数据库连接
+    time.sleep(random.uniform(work_seconds / 2, work_seconds * 1.5))
+
+    Account.update_by_id(account_id, login_status='success', status=True)
+    with session_scope():
+        db.session.add(LoginLog(account_id=account_id, action='auto_login', status='success',
+                                message=f'压力测试 {username}'))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='数据库连接池压力测试')
+    parser.add_argument('--database-uri', default=None, help='数据库地址（默认使用 config.json 中的 MySQL）')
+    parser.add_argument('--workers', type=int, default=50, help='并发工作线程数')
+    parser.add_argument('--items', type=int, default=500, help='处理的账号总数')
+    parser.add_argument('--work', type=float, default=0.2, help='每个账号模拟浏览器操作的平均秒数')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    app = create_app(options.database_uri or config.DATABASE_URI)
+
+    errors = []
+    timeouts = []
+    completed = []
+    lock = threading.Lock()
+
+    with app.app_context():
+        db.create_all()
+        stats = PoolStats(db.engine)
+        account_ids = seed_accounts(options.items)
+        pool_size = config.DB_POOL_CONFIG.get('pool_size')
+        max_overflow = config.DB_POOL_CONFIG.get('max_overflow')
+
+    queue = list(account_ids)
+
+    def worker():
+        while True:
+            with lock:
+                if not queue:
+                    return
+                account_id = queue.pop()
+            with app.app_context():
+                try:
+                    process_account(account_id, options.work)
+                    with lock:
+                        completed.append(account_id)
+                except PoolTimeoutError as e:
+                    with lock:
+                        timeouts.append(str(e))
+                except OperationalError as e:
+                    with lock:
+                        errors.append(str(e))
+
+    print(f"数据库: {app.config['SQLALCHEMY_DATABASE_URI'].split('@')[-1]}")
+    print(f"连接池: pool_size={pool_size}, max_overflow={max_overflow}")
+    print(f"工作线程 {options.workers} 个，账号 {len(account_ids)} 个，平均模拟操作 {options.work} 秒")
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(options.workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print()
+    print(f"完成 {len(completed)}/{len(account_ids)} 个，耗时 {elapsed:.1f} 秒")
+    print(f"同时借出连接数峰值: {stats.peak}（上限 {pool_size + max_overflow}）")
+    print(f"获取连接超时: {len(timeouts)} 次，数据库错误: {len(errors)} 次")
+    for message in (timeouts + errors)[:5]:
+        print(f"  {message.splitlines()[0]}")
+
+    if timeouts or errors or len(completed) != len(account_ids):
+        print("❌ 出现连接池耗尽或数据库错误")
+        return 1
+    print("✅ 未出现连接池耗尽")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""
+HubStudio 批量操作压力测试：对 HubStudio 模拟器（tools.hubstudio_simulator）运行真实的批量代码
+
+依次测量:
+- sync: login_service.sync_browser_envs() 同步全部环境（首次全部新增、再次全部已存在）
+- create: 通过 /api/hubstudio/batch-create 接口批量创建环境（消费完整的 SSE 推送）
+- workers: 通过工作进程的领取流程（claim_job -> JobRunner）运行真实的批量登录
+  （batch_login_task）或批量创建频道（batch_create_channel_task）任务，包括重试队列、
+  进度回写、环境分配和账号状态更新；模拟器不提供真实浏览器，只把打开浏览器后的页面操作
+  （登录、创建频道）替换为等待 --work 秒（stubbed_browser_steps）
+
+默认在进程内启动模拟器并使用临时 SQLite 数据库；--base-url 指向单独运行的模拟器，
+--database-uri 指向测试库。--instances N 启动 N 个模拟器作为多个 HubStudio 实例
+（每个实例容量为 --capacity），验证环境同步、创建和浏览器启动按实例分摊且不超过容量
+（以模拟器 /stats 记录的同时运行峰值为准；单独运行的模拟器的峰值包括之前的压测）。
+出现非模拟注入的失败时退出码为 1。
+
+用法:
+    python -m tools.hubstudio_loadtest                          # 10000 个环境
+    python -m tools.hubstudio_loadtest --envs 10000 --create 500 --items 2000 --workers 3
+    python -m tools.hubstudio_loadtest --latency 0.05 --start-latency 1 --error-rate 0.02
+    python -m tools.hubstudio_loadtest --base-url http://127.0.0.1:6873 --phase sync
+    python -m tools.hubstudio_loadtest --instances 3 --capacity 2 --work 0.05
+    python -m tools.hubstudio_loadtest --phase workers --task channel --items 500 --fail-rate 0.1
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import requests  # noqa: E402
+from flask import Flask  # noqa: E402
+
+import config  # noqa: E402
+from models import db, BrowserEnv, Node, session_scope  # noqa: E402
+from tools.hubstudio_simulator import HubStudioSimulator, parse_args as simulator_args  # noqa: E402
+
+PHASES = ('sync', 'create', 'workers')
+# --task -> 任务类型
+JOB_TYPES = {'login': 'batch_login', 'channel': 'batch_create_channel'}
+ACCOUNT_PREFIX = 'hubstudio_loadtest_'
+# 压测节点使用保留给基准测试的地址段
+NODE_IP_PREFIX = '198.18.'
+
+
+def create_app(database_uri):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(config.DB_POOL_CONFIG)
+    db.init_app(app)
+
+    from routes import browser_bp
+    app.register_blueprint(browser_bp)
+    return app
+
+
+def percentile(values, percent):
+    if not values:
+        return 0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
+
+
+def fetch_stats(base_url):
+    """模拟器的接口调用统计"""
+    try:
+        return requests.get(f'{base_url}/stats', timeout=10).json()
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def print_stats_delta(before, after, label=''):
+    if not before or not after:
+        return
+    for endpoint, stat in after['endpoints'].items():
+        count = stat['count'] - before['endpoints'][endpoint]['count']
+        if count:
+            errors = stat['errors'] - before['endpoints'][endpoint]['errors']
+            seconds = stat['seconds'] - before['endpoints'][endpoint]['seconds']
+            print(f"   {label}{endpoint}: {count} 次请求，出错 {errors} 次，平均 {seconds / count * 1000:.1f} ms")
+
+
+def run_sync(options):
+    from services import login_service
+
+    results = []
+    for label in ('首次同步', '再次同步'):
+        start = time.perf_counter()
+        synced, total = login_service.sync_browser_envs()
+        elapsed = time.perf_counter() - start
+        print(f"   {label}: 新增 {synced} 个 / 共 {total} 个，耗时 {elapsed:.2f} 秒"
+              f"（{total / elapsed if elapsed else 0:.0f} 个/秒）")
+        results.append((synced, total))
+    local_count = BrowserEnv.query.count()
+    print(f"   本地环境数: {local_count}")
+    if options.injects_errors:
+        return True
+    return results[0][1] == local_count and results[1][0] == 0
+
+
+def seed_nodes(count):
+    with session_scope():
+        Node.query.filter(Node.ip.like(f'{NODE_IP_PREFIX}%')).delete(synchronize_session=False)
+    with session_scope():
+        db.session.add_all([
+            Node(ip=f'{NODE_IP_PREFIX}{index // 250}.{index % 250 + 1}', port=1080,
+                 username='loadtest', password='loadtest')
+            for index in range(count)
+        ])
+
+
+def run_create(app, options):
+    seed_nodes(options.create)
+    client = app.test_client()
+    start = time.perf_counter()
+    response = client.post('/api/hubstudio/batch-create', json={'count': options.create, 'check_nodes': False})
+    succeeded = failed = 0
+    errors = []
+    for line in response.get_data(as_text=True).splitlines():
+        if not line.startswith('data: '):
+            continue
+        message = json.loads(line[len('data: '):])
+        if message['type'] == 'progress':
+            if message['success']:
+                succeeded += 1
+            else:
+                failed += 1
+        elif message.get('level') == 'error':
+            errors.append(message['message'])
+    elapsed = time.perf_counter() - start
+    print(f"   创建成功 {succeeded} 个，失败 {failed} 个，耗时 {elapsed:.2f} 秒"
+          f"（{(succeeded + failed) / elapsed if elapsed else 0:.1f} 个/秒）")
+    for message in errors[:5]:
+        print(f"   {message}")
+    if options.injects_errors:
+        return response.status_code == 200
+    return response.status_code == 200 and succeeded == options.create
+
+
+class LoadtestDriver:
+    """代替 WebDriver：浏览器已通过模拟器的启动接口“打开”，页面操作由 stubbed_browser_steps 代替"""
+
+    current_url = 'about:blank'
+
+    def quit(self):
+        pass
+
+
+@contextmanager
+def stubbed_browser_steps(options, usage):
+    """把批量任务中依赖真实浏览器的步骤替换为模拟，其余（任务队列、重试、进度回写、
+    环境分配、账号状态更新、HubStudio 接口调用）都使用真实代码
+
+    Args:
+        usage: 实例名称 -> [启动次数, 启动耗时列表]，由替换后的 open_browser 记录
+    """
+    from services import channel_service, hubstudio_service, login_service
+    from models import Account
+
+    rng = random.Random(options.seed)
+    lock = threading.Lock()
+
+    def open_browser(container_code, is_headless=False):
+        started = time.perf_counter()
+        try:
+            hubstudio_service.start_browser(container_code, is_headless)
+        except Exception:
+            return None
+        finally:
+            instance = hubstudio_service.instance_for_env(container_code)
+            with lock:
+                usage[instance.name][0] += 1
+                usage[instance.name][1].append(time.perf_counter() - started)
+        return LoadtestDriver()
+
+    def perform_login(driver, account, password, account_id=None, backup_email=None):
+        time.sleep(options.work)
+        with lock:
+            failed = rng.random() < options.fail_rate
+        # 网络错误按重试规则重新入队，用于测量重试队列
+        return ('failed', '网络错误（压测注入）') if failed else ('success', '登录成功')
+
+    def create_youtube_channel(driver, account_id=None, browser_env_id=None):
+        time.sleep(options.work)
+        Account.update_by_id(account_id, channel_status='created',
+                             channel_url=f'https://www.youtube.com/channel/loadtest{account_id}')
+        return 'success', '频道创建成功'
+
+    replacements = [
+        (hubstudio_service, 'open_browser', open_browser),
+        (login_service, 'perform_login', perform_login),
+        (login_service, 'ITEM_INTERVAL', (options.interval, options.interval)),
+        (channel_service, 'create_youtube_channel', create_youtube_channel),
+        (channel_service, 'check_avatar_availability', lambda: (True, 1, '')),
+        (channel_service, 'ITEM_INTERVAL', (options.interval, options.interval)),
+    ]
+    if options.workers:
+        replacements += [(login_service, 'BATCH_CONCURRENCY', options.workers),
+                         (channel_service, 'BATCH_CONCURRENCY', options.workers)]
+    originals = [(module, name, getattr(module, name)) for module, name, _ in replacements]
+    for module, name, value in replacements:
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for module, name, value in originals:
+            setattr(module, name, value)
+
+
+def seed_accounts(options):
+    """写入压测账号：批量登录为未登录账号；创建频道为已登录并绑定了浏览器环境的账号"""
+    from models import Account
+
+    with session_scope():
+        Account.query.filter(Account.account.like(f'{ACCOUNT_PREFIX}%')).delete(synchronize_session=False)
+    with session_scope():
+        envs = []
+        if options.task == 'channel':
+            envs = BrowserEnv.query.filter_by(status=False).order_by(BrowserEnv.id).limit(options.items).all()
+            if len(envs) < options.items:
+                raise Exception(f'可用浏览器环境不足: 需要 {options.items} 个，仅有 {len(envs)} 个')
+        accounts = [Account(account=f'{ACCOUNT_PREFIX}{index}@gmail.com', password='loadtest',
+                            login_status='success' if envs else 'not_logged',
+                            browser_env_id=envs[index].container_code if envs else None)
+                    for index in range(options.items)]
+        db.session.add_all(accounts)
+        db.session.flush()
+        for env, account in zip(envs, accounts):
+            env.status = True
+            env.account_id = account.id
+        return [account.id for account in accounts]
+
+
+def run_workers(app, options):
+    """通过工作进程的领取和执行流程（claim_job -> JobRunner）运行真实的批量任务"""
+    from services import hubstudio_service, job_service, login_service, worker
+
+    if not BrowserEnv.query.count():
+        login_service.sync_browser_envs()
+    account_ids = seed_accounts(options)
+    db.session.remove()
+
+    job_type = JOB_TYPES[options.task]
+    usage = {instance.name: [0, []] for instance in hubstudio_service.get_instances()}
+    with stubbed_browser_steps(options, usage):
+        job_id = job_service.create_job(job_type, account_ids)
+        claimed = worker.claim_job('hubstudio_loadtest')
+        if not claimed or claimed[0] != job_id:
+            print(f"   未能领取压测任务 {job_id}")
+            return False
+        runner = worker.JobRunner(app, *claimed)
+        start = time.perf_counter()
+        runner.start()
+        runner.join()
+        elapsed = time.perf_counter() - start
+
+    with session_scope():
+        result = job_service.get_job(job_id)
+    counts = result['counts']
+    done = counts['succeeded'] + counts['failed']
+    print(f"   任务 {job_service.JOB_TYPES[job_type]}: 工作线程 {runner.job.concurrency} 个，"
+          f"成功 {counts['succeeded']} 个，失败 {counts['failed']} 个，重试 {counts['retried']} 次，"
+          f"耗时 {elapsed:.2f} 秒（{done / elapsed if elapsed else 0:.1f} 个/秒），状态 {result['status']}")
+    latencies = sorted(latency for _, instance_latencies in usage.values() for latency in instance_latencies)
+    print(f"   启动浏览器接口耗时 p50 {percentile(latencies, 50) * 1000:.0f} ms，"
+          f"p95 {percentile(latencies, 95) * 1000:.0f} ms")
+    within_capacity = True
+    if len(usage) > 1 or options.capacity:
+        for instance in hubstudio_service.get_instances():
+            stats = fetch_stats(instance.base_url)
+            peak = stats['peak_running'] if stats else None
+            print(f"   实例 {instance.name}: 启动 {usage[instance.name][0]} 次，同时运行峰值 "
+                  f"{'未知' if peak is None else peak}（容量 {instance.capacity or '不限'}）")
+            if instance.capacity and peak is not None and peak > instance.capacity:
+                print(f"   实例 {instance.name} 同时运行的浏览器数超过容量")
+                within_capacity = False
+    if options.injects_errors or options.fail_rate:
+        return result['status'] == 'finished' and within_capacity
+    return result['status'] == 'finished' and counts['succeeded'] == options.items and within_capacity
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='HubStudio 批量操作压力测试')
+    parser.add_argument('--phase', action='append', choices=PHASES, default=None, help='只运行指定阶段（可重复）')
+    parser.add_argument('--base-url', default=None, help='单独运行的模拟器地址（默认在进程内启动）')
+    parser.add_argument('--database-uri', default=None, help='数据库地址（默认使用临时 SQLite 数据库）')
+    parser.add_argument('--envs', type=int, default=10000, help='模拟器初始环境数量（多个实例时为每个实例的数量）')
+    parser.add_argument('--instances', type=int, default=1, help='进程内启动的模拟器（HubStudio 实例）数量')
+    parser.add_argument('--capacity', type=int, default=0, help='每个实例同时运行的浏览器数上限（0 为不限）')
+    parser.add_argument('--latency', type=float, default=0.005, help='模拟器接口平均延迟（秒）')
+    parser.add_argument('--start-latency', type=float, default=0.05, help='模拟器启动浏览器接口的平均延迟（秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='模拟器返回 code != 0 的比例')
+    parser.add_argument('--create', type=int, default=200, help='批量创建的环境数')
+    parser.add_argument('--create-interval', type=float, default=0, help='批量创建时相邻两次创建的间隔（秒）')
+    parser.add_argument('--task', choices=sorted(JOB_TYPES), default='login', help='workers 阶段运行的批量任务')
+    parser.add_argument('--items', type=int, default=1000, help='批量任务处理的账号数')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='批量任务的并发数 BATCH_CONCURRENCY（默认 3；多实例时为各实例容量之和）')
+    parser.add_argument('--work', type=float, default=0, help='每个账号模拟浏览器操作的秒数')
+    parser.add_argument('--interval', type=float, default=0, help='工作线程处理完一个账号后的等待秒数')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='模拟登录返回网络错误（按规则重试）的比例')
+    parser.add_argument('--retry-delay', type=float, default=0.2, help='重试退避等待和代理冷却的上限（秒）')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    parser.add_argument('--log-level', default='WARNING', help='业务日志级别（默认 WARNING）')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    phases = options.phase or list(PHASES)
+    options.injects_errors = options.error_rate > 0
+
+    # 先导入业务模块（导入时初始化日志），再设置日志级别
+    from services import channel_service, login_service  # noqa: F401
+    from services.log_service import ROOT_LOGGER_NAME
+    logging.getLogger(ROOT_LOGGER_NAME).setLevel(options.log_level)
+
+    simulators = []
+    base_urls = [options.base_url] if options.base_url else []
+    if not base_urls:
+        for index in range(max(options.instances, 1)):
+            simulator = HubStudioSimulator(simulator_args([
+                '--port', '0', '--envs', str(options.envs), '--latency', str(options.latency),
+                '--start-latency', str(options.start_latency), '--error-rate', str(options.error_rate),
+                '--code-base', str(900000000 + index * 10000000),
+            ]))
+            simulator.start_background()
+            simulators.append(simulator)
+            base_urls.append(simulator.base_url)
+    base_url = base_urls[0]
+    config.HUBSTUDIO_CONFIG = dict(
+        config.HUBSTUDIO_CONFIG, base_url=base_url, capacity=options.capacity,
+        instances=[{'name': f'sim{index}', 'base_url': url, 'capacity': options.capacity}
+                   for index, url in enumerate(base_urls[1:], 2)],
+        create_interval=[options.create_interval, options.create_interval])
+    config.RETRY_CONFIG = dict(config.RETRY_CONFIG, max_delay=options.retry_delay, proxy_cooldown=options.retry_delay)
+
+    workdir = None
+    database_uri = options.database_uri
+    if not database_uri:
+        workdir = tempfile.mkdtemp(prefix='hubstudio_loadtest_')
+        database_uri = f"sqlite:///{os.path.join(workdir, 'loadtest.db')}"
+    app = create_app(database_uri)
+
+    print(f"HubStudio: {', '.join(base_urls)}{'（进程内模拟器）' if simulators else ''}"
+          f"{f'，每个实例容量 {options.capacity}' if options.capacity else ''}")
+    print(f"数据库: {database_uri.split('@')[-1]}")
+    ok = True
+    try:
+        with app.app_context():
+            db.create_all()
+            for phase in phases:
+                print()
+                print(f"[{phase}]")
+                before = [fetch_stats(url) for url in base_urls]
+                if phase == 'sync':
+                    passed = run_sync(options)
+                elif phase == 'create':
+                    passed = run_create(app, options)
+                else:
+                    passed = run_workers(app, options)
+                for index, url in enumerate(base_urls):
+                    label = f'[{url}] ' if len(base_urls) > 1 else ''
+                    print_stats_delta(before[index], fetch_stats(url), label)
+                ok = ok and passed
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        for simulator in simulators:
+            simulator.shutdown()
+            simulator.server_close()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    if not ok:
+        print("❌ 出现非模拟注入的失败")
+        return 1
+    print("✅ 批量操作全部完成")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+本地 HubStudio API 模拟器，用于在没有 HubStudio 客户端时压测批量操作
+
+实现 hubstudio_service 用到的接口：/api/v1/group/list、/api/v1/env/list、
+/api/v1/env/create、/api/v1/browser/start、/api/v1/browser/stop。
+可配置环境数量、接口延迟和出错比例；GET /stats 返回各接口的调用次数和平均耗时，
+以及同时运行的浏览器数的峰值（peak_running，用于从 HubStudio 一侧验证容量限制）。
+browser/start 返回的调试端口不对应真实浏览器，只用于验证接口层面的吞吐。
+
+用法:
+    python -m tools.hubstudio_simulator --port 6873 --envs 10000
+    python -m tools.hubstudio_simulator --latency 0.05 --start-latency 1.5 --error-rate 0.02
+
+然后把 config.json 中 hubstudio.base_url 指向 http://127.0.0.1:6873。
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENDPOINTS = ('group/list', 'env/list', 'env/create', 'browser/start', 'browser/stop')
+DEBUGGING_PORT_BASE = 20000
+
+
+class SimulatorState:
+    """模拟的环境、分组、已启动浏览器及调用统计（线程安全）"""
+
+    def __init__(self, env_count, group_count, code_base=900000000):
+        self._lock = threading.Lock()
+        self.code_base = code_base
+        self.groups = [{'tagCode': f'G{index:04d}', 'tagName': f'分组{index}'} for index in range(1, group_count + 1)]
+        self.envs = []
+        self.env_index = {}
+        self.running = {}
+        self.peak_running = 0
+        self.stats = {endpoint: {'count': 0, 'errors': 0, 'seconds': 0.0} for endpoint in ENDPOINTS}
+        for index in range(1, env_count + 1):
+            group = self.groups[index % group_count] if group_count else {'tagCode': '', 'tagName': ''}
+            self._add_env(f'sim{index:06d}', group)
+
+    def _add_env(self, name, group, **fields):
+        code = str(self.code_base + len(self.envs) + 1)
+        env = dict({
+            'containerCode': code,
+            'containerName': name,
+            'tagCode': group['tagCode'],
+            'tagName': group['tagName'],
+            'coreVersion': 124,
+            'proxyTypeName': 'Socks5',
+        }, **fields)
+        self.envs.append(env)
+        self.env_index[code] = env
+        return env
+
+    def list_envs(self, page, limit, name='', tag_code=''):
+        with self._lock:
+            envs = self.envs
+            if name:
+                envs = [env for env in envs if name in env['containerName']]
+            if tag_code:
+                envs = [env for env in envs if env['tagCode'] == tag_code]
+            start = (page - 1) * limit
+            return envs[start:start + limit], len(envs)
+
+    def create_env(self, body):
+        with self._lock:
+            group = next((g for g in self.groups if g['tagName'] == body.get('tagName')),
+                         {'tagCode': '', 'tagName': body.get('tagName', '')})
+            return self._add_env(body.get('containerName', ''), group,
+                                 coreVersion=body.get('coreVersion'),
+                                 proxyServer=body.get('proxyServer'), proxyPort=body.get('proxyPort'))
+
+    def start_browser(self, code):
+        with self._lock:
+            if code not in self.env_index:
+                return None
+            if code not in self.running:
+                self.running[code] = DEBUGGING_PORT_BASE + len(self.running) % 40000
+                self.peak_running = max(self.peak_running, len(self.running))
+            return self.running[code]
+
+    def stop_browser(self, code):
+        with self._lock:
+            return self.running.pop(code, None) is not None
+
+    def record(self, endpoint, seconds, error):
+        with self._lock:
+            stat = self.stats[endpoint]
+            stat['count'] += 1
+            stat['errors'] += int(error)
+            stat['seconds'] += seconds
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'envs': len(self.envs),
+                'running': len(self.running),
+                'peak_running': self.peak_running,
+                'endpoints': {
+                    endpoint: dict(stat, avg_ms=round(stat['seconds'] / stat['count'] * 1000, 1) if stat['count'] else 0)
+                    for endpoint, stat in self.stats.items()
+                },
+            }
+
+
+class HubStudioHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.options.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._send(200, self.server.state.snapshot())
+        else:
+            self._send(404, {'code': 404, 'msg': 'not found'})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        endpoint = self.path.split('?')[0].removeprefix('/api/v1/')
+        if endpoint not in ENDPOINTS:
+            self._send(404, {'code': 404, 'msg': 'not found'})
+            return
+
+        options = self.server.options
+        delay = options.start_latency if endpoint == 'browser/start' else options.latency
+        time.sleep(max(0.0, random.uniform(delay - options.jitter, delay + options.jitter)))
+
+        status, payload = self._handle(endpoint, raw)
+        self.server.state.record(endpoint, time.perf_counter() - start, status != 200 or payload.get('code') != 0)
+        self._send(status, payload)
+
+    def _handle(self, endpoint, raw):
+        options = self.server.options
+        if options.app_id and self.headers.get('app-id') != options.app_id:
+            return 200, {'code': -10003, 'msg': 'app-id 或 app-secret 错误'}
+        if random.random() < options.http_error_rate:
+            return 500, {'code': 500, 'msg': 'Internal Server Error'}
+        if random.random() < options.error_rate:
+            return 200, {'code': -1, 'msg': '模拟的接口错误'}
+        try:
+            body = json.loads(raw or b'{}')
+        except ValueError:
+            return 400, {'code': 400, 'msg': '请求体不是合法的 JSON'}
+
+        state = self.server.state
+        if endpoint == 'group/list':
+            return 200, {'code': 0, 'msg': 'success', 'data': state.groups}
+        if endpoint == 'env/list':
+            page = max(int(body.get('page', 1)), 1)
+            limit = min(max(int(body.get('limit', 20)), 1), options.max_page_size)
+            envs, total = state.list_envs(page, limit, body.get('containerName', ''), body.get('tagCode', ''))
+            return 200, {'code': 0, 'msg': 'success', 'data': {'list': envs, 'total': total}}
+        if endpoint == 'env/create':
+            env = state.create_env(body)
+            return 200, {'code': 0, 'msg': 'success', 'data': {'containerCode': env['containerCode']}}
+        if endpoint == 'browser/start':
+            port = state.start_browser(str(body.get('containerCode', '')))
+            if port is None:
+                return 200, {'code': -10013, 'msg': '环境不存在'}
+            return 200, {'code': 0, 'msg': 'success', 'data': {
+                'debuggingPort': port,
+                'webdriver': 'webdriver/chromedriver.exe',
+                'containerCode': body.get('containerCode'),
+            }}
+        stopped = state.stop_browser(str(body.get('containerCode', '')))
+        return 200, {'code': 0, 'msg': 'success' if stopped else '环境未启动'}
+
+
+class HubStudioSimulator(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, options):
+        self.options = options
+        self.state = SimulatorState(options.envs, options.groups, options.code_base)
+        super().__init__((options.host, options.port), HubStudioHandler)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start_background(self):
+        """在后台线程中运行（压测脚本内嵌使用）"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='本地 HubStudio API 模拟器')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6873, help='监听端口（0 为随机端口）')
+    parser.add_argument('--envs', type=int, default=10000, help='初始环境数量')
+    parser.add_argument('--groups', type=int, default=10, help='分组数量')
+    parser.add_argument('--code-base', type=int, default=900000000,
+                        help='环境编码起始值（同时运行多个模拟器时设置不同的值，避免编码重复）')
+    parser.add_argument('--latency', type=float, default=0.01, help='接口平均延迟（秒）')
+    parser.add_argument('--start-latency', type=float, default=0.5, help='启动浏览器接口的平均延迟（秒）')
+    parser.add_argument('--jitter', type=float, default=0.0, help='延迟的随机波动范围（秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='返回 code != 0 的比例')
+    parser.add_argument('--http-error-rate', type=float, default=0.0, help='返回 HTTP 500 的比例')
+    parser.add_argument('--max-page-size', type=int, default=500, help='env/list 单页最多返回的环境数')
+    parser.add_argument('--app-id', default='', help='校验请求头中的 app-id（为空不校验）')
+    parser.add_argument('--verbose', action='store_true', help='打印每个请求')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    server = HubStudioSimulator(options)
+    print(f"HubStudio 模拟器监听 {server.base_url}，环境 {options.envs} 个，"
+          f"接口延迟 {options.latency} 秒，启动延迟 {options.start_latency} 秒，出错比例 {options.error_rate}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.state.snapshot(), ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+离线回放：用录制的页面和虚拟时钟驱动真实的登录、创建频道流程（见 tools.replay_benchmark）
+"""
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+虚拟时钟：回放期间替换 time.sleep / time.time / time.monotonic
+
+流程中的等待（interruptible_sleep、WebDriverWait 轮询、选择器探测间隔）只推进虚拟时间，
+不真正休眠；统计的虚拟时间即真实浏览器中这些等待的总时长。
+只对安装时钟的线程生效，其他线程（如头像目录监控）仍使用真实时间；
+time.perf_counter 不替换，用于统计回放本身的耗时。
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class VirtualClock:
+    def __init__(self):
+        self._real_time = time.time
+        self._real_monotonic = time.monotonic
+        self._real_sleep = time.sleep
+        self.offset = 0.0
+        self.slept = 0.0
+        self._thread = None
+
+    def _virtual(self):
+        return threading.get_ident() == self._thread
+
+    def time(self):
+        return self._real_time() + (self.offset if self._virtual() else 0)
+
+    def monotonic(self):
+        return self._real_monotonic() + (self.offset if self._virtual() else 0)
+
+    def advance(self, seconds):
+        self.offset += max(0.0, seconds)
+
+    def sleep(self, seconds):
+        if not self._virtual():
+            return self._real_sleep(seconds)
+        if seconds < 0:
+            raise ValueError('sleep length must be non-negative')
+        self.slept += seconds
+        self.advance(seconds)
+
+    @contextmanager
+    def installed(self):
+        """在 with 块内替换 time 模块中的函数"""
+        self._thread = threading.get_ident()
+        time.time, time.monotonic, time.sleep = self.time, self.monotonic, self.sleep
+        try:
+            yield self
+        finally:
+            time.time, time.monotonic, time.sleep = self._real_time, self._real_monotonic, self._real_sleep
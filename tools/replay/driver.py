@@ -0,0 +1,594 @@
+# -*- coding: utf-8 -*-
+"""
+离线回放用的 WebDriver：页面来自录制的 HTML/URL 夹具，用 lxml 执行 XPath / CSS 定位
+
+只实现登录、创建频道流程用到的 WebDriver 接口。页面跳转由场景中的动作描述：
+点击某个元素、在输入框中按回车、给文件 input 设置文件、执行包含某段文字的脚本时，
+切换到指定页面（在 iframe 内触发时只切换该 iframe 的内容），可设置延迟模拟页面加载。
+
+选择器探测（selector_service.PROBE_JS）、创收 threshold 提取脚本在 Python 中模拟执行，
+其他脚本按场景中配置的返回值返回（未配置时返回 None，并计入 unscripted 统计）。
+"""
+import copy
+import json
+import re
+from collections import Counter
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from selenium.common.exceptions import (
+    ElementNotInteractableException, NoSuchElementException, NoSuchFrameException,
+    StaleElementReferenceException, WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.command import Command
+
+from services import selector_service
+from services.channel_service import FILE_CHOOSER_HOOK_JS, MONETIZATION_THRESHOLDS_JS
+
+# get_attribute 对布尔属性返回 "true" / None
+BOOLEAN_ATTRIBUTES = {'checked', 'disabled', 'hidden', 'multiple', 'readonly', 'required', 'selected'}
+POPUP_BUTTON_TEXTS = ('got it', '知道了', 'continue', '继续')
+_HIDDEN_STYLE = re.compile(r'display\s*:\s*none|visibility\s*:\s*hidden')
+
+
+def _xpath_for(by, value):
+    """Selenium 定位方式 -> lxml 可执行的 (xpath|css, 表达式)"""
+    if by == By.XPATH:
+        return 'xpath', value
+    if by == By.CSS_SELECTOR:
+        return 'css', value
+    if by == By.ID:
+        return 'css', f'[id="{value}"]'
+    if by == By.NAME:
+        return 'css', f'[name="{value}"]'
+    if by == By.TAG_NAME:
+        return 'css', value
+    if by == By.CLASS_NAME:
+        return 'css', f'.{value}'
+    if by == By.LINK_TEXT:
+        return 'xpath', f'//a[normalize-space(.)="{value}"]'
+    if by == By.PARTIAL_LINK_TEXT:
+        return 'xpath', f'//a[contains(., "{value}")]'
+    raise WebDriverException(f'回放驱动不支持的定位方式: {by}')
+
+
+def _select(root, kind, expression):
+    try:
+        if kind == 'css':
+            return CSSSelector(expression)(root)
+        return [node for node in root.xpath(expression) if isinstance(node.tag, str)]
+    except Exception as e:
+        raise WebDriverException(f'无效的选择器 {expression}: {e}')
+
+
+def _is_hidden(node):
+    if node.tag in ('script', 'style', 'head', 'template'):
+        return True
+    if node.get('hidden') is not None:
+        return True
+    if node.tag == 'input' and node.get('type') == 'hidden':
+        return True
+    return bool(_HIDDEN_STYLE.search(node.get('style') or ''))
+
+
+def _visible(node):
+    while node is not None:
+        if _is_hidden(node):
+            return False
+        node = node.getparent()
+    return True
+
+
+def _visible_text(node):
+    """与 WebElement.text 一致：只包含可见文字，空白折叠"""
+    parts = []
+
+    def walk(current):
+        if _is_hidden(current):
+            return
+        if current.text:
+            parts.append(current.text)
+        for child in current:
+            if isinstance(child.tag, str):
+                walk(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    walk(node)
+    return ' '.join(''.join(parts).split())
+
+
+class Page:
+    """一个已加载的文档（顶层页面或 iframe 内容）"""
+
+    def __init__(self, name, spec, url):
+        self.name = name
+        self.spec = spec
+        self.url = spec.get('url') or url
+        self.root = lxml_html.document_fromstring(spec['html'])
+        self.alive = True
+        self.file_hook = False
+        self.captured_input = None
+        # iframe 元素路径 -> Page
+        self.frames = {}
+
+    def select(self, kind, expression):
+        return _select(self.root, kind, expression)
+
+    def actions(self, event):
+        return [action for action in self.spec.get('actions', []) if action.get('on') == event]
+
+    def close(self):
+        self.alive = False
+        for frame in self.frames.values():
+            frame.close()
+
+
+class FakeElement:
+    """页面元素（页面切换后再使用会抛出 StaleElementReferenceException）"""
+
+    def __init__(self, driver, page, node):
+        self._driver = driver
+        self._page = page
+        self._node = node
+        self.id = f'{page.name}:{page.root.getroottree().getpath(node)}'
+
+    def __eq__(self, other):
+        return isinstance(other, FakeElement) and other._node is self._node
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f'<FakeElement {self.id}>'
+
+    def _check(self, command):
+        self._driver._call(command)
+        if not self._page.alive:
+            raise StaleElementReferenceException(f'元素已失效: {self.id}')
+
+    @property
+    def tag_name(self):
+        self._check('tag_name')
+        return self._node.tag
+
+    @property
+    def text(self):
+        self._check('text')
+        return _visible_text(self._node)
+
+    @property
+    def location(self):
+        self._check('location')
+        return {'x': 0, 'y': 0}
+
+    @property
+    def size(self):
+        self._check('size')
+        return {'width': 400, 'height': 300}
+
+    @property
+    def rect(self):
+        self._check('rect')
+        return {'x': 0, 'y': 0, 'width': 400, 'height': 300}
+
+    def is_displayed(self):
+        self._check('is_displayed')
+        return _visible(self._node)
+
+    def is_enabled(self):
+        self._check('is_enabled')
+        return self._node.get('disabled') is None and self._node.get('aria-disabled') != 'true'
+
+    def is_selected(self):
+        self._check('is_selected')
+        return self._node.get('checked') is not None or self._node.get('aria-selected') == 'true'
+
+    def get_attribute(self, name):
+        self._check('get_attribute')
+        return self._attribute(name)
+
+    def get_dom_attribute(self, name):
+        self._check('get_dom_attribute')
+        return self._node.get(name)
+
+    def get_property(self, name):
+        self._check('get_property')
+        return self._attribute(name)
+
+    def _attribute(self, name):
+        node = self._node
+        if name == 'outerHTML':
+            return lxml_html.tostring(node, encoding='unicode', with_tail=False)
+        if name == 'innerHTML':
+            return (node.text or '') + ''.join(lxml_html.tostring(child, encoding='unicode') for child in node)
+        if name in ('textContent', 'innerText'):
+            return node.text_content() if name == 'textContent' else _visible_text(node)
+        if name in BOOLEAN_ATTRIBUTES:
+            return 'true' if node.get(name) is not None else None
+        if name == 'value' and node.get('value') is None and node.tag in ('input', 'textarea'):
+            return ''
+        return node.get(name)
+
+    def find_element(self, by=By.ID, value=None):
+        self._check('find_element')
+        return self._driver._find(self._page, self._node, by, value, single=True)
+
+    def find_elements(self, by=By.ID, value=None):
+        self._check('find_elements')
+        return self._driver._find(self._page, self._node, by, value, single=False)
+
+    def click(self):
+        self._check('click')
+        if not _visible(self._node):
+            raise ElementNotInteractableException(f'元素不可见，无法点击: {self.id}')
+        self._driver._fire(self._page, 'click', self._node)
+
+    def clear(self):
+        self._check('clear')
+        if self._node.tag in ('input', 'textarea'):
+            self._node.set('value', '')
+
+    def send_keys(self, *values):
+        self._check('send_keys')
+        text = ''.join(str(value) for value in values)
+        node = self._node
+        if node.tag == 'input' and node.get('type') == 'file':
+            node.set('value', text)
+            self._driver._fire(self._page, 'file', node)
+            return
+        if not _visible(node):
+            raise ElementNotInteractableException(f'元素不可见，无法输入: {self.id}')
+        submit = Keys.ENTER in text or Keys.RETURN in text
+        text = text.replace(Keys.ENTER, '').replace(Keys.RETURN, '')
+        node.set('value', (node.get('value') or '') + text)
+        if submit:
+            self._driver._fire(self._page, 'enter', node)
+
+    def screenshot(self, filename):
+        self._check('screenshot')
+        return False
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def frame(self, frame_reference):
+        self._driver._switch_frame(frame_reference)
+
+    def default_content(self):
+        self._driver._call('switch_to.default_content')
+        self._driver._frame_stack = []
+
+    def parent_frame(self):
+        self._driver._call('switch_to.parent_frame')
+        if self._driver._frame_stack:
+            self._driver._frame_stack.pop()
+
+    def window(self, window_name):
+        self._driver._call('switch_to.window')
+
+    @property
+    def active_element(self):
+        raise WebDriverException('回放驱动不支持 active_element')
+
+
+class FakeDriver:
+    """回放 WebDriver
+
+    Args:
+        scenario: tools.replay.scenario.Scenario
+        clock: VirtualClock，用于延迟跳转（可为 None，跳转立即生效）
+    """
+
+    def __init__(self, scenario, clock=None):
+        self.scenario = scenario
+        self.clock = clock
+        self.calls = Counter()
+        self.unscripted = Counter()
+        self.unrecorded_urls = []
+        self.switch_to = _SwitchTo(self)
+        self.closed = False
+        self._pending = []
+        self._frame_stack = []
+        self.page = self._load(scenario.start, None)
+
+    # --- 页面状态 ---
+
+    def _now(self):
+        return self.clock.time() if self.clock else 0
+
+    def _load(self, name, url):
+        page = Page(name, self.scenario.page(name), url)
+        for selector, frame_name in page.spec.get('frames', {}).items():
+            for node in page.select('css', selector):
+                page.frames[page.root.getroottree().getpath(node)] = self._load(frame_name, node.get('src'))
+        return page
+
+    def _navigate(self, owner, name, url=None):
+        """在顶层页面或 iframe 中加载页面"""
+        if owner is None or owner is self.page:
+            self.page.close()
+            self.page = self._load(name, url)
+            self._frame_stack = []
+            return
+        for parent in [self.page] + self._all_frames(self.page):
+            for path, frame in parent.frames.items():
+                if frame is owner:
+                    frame.close()
+                    parent.frames[path] = self._load(name, url)
+                    self._frame_stack = [
+                        parent.frames[path] if item is owner else item for item in self._frame_stack
+                    ]
+                    return
+
+    def _all_frames(self, page):
+        result = []
+        for frame in page.frames.values():
+            result.append(frame)
+            result.extend(self._all_frames(frame))
+        return result
+
+    def _tick(self):
+        """执行到期的延迟跳转"""
+        now = self._now()
+        due = [item for item in self._pending if item[0] <= now]
+        if not due:
+            return
+        self._pending = [item for item in self._pending if item[0] > now]
+        for _, owner, name in due:
+            if owner.alive:
+                self._navigate(owner, name)
+
+    def _current(self):
+        self._tick()
+        return self._frame_stack[-1] if self._frame_stack else self.page
+
+    def _call(self, command):
+        if self.closed:
+            raise WebDriverException('浏览器已关闭')
+        self.calls[command] += 1
+        self._tick()
+
+    def _run_action(self, page, action):
+        if action.get('goto'):
+            delay = action.get('delay', 0)
+            if delay and self.clock:
+                self._pending.append((self._now() + delay, page, action['goto']))
+            else:
+                self._navigate(page, action['goto'])
+
+    def _fire(self, page, event, node):
+        """元素事件：匹配 target 的动作（点击可冒泡到祖先元素）"""
+        ancestors = [node] + list(node.iterancestors())
+        for action in page.actions(event):
+            targets = page.select('css', action['target'])
+            if not any(item in targets for item in ancestors):
+                continue
+            if action.get('file_chooser') and page.file_hook:
+                inputs = page.select('css', action['file_chooser'])
+                page.captured_input = inputs[0] if inputs else None
+            self._run_action(page, action)
+            return
+
+    def _find(self, page, root, by, value, single):
+        # 与浏览器一致：元素上的 "//" XPath 仍从文档根查找，CSS 只查找后代
+        nodes = _select(root, *_xpath_for(by, value))
+        if single:
+            if not nodes:
+                raise NoSuchElementException(f'未找到元素: {by}={value}')
+            return FakeElement(self, page, nodes[0])
+        return [FakeElement(self, page, node) for node in nodes]
+
+    def _element(self, page, node):
+        return FakeElement(self, page, node) if node is not None else None
+
+    def _switch_frame(self, frame_reference):
+        self._call('switch_to.frame')
+        current = self._current()
+        if isinstance(frame_reference, FakeElement):
+            path = current.root.getroottree().getpath(frame_reference._node)
+        elif isinstance(frame_reference, int):
+            iframes = current.select('xpath', '//iframe')
+            if frame_reference >= len(iframes):
+                raise NoSuchFrameException(str(frame_reference))
+            path = current.root.getroottree().getpath(iframes[frame_reference])
+        else:
+            nodes = current.select('xpath', f'//iframe[@name="{frame_reference}" or @id="{frame_reference}"]')
+            if not nodes:
+                raise NoSuchFrameException(str(frame_reference))
+            path = current.root.getroottree().getpath(nodes[0])
+        if path not in current.frames:
+            raise NoSuchFrameException(f'未录制的 iframe: {path}')
+        self._frame_stack.append(current.frames[path])
+
+    # --- WebDriver 接口 ---
+
+    @property
+    def current_url(self):
+        self._call('current_url')
+        return self.page.url
+
+    @property
+    def title(self):
+        self._call('title')
+        titles = self._current().root.xpath('//title/text()')
+        return titles[0].strip() if titles else ''
+
+    @property
+    def page_source(self):
+        self._call('page_source')
+        return lxml_html.tostring(self._current().root, encoding='unicode')
+
+    @property
+    def window_handles(self):
+        self._call('window_handles')
+        return ['main']
+
+    @property
+    def current_window_handle(self):
+        self._call('current_window_handle')
+        return 'main'
+
+    def get(self, url):
+        self._call('get')
+        name = self.scenario.route(url)
+        if name is None:
+            self.unrecorded_urls.append(url)
+            name = self.scenario.blank_page(url)
+        self._pending = []
+        self._navigate(None, name, url)
+
+    def refresh(self):
+        self._call('refresh')
+        self._navigate(None, self.page.name, self.page.url)
+
+    def find_element(self, by=By.ID, value=None):
+        self._call('find_element')
+        page = self._current()
+        return self._find(page, page.root, by, value, single=True)
+
+    def find_elements(self, by=By.ID, value=None):
+        self._call('find_elements')
+        page = self._current()
+        return self._find(page, page.root, by, value, single=False)
+
+    def execute_script(self, script, *args):
+        self._call('execute_script')
+        page = self._current()
+        if script == selector_service.PROBE_JS:
+            return self._probe(page, *args)
+        if script == FILE_CHOOSER_HOOK_JS:
+            page.file_hook = True
+            page.captured_input = None
+            return None
+        if '__capturedFileInputs' in script:
+            return self._element(page, page.captured_input)
+        if re.match(r'\s*arguments\[0\]\.click\(\)', script) and args and isinstance(args[0], FakeElement):
+            element = args[0]
+            element._check('js_click')
+            self._fire(element._page, 'click', element._node)
+            return None
+        if 'scrollIntoView' in script and len(script) < 120:
+            return None
+        return self._scripted(page, script, args)
+
+    def execute_async_script(self, script, *args):
+        self._call('execute_async_script')
+        page = self._current()
+        if script == MONETIZATION_THRESHOLDS_JS:
+            return self._monetization_thresholds(page, *args)
+        return self._scripted(page, script, args)
+
+    def _scripted(self, page, script, args):
+        for rule in page.spec.get('scripts', []):
+            if rule['contains'] in script:
+                if rule.get('click'):
+                    nodes = page.select('css', rule['click'])
+                    if nodes:
+                        self._fire(page, 'click', nodes[0])
+                self._run_action(page, rule)
+                return self._resolve(page, copy.deepcopy(rule.get('return')))
+        self.unscripted[' '.join(script.split())[:60]] += 1
+        return None
+
+    def _resolve(self, page, value):
+        """返回值中的 {"$element": "css"} 替换为页面元素"""
+        if isinstance(value, dict):
+            if set(value) == {'$element'}:
+                nodes = page.select('css', value['$element'])
+                return self._element(page, nodes[0] if nodes else None)
+            return {key: self._resolve(page, item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._resolve(page, item) for item in value]
+        return value
+
+    def _probe(self, page, queries, clickable):
+        """模拟 selector_service.PROBE_JS：按顺序返回第一个可见元素及各选择器是否命中"""
+        index, element, matched = -1, None, []
+        for position, (kind, expression) in enumerate(queries):
+            try:
+                nodes = page.select(kind, expression)
+            except WebDriverException:
+                nodes = []
+            found = next((node for node in nodes if _visible(node) and not (
+                clickable and (node.get('disabled') is not None or node.get('aria-disabled') == 'true'))), None)
+            matched.append(found is not None)
+            if found is not None and element is None:
+                index, element = position, FakeElement(self, page, found)
+        return [index, element, matched]
+
+    def _monetization_thresholds(self, page, wait_ms):
+        """模拟 MONETIZATION_THRESHOLDS_JS：关闭弹窗后提取 threshold，未出现时等满 wait_ms"""
+        clicked = []
+        for node in page.select('xpath', '//button | //ytcp-button | //tp-yt-paper-button'):
+            texts = (_visible_text(node).lower(), (node.get('aria-label') or '').strip().lower())
+            if _visible(node) and any(text in POPUP_BUTTON_TEXTS for text in texts):
+                clicked.append(next(text for text in texts if text in POPUP_BUTTON_TEXTS))
+                self._fire(page, 'click', node)
+                page = self._current()
+
+        def section_of(node):
+            for ancestor in [node] + list(node.iterancestors()):
+                for name in (ancestor.get('class') or '').split():
+                    if name == 'watch-and-shorts-progress':
+                        continue
+                    if 'shorts-progress' in name:
+                        return 'shorts'
+                    if 'watch' in name and 'progress' in name:
+                        return 'watch'
+                    if 'subscriber' in name:
+                        return 'subscribers'
+            return ''
+
+        items = []
+        for node in page.select('xpath', '//span[contains(@class, "threshold")]'):
+            label_node = next((ancestor for ancestor in node.iterancestors()
+                               if 'progress-text' in (ancestor.get('class') or '')), node.getparent())
+            items.append({'text': node.text_content().strip(), 'section': section_of(node),
+                          'label': label_node.text_content().strip() if label_node is not None else ''})
+        ready = bool(items)
+        if self.clock:
+            self.clock.advance(0.25 if ready else wait_ms / 1000)
+        return json.dumps({'ready': ready, 'items': items, 'clicked': clicked, 'url': page.url})
+
+    def execute(self, driver_command, params=None):
+        self._call(driver_command)
+        if driver_command in (Command.W3C_ACTIONS, Command.W3C_CLEAR_ACTIONS):
+            # ActionChains 的坐标点击在回放页面中没有布局，不产生点击
+            return {'value': None}
+        raise WebDriverException(f'回放驱动不支持的命令: {driver_command}')
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self._call('execute_cdp_cmd')
+        return {}
+
+    def set_script_timeout(self, time_to_wait):
+        self._call('set_script_timeout')
+
+    def set_page_load_timeout(self, time_to_wait):
+        self._call('set_page_load_timeout')
+
+    def implicitly_wait(self, time_to_wait):
+        self._call('implicitly_wait')
+
+    def maximize_window(self):
+        self._call('maximize_window')
+
+    def set_window_size(self, width, height, windowHandle='current'):
+        self._call('set_window_size')
+
+    def save_screenshot(self, filename):
+        self._call('save_screenshot')
+        return False
+
+    def quit(self):
+        self._call('quit')
+        self.closed = True
+
+    def close(self):
+        self._call('close')
+        self.closed = True
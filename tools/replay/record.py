@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+录制回放页面：打开 HubStudio 浏览器环境，手动操作到目标页面后保存页面 HTML 和 URL
+
+每次按回车保存当前页面（及其中各 iframe 的内容）到 fixtures/pages/<前缀>/ 下，
+并输出可粘贴到场景文件 pages 中的配置。录制的页面含账号信息，提交前请删减无关内容。
+
+用法:
+    python -m tools.replay.record --env <环境ID> --prefix google
+"""
+import argparse
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from tools.replay.scenario import FIXTURES_DIR  # noqa: E402
+
+
+def snapshot(driver, directory, name):
+    """保存当前页面及其 iframe，返回可加入场景 pages 的页面配置 {页面名: 配置}"""
+    from selenium.webdriver.common.by import By
+
+    os.makedirs(directory, exist_ok=True)
+    relative_dir = os.path.relpath(directory, os.path.join(FIXTURES_DIR, 'pages')).replace(os.sep, '/')
+    driver.switch_to.default_content()
+    spec = {'url': driver.current_url, 'file': f'{relative_dir}/{name}.html'}
+    pages = {name: spec}
+    with open(os.path.join(directory, f'{name}.html'), 'w', encoding='utf-8') as f:
+        f.write(driver.page_source)
+
+    frames = {}
+    for index, iframe in enumerate(driver.find_elements(By.TAG_NAME, 'iframe')):
+        src = iframe.get_attribute('src') or ''
+        if not src.startswith('http'):
+            continue
+        frame_name = f'{name}_frame{index}'
+        try:
+            driver.switch_to.frame(iframe)
+            with open(os.path.join(directory, f'{frame_name}.html'), 'w', encoding='utf-8') as f:
+                f.write(driver.page_source)
+            frames[f'iframe[src="{src}"]'] = frame_name
+            pages[frame_name] = {'file': f'{relative_dir}/{frame_name}.html'}
+        except Exception as e:
+            print(f"  跳过 iframe {index}（{src[:60]}）: {e}")
+        finally:
+            driver.switch_to.default_content()
+    if frames:
+        spec['frames'] = frames
+    return pages
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='录制回放页面')
+    parser.add_argument('--env', required=True, help='HubStudio 浏览器环境ID')
+    parser.add_argument('--prefix', default='recorded', help='保存到 fixtures/pages 下的子目录')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    from services import hubstudio_service
+
+    driver = hubstudio_service.open_browser(options.env)
+    if not driver:
+        print("❌ 无法打开浏览器环境")
+        return 1
+
+    directory = os.path.join(FIXTURES_DIR, 'pages', options.prefix)
+    try:
+        count = 0
+        while True:
+            name = input("操作到目标页面后输入页面名并回车保存（直接回车使用序号，q 退出）: ").strip()
+            if name.lower() == 'q':
+                break
+            count += 1
+            name = name or f'page{count}'
+            print(json.dumps(snapshot(driver, directory, name), ensure_ascii=False, indent=4))
+    finally:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        hubstudio_service.close_browser(options.env)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
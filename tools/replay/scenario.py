@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+回放场景：一个流程（登录 / 状态检测 / 创建频道）及其经过的录制页面
+
+场景文件（fixtures/scenarios/*.json）格式:
+    {
+        "description": "说明",
+        "flow": "perform_login",            # 见 tools.replay_benchmark.FLOWS
+        "args": {"account": "...", "password": "..."},
+        "account": {"channel_status": "none"},   # 写入测试库的账号字段（可选）
+        "expect": "success",                # 期望的返回状态
+        "start": "blank",                   # 起始页面
+        "routes": [{"match": "accounts.google.com", "page": "identifier"}],   # driver.get 的 URL 包含 match 时加载的页面
+        "pages": {
+            "identifier": {
+                "url": "https://accounts.google.com/...",   # 省略时使用 driver.get 的地址
+                "file": "google/signin_identifier.html",    # fixtures/pages 下的录制页面（或用 "html" 直接写页面）
+                "frames": {"iframe[src*=profilewidgets]": "picker"},   # iframe 内容
+                "actions": [{"on": "click", "target": "#identifierNext", "goto": "password", "delay": 2}],
+                "scripts": [{"contains": "getElementById('nTuXNc')", "click": "#nTuXNc", "return": {"success": true}}]
+            }
+        }
+    }
+
+动作的 on 可以是 click（点击 target 或其子元素）、enter（在 target 中输入回车）、
+file（给文件 input 设置文件）；file_chooser 指定点击后被文件选择拦截捕获的 input。
+脚本返回值中的 {"$element": "css"} 会替换为页面元素。
+"""
+import json
+import os
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+BLANK_HTML = '<html><head></head><body></body></html>'
+
+
+class Scenario:
+    def __init__(self, name, data, pages_dir=os.path.join(FIXTURES_DIR, 'pages')):
+        self.name = name
+        self.description = data.get('description', '')
+        self.flow = data['flow']
+        self.args = data.get('args', {})
+        self.account = data.get('account', {})
+        self.expect = data.get('expect')
+        self.start = data.get('start', 'blank')
+        self.routes = data.get('routes', [])
+        self.pages = {'blank': {'url': 'about:blank', 'html': BLANK_HTML}}
+        self.pages.update(data.get('pages', {}))
+        self._pages_dir = pages_dir
+        self._html = {}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(os.path.splitext(os.path.basename(path))[0], data)
+
+    def page(self, name):
+        """页面配置（html 已从录制文件读入）"""
+        if name not in self.pages:
+            raise KeyError(f'场景 {self.name} 中没有页面: {name}')
+        spec = self.pages[name]
+        if 'html' not in spec:
+            if spec['file'] not in self._html:
+                with open(os.path.join(self._pages_dir, spec['file']), 'r', encoding='utf-8') as f:
+                    self._html[spec['file']] = f.read()
+            spec = dict(spec, html=self._html[spec['file']])
+        return spec
+
+    def route(self, url):
+        """driver.get(url) 加载的页面名，未录制时返回 None"""
+        for route in self.routes:
+            if route['match'] in url:
+                return route['page']
+        return None
+
+    def blank_page(self, url):
+        """未录制的地址加载为空白页（地址保持为请求的地址）"""
+        self.pages.setdefault('__unrecorded__', {'html': BLANK_HTML})
+        return '__unrecorded__'
+
+
+def load_scenarios(directory=os.path.join(FIXTURES_DIR, 'scenarios'), names=None):
+    """读取场景目录下的全部场景（按文件名排序），names 不为空时只读取指定的场景"""
+    scenarios = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.json'):
+            continue
+        scenario = Scenario.load(os.path.join(directory, filename))
+        if not names or scenario.name in names:
+            scenarios.append(scenario)
+    return scenarios
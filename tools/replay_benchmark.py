@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+离线回放基准测试：用录制的页面驱动真实的登录、页面状态检测和创建频道流程
+
+不需要 HubStudio 和真实浏览器：FakeDriver 按场景文件（tools/replay/fixtures/scenarios）
+加载录制的页面并模拟点击、输入和跳转，流程中的等待由虚拟时钟推进。
+每个场景统计回放耗时、虚拟等待时间、WebDriver 调用次数和数据库写入次数，
+结果与场景期望不一致时退出码为 1，可用于验证选择器或流程改动后的性能变化。
+
+用法:
+    python -m tools.replay_benchmark
+    python -m tools.replay_benchmark --runs 20 --scenario login_success --scenario channel_create
+    python -m tools.replay_benchmark --json replay.json --log-level INFO
+
+依赖 lxml 和 cssselect（仅回放工具需要）。
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from flask import Flask  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+import config  # noqa: E402
+from tools.replay.clock import VirtualClock  # noqa: E402
+from tools.replay.scenario import load_scenarios  # noqa: E402
+
+# 1x1 PNG，作为创建频道时上传的头像
+AVATAR_PNG = bytes.fromhex(
+    '89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489'
+    '0000000d4944415478da63f8cfc0f01f0005000201a5b2e0a40000000049454e44ae426082'
+)
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+
+def _run_perform_login(driver, scenario, account_id):
+    from services.login_service import perform_login
+    return perform_login(driver, account_id=account_id, **scenario.args)[0]
+
+
+def _run_detect_login_page_state(driver, scenario, account_id):
+    from services.login_service import detect_login_page_state
+    return detect_login_page_state(driver)
+
+
+def _run_create_youtube_channel(driver, scenario, account_id):
+    from services.channel_service import create_youtube_channel
+    return create_youtube_channel(driver, account_id=account_id, browser_env_id='replay')[0]
+
+
+# 场景 flow -> 执行函数(driver, scenario, account_id)，返回流程结果状态
+FLOWS = {
+    'perform_login': _run_perform_login,
+    'detect_login_page_state': _run_detect_login_page_state,
+    'create_youtube_channel': _run_create_youtube_channel,
+}
+
+
+def create_app():
+    from models import db
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+class WriteCounter:
+    """统计执行的 INSERT / UPDATE / DELETE 语句数"""
+
+    def __init__(self, engine):
+        self.count = 0
+        self.enabled = False
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.enabled and statement.lstrip().upper().startswith(WRITE_STATEMENTS):
+            self.count += 1
+
+
+def prepare_run(scenario, avatar_dir):
+    """重建测试库和头像目录，返回测试账号ID"""
+    from models import db, Account
+    from services import avatar_service
+
+    db.drop_all()
+    db.create_all()
+    fields = dict(scenario.account)
+    account = Account(account=scenario.args.get('account', 'replay.account@gmail.com'),
+                      password=scenario.args.get('password', 'replay-password'), **fields)
+    db.session.add(account)
+    db.session.commit()
+
+    # 创建频道成功后会删除使用过的头像文件，每次运行重新放一张
+    with open(os.path.join(avatar_dir, 'avatar.png'), 'wb') as f:
+        f.write(AVATAR_PNG)
+    avatar_service.catalog.invalidate()
+    return account.id
+
+
+def run_once(scenario, avatar_dir, writes):
+    """回放一次场景，返回本次运行的统计"""
+    from models import db
+    from tools.replay.driver import FakeDriver
+
+    account_id = prepare_run(scenario, avatar_dir)
+    clock = VirtualClock()
+    driver = FakeDriver(scenario, clock=clock)
+
+    writes.count = 0
+    writes.enabled = True
+    start = time.perf_counter()
+    try:
+        with clock.installed():
+            result = FLOWS[scenario.flow](driver, scenario, account_id)
+    finally:
+        elapsed = time.perf_counter() - start
+        writes.enabled = False
+        db.session.remove()
+    return {
+        'result': result,
+        'wall_ms': elapsed * 1000,
+        'virtual_seconds': clock.offset,
+        'driver_calls': sum(driver.calls.values()),
+        'calls': dict(driver.calls),
+        'db_writes': writes.count,
+        'unscripted': dict(driver.unscripted),
+        'unrecorded_urls': sorted(set(driver.unrecorded_urls)),
+    }
+
+
+def summarize(scenario, runs):
+    """汇总同一场景多次运行的统计"""
+    results = Counter(run['result'] for run in runs)
+    calls = Counter()
+    for run in runs:
+        calls.update(run['calls'])
+    last = runs[-1]
+    return {
+        'scenario': scenario.name,
+        'flow': scenario.flow,
+        'expect': scenario.expect,
+        'results': dict(results),
+        'ok': set(results) == {scenario.expect},
+        'runs': len(runs),
+        'wall_ms_median': round(statistics.median(run['wall_ms'] for run in runs), 2),
+        'wall_ms_max': round(max(run['wall_ms'] for run in runs), 2),
+        'virtual_seconds': round(last['virtual_seconds'], 2),
+        'driver_calls': last['driver_calls'],
+        'calls': dict(sorted(last['calls'].items(), key=lambda item: -item[1])),
+        'db_writes': last['db_writes'],
+        'unscripted': last['unscripted'],
+        'unrecorded_urls': last['unrecorded_urls'],
+    }
+
+
+def print_summary(summary):
+    mark = '✅' if summary['ok'] else '❌'
+    results = ', '.join(f'{result} x{count}' for result, count in summary['results'].items())
+    print(f"{mark} {summary['scenario']} ({summary['flow']}): {results}（期望 {summary['expect']}）")
+    print(f"   回放耗时 中位数 {summary['wall_ms_median']:.1f} ms / 最大 {summary['wall_ms_max']:.1f} ms，"
+          f"虚拟等待 {summary['virtual_seconds']:.1f} 秒")
+    top_calls = ', '.join(f'{command} {count}' for command, count in list(summary['calls'].items())[:6])
+    print(f"   WebDriver 调用 {summary['driver_calls']} 次（{top_calls}），数据库写入 {summary['db_writes']} 次")
+    if summary['unscripted']:
+        print(f"   未模拟的脚本 {sum(summary['unscripted'].values())} 次: "
+              + '; '.join(f'{script} x{count}' for script, count in summary['unscripted'].items()))
+    if summary['unrecorded_urls']:
+        print(f"   未录制的地址: {', '.join(summary['unrecorded_urls'])}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='离线回放基准测试')
+    parser.add_argument('--runs', type=int, default=5, help='每个场景运行次数')
+    parser.add_argument('--scenario', action='append', default=None, help='只运行指定场景（可重复）')
+    parser.add_argument('--json', default=None, help='把结果写入 JSON 文件')
+    parser.add_argument('--log-level', default='WARNING', help='流程日志级别（默认 WARNING）')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    scenarios = load_scenarios(names=options.scenario)
+    if not scenarios:
+        print("❌ 没有找到场景")
+        return 1
+
+    workdir = tempfile.mkdtemp(prefix='replay_')
+    avatar_dir = os.path.join(workdir, 'avatars')
+    os.makedirs(avatar_dir)
+    # 日志、头像和选择器统计都放在临时目录，不影响正式数据
+    config.LOG_CONFIG = dict(config.LOG_CONFIG, dir=os.path.join(workdir, 'logs'), console_level=options.log_level)
+    config.CHANNEL_AVATAR_PATH = avatar_dir
+    config.AVATAR_CACHE_CONFIG = dict(config.AVATAR_CACHE_CONFIG, enabled=False)
+
+    from models import db
+    from services import selector_service
+    from services.log_service import ROOT_LOGGER_NAME
+
+    selector_service.STATS_FILE = os.path.join(workdir, 'selector_stats.json')
+    logging.getLogger(ROOT_LOGGER_NAME).setLevel(options.log_level)
+
+    app = create_app()
+    summaries = []
+    try:
+        with app.app_context():
+            writes = WriteCounter(db.engine)
+            for scenario in scenarios:
+                if scenario.flow not in FLOWS:
+                    print(f"❌ {scenario.name}: 未知流程 {scenario.flow}")
+                    summaries.append({'scenario': scenario.name, 'flow': scenario.flow, 'ok': False})
+                    continue
+                runs = [run_once(scenario, avatar_dir, writes) for _ in range(max(options.runs, 1))]
+                summary = summarize(scenario, runs)
+                summaries.append(summary)
+                print_summary(summary)
+    finally:
+        from services.log_service import shutdown_logging
+        shutdown_logging()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if options.json:
+        with open(options.json, 'w', encoding='utf-8') as f:
+            json.dump(summaries, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {options.json}")
+
+    failed = [summary['scenario'] for summary in summaries if not summary['ok']]
+    print()
+    if failed:
+        print(f"❌ {len(failed)}/{len(summaries)} 个场景结果与期望不一致: {', '.join(failed)}")
+        return 1
+    print(f"✅ {len(summaries)} 个场景全部符合期望")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+本地 SOCKS5 代理替身，用于在没有真实节点时验证节点健康检测
+
+只实现健康检测需要的部分：认证协商、用户名/密码认证、CONNECT 应答，
+不会真正建立到目标地址的连接。
+
+用法:
+    python -m tools.socks5_server --port 1080 --username user --password pass --delay 0.2
+    python -m tools.socks5_server --port 1081 --reject-connect   # 模拟无法出网的节点
+
+然后在节点管理中添加 127.0.0.1:1080，点击“检测连通性”。
+"""
+import argparse
+import socketserver
+import struct
+import time
+
+
+class Socks5Handler(socketserver.BaseRequestHandler):
+    """按 RFC 1928 / RFC 1929 应答一次握手与 CONNECT"""
+
+    def handle(self):
+        options = self.server.options
+        sock = self.request
+        time.sleep(options.delay)
+
+        version, method_count = sock.recv(2)
+        methods = sock.recv(method_count)
+        if options.username:
+            if 0x02 not in methods:
+                sock.sendall(b'\x05\xff')
+                return
+            sock.sendall(b'\x05\x02')
+            _, user_len = sock.recv(2)
+            username = sock.recv(user_len).decode('utf-8')
+            password = sock.recv(sock.recv(1)[0]).decode('utf-8')
+            if (username, password) != (options.username, options.password):
+                sock.sendall(b'\x01\x01')
+                return
+            sock.sendall(b'\x01\x00')
+        else:
+            sock.sendall(b'\x05\x00')
+
+        header = sock.recv(4)
+        if len(header) < 4:
+            return
+        address_type = header[3]
+        if address_type == 0x01:
+            sock.recv(4 + 2)
+        elif address_type == 0x04:
+            sock.recv(16 + 2)
+        elif address_type == 0x03:
+            sock.recv(sock.recv(1)[0] + 2)
+
+        reply = 0x05 if options.reject_connect else 0x00  # 0x05: connection refused
+        sock.sendall(bytes([0x05, reply, 0x00, 0x01]) + bytes(4) + struct.pack('>H', 0))
+
+
+class Socks5Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, options):
+        super().__init__(address, Socks5Handler)
+        self.options = options
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='本地 SOCKS5 代理替身')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1080)
+    parser.add_argument('--username', default='', help='设置后要求用户名/密码认证')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--delay', type=float, default=0, help='每次握手前的人为延迟（秒）')
+    parser.add_argument('--reject-connect', action='store_true', help='CONNECT 一律返回连接被拒绝')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    with Socks5Server((options.host, options.port), options) as server:
+        print(f"SOCKS5 替身已启动: {options.host}:{options.port}（Ctrl+C 退出）")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
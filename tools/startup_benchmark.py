@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+启动耗时基准：统计导入 main（注册全部蓝图）时各模块的导入耗时
+
+每轮在新的 Python 进程中用 -X importtime 导入目标模块，取多轮的中位数，
+列出耗时最多的模块，并检查启动时是否误导入了重量级依赖。
+总耗时超过目标或导入了重量级依赖时退出码为 1，可用于 CI 或打包前检查。
+
+用法:
+    python -m tools.startup_benchmark
+    python -m tools.startup_benchmark --runs 5 --top 20 --target 1000
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# 启动时不应导入的重量级依赖（应在使用时才导入）
+HEAVY_MODULES = ('pandas', 'numpy', 'selenium', 'alembic', 'PIL', 'pyautogui',
+                 'services.login_service', 'services.channel_service')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module):
+    """在新进程中导入模块一次
+
+    Returns:
+        dict: 模块名 -> (自身耗时us, 累计耗时us, 嵌套层级)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, encoding='utf-8', errors='replace'
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'导入 {module} 失败:\n{result.stderr[-2000:]}')
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return timings
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='统计启动时各模块的导入耗时')
+    parser.add_argument('--module', default='main', help='要导入的模块（默认 main）')
+    parser.add_argument('--runs', type=int, default=3, help='测量轮数，取中位数')
+    parser.add_argument('--top', type=int, default=15, help='列出累计耗时最多的模块数')
+    parser.add_argument('--target', type=float, default=1000, help='总导入耗时目标（毫秒）')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    runs = [measure(options.module) for _ in range(max(1, options.runs))]
+
+    def median(name, index):
+        return statistics.median(run[name][index] for run in runs if name in run) / 1000
+
+    total = median(options.module, 1)
+    names = set().union(*runs)
+
+    print(f"导入 {options.module} 耗时（{len(runs)} 轮中位数）: {total:.0f} ms，目标 {options.target:.0f} ms")
+    print()
+    print(f"{'累计(ms)':>10} {'自身(ms)':>10}  模块")
+    # 只列出顶层及第二层的模块，更深的依赖已包含在其累计耗时中
+    candidates = [name for name in names if name != options.module and runs[0].get(name, (0, 0, 0))[2] <= 2]
+    for name in sorted(candidates, key=lambda n: median(n, 1), reverse=True)[:options.top]:
+        print(f"{median(name, 1):>10.1f} {median(name, 0):>10.1f}  {name}")
+
+    heavy = sorted(name for name in names if name in HEAVY_MODULES)
+    print()
+    if heavy:
+        print(f"❌ 启动时导入了重量级依赖: {', '.join(heavy)}")
+    else:
+        print(f"✅ 启动时未导入重量级依赖（{', '.join(HEAVY_MODULES)}）")
+
+    if total > options.target:
+        print(f"❌ 启动导入耗时超过目标 {total - options.target:.0f} ms")
+    else:
+        print(f"✅ 启动导入耗时在目标内")
+
+    return 1 if heavy or total > options.target else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())